@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import Optional
 
+from . import metrics, tracing
 from .client import AuraBackendClient
 
 
@@ -28,20 +30,33 @@ class BaseAgent:
     async def initialize(self) -> None:
         """Hook for subclasses to perform startup actions."""
 
-    async def step(self) -> None:
-        """One iteration of work for the agent."""
+    async def step(self) -> int:
+        """One iteration of work for the agent; returns the number of items acted on."""
         raise NotImplementedError
 
+    def record_backlog(self, queue: str, size: int) -> None:
+        """Report how many items are waiting in `queue` for this agent."""
+        metrics.BACKLOG.set(size, self.name, queue)
+
     async def run_forever(self) -> None:
         if not self._initialized:
             await self.initialize()
             self._initialized = True
             self.logger.info("%s initialized", self.name)
         while not self._shutdown_event.is_set():
-            try:
-                await self.step()
-            except Exception as exc:  # pragma: no cover - defensive logging
-                self.logger.exception("Agent %s encountered error: %s", self.name, exc)
+            started = time.perf_counter()
+            with tracing.span("agent.step", agent=self.name) as step_span:
+                try:
+                    items = await self.step()
+                except Exception as exc:  # pragma: no cover - defensive logging
+                    step_span.status = "error"
+                    step_span.attributes["exception.type"] = type(exc).__name__
+                    metrics.STEP_ERRORS.inc(1, self.name)
+                    self.logger.exception("Agent %s encountered error: %s", self.name, exc)
+                else:
+                    step_span.attributes["items"] = items or 0
+                    metrics.STEP_ITEMS.observe(items or 0, self.name)
+            metrics.STEP_SECONDS.observe(time.perf_counter() - started, self.name)
             try:
                 await asyncio.wait_for(self._shutdown_event.wait(), timeout=self.poll_interval)
             except asyncio.TimeoutError:
@@ -1,98 +1,232 @@
 from __future__ import annotations
 
+import time
 from collections.abc import Iterable
+from datetime import datetime
 from typing import Any
 
 import httpx
 
-from .models import Agent, Negotiation, Producer, WasteLot, WasteLotStatus
+from . import compact, metrics, tracing
+from .models import Agent, MintJob, Negotiation, OracleFeed, Producer, ProducerSummary, WasteLot, WasteLotStatus
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Traces and times every request sent through `transport`, including ones that fail before a response."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = metrics.endpoint_template(request.url.path)
+        attributes = {"http.method": request.method, "http.url": str(request.url)}
+        span = tracing.start(f"{request.method} {endpoint}", kind="client", **attributes)
+        request.headers["traceparent"] = span.traceparent
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as exc:  # connect errors, timeouts, cancellation
+            metrics.HTTP_SECONDS.observe(time.perf_counter() - started, request.method, endpoint, "error")
+            span.status = "error"
+            span.attributes["exception.type"] = type(exc).__name__
+            tracing.finish(span)
+            raise
+        metrics.HTTP_SECONDS.observe(time.perf_counter() - started, request.method, endpoint, response.status_code)
+        span.attributes["http.status_code"] = response.status_code
+        span.status = "error" if response.status_code >= 500 else "ok"
+        tracing.finish(span)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
 
 
 class AuraBackendClient:
     """Async wrapper around the Aura FastAPI backend."""
 
-    def __init__(self, base_url: str, *, timeout: float = 10.0) -> None:
-        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: float = 10.0,
+        compact_models: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        # `transport` lets the simulator drive an in-process ASGI app instead of a socket.
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            transport=_InstrumentedTransport(transport or httpx.AsyncHTTPTransport()),
+        )
+        self.compact_models = compact_models
+        self._oracle_feeds: tuple[str, list[OracleFeed]] | None = None
 
     async def close(self) -> None:
         await self._client.aclose()
 
+    def _one(self, resp: httpx.Response, model: type) -> Any:
+        if self.compact_models:
+            return compact.decode(resp.content, model)
+        return model.model_validate(resp.json())
+
+    def _many(self, resp: httpx.Response, model: type) -> list[Any]:
+        if self.compact_models:
+            return compact.decode_many(resp.content, model)
+        return [model.model_validate(item) for item in resp.json()]
+
     async def list_producers(self) -> list[Producer]:
         resp = await self._client.get("/producers")
         resp.raise_for_status()
-        return [Producer.model_validate(item) for item in resp.json()]
+        return self._many(resp, Producer)
 
     async def create_producer(self, payload: dict[str, Any]) -> Producer:
         resp = await self._client.post("/producers", json=payload)
         resp.raise_for_status()
-        return Producer.model_validate(resp.json())
+        return self._one(resp, Producer)
+
+    async def get_producer(
+        self,
+        producer_id: int,
+        *,
+        status: Iterable[WasteLotStatus] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Producer:
+        """The producer with one page of its lots, newest first; `status` narrows the page to those statuses."""
+        params: dict[str, Any] = {}
+        if status:
+            params["status"] = [item.value for item in status]
+        if limit is not None:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        resp = await self._client.get(f"/producers/{producer_id}", params=params or None)
+        resp.raise_for_status()
+        return self._one(resp, Producer)
 
-    async def get_producer(self, producer_id: int) -> Producer:
-        resp = await self._client.get(f"/producers/{producer_id}")
+    async def get_producer_summary(self, producer_id: int) -> ProducerSummary:
+        """Per-status lot counts and the IDs of lots waiting on the producer, without the lots themselves."""
+        resp = await self._client.get(f"/producers/{producer_id}", params={"summary": "true"})
+        resp.raise_for_status()
+        return self._one(resp, ProducerSummary)
+
+    async def list_lots(
+        self,
+        *,
+        status: WasteLotStatus | Iterable[WasteLotStatus] | None = None,
+        producer_id: int | None = None,
+        recycler_agent_id: int | None = None,
+        updated_since: datetime | None = None,
+        composition: list[str] | None = None,
+    ) -> list[WasteLot]:
+        params: dict[str, Any] = {}
+        if isinstance(status, WasteLotStatus):
+            params["status"] = status.value
+        elif status:
+            params["status"] = [item.value for item in status]  # any of these
+        if producer_id is not None:
+            params["producer_id"] = producer_id
+        if recycler_agent_id is not None:
+            params["recycler_agent_id"] = recycler_agent_id  # lots in this recycler's negotiations
+        if updated_since is not None:
+            params["updated_since"] = updated_since.isoformat()
+        if composition:
+            params["composition"] = composition  # e.g. ["Cu>5", "Pb<0.1"]; all must hold
+        resp = await self._client.get("/lots", params=params or None)
         resp.raise_for_status()
-        return Producer.model_validate(resp.json())
+        return self._many(resp, WasteLot)
 
-    async def list_lots(self, *, status: WasteLotStatus | None = None) -> list[WasteLot]:
-        params = {"status": status.value} if status else None
-        resp = await self._client.get("/lots", params=params)
+    async def create_lot(self, payload: dict[str, Any]) -> WasteLot:
+        resp = await self._client.post("/lots", json=payload)
         resp.raise_for_status()
-        return [WasteLot.model_validate(item) for item in resp.json()]
+        return self._one(resp, WasteLot)
 
     async def get_lot(self, lot_id: int) -> WasteLot:
         resp = await self._client.get(f"/lots/{lot_id}")
         resp.raise_for_status()
-        return WasteLot.model_validate(resp.json())
+        return self._one(resp, WasteLot)
 
     async def request_verification(self, lot_id: int, payload: dict[str, Any]) -> WasteLot:
         resp = await self._client.post(f"/lots/{lot_id}/verification", json=payload)
         resp.raise_for_status()
-        return WasteLot.model_validate(resp.json())
+        return self._one(resp, WasteLot)
 
     async def approve_verification(self, lot_id: int, payload: dict[str, Any] | None = None) -> WasteLot:
         resp = await self._client.post(f"/lots/{lot_id}/verify", json=payload or {})
         resp.raise_for_status()
-        return WasteLot.model_validate(resp.json())
+        return self._one(resp, WasteLot)
 
-    async def tokenize_lot(self, lot_id: int, payload: dict[str, Any]) -> WasteLot:
+    async def tokenize_lot(self, lot_id: int, payload: dict[str, Any]) -> WasteLot | MintJob:
+        """Returns the tokenized lot, or the queued `MintJob` when the backend mints asynchronously."""
         resp = await self._client.post(f"/lots/{lot_id}/tokenize", json=payload)
         resp.raise_for_status()
-        return WasteLot.model_validate(resp.json())
+        if resp.status_code == 202:
+            return MintJob.model_validate(resp.json())
+        return self._one(resp, WasteLot)
+
+    async def get_mint_job(self, job_id: int) -> MintJob:
+        resp = await self._client.get(f"/mint-jobs/{job_id}")
+        resp.raise_for_status()
+        return MintJob.model_validate(resp.json())
 
     async def list_agents(self, *, agent_type: str | None = None) -> list[Agent]:
         params = {"agent_type": agent_type} if agent_type else None
         resp = await self._client.get("/agents", params=params)
         resp.raise_for_status()
-        return [Agent.model_validate(item) for item in resp.json()]
+        return self._many(resp, Agent)
 
     async def create_agent(self, payload: dict[str, Any]) -> Agent:
         resp = await self._client.post("/agents", json=payload)
         resp.raise_for_status()
-        return Agent.model_validate(resp.json())
+        return self._one(resp, Agent)
 
     async def matchmaking(self) -> list[Negotiation]:
         resp = await self._client.post("/agents/matchmaking")
         resp.raise_for_status()
-        return [Negotiation.model_validate(item) for item in resp.json()]
+        return self._many(resp, Negotiation)
+
+    async def list_negotiations(
+        self,
+        *,
+        statuses: Iterable[str] | None = None,
+        recycler_agent_id: int | None = None,
+        updated_since: datetime | None = None,
+    ) -> list[Negotiation]:
+        params: dict[str, Any] = {}
+        if recycler_agent_id is not None:
+            params["recycler_agent_id"] = recycler_agent_id
+        if updated_since is not None:
+            params["updated_since"] = updated_since.isoformat()
 
-    async def list_negotiations(self, *, statuses: Iterable[str] | None = None) -> list[Negotiation]:
         negotiations: dict[int, Negotiation] = {}
         if not statuses:
-            resp = await self._client.get("/negotiations")
+            resp = await self._client.get("/negotiations", params=params or None)
             resp.raise_for_status()
-            return [Negotiation.model_validate(item) for item in resp.json()]
+            return self._many(resp, Negotiation)
 
         for status in statuses:
-            resp = await self._client.get("/negotiations", params={"status": status})
+            resp = await self._client.get("/negotiations", params={**params, "status": status})
             resp.raise_for_status()
-            for payload in resp.json():
-                negotiation = Negotiation.model_validate(payload)
+            for negotiation in self._many(resp, Negotiation):
                 negotiations[negotiation.id] = negotiation
         return list(negotiations.values())
 
     async def decide_negotiation(self, negotiation_id: int, payload: dict[str, Any]) -> Negotiation:
         resp = await self._client.post(f"/negotiations/{negotiation_id}/decision", json=payload)
         resp.raise_for_status()
-        return Negotiation.model_validate(resp.json())
+        return self._one(resp, Negotiation)
+
+    async def list_oracle_feeds(self) -> list[OracleFeed]:
+        """Oracle feeds, revalidated with the last ETag so unchanged feeds cost a 304."""
+        headers = {"If-None-Match": self._oracle_feeds[0]} if self._oracle_feeds else None
+        resp = await self._client.get("/oracle/feeds", headers=headers)
+        if resp.status_code == 304 and self._oracle_feeds:
+            return self._oracle_feeds[1]
+        resp.raise_for_status()
+        feeds = [OracleFeed.model_validate(item) for item in resp.json()]
+        if "etag" in resp.headers:
+            self._oracle_feeds = (resp.headers["etag"], feeds)
+        return feeds
 
     async def submit_proof(self, lot_id: int, payload: dict[str, Any]) -> dict[str, Any]:
         resp = await self._client.post(f"/lots/{lot_id}/proofs", json=payload)
@@ -0,0 +1,274 @@
+"""Slotted, low-allocation mirrors of the response models in `models.py`.
+
+These structs expose the same attributes the policies and agents read from the
+Pydantic models but skip validation entirely: they are decoded straight from
+the response bytes of a trusted backend. Enable them with
+`AgentServiceSettings.compact_models` (or `AuraBackendClient(compact_models=True)`).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from . import models
+from .models import NegotiationStatus, WasteLotStatus
+
+
+@dataclass(slots=True)
+class Agent:
+    id: int
+    agent_identifier: str
+    agent_type: str
+    owner_name: str
+    owner_contact: Optional[str] = None
+    producer_id: Optional[int] = None
+    target_price_usd_per_ton: Optional[float] = None
+    max_price_usd_per_ton: Optional[float] = None
+    deadline_hours: Optional[int] = None
+    radius_miles: Optional[int] = None
+    auto_negotiate: Optional[bool] = True
+    bundle_preference: Optional[bool] = False
+    strategy_metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class WasteLotToken:
+    id: int
+    token_address: str
+    token_name: str
+    token_symbol: str
+    supply: int
+    transaction_hash: Optional[str] = None
+    minted_at: Optional[datetime] = None
+    retired_at: Optional[datetime] = None
+    retire_transaction_hash: Optional[str] = None
+
+
+@dataclass(slots=True)
+class WasteLotVerification:
+    id: int
+    status: str
+    method: str
+    evidence_uri: Optional[str] = None
+    sensor_checksum: Optional[str] = None
+    verifier_notes: Optional[str] = None
+    requested_at: Optional[datetime] = None
+    verified_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class UpcyclingProof:
+    id: int
+    waste_lot_id: int
+    status: str
+    recycler_agent_id: Optional[int] = None
+    evidence_uri: Optional[str] = None
+    sensor_checksum: Optional[str] = None
+    processing_notes: Optional[str] = None
+    ai_confidence: Optional[float] = None
+    certificate_uri: Optional[str] = None
+    submitted_at: Optional[datetime] = None
+    validated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class WasteLot:
+    id: int
+    producer_id: int
+    material_type: str
+    quantity_tons: float
+    location: str
+    status: WasteLotStatus
+    external_reference: Optional[str] = None
+    price_floor_usd_per_ton: Optional[float] = None
+    chemical_composition: dict[str, Any] = field(default_factory=dict)
+    photos: list[str] = field(default_factory=list)
+    token: Optional[WasteLotToken] = None
+    verification: Optional[WasteLotVerification] = None
+    proofs: list[UpcyclingProof] = field(default_factory=list)
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class Producer:
+    id: int
+    name: str
+    contact_email: str
+    organization_type: Optional[str] = None
+    aptos_address: Optional[str] = None
+    lots: list[WasteLot] = field(default_factory=list)
+    agents: list[Agent] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ProducerSummary:
+    id: int
+    name: str
+    contact_email: str
+    organization_type: Optional[str] = None
+    aptos_address: Optional[str] = None
+    lot_counts: dict[WasteLotStatus, int] = field(default_factory=dict)
+    actionable_lot_ids: list[int] = field(default_factory=list)
+    agents: list[Agent] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Negotiation:
+    id: int
+    waste_lot_id: int
+    producer_agent_id: int
+    recycler_agent_id: int
+    status: NegotiationStatus
+    producer_offer_usd_per_ton: Optional[float] = None
+    recycler_offer_usd_per_ton: Optional[float] = None
+    agreed_price_usd_per_ton: Optional[float] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+
+def _timestamp(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def agent_from_dict(data: dict[str, Any]) -> Agent:
+    return Agent(
+        id=data["id"],
+        agent_identifier=data["agent_identifier"],
+        agent_type=data["agent_type"],
+        owner_name=data["owner_name"],
+        owner_contact=data.get("owner_contact"),
+        producer_id=data.get("producer_id"),
+        target_price_usd_per_ton=data.get("target_price_usd_per_ton"),
+        max_price_usd_per_ton=data.get("max_price_usd_per_ton"),
+        deadline_hours=data.get("deadline_hours"),
+        radius_miles=data.get("radius_miles"),
+        auto_negotiate=data.get("auto_negotiate", True),
+        bundle_preference=data.get("bundle_preference", False),
+        strategy_metadata=data.get("strategy_metadata") or {},
+    )
+
+
+def token_from_dict(data: dict[str, Any]) -> WasteLotToken:
+    return WasteLotToken(
+        id=data["id"],
+        token_address=data["token_address"],
+        token_name=data["token_name"],
+        token_symbol=data["token_symbol"],
+        supply=data["supply"],
+        transaction_hash=data.get("transaction_hash"),
+        minted_at=_timestamp(data.get("minted_at")),
+        retired_at=_timestamp(data.get("retired_at")),
+        retire_transaction_hash=data.get("retire_transaction_hash"),
+    )
+
+
+def verification_from_dict(data: dict[str, Any]) -> WasteLotVerification:
+    return WasteLotVerification(
+        id=data["id"],
+        status=data["status"],
+        method=data["method"],
+        evidence_uri=data.get("evidence_uri"),
+        sensor_checksum=data.get("sensor_checksum"),
+        verifier_notes=data.get("verifier_notes"),
+        requested_at=_timestamp(data.get("requested_at")),
+        verified_at=_timestamp(data.get("verified_at")),
+    )
+
+
+def proof_from_dict(data: dict[str, Any]) -> UpcyclingProof:
+    return UpcyclingProof(
+        id=data["id"],
+        waste_lot_id=data["waste_lot_id"],
+        status=data["status"],
+        recycler_agent_id=data.get("recycler_agent_id"),
+        evidence_uri=data.get("evidence_uri"),
+        sensor_checksum=data.get("sensor_checksum"),
+        processing_notes=data.get("processing_notes"),
+        ai_confidence=data.get("ai_confidence"),
+        certificate_uri=data.get("certificate_uri"),
+        submitted_at=_timestamp(data.get("submitted_at")),
+        validated_at=_timestamp(data.get("validated_at")),
+    )
+
+
+def lot_from_dict(data: dict[str, Any]) -> WasteLot:
+    token = data.get("token")
+    verification = data.get("verification")
+    return WasteLot(
+        id=data["id"],
+        producer_id=data["producer_id"],
+        material_type=data["material_type"],
+        quantity_tons=data["quantity_tons"],
+        location=data["location"],
+        status=WasteLotStatus(data["status"]),
+        external_reference=data.get("external_reference"),
+        price_floor_usd_per_ton=data.get("price_floor_usd_per_ton"),
+        chemical_composition=data.get("chemical_composition") or {},
+        photos=data.get("photos") or [],
+        token=token_from_dict(token) if token else None,
+        verification=verification_from_dict(verification) if verification else None,
+        proofs=[proof_from_dict(proof) for proof in data.get("proofs") or ()],
+        updated_at=_timestamp(data.get("updated_at")),
+    )
+
+
+def producer_from_dict(data: dict[str, Any]) -> Producer:
+    return Producer(
+        id=data["id"],
+        name=data["name"],
+        contact_email=data["contact_email"],
+        organization_type=data.get("organization_type"),
+        aptos_address=data.get("aptos_address"),
+        lots=[lot_from_dict(lot) for lot in data.get("lots") or ()],
+        agents=[agent_from_dict(agent) for agent in data.get("agents") or ()],
+    )
+
+
+def producer_summary_from_dict(data: dict[str, Any]) -> ProducerSummary:
+    return ProducerSummary(
+        id=data["id"],
+        name=data["name"],
+        contact_email=data["contact_email"],
+        organization_type=data.get("organization_type"),
+        aptos_address=data.get("aptos_address"),
+        lot_counts={WasteLotStatus(status): count for status, count in (data.get("lot_counts") or {}).items()},
+        actionable_lot_ids=list(data.get("actionable_lot_ids") or ()),
+        agents=[agent_from_dict(agent) for agent in data.get("agents") or ()],
+    )
+
+
+def negotiation_from_dict(data: dict[str, Any]) -> Negotiation:
+    return Negotiation(
+        id=data["id"],
+        waste_lot_id=data["waste_lot_id"],
+        producer_agent_id=data["producer_agent_id"],
+        recycler_agent_id=data["recycler_agent_id"],
+        status=NegotiationStatus(data["status"]),
+        producer_offer_usd_per_ton=data.get("producer_offer_usd_per_ton"),
+        recycler_offer_usd_per_ton=data.get("recycler_offer_usd_per_ton"),
+        agreed_price_usd_per_ton=data.get("agreed_price_usd_per_ton"),
+        updated_at=_timestamp(data.get("updated_at")),
+        version=data.get("version"),
+    )
+
+
+# Keyed by the Pydantic model the client would otherwise validate into.
+DECODERS: dict[type, Callable[[dict[str, Any]], Any]] = {
+    models.Agent: agent_from_dict,
+    models.WasteLot: lot_from_dict,
+    models.Producer: producer_from_dict,
+    models.ProducerSummary: producer_summary_from_dict,
+    models.Negotiation: negotiation_from_dict,
+}
+
+
+def decode(content: bytes, model: type) -> Any:
+    return DECODERS[model](json.loads(content))
+
+
+def decode_many(content: bytes, model: type) -> list[Any]:
+    decoder = DECODERS[model]
+    return [decoder(item) for item in json.loads(content)]
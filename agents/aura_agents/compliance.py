@@ -8,6 +8,7 @@ from .client import AuraBackendClient
 from .config import ComplianceAgentSettings
 from .models import WasteLotStatus
 from .policies import proof_validation_payload, should_validate_proof
+from .replica import MarketplaceReplica
 
 
 class ComplianceAgent(BaseAgent):
@@ -26,10 +27,14 @@ class ComplianceAgent(BaseAgent):
             logger=logger,
         )
         self.settings = settings
+        self._replica = MarketplaceReplica(client, lot_statuses=(WasteLotStatus.UPCYCLING_PENDING,))
 
-    async def step(self) -> None:
-        lots = await self.client.list_lots(status=WasteLotStatus.UPCYCLING_PENDING)
-        for lot in lots:
+    async def step(self) -> int:
+        await self._replica.refresh()
+        validated = 0
+        pending = self._replica.lots_by_status(WasteLotStatus.UPCYCLING_PENDING)
+        self.record_backlog("proofs", sum(len(lot.proofs) for lot in pending))
+        for lot in pending:
             for proof in lot.proofs:
                 if not should_validate_proof(proof, self.settings):
                     continue
@@ -39,3 +44,5 @@ class ComplianceAgent(BaseAgent):
                     extra={"lot_id": lot.id, "proof_id": proof.id, "approve": payload.get("approve")},
                 )
                 await self.client.validate_proof(lot.id, proof.id, payload)
+                validated += 1
+        return validated
@@ -37,6 +37,7 @@ class RecyclerAgentSettings(BaseModel):
     owner_name: str
     owner_contact: str | None = None
     max_price_usd_per_ton: float = Field(default=275.0, ge=0)
+    target_price_usd_per_ton: float | None = Field(default=None, ge=0)
     counter_offer_step: float = Field(
         default=15.0,
         ge=0,
@@ -46,6 +47,10 @@ class RecyclerAgentSettings(BaseModel):
     proof_evidence_uri: str | None = None
     proof_notes: str | None = "Automated upcycling batch"
     agent_identifier: str | None = None
+    strategy_metadata: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Registered with the agent; `rules` holds a strategy rule set (see aura_agents.strategy).",
+    )
 
 
 class ComplianceAgentSettings(BaseModel):
@@ -61,6 +66,25 @@ class AgentServiceSettings(BaseModel):
         default_factory=lambda: float(os.getenv("AURA_AGENT_POLL_INTERVAL", "5.0")), ge=1.0
     )
     matchmaking_interval_seconds: float = Field(default=30.0, ge=5.0)
+    metrics_host: str = Field(default_factory=lambda: os.getenv("AURA_AGENT_METRICS_HOST", "127.0.0.1"))
+    metrics_port: int | None = Field(
+        default_factory=lambda: int(os.environ["AURA_AGENT_METRICS_PORT"]) if os.getenv("AURA_AGENT_METRICS_PORT") else None,
+        description="Serve Prometheus metrics on this port at /metrics; disabled when unset.",
+    )
+    trace_sample_rate: float = Field(
+        default_factory=lambda: float(os.getenv("AURA_TRACE_SAMPLE_RATE", "0")),
+        ge=0,
+        le=1,
+        description="Fraction of agent steps traced end to end (agent, HTTP, API, SQL).",
+    )
+    trace_file: str | None = Field(
+        default_factory=lambda: os.getenv("AURA_TRACE_FILE"),
+        description="JSON-lines file that sampled spans are appended to; tracing is off when unset.",
+    )
+    compact_models: bool = Field(
+        default=False,
+        description="Decode backend responses into slotted structs instead of validated Pydantic models.",
+    )
     producer: ProducerAgentSettings | None = None
     recycler: RecyclerAgentSettings | None = None
     compliance: ComplianceAgentSettings | None = None
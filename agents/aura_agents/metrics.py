@@ -0,0 +1,183 @@
+"""Prometheus metrics for the agent service.
+
+Agents, the backend client and the matchmaking loop record into the
+module-level metrics below; `serve` exposes them in the Prometheus text format
+on `GET /metrics` from a tiny asyncio server so a scraper can reach the agent
+process without a web framework or client-library dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def endpoint_template(path: str) -> str:
+    """`/lots/12/proofs/3/validate` -> `/lots/{id}/proofs/{id}/validate`, keeping label cardinality bounded."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: Any) -> None:
+        with self._lock:
+            self._values[tuple(str(label) for label in labels)] = value
+
+    def inc(self, amount: float = 1.0, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: Any) -> float:
+        return self._values.get(tuple(str(label) for label in labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(dict(zip(self.labelnames, key)))} {_format(value)}" for key, value in values
+        ]
+
+
+class Counter(Gauge):
+    kind = "counter"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            # One slot per finite bucket, then +Inf (the count), then the sum.
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, *labels: Any) -> float:
+        series = self._series.get(tuple(str(label) for label in labels))
+        return series[-2] if series else 0.0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = {key: list(values) for key, values in sorted(self._series.items())}
+        lines = self._header()
+        for key, values in series.items():
+            labels = dict(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': _format(bound)})} {_format(count)}")
+            lines.append(f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {_format(values[-2])}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_format(values[-1])}")
+            lines.append(f"{self.name}_count{_labels(labels)} {_format(values[-2])}")
+        return lines
+
+
+STEP_SECONDS = Histogram("aura_agent_step_duration_seconds", "Time spent in one agent step.", ("agent",))
+STEP_ITEMS = Histogram(
+    "aura_agent_step_items", "Lots, negotiations or proofs acted on in one step.", ("agent",), COUNT_BUCKETS
+)
+STEP_ERRORS = Counter("aura_agent_step_errors_total", "Agent steps that raised.", ("agent",))
+BACKLOG = Gauge("aura_agent_backlog", "Items waiting for an agent at the end of its last step.", ("agent", "queue"))
+HTTP_SECONDS = Histogram(
+    "aura_agent_http_request_duration_seconds",
+    "Backend API call latency as seen by the agents.",
+    ("method", "endpoint", "status"),
+)
+MATCHMAKING_SECONDS = Histogram(
+    "aura_agent_matchmaking_sweep_duration_seconds", "Duration of one matchmaking sweep.", ("outcome",)
+)
+MATCHMAKING_NEGOTIATIONS = Histogram(
+    "aura_agent_matchmaking_negotiations", "Negotiations opened or updated by one sweep.", (), COUNT_BUCKETS
+)
+
+REGISTRY: tuple[_Metric, ...] = (
+    STEP_SECONDS,
+    STEP_ITEMS,
+    STEP_ERRORS,
+    BACKLOG,
+    HTTP_SECONDS,
+    MATCHMAKING_SECONDS,
+    MATCHMAKING_NEGOTIATIONS,
+)
+
+
+def render(metrics: Iterable[_Metric] = REGISTRY) -> str:
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()).strip():
+            pass  # headers are not needed
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", render().encode()
+        else:
+            status, body = "404 Not Found", b"not found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int) -> asyncio.AbstractServer:
+    """Start the `/metrics` exporter; close the returned server to stop it."""
+    return await asyncio.start_server(_handle, host, port)
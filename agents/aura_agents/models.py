@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
@@ -49,8 +50,8 @@ class WasteLotToken(BaseModel):
     token_symbol: str
     supply: int
     transaction_hash: Optional[str] = None
-    minted_at: Optional[str] = None
-    retired_at: Optional[str] = None
+    minted_at: Optional[datetime] = None
+    retired_at: Optional[datetime] = None
     retire_transaction_hash: Optional[str] = None
 
 
@@ -61,8 +62,8 @@ class WasteLotVerification(BaseModel):
     evidence_uri: Optional[str]
     sensor_checksum: Optional[str]
     verifier_notes: Optional[str]
-    requested_at: Optional[str]
-    verified_at: Optional[str]
+    requested_at: Optional[datetime]
+    verified_at: Optional[datetime]
 
 
 class UpcyclingProof(BaseModel):
@@ -75,8 +76,8 @@ class UpcyclingProof(BaseModel):
     ai_confidence: Optional[float]
     status: str
     certificate_uri: Optional[str]
-    submitted_at: Optional[str]
-    validated_at: Optional[str]
+    submitted_at: Optional[datetime]
+    validated_at: Optional[datetime]
 
 
 class WasteLot(BaseModel):
@@ -93,6 +94,7 @@ class WasteLot(BaseModel):
     token: Optional[WasteLotToken] = None
     verification: Optional[WasteLotVerification] = None
     proofs: list[UpcyclingProof] = Field(default_factory=list)
+    updated_at: Optional[datetime] = None
 
 
 class Producer(BaseModel):
@@ -105,6 +107,17 @@ class Producer(BaseModel):
     agents: list[Agent] = Field(default_factory=list)
 
 
+class ProducerSummary(BaseModel):
+    id: int
+    name: str
+    contact_email: str
+    organization_type: Optional[str] = None
+    aptos_address: Optional[str] = None
+    lot_counts: dict[WasteLotStatus, int] = Field(default_factory=dict)
+    actionable_lot_ids: list[int] = Field(default_factory=list)
+    agents: list[Agent] = Field(default_factory=list)
+
+
 class Negotiation(BaseModel):
     id: int
     waste_lot_id: int
@@ -114,6 +127,28 @@ class Negotiation(BaseModel):
     producer_offer_usd_per_ton: Optional[float]
     recycler_offer_usd_per_ton: Optional[float]
     agreed_price_usd_per_ton: Optional[float]
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+
+class MintJob(BaseModel):
+    id: int
+    waste_lot_id: int
+    status: str
+    attempts: int = 0
+    token_address: Optional[str] = None
+    transaction_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class OracleFeed(BaseModel):
+    feed_id: int
+    name: str
+    payload: str
+    lot_id: Optional[int] = None
+    expires_at: Optional[int] = None
+    version: int
+    updated_at: int
 
 
 class Snapshot(BaseModel):
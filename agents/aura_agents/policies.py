@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from datetime import datetime
+from enum import IntEnum
 from typing import Any
 
+import numpy as np
+
 from .config import ComplianceAgentSettings, ProducerAgentSettings, RecyclerAgentSettings
-from .models import Negotiation, NegotiationStatus, UpcyclingProof, WasteLot, WasteLotStatus
+from .models import Negotiation, NegotiationStatus, OracleFeed, UpcyclingProof, WasteLot, WasteLotStatus
+from .strategy import CompiledStrategy
 
 
 def should_auto_verify(lot: WasteLot, settings: ProducerAgentSettings) -> bool:
@@ -25,22 +32,61 @@ def tokenization_payload(lot: WasteLot, settings: ProducerAgentSettings) -> dict
     return {"token_name": token_name, "token_symbol": symbol, "supply": settings.token_supply}
 
 
-def decide_negotiation(negotiation: Negotiation, settings: RecyclerAgentSettings) -> dict[str, Any] | None:
-    if negotiation.status in {NegotiationStatus.AGREED, NegotiationStatus.SETTLED}:
+_OPENING_BID_NOTES = "Issuing opening bid at max acceptable price."
+_ACCEPT_NOTES = "Accepting offer within threshold."
+_COUNTER_NOTES = "Countering above target price with cap."
+_CLOSED_NEGOTIATION_STATUSES = {NegotiationStatus.AGREED, NegotiationStatus.SETTLED}
+_PROOF_LOT_STATUSES = {WasteLotStatus.SETTLED, WasteLotStatus.UPCYCLING_PENDING}
+
+
+def _strategy_variables(settings: RecyclerAgentSettings, price: Any) -> dict[str, Any]:
+    target = settings.target_price_usd_per_ton
+    return {
+        "price": price,
+        "max_price": settings.max_price_usd_per_ton,
+        "target_price": np.nan if target is None else target,
+    }
+
+
+def decide_negotiation(
+    negotiation: Negotiation,
+    settings: RecyclerAgentSettings,
+    *,
+    strategy: CompiledStrategy | None = None,
+    lot: WasteLot | None = None,
+) -> dict[str, Any] | None:
+    if negotiation.status in _CLOSED_NEGOTIATION_STATUSES:
         return None
 
     reference_price = negotiation.recycler_offer_usd_per_ton or negotiation.producer_offer_usd_per_ton
     max_price = settings.max_price_usd_per_ton
+    opening_bid = max_price
+
+    if strategy is not None:
+        # The first matching rule sets the cap and opening bid; no match means the lot is not for this agent.
+        variables = _strategy_variables(settings, np.nan if reference_price is None else reference_price)
+        if lot is not None:
+            variables.update(
+                material_type=lot.material_type,
+                quantity_tons=lot.quantity_tons,
+                floor=np.nan if lot.price_floor_usd_per_ton is None else lot.price_floor_usd_per_ton,
+            )
+        limits = strategy.evaluate(variables)
+        if not limits.matched:
+            return None
+        if not np.isnan(limits.max_price):
+            max_price = float(limits.max_price)
+        opening_bid = max_price if np.isnan(limits.offer) else min(float(limits.offer), max_price)
 
     if reference_price is None:
         return {
             "agree": False,
-            "counter_offer_usd_per_ton": max_price,
-            "notes": "Issuing opening bid at max acceptable price.",
+            "counter_offer_usd_per_ton": opening_bid,
+            "notes": _OPENING_BID_NOTES,
         }
 
     if reference_price <= max_price:
-        return {"agree": True, "notes": "Accepting offer within threshold."}
+        return {"agree": True, "notes": _ACCEPT_NOTES}
 
     counter_price = max_price
     if settings.counter_offer_step > 0 and max_price < reference_price:
@@ -52,14 +98,14 @@ def decide_negotiation(negotiation: Negotiation, settings: RecyclerAgentSettings
     return {
         "agree": False,
         "counter_offer_usd_per_ton": counter_price,
-        "notes": "Countering above target price with cap.",
+        "notes": _COUNTER_NOTES,
     }
 
 
 def should_submit_proof(lot: WasteLot, settings: RecyclerAgentSettings) -> bool:
     if not settings.submit_proof:
         return False
-    if lot.status not in {WasteLotStatus.SETTLED, WasteLotStatus.UPCYCLING_PENDING}:
+    if lot.status not in _PROOF_LOT_STATUSES:
         return False
     return all(proof.status != "pending" for proof in lot.proofs)
 
@@ -90,3 +136,194 @@ def proof_validation_payload(proof: UpcyclingProof, settings: ComplianceAgentSet
         "certificate_uri": certificate_uri,
         "notes": notes,
     }
+
+
+# Batch variants. Each takes columnar inputs (one array element per negotiation,
+# lot or proof, with NaN for a missing price or confidence) and returns the
+# same decisions as the scalar function above applied row by row, computed
+# with array operations so a large backlog is decided in one pass.
+
+
+class NegotiationAction(IntEnum):
+    SKIP = 0  # already agreed or settled: `decide_negotiation` returns None
+    OPENING_BID = 1
+    AGREE = 2
+    COUNTER = 3
+
+
+_ACTION_NOTES = {
+    NegotiationAction.OPENING_BID: _OPENING_BID_NOTES,
+    NegotiationAction.AGREE: _ACCEPT_NOTES,
+    NegotiationAction.COUNTER: _COUNTER_NOTES,
+}
+
+
+def _status_values(statuses: Sequence[Any] | np.ndarray) -> np.ndarray:
+    # NumPy turns str-valued enums into their `str()` ("NegotiationStatus.OPEN"), so unwrap them first.
+    if isinstance(statuses, np.ndarray):
+        return statuses
+    return np.asarray([getattr(status, "value", status) for status in statuses], dtype=str)
+
+
+def _prices(values: Sequence[float | None] | np.ndarray) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64, count=len(values))
+
+
+@dataclass(frozen=True)
+class NegotiationDecisions:
+    actions: np.ndarray  # NegotiationAction codes, int8
+    counter_offers: np.ndarray  # bid or counter price per row; NaN where the action is SKIP or AGREE
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def payload(self, index: int) -> dict[str, Any] | None:
+        """The `decide_negotiation` result for row `index`."""
+        action = NegotiationAction(int(self.actions[index]))
+        if action is NegotiationAction.SKIP:
+            return None
+        if action is NegotiationAction.AGREE:
+            return {"agree": True, "notes": _ACCEPT_NOTES}
+        return {
+            "agree": False,
+            "counter_offer_usd_per_ton": float(self.counter_offers[index]),
+            "notes": _ACTION_NOTES[action],
+        }
+
+    def payloads(self) -> list[dict[str, Any] | None]:
+        return [self.payload(index) for index in range(len(self))]
+
+
+def negotiation_columns(negotiations: Iterable[Negotiation]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`(statuses, recycler_offers, producer_offers)` columns for `decide_negotiations`."""
+    negotiations = list(negotiations)
+    return (
+        _status_values([negotiation.status for negotiation in negotiations]),
+        _prices([negotiation.recycler_offer_usd_per_ton for negotiation in negotiations]),
+        _prices([negotiation.producer_offer_usd_per_ton for negotiation in negotiations]),
+    )
+
+
+def reference_prices(feeds: Iterable[OracleFeed]) -> dict[str, float]:
+    """USD/ton per lower-cased material type, from the price feeds (JSON `material_type`/`usd_per_ton` payloads)."""
+    prices = {}
+    for feed in feeds:
+        try:
+            payload = json.loads(feed.payload)
+            prices[str(payload["material_type"]).lower()] = float(payload["usd_per_ton"])
+        except (ValueError, TypeError, KeyError):
+            continue
+    return prices
+
+
+def lot_columns(lots: Iterable[WasteLot | None], prices: Mapping[str, float] | None = None) -> dict[str, np.ndarray]:
+    """`material_type`, `quantity_tons` and `floor` strategy variables, one row per lot ('' / NaN for None).
+
+    With `prices` (from `reference_prices`), also the `reference` price of
+    each lot's material, NaN where no feed prices it.
+    """
+    lots = list(lots)
+    columns = {
+        "material_type": np.asarray([lot.material_type if lot else "" for lot in lots], dtype=str),
+        "quantity_tons": _prices([lot.quantity_tons if lot else None for lot in lots]),
+        "floor": _prices([lot.price_floor_usd_per_ton if lot else None for lot in lots]),
+    }
+    if prices is not None:
+        columns["reference"] = _prices([prices.get(lot.material_type.lower()) if lot else None for lot in lots])
+    return columns
+
+
+def decide_negotiations(
+    statuses: Sequence[Any] | np.ndarray,
+    recycler_offers: Sequence[float | None] | np.ndarray,
+    producer_offers: Sequence[float | None] | np.ndarray,
+    settings: RecyclerAgentSettings,
+    *,
+    strategy: CompiledStrategy | None = None,
+    lots: dict[str, np.ndarray] | None = None,
+) -> NegotiationDecisions:
+    """`decide_negotiation` over columns of negotiation statuses and offers.
+
+    With a `strategy`, its rules are evaluated once over all rows, using the
+    `lot_columns` of each negotiation's lot when given.
+    """
+    statuses = _status_values(statuses)
+    recycler = _prices(recycler_offers)
+    producer = _prices(producer_offers)
+
+    # `recycler or producer`: a missing or zero recycler offer falls back to the producer's.
+    reference = np.where(np.isnan(recycler) | (recycler == 0), producer, recycler)
+    max_price = np.full(len(statuses), settings.max_price_usd_per_ton)
+    opening_bid = max_price
+    unmatched = np.zeros(len(statuses), dtype=bool)
+    if strategy is not None:
+        limits = strategy.evaluate({**(lots or {}), **_strategy_variables(settings, reference)})
+        max_price = np.where(np.isnan(limits.max_price), max_price, limits.max_price)
+        opening_bid = np.where(np.isnan(limits.offer), max_price, np.fmin(limits.offer, max_price))
+        unmatched = ~limits.matched
+
+    actions = np.full(len(statuses), NegotiationAction.COUNTER, dtype=np.int8)
+    actions[reference <= max_price] = NegotiationAction.AGREE  # False for NaN
+    actions[np.isnan(reference)] = NegotiationAction.OPENING_BID
+    actions[np.isin(statuses, [status.value for status in _CLOSED_NEGOTIATION_STATUSES]) | unmatched] = (
+        NegotiationAction.SKIP
+    )
+    bids = np.where(actions == NegotiationAction.OPENING_BID, opening_bid, max_price)
+    countered = (actions == NegotiationAction.OPENING_BID) | (actions == NegotiationAction.COUNTER)
+    return NegotiationDecisions(actions, np.where(countered, bids, np.nan))
+
+
+def should_submit_proofs(
+    lot_statuses: Sequence[Any] | np.ndarray,
+    pending_proofs: Sequence[int] | np.ndarray,
+    settings: RecyclerAgentSettings,
+) -> np.ndarray:
+    """`should_submit_proof` per lot, given each lot's status and its number of pending proofs."""
+    lot_statuses = _status_values(lot_statuses)
+    if not settings.submit_proof:
+        return np.zeros(len(lot_statuses), dtype=bool)
+    eligible = np.isin(lot_statuses, [status.value for status in _PROOF_LOT_STATUSES])
+    return eligible & (np.asarray(pending_proofs) == 0)
+
+
+@dataclass(frozen=True)
+class ProofValidations:
+    proof_ids: np.ndarray
+    confidences: np.ndarray
+    approve: np.ndarray
+    certificate_uri: str | None
+    notes: str
+
+    def __len__(self) -> int:
+        return len(self.proof_ids)
+
+    def payload(self, index: int) -> dict[str, Any]:
+        """The `proof_validation_payload` result for row `index`."""
+        return {
+            "approve": bool(self.approve[index]),
+            "ai_confidence": float(self.confidences[index]),
+            "certificate_uri": self.certificate_uri or f"https://example.com/certificates/{int(self.proof_ids[index])}",
+            "notes": self.notes,
+        }
+
+    def payloads(self) -> list[dict[str, Any]]:
+        return [self.payload(index) for index in range(len(self))]
+
+
+def proof_validations(
+    proof_ids: Sequence[int] | np.ndarray,
+    confidences: Sequence[float | None] | np.ndarray,
+    settings: ComplianceAgentSettings,
+) -> ProofValidations:
+    """`proof_validation_payload` over columns of proof IDs and AI confidences (NaN when absent)."""
+    confidences = _prices(confidences)
+    resolved = np.where(np.isnan(confidences), settings.approve_threshold, confidences)
+    return ProofValidations(
+        proof_ids=np.asarray(proof_ids, dtype=np.int64),
+        confidences=resolved,
+        approve=resolved >= settings.approve_threshold,
+        certificate_uri=settings.auto_certificate_uri,
+        notes=f"Auto-reviewed by {settings.reviewer_name}.",
+    )
@@ -6,13 +6,17 @@ from typing import Optional
 from .base import BaseAgent
 from .client import AuraBackendClient
 from .config import ProducerAgentSettings
-from .models import Agent, Producer, WasteLot, WasteLotStatus
+from .models import Agent, MintJob, Producer, WasteLot, WasteLotStatus
 from .policies import (
     should_auto_verify,
     should_tokenize,
     tokenization_payload,
     verification_payload,
 )
+from .replica import MarketplaceReplica
+
+# Lots waiting on the producer; the backend's summary lists exactly these as `actionable_lot_ids`.
+ACTIONABLE_STATUSES = (WasteLotStatus.PENDING_VERIFICATION, WasteLotStatus.VERIFIED)
 
 
 class ProducerAgent(BaseAgent):
@@ -33,22 +37,34 @@ class ProducerAgent(BaseAgent):
         self.settings = settings
         self._producer: Producer | None = None
         self._agent: Agent | None = None
+        self._replica: MarketplaceReplica | None = None
 
     async def initialize(self) -> None:
         self._producer = await self._ensure_producer()
         self._agent = await self._ensure_agent(self._producer)
+        self._replica = MarketplaceReplica(
+            self.client, producer_id=self._producer.id, lot_statuses=ACTIONABLE_STATUSES
+        )
         self.logger.info(
             "Producer agent ready", extra={"producer_id": self._producer.id, "agent_id": self._agent.id if self._agent else None}
         )
 
-    async def step(self) -> None:
-        if not self._producer:
-            return
-        producer = await self.client.get_producer(self._producer.id)
-        self._producer = producer
+    async def step(self) -> int:
+        if not self._producer or not self._replica:
+            return 0
+        # The summary is a couple of indexed queries however many lots the producer has; the replica then
+        # fetches only actionable lots that changed, and forgets those that moved on (e.g. a mint completed).
+        summary = await self.client.get_producer_summary(self._producer.id)
+        self._replica.retain_lots(summary.actionable_lot_ids)
+        if summary.actionable_lot_ids:
+            await self._replica.refresh()
 
-        for lot in producer.lots:
+        lots = self._replica.lots_by_status(*ACTIONABLE_STATUSES)
+        for lot in lots:
             await self._process_lot(lot)
+        # Lots still short of TOKENIZED (e.g. waiting on a queued mint) are this agent's backlog.
+        self.record_backlog("lots", len(self._replica.lots_by_status(*ACTIONABLE_STATUSES)))
+        return len(lots)
 
     async def _ensure_producer(self) -> Producer:
         producers = await self.client.list_producers()
@@ -85,7 +101,7 @@ class ProducerAgent(BaseAgent):
     async def _process_lot(self, lot: WasteLot) -> None:
         if lot.status == WasteLotStatus.PENDING_VERIFICATION and lot.verification is None:
             self.logger.info("Submitting verification request", extra={"lot_id": lot.id})
-            await self.client.request_verification(
+            updated = await self.client.request_verification(
                 lot.id,
                 {
                     "method": "automated_inspection",
@@ -93,13 +109,19 @@ class ProducerAgent(BaseAgent):
                     "evidence_uri": (lot.photos[0] if lot.photos else None) or "https://example.com/verification",
                 },
             )
-            lot = await self.client.get_lot(lot.id)
+            lot = self._replica.apply_lot(updated)
 
         if should_auto_verify(lot, self.settings) and lot.verification is not None:
             self.logger.info("Auto-approving verification", extra={"lot_id": lot.id})
-            await self.client.approve_verification(lot.id, verification_payload(self.settings))
-            lot = await self.client.get_lot(lot.id)
+            updated = await self.client.approve_verification(lot.id, verification_payload(self.settings))
+            lot = self._replica.apply_lot(updated)
 
         if should_tokenize(lot, self.settings):
             self.logger.info("Tokenizing lot", extra={"lot_id": lot.id})
-            await self.client.tokenize_lot(lot.id, tokenization_payload(lot, self.settings))
\ No newline at end of file
+            updated = await self.client.tokenize_lot(lot.id, tokenization_payload(lot, self.settings))
+            if isinstance(updated, MintJob):
+                # Minted in the background; the replica sees the TOKENIZED lot on a later refresh.
+                # Re-requesting while the job is pending returns the same job.
+                self.logger.info("Mint queued", extra={"lot_id": lot.id, "mint_job_id": updated.id})
+            else:
+                self._replica.apply_lot(updated)
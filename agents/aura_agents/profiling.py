@@ -0,0 +1,245 @@
+"""Sampling profiler for the agent service.
+
+A daemon thread snapshots every other thread's Python stack each `interval`
+seconds and charges the elapsed wall time, plus the CPU time the thread used
+since the previous sample (its POSIX thread CPU clock), to that stack. Agents
+share one event loop, so a stack is attributed to an agent type by the
+agent's `step` frame on it; a loop parked between steps (using less than
+half a sample of CPU) counts as `idle` and is left out of the flamegraphs.
+
+`profile_agents` runs the agent service under the profiler for a window and
+writes collapsed stacks (`tag;frame;frame <microseconds>`) for wall and CPU
+time, readable by flamegraph.pl, speedscope and inferno, plus a JSON summary
+of wall/CPU seconds per agent type.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+from .client import AuraBackendClient
+from .compliance import ComplianceAgent
+from .config import AgentServiceSettings
+from .producer import ProducerAgent
+from .recycler import RecyclerAgent
+from .runner import run_agents
+
+logger = logging.getLogger("aura.agents.profiling")
+
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+@dataclass
+class Profile:
+    started_at: datetime
+    seconds: float = 0.0
+    samples: int = 0
+    wall: Counter = field(default_factory=Counter)
+    cpu: Counter = field(default_factory=Counter)
+    tag_wall: Counter = field(default_factory=Counter)
+    tag_cpu: Counter = field(default_factory=Counter)
+    tag_samples: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "seconds": round(self.seconds, 3),
+            "samples": self.samples,
+            "tags": {
+                tag: {
+                    "samples": self.tag_samples[tag],
+                    "wall_seconds": round(self.tag_wall[tag], 6),
+                    "cpu_seconds": round(self.tag_cpu[tag], 6),
+                }
+                for tag, _ in self.tag_wall.most_common()
+            },
+        }
+
+    def write(self, directory: str | Path, prefix: str) -> dict[str, Path]:
+        """Write `<prefix>.wall.collapsed`, `<prefix>.cpu.collapsed` and `<prefix>.summary.json`."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "wall": directory / f"{prefix}.wall.collapsed",
+            "cpu": directory / f"{prefix}.cpu.collapsed",
+            "summary": directory / f"{prefix}.summary.json",
+        }
+        for kind, stacks in (("wall", self.wall), ("cpu", self.cpu)):
+            lines = [f"{stack} {round(seconds * 1e6)}" for stack, seconds in stacks.most_common() if seconds >= 5e-7]
+            paths[kind].write_text("\n".join(lines) + ("\n" if lines else ""))
+        paths["summary"].write_text(json.dumps(self.summary(), indent=2))
+        return paths
+
+
+def _thread_cpu(thread_id: int) -> float | None:
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):  # pragma: no cover - non-POSIX or thread already gone
+        return None
+
+
+class SamplingProfiler:
+    def __init__(self, tags: Mapping[CodeType, str] | None = None, *, interval: float = 0.005) -> None:
+        self.tags = dict(tags or {})
+        self.interval = interval
+        self._labels: dict[CodeType, str] = {}
+        self._lock = threading.Lock()
+        self._profile = Profile(datetime.utcnow())
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last: float | None = None
+        self._last_cpu: dict[int, float] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._last = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="aura-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> Profile:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.reset()
+
+    def reset(self) -> Profile:
+        """Return the profile gathered so far and start a new one."""
+        with self._lock:
+            profile, self._profile = self._profile, Profile(datetime.utcnow())
+        return profile
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for root in sys.path:
+                if root and filename.startswith(root):
+                    filename = filename[len(root) :].lstrip(os.sep)
+                    break
+            label = self._labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ",")
+        return label
+
+    def sample(self) -> None:
+        now = time.perf_counter()
+        elapsed = now - (self._last or now)
+        self._last = now
+        own = threading.get_ident()
+        frames = sys._current_frames()
+        with self._lock:
+            profile = self._profile
+            profile.seconds += elapsed
+            profile.samples += 1
+            for thread_id, frame in frames.items():
+                if thread_id == own:
+                    continue
+                cpu_now = _thread_cpu(thread_id)
+                cpu = None
+                if cpu_now is not None:
+                    cpu = max(cpu_now - self._last_cpu.get(thread_id, cpu_now), 0.0)
+                    self._last_cpu[thread_id] = cpu_now
+                self._record(profile, frame, elapsed, cpu)
+
+    def _record(self, profile: Profile, leaf: FrameType, wall: float, cpu: float | None) -> None:
+        tag = None
+        codes: list[CodeType] = []
+        frame: FrameType | None = leaf
+        while frame is not None:
+            codes.append(frame.f_code)
+            if tag is None:
+                tag = self.tags.get(frame.f_code)
+            frame = frame.f_back
+        if tag is None:
+            if cpu is not None:
+                # An untagged thread that barely ran is parked (event loop poll, idle pool worker).
+                idle = cpu < wall / 2
+            else:
+                idle = (os.path.basename(leaf.f_code.co_filename), leaf.f_code.co_name) in IDLE_FRAMES
+            tag = "idle" if idle else "other"
+        cpu = cpu or 0.0
+        profile.tag_wall[tag] += wall
+        profile.tag_cpu[tag] += cpu
+        profile.tag_samples[tag] += 1
+        if tag == "idle":
+            return
+        stack = ";".join([tag, *(self._label(code) for code in reversed(codes))])
+        profile.wall[stack] += wall
+        if cpu:
+            profile.cpu[stack] += cpu
+
+
+def agent_tags() -> dict[CodeType, str]:
+    """Code objects that identify what a sampled stack is working on."""
+    return {
+        ProducerAgent.step.__code__: "producer",
+        RecyclerAgent.step.__code__: "recycler",
+        ComplianceAgent.step.__code__: "compliance",
+        ProducerAgent.initialize.__code__: "producer",
+        RecyclerAgent.initialize.__code__: "recycler",
+        AuraBackendClient.matchmaking.__code__: "matchmaking",
+    }
+
+
+async def profile_agents(
+    settings: AgentServiceSettings,
+    *,
+    duration: float,
+    directory: str | Path,
+    interval: float = 0.005,
+    dump_every: float | None = None,
+) -> list[dict[str, Path]]:
+    """Run the agent service for `duration` seconds under the profiler.
+
+    Writes one set of profile files per `dump_every` seconds (or one for the
+    whole window) and returns their paths.
+    """
+    profiler = SamplingProfiler(agent_tags(), interval=interval)
+    written: list[dict[str, Path]] = []
+
+    def dump(profile: Profile) -> None:
+        if profile.samples:
+            prefix = f"agents-{profile.started_at:%Y%m%dT%H%M%S}-{os.getpid()}"
+            written.append(profile.write(directory, prefix))
+            logger.info("Wrote profile %s", written[-1]["summary"])
+
+    service = asyncio.create_task(run_agents(settings))
+    profiler.start()
+    deadline = time.monotonic() + duration
+    try:
+        while (remaining := deadline - time.monotonic()) > 0 and not service.done():
+            await asyncio.wait({service}, timeout=min(remaining, dump_every or remaining))
+            if dump_every and time.monotonic() < deadline and not service.done():
+                dump(profiler.reset())
+    finally:
+        service.cancel()
+        await asyncio.gather(service, return_exceptions=True)
+        dump(profiler.stop())
+    return written
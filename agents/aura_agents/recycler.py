@@ -3,15 +3,24 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+import httpx
+import numpy as np
+
 from .base import BaseAgent
 from .client import AuraBackendClient
 from .config import RecyclerAgentSettings
 from .models import Agent, NegotiationStatus
 from .policies import (
-    decide_negotiation,
+    NegotiationAction,
+    decide_negotiations,
+    lot_columns,
+    negotiation_columns,
     proof_submission_payload,
+    reference_prices,
     should_submit_proof,
 )
+from .replica import MarketplaceReplica
+from .strategy import compile_strategy
 
 
 class RecyclerAgent(BaseAgent):
@@ -31,47 +40,70 @@ class RecyclerAgent(BaseAgent):
         )
         self.settings = settings
         self._agent: Agent | None = None
+        self._replica: MarketplaceReplica | None = None
 
     async def initialize(self) -> None:
         self._agent = await self._ensure_agent()
+        compile_strategy(self._agent.id, self._agent.strategy_metadata)  # fail fast on an invalid rule set
+        self._replica = MarketplaceReplica(
+            self.client,
+            track_lots=True,
+            track_negotiations=True,
+            recycler_agent_id=self._agent.id,
+        )
         self.logger.info("Recycler agent ready", extra={"agent_id": self._agent.id})
 
-    async def step(self) -> None:
-        if not self._agent:
-            return
-
-        status_filters = [
-            NegotiationStatus.OPEN.value,
-            NegotiationStatus.COUNTER.value,
-            NegotiationStatus.AGREED.value,
-            NegotiationStatus.SETTLED.value,
-        ]
-        negotiations = await self.client.list_negotiations(statuses=status_filters)
-        targeted = [n for n in negotiations if n.recycler_agent_id == self._agent.id]
+    async def step(self) -> int:
+        if not self._agent or not self._replica:
+            return 0
+        await self._replica.refresh()
+        processed = 0
 
-        for negotiation in targeted:
-            decision = decide_negotiation(negotiation, self.settings)
-            if decision is None:
-                continue
+        open_negotiations = self._replica.negotiations_by_status(NegotiationStatus.OPEN, NegotiationStatus.COUNTER)
+        self.record_backlog("negotiations", len(open_negotiations))
+        strategy = compile_strategy(self._agent.id, self._agent.strategy_metadata)
+        lots = None
+        if strategy is not None:
+            # Rules may use `reference`; the feed list is revalidated by ETag, so an unchanged one costs a 304.
+            prices = reference_prices(await self.client.list_oracle_feeds())
+            lots = lot_columns((self._replica.lot(n.waste_lot_id) for n in open_negotiations), prices)
+        decisions = decide_negotiations(
+            *negotiation_columns(open_negotiations), self.settings, strategy=strategy, lots=lots
+        )
+        for index in np.flatnonzero(decisions.actions != NegotiationAction.SKIP):
+            negotiation = open_negotiations[index]
+            decision = decisions.payload(index)
             self.logger.info(
                 "Responding to negotiation",
                 extra={"negotiation_id": negotiation.id, "payload": decision},
             )
-            await self.client.decide_negotiation(negotiation.id, decision)
+            if negotiation.version is not None:
+                decision["expected_version"] = negotiation.version
+            try:
+                updated = await self.client.decide_negotiation(negotiation.id, decision)
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 409:
+                    raise
+                # Another writer moved the negotiation; the next refresh picks up its current state.
+                self.logger.info("Negotiation changed concurrently", extra={"negotiation_id": negotiation.id})
+                continue
+            self._replica.apply_negotiation(updated)
+            processed += 1
 
         # Proof submissions for settled lots
         lot_ids = {
             neg.waste_lot_id
-            for neg in targeted
-            if neg.status in {NegotiationStatus.AGREED, NegotiationStatus.SETTLED}
+            for neg in self._replica.negotiations_by_status(NegotiationStatus.AGREED, NegotiationStatus.SETTLED)
         }
-        for lot_id in lot_ids:
-            lot = await self.client.get_lot(lot_id)
-            if not should_submit_proof(lot, self.settings):
+        for lot_id in sorted(lot_ids):
+            lot = self._replica.lot(lot_id)
+            if lot is None or not should_submit_proof(lot, self.settings):
                 continue
             payload = proof_submission_payload(lot, self.settings, self._agent.id)
             self.logger.info("Submitting upcycling proof", extra={"lot_id": lot_id})
             await self.client.submit_proof(lot_id, payload)
+            processed += 1
+        return processed
 
     async def _ensure_agent(self) -> Agent:
         agents = await self.client.list_agents(agent_type="recycler")
@@ -83,7 +115,9 @@ class RecyclerAgent(BaseAgent):
             "agent_type": "recycler",
             "owner_contact": self.settings.owner_contact,
             "max_price_usd_per_ton": self.settings.max_price_usd_per_ton,
+            "target_price_usd_per_ton": self.settings.target_price_usd_per_ton,
             "auto_negotiate": True,
+            "strategy_metadata": self.settings.strategy_metadata,
             "agent_identifier": self.settings.agent_identifier,
         }
         created = await self.client.create_agent(payload)
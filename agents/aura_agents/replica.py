@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .client import AuraBackendClient
+from .models import Negotiation, NegotiationStatus, WasteLot, WasteLotStatus
+
+# Refreshes re-read this far behind the newest row seen: the backend stamps `updated_at` before it
+# commits, so a row stamped earlier than one already seen can still become visible afterwards.
+WATERMARK_LAG = timedelta(seconds=5)
+
+
+@dataclass(frozen=True)
+class ReplicaDelta:
+    lots: int = 0
+    negotiations: int = 0
+
+
+class MarketplaceReplica:
+    """Agent-local copy of the lots and negotiations an agent cares about.
+
+    Each `refresh` asks the backend only for rows whose `updated_at` is at or
+    after a watermark trailing the newest timestamp it has fetched by
+    `WATERMARK_LAG`, so the per-poll transfer is proportional to what changed
+    rather than to the size of the marketplace. Rows are indexed by ID and by
+    status; policies read from the replica and agents write mutation
+    responses back through `apply_lot` / `apply_negotiation` so the replica
+    stays current between polls. Only `refresh` moves the watermarks: a
+    mutation response is newer than rows other actors changed since the last
+    refresh, and advancing past it would skip them.
+
+    The lots tracked are scoped by `producer_id`, by `recycler_agent_id`
+    (lots in that recycler's negotiations) and by `lot_statuses`. The status
+    scope filters the first, full sync; later refreshes fetch every change so
+    lots leaving the scope are seen and dropped. `retain_lots` prunes lots an
+    authoritative source (e.g. the producer summary's `actionable_lot_ids`)
+    says are out of scope.
+    """
+
+    def __init__(
+        self,
+        client: AuraBackendClient,
+        *,
+        track_lots: bool = True,
+        track_negotiations: bool = False,
+        producer_id: int | None = None,
+        recycler_agent_id: int | None = None,
+        lot_statuses: Iterable[WasteLotStatus] | None = None,
+    ) -> None:
+        self.client = client
+        self.track_lots = track_lots
+        self.track_negotiations = track_negotiations
+        self.producer_id = producer_id
+        self.recycler_agent_id = recycler_agent_id
+        self.lot_statuses = frozenset(lot_statuses) if lot_statuses is not None else None
+
+        self._lots: dict[int, WasteLot] = {}
+        self._lots_by_status: dict[WasteLotStatus, set[int]] = defaultdict(set)
+        self._negotiations: dict[int, Negotiation] = {}
+        self._negotiations_by_status: dict[NegotiationStatus, set[int]] = defaultdict(set)
+        self._lots_watermark: datetime | None = None
+        self._negotiations_watermark: datetime | None = None
+
+    async def refresh(self) -> ReplicaDelta:
+        lot_changes = 0
+        negotiation_changes = 0
+
+        if self.track_negotiations:
+            negotiations = await self.client.list_negotiations(
+                recycler_agent_id=self.recycler_agent_id,
+                updated_since=self._negotiations_watermark,
+            )
+            for negotiation in negotiations:
+                self.apply_negotiation(negotiation)
+            self._negotiations_watermark = _advance(self._negotiations_watermark, negotiations)
+            negotiation_changes = len(negotiations)
+
+        if self.track_lots:
+            initial = self._lots_watermark is None
+            lots = await self.client.list_lots(
+                producer_id=self.producer_id,
+                recycler_agent_id=self.recycler_agent_id,
+                updated_since=self._lots_watermark,
+                status=sorted(self.lot_statuses) if initial and self.lot_statuses else None,
+            )
+            for lot in lots:
+                self.apply_lot(lot)
+            self._lots_watermark = _advance(self._lots_watermark, lots)
+            lot_changes = len(lots)
+
+        return ReplicaDelta(lots=lot_changes, negotiations=negotiation_changes)
+
+    def apply_lot(self, lot: WasteLot) -> WasteLot:
+        self._discard_lot(lot.id)
+        if self.lot_statuses is None or lot.status in self.lot_statuses:
+            self._lots[lot.id] = lot
+            self._lots_by_status[lot.status].add(lot.id)
+        return lot
+
+    def retain_lots(self, lot_ids: Iterable[int]) -> int:
+        """Drop every lot not in `lot_ids`; returns how many were dropped."""
+        keep = set(lot_ids)
+        stale = [lot_id for lot_id in self._lots if lot_id not in keep]
+        for lot_id in stale:
+            self._discard_lot(lot_id)
+        return len(stale)
+
+    def _discard_lot(self, lot_id: int) -> None:
+        previous = self._lots.pop(lot_id, None)
+        if previous is not None:
+            self._lots_by_status[previous.status].discard(lot_id)
+
+    def apply_negotiation(self, negotiation: Negotiation) -> Negotiation:
+        previous = self._negotiations.get(negotiation.id)
+        if previous is not None:
+            self._negotiations_by_status[previous.status].discard(negotiation.id)
+        self._negotiations[negotiation.id] = negotiation
+        self._negotiations_by_status[negotiation.status].add(negotiation.id)
+        return negotiation
+
+    def lot(self, lot_id: int) -> WasteLot | None:
+        return self._lots.get(lot_id)
+
+    def lots(self) -> list[WasteLot]:
+        return list(self._lots.values())
+
+    def lots_by_status(self, *statuses: WasteLotStatus) -> list[WasteLot]:
+        return [self._lots[lot_id] for lot_id in _sorted_ids(self._lots_by_status, statuses)]
+
+    def negotiation(self, negotiation_id: int) -> Negotiation | None:
+        return self._negotiations.get(negotiation_id)
+
+    def negotiations(self) -> list[Negotiation]:
+        return list(self._negotiations.values())
+
+    def negotiations_by_status(self, *statuses: NegotiationStatus) -> list[Negotiation]:
+        return [
+            self._negotiations[negotiation_id]
+            for negotiation_id in _sorted_ids(self._negotiations_by_status, statuses)
+        ]
+
+
+def _advance(watermark: datetime | None, rows: Iterable[WasteLot | Negotiation]) -> datetime | None:
+    newest = max((row.updated_at for row in rows if row.updated_at is not None), default=None)
+    if newest is None:
+        return watermark
+    candidate = newest - WATERMARK_LAG
+    if watermark is None or candidate > watermark:
+        return candidate
+    return watermark
+
+
+def _sorted_ids(index: dict, statuses: Iterable) -> Iterator[int]:
+    ids: set[int] = set()
+    for status in statuses:
+        ids |= index.get(status, set())
+    return iter(sorted(ids))
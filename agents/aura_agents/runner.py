@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import List
 
+from . import metrics, tracing
 from .client import AuraBackendClient
 from .compliance import ComplianceAgent
 from .config import AgentServiceSettings
@@ -16,7 +18,11 @@ async def run_agents(settings: AgentServiceSettings) -> None:
     logger = logging.getLogger("aura.agents")
     logger.info("Starting agent service", extra={"api_base_url": settings.api_base_url})
 
-    client = AuraBackendClient(settings.api_base_url)
+    tracing.configure(
+        settings.trace_sample_rate,
+        tracing.FileExporter(settings.trace_file) if settings.trace_file else None,
+    )
+    client = AuraBackendClient(settings.api_base_url, compact_models=settings.compact_models)
     agent_tasks: List[asyncio.Task] = []
     agent_instances = []
 
@@ -55,11 +61,21 @@ async def run_agents(settings: AgentServiceSettings) -> None:
     async def matchmaking_loop() -> None:
         while True:
             await asyncio.sleep(settings.matchmaking_interval_seconds)
+            started = time.perf_counter()
             try:
                 logger.debug("Running matchmaking sweep")
-                await client.matchmaking()
+                negotiations = await client.matchmaking()
             except Exception as exc:  # pragma: no cover - defensive logging
+                metrics.MATCHMAKING_SECONDS.observe(time.perf_counter() - started, "error")
                 logger.warning("Matchmaking sweep failed: %s", exc)
+            else:
+                metrics.MATCHMAKING_SECONDS.observe(time.perf_counter() - started, "ok")
+                metrics.MATCHMAKING_NEGOTIATIONS.observe(len(negotiations))
+
+    metrics_server: asyncio.AbstractServer | None = None
+    if settings.metrics_port is not None:
+        metrics_server = await metrics.serve(settings.metrics_host, settings.metrics_port)
+        logger.info("Serving metrics on %s:%s/metrics", settings.metrics_host, settings.metrics_port)
 
     # Start agent coroutines
     for agent in agent_instances:
@@ -82,5 +98,8 @@ async def run_agents(settings: AgentServiceSettings) -> None:
             matchmaking_task.cancel()
             await asyncio.gather(matchmaking_task, return_exceptions=True)
         await asyncio.gather(*agent_tasks, return_exceptions=True)
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
         await client.close()
         logger.info("Agent service stopped")
@@ -0,0 +1,467 @@
+"""Discrete-event marketplace simulator for capacity planning.
+
+Runs the real `ProducerAgent`, `RecyclerAgent` and `ComplianceAgent` (and so
+the real `policies`) against the backend FastAPI app in this process: the
+agents' `AuraBackendClient` talks to the app through an ASGI transport, so no
+sockets are involved and the backend's own background workers share the
+event loop.
+
+Time is virtual. `VirtualTimeLoop` keeps an offset on top of the monotonic
+clock and, whenever nothing is runnable and no request or executor job is in
+flight, jumps the offset to the next timer instead of sleeping. Poll
+intervals, matchmaking sweeps and lot arrivals therefore cost nothing while
+idle, whereas request handling advances virtual time at the real rate, so
+latencies and queueing are measured, not modelled. A saturated marketplace
+never idles and the run slows to real time; the reported speedup shows it.
+
+Backend timestamps (`updated_at`, negotiation `expires_at`) remain wall-clock,
+so server-side deadlines do not fire within a simulated hour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import random
+import selectors
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+from pydantic import BaseModel, Field
+
+from .client import AuraBackendClient
+from .compliance import ComplianceAgent
+from .config import ComplianceAgentSettings, ProducerAgentSettings, ProducerIdentity, RecyclerAgentSettings
+from .metrics import endpoint_template
+from .models import Negotiation, NegotiationStatus
+from .producer import ProducerAgent
+from .recycler import RecyclerAgent
+
+logger = logging.getLogger("aura.simulation")
+
+DEFAULT_BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+MATERIALS = ("PET Bales", "HDPE Regrind", "Aluminium UBC", "Mixed Paper", "Glass Cullet", "Copper Wire")
+LOCATIONS = ("Dallas, TX", "Newark, NJ", "Fresno, CA", "Gary, IN", "Tacoma, WA")
+
+
+class SimulationConfig(BaseModel):
+    producers: int = Field(default=200, ge=1)
+    recyclers: int = Field(default=20, ge=1)
+    compliance: int = Field(default=2, ge=1)
+    hours: float = Field(default=2.0, gt=0)
+    poll_interval_seconds: float = Field(default=300.0, gt=0)
+    matchmaking_interval_seconds: float = Field(default=300.0, gt=0)
+    lots_per_producer_hour: float = Field(default=0.5, ge=0)
+    seed: int = 0
+    backend_dir: Path = DEFAULT_BACKEND_DIR
+    database_url: str | None = Field(default=None, description="Defaults to a fresh SQLite file in a temp dir.")
+
+
+class VirtualClock:
+    """Monotonic time plus the idle gaps skipped so far."""
+
+    def __init__(self) -> None:
+        self.offset = 0.0
+        self.in_flight = 0
+
+    def now(self) -> float:
+        return time.monotonic() + self.offset
+
+    def advance(self, seconds: float) -> None:
+        self.offset += seconds
+
+
+class _WarpSelector(selectors.DefaultSelector):
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout: float | None = None):
+        # While a request or executor job is running a worker thread will wake the
+        # loop through its self-pipe, so wait for real; otherwise skip to the next timer.
+        if timeout is None or timeout <= 0 or self.clock.in_flight:
+            return super().select(timeout)
+        ready = super().select(0)
+        if not ready:
+            self.clock.advance(timeout)
+        return ready
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__(_WarpSelector(clock))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.now()
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self.clock.in_flight += 1
+        future.add_done_callback(self._executor_done)
+        return future
+
+    def _executor_done(self, future: asyncio.Future) -> None:
+        self.clock.in_flight -= 1
+
+
+@dataclass
+class RequestStats:
+    """Completed requests bucketed by simulated hour."""
+
+    started_at: float
+    latencies: dict[int, list[float]] = field(default_factory=lambda: defaultdict(list))
+    by_endpoint: dict[int, dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    client_errors: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    server_errors: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def hour(self, at: float) -> int:
+        return int((at - self.started_at) // 3600)
+
+    def record(self, at: float, endpoint: str, status: int, seconds: float) -> None:
+        hour = self.hour(at)
+        self.latencies[hour].append(seconds)
+        self.by_endpoint[hour][endpoint] += 1
+        if status >= 500:
+            self.server_errors[hour] += 1
+        elif status >= 400:
+            self.client_errors[hour] += 1
+
+
+class SimulatedTransport(httpx.ASGITransport):
+    """ASGI transport that keeps the virtual clock honest and records each request."""
+
+    def __init__(self, app: Any, clock: VirtualClock, stats: RequestStats | None = None) -> None:
+        super().__init__(app=app)
+        self.clock = clock
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.clock.in_flight += 1
+        started = self.clock.now()
+        try:
+            response = await super().handle_async_request(request)
+        finally:
+            self.clock.in_flight -= 1
+        if self.stats is not None:
+            finished = self.clock.now()
+            endpoint = f"{request.method} {endpoint_template(request.url.path)}"
+            self.stats.record(finished, endpoint, response.status_code, finished - started)
+        return response
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class HourReport:
+    hour: int
+    requests: int
+    requests_per_second: float
+    latency_ms: dict[str, float | None]
+    client_errors: int
+    server_errors: int
+    lots_created: int
+    negotiations_opened: int
+    negotiations_agreed: int
+    convergence_seconds: dict[str, float | None]
+    rows_added: int
+    db_bytes: int
+    top_endpoints: dict[str, int]
+
+
+@dataclass
+class SimulationReport:
+    config: dict[str, Any]
+    agents: int
+    simulated_seconds: float
+    wall_seconds: float
+    hours: list[HourReport]
+    rows_by_table: dict[str, int]
+
+    @property
+    def speedup(self) -> float:
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else math.inf
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "speedup": self.speedup}
+
+    def format(self) -> str:
+        lines = [
+            f"{self.agents} agents, {self.simulated_seconds / 3600:.2f} simulated hours in {self.wall_seconds:.1f}s "
+            f"wall ({self.speedup:.0f}x real time)",
+            f"{'hour':>4} {'requests':>9} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'4xx':>5} "
+            f"{'5xx':>5} {'lots':>6} {'opened':>7} {'agreed':>7} {'conv p50 s':>10} {'conv p95 s':>10} "
+            f"{'rows+':>7} {'db MB':>7}",
+        ]
+
+        def fmt(value: float | None, spec: str) -> str:
+            return "-" if value is None else format(value, spec)
+
+        for hour in self.hours:
+            lines.append(
+                f"{hour.hour:>4} {hour.requests:>9} {hour.requests_per_second:>7.1f} "
+                f"{fmt(hour.latency_ms['p50'], '8.1f'):>8} {fmt(hour.latency_ms['p95'], '8.1f'):>8} "
+                f"{fmt(hour.latency_ms['p99'], '8.1f'):>8} {hour.client_errors:>5} {hour.server_errors:>5} "
+                f"{hour.lots_created:>6} {hour.negotiations_opened:>7} {hour.negotiations_agreed:>7} "
+                f"{fmt(hour.convergence_seconds['p50'], '10.0f'):>10} {fmt(hour.convergence_seconds['p95'], '10.0f'):>10} "
+                f"{hour.rows_added:>7} {hour.db_bytes / 1e6:>7.2f}"
+            )
+        return "\n".join(lines)
+
+
+def load_backend(backend_dir: Path, database_url: str) -> Any:
+    """Import the backend app against `database_url`; its settings are read from the environment on import."""
+    os.environ["AURA_DATABASE_URL"] = database_url
+    if str(backend_dir) not in sys.path:
+        sys.path.insert(0, str(backend_dir))
+    from app.main import app
+
+    return app
+
+
+class _RecordingClient(AuraBackendClient):
+    """Backend client that notes when negotiations open and agree, in virtual time."""
+
+    def __init__(self, *args: Any, clock: VirtualClock, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.clock = clock
+        self.opened_at: dict[int, float] = {}
+        self.agreed_at: dict[int, float] = {}
+
+    async def matchmaking(self) -> list[Negotiation]:
+        negotiations = await super().matchmaking()
+        for negotiation in negotiations:
+            self.opened_at.setdefault(negotiation.id, self.clock.now())
+        return negotiations
+
+    async def decide_negotiation(self, negotiation_id: int, payload: dict[str, Any]) -> Negotiation:
+        negotiation = await super().decide_negotiation(negotiation_id, payload)
+        if negotiation.status in (NegotiationStatus.AGREED, NegotiationStatus.SETTLED):
+            self.agreed_at.setdefault(negotiation.id, self.clock.now())
+        return negotiation
+
+
+class Simulation:
+    def __init__(self, config: SimulationConfig, clock: VirtualClock, app: Any, db_path: Path | None) -> None:
+        self.config = config
+        self.clock = clock
+        self.app = app
+        self.db_path = db_path
+        self.rng = random.Random(config.seed)
+        self.started_at = clock.now()
+        self.deadline = self.started_at + config.hours * 3600
+        self.stats = RequestStats(self.started_at)
+        self.client = _RecordingClient(
+            "http://aura.simulated", timeout=600.0, transport=SimulatedTransport(app, clock, self.stats), clock=clock
+        )
+        self.agent_logger = logging.getLogger("aura.simulation.agents")
+        self.agent_logger.setLevel(logging.CRITICAL)
+        self.lots_created: dict[int, int] = defaultdict(int)
+        self.hourly_rows: list[tuple[int, int]] = []
+        self.final_rows: dict[str, int] = {}
+
+    def _agents(self) -> list[Any]:
+        config = self.config
+        agents: list[Any] = []
+        for index in range(config.producers):
+            settings = ProducerAgentSettings(
+                identity=ProducerIdentity(name=f"sim-producer-{index}", contact_email=f"producer{index}@sim.aura")
+            )
+            agents.append(
+                ProducerAgent(self.client, settings, poll_interval=config.poll_interval_seconds, logger=self.agent_logger)
+            )
+        for index in range(config.recyclers):
+            settings = RecyclerAgentSettings(
+                owner_name=f"sim-recycler-{index}",
+                owner_contact=f"recycler{index}@sim.aura",
+                max_price_usd_per_ton=round(self.rng.uniform(180, 320), 2),
+            )
+            agents.append(
+                RecyclerAgent(self.client, settings, poll_interval=config.poll_interval_seconds, logger=self.agent_logger)
+            )
+        for index in range(config.compliance):
+            settings = ComplianceAgentSettings(reviewer_name=f"sim-compliance-{index}")
+            agents.append(
+                ComplianceAgent(self.client, settings, poll_interval=config.poll_interval_seconds, logger=self.agent_logger)
+            )
+        return agents
+
+    async def _run_agent(self, agent: Any) -> None:
+        # Stagger start-up over one poll interval, as independently deployed agents would be.
+        await asyncio.sleep(self.rng.uniform(0, self.config.poll_interval_seconds))
+        await agent.run_forever()
+
+    async def _lot_arrivals(self) -> None:
+        rate = self.config.lots_per_producer_hour * self.config.producers / 3600
+        if rate <= 0:
+            return
+        producer_ids: list[int] = []
+        while True:
+            await asyncio.sleep(self.rng.expovariate(rate))
+            if len(producer_ids) < self.config.producers:
+                # Producer agents register themselves on their first (staggered) step.
+                producers = await self.client.list_producers()
+                producer_ids = [producer.id for producer in producers if producer.name.startswith("sim-producer-")]
+                if not producer_ids:
+                    continue
+            payload = {
+                "producer_id": self.rng.choice(producer_ids),
+                "material_type": self.rng.choice(MATERIALS),
+                "quantity_tons": round(self.rng.uniform(1, 40), 1),
+                "location": self.rng.choice(LOCATIONS),
+                "price_floor_usd_per_ton": round(self.rng.uniform(150, 300), 2),
+            }
+            try:
+                await self.client.create_lot(payload)
+            except httpx.HTTPStatusError:
+                continue
+            self.lots_created[self.stats.hour(self.clock.now())] += 1
+
+    async def _matchmaking(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.matchmaking_interval_seconds)
+            try:
+                await self.client.matchmaking()
+            except httpx.HTTPStatusError:
+                continue
+
+    def _row_counts(self) -> dict[str, int]:
+        from app.db import get_engine
+        from sqlalchemy import text
+        from sqlmodel import SQLModel
+
+        with get_engine().connect() as connection:
+            return {
+                table.name: connection.execute(text(f'SELECT count(*) FROM "{table.name}"')).scalar_one()
+                for table in SQLModel.metadata.sorted_tables
+            }
+
+    def _db_bytes(self) -> int:
+        if self.db_path is None:
+            return 0
+        return sum(
+            os.path.getsize(path)
+            for path in (self.db_path, Path(f"{self.db_path}-wal"))
+            if os.path.exists(path)
+        )
+
+    async def _hourly_snapshots(self) -> None:
+        loop = asyncio.get_running_loop()
+        hour = 0
+        while True:
+            rows = await loop.run_in_executor(None, self._row_counts)
+            self.hourly_rows.append((sum(rows.values()), self._db_bytes()))
+            hour += 1
+            await asyncio.sleep(max(0.0, self.started_at + hour * 3600 - self.clock.now()))
+
+    def _report(self, agents: int, wall_seconds: float) -> SimulationReport:
+        simulated = min(self.clock.now(), self.deadline) - self.started_at
+        opened_at, agreed_at = self.client.opened_at, self.client.agreed_at
+        hours = []
+        for hour in range(math.ceil(self.config.hours)):
+            latencies = self.stats.latencies.get(hour, [])
+            span = min(3600.0, simulated - hour * 3600)
+            convergence = [
+                agreed_at[negotiation_id] - opened
+                for negotiation_id, opened in opened_at.items()
+                if negotiation_id in agreed_at and self.stats.hour(agreed_at[negotiation_id]) == hour
+            ]
+            rows_before, _ = self.hourly_rows[min(hour, len(self.hourly_rows) - 1)]
+            rows_after, db_bytes = self.hourly_rows[min(hour + 1, len(self.hourly_rows) - 1)]
+            endpoints = self.stats.by_endpoint.get(hour, {})
+            hours.append(
+                HourReport(
+                    hour=hour,
+                    requests=len(latencies),
+                    requests_per_second=len(latencies) / span if span > 0 else 0.0,
+                    latency_ms={
+                        name: None if (value := _percentile(latencies, fraction)) is None else value * 1000
+                        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+                    },
+                    client_errors=self.stats.client_errors.get(hour, 0),
+                    server_errors=self.stats.server_errors.get(hour, 0),
+                    lots_created=self.lots_created.get(hour, 0),
+                    negotiations_opened=sum(1 for at in opened_at.values() if self.stats.hour(at) == hour),
+                    negotiations_agreed=len(convergence),
+                    convergence_seconds={
+                        "p50": _percentile(convergence, 0.5),
+                        "p95": _percentile(convergence, 0.95),
+                    },
+                    rows_added=rows_after - rows_before,
+                    db_bytes=db_bytes,
+                    top_endpoints=dict(sorted(endpoints.items(), key=lambda item: -item[1])[:5]),
+                )
+            )
+        return SimulationReport(
+            config=self.config.model_dump(mode="json"),
+            agents=agents,
+            simulated_seconds=simulated,
+            wall_seconds=wall_seconds,
+            hours=hours,
+            rows_by_table=self.final_rows,
+        )
+
+    async def run(self) -> SimulationReport:
+        wall_started = time.perf_counter()
+        await self.app.router.startup()
+        agents = self._agents()
+        logger.info("Simulating %d agents for %.1f hours", len(agents), self.config.hours)
+        tasks = [asyncio.create_task(self._run_agent(agent)) for agent in agents]
+        tasks += [
+            asyncio.create_task(self._lot_arrivals()),
+            asyncio.create_task(self._matchmaking()),
+            asyncio.create_task(self._hourly_snapshots()),
+        ]
+        try:
+            await asyncio.sleep(self.deadline - self.clock.now())
+        finally:
+            for agent in agents:
+                agent.stop()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        # The closing snapshot is the end of the last (possibly partial) hour.
+        rows = await asyncio.get_running_loop().run_in_executor(None, self._row_counts)
+        self.hourly_rows.append((sum(rows.values()), self._db_bytes()))
+        self.final_rows = rows
+        await self.app.router.shutdown()
+        await self.client.close()
+        return self._report(len(agents), time.perf_counter() - wall_started)
+
+
+def simulate(config: SimulationConfig) -> SimulationReport:
+    """Run `config.hours` of marketplace activity on a virtual clock and report per simulated hour."""
+    with tempfile.TemporaryDirectory(prefix="aura-sim-") as scratch:
+        db_path = None
+        database_url = config.database_url
+        if database_url is None:
+            db_path = Path(scratch) / "simulation.db"
+            database_url = f"sqlite:///{db_path}"
+        elif database_url.startswith("sqlite:///"):
+            db_path = Path(database_url[len("sqlite:///") :])
+        app = load_backend(config.backend_dir, database_url)
+        # The backend's per-request N+1 warnings would drown the report; /system/queries still has them.
+        logging.getLogger("aura.queries").setLevel(logging.ERROR)
+
+        clock = VirtualClock()
+        loop = VirtualTimeLoop(clock)
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(Simulation(config, clock, app, db_path).run())
+        finally:
+            loop.run_until_complete(loop.shutdown_default_executor())
+            asyncio.set_event_loop(None)
+            loop.close()
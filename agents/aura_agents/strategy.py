@@ -0,0 +1,359 @@
+"""Strategy rule sets from ``Agent.strategy_metadata["rules"]``, evaluated over NumPy columns.
+
+The rule language is the backend's (``app.services.strategy``): an ordered
+list of ``{"when": ..., "max_price": ..., "offer": ...}`` rules whose
+expressions use arithmetic, comparisons, ``and``/``or``/``not``, ``in``
+against a literal tuple, ``a if cond else b`` and ``min``/``max``/``abs``
+over the names in ``VARIABLES``. The first rule whose ``when`` holds decides
+a row; a row no rule matches is skipped. Missing values are NaN, so
+comparisons with them are false and ``min``/``max`` skip them.
+
+Here each expression is rewritten into NumPy calls (``and`` becomes
+``np.logical_and``, ``a if c else b`` becomes ``np.where``, ``min`` becomes
+``np.fmin``...) and compiled once, so one call evaluates a rule set over a
+whole column of negotiations as readily as over a single one. Compiled rule
+sets are cached per agent ID and ``version``.
+
+Where NumPy and Python arithmetic part ways -- ``x / 0`` is inf or NaN in
+NumPy but raises in Python, and Python skips the branches ``and``/``or`` and
+``a if c else b`` do not take -- the backend is authoritative: a column that
+trips a floating-point error is re-evaluated row by row with the backend's
+plain Python semantics, and rows its rules fail on are reported as failed and
+left unmatched, as the backend's matchmaker skips such lots.
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Callable
+
+import numpy as np
+
+VARIABLES: dict[str, str] = {
+    "material_type": "lot material, e.g. 'PET Bales'",
+    "quantity_tons": "lot quantity",
+    "floor": "lot price floor (USD/ton)",
+    "price": "price on the table: the producer's ask when matching, the latest offer when negotiating",
+    "reference": "oracle reference price for the lot material, from /oracle/feeds",
+    "max_price": "agent's configured maximum price",
+    "target_price": "agent's configured target price",
+}
+RULE_KEYS = ("when", "max_price", "offer")
+MAX_EXPRESSION_LENGTH = 2000  # characters per expression
+MAX_EXPRESSION_NODES = 500  # syntax tree nodes per expression, which also bounds its nesting depth
+
+_BOOL_OPS = (ast.And, ast.Or)
+_UNARY_OPS = (ast.Not, ast.USub, ast.UAdd)
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_COMPARE_OPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.In, ast.NotIn)
+_FUNCTIONS = {"min": "fmin", "max": "fmax", "abs": "abs"}
+
+
+class StrategyError(ValueError):
+    """A rule set that does not parse or uses something outside the rule language."""
+
+
+def _nan_skipping(reduce: Callable[..., float]) -> Callable[..., float]:
+    def call(*values: float) -> float:
+        known = [value for value in values if not (isinstance(value, float) and math.isnan(value))]
+        return reduce(known) if known else float("nan")
+
+    return call
+
+
+# The backend's evaluation namespace, for `CompiledStrategy._compile_rows`.
+_ROW_NAMESPACE = {"__builtins__": {}, "min": _nan_skipping(min), "max": _nan_skipping(max), "abs": abs}
+
+
+def parse_expression(source: Any, where: str) -> ast.expr:
+    """Parse one rule expression, rejecting anything outside the rule language."""
+    if isinstance(source, (bool, int, float)):
+        source = repr(source)
+    if not isinstance(source, str):
+        raise StrategyError(f"{where}: expected an expression string, got {type(source).__name__}")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise StrategyError(f"{where}: longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(source, mode="eval").body
+    except SyntaxError as exc:
+        raise StrategyError(f"{where}: {exc.msg}") from None
+    except (RecursionError, MemoryError):  # the parser's own nesting limits
+        raise StrategyError(f"{where}: too deeply nested") from None
+    nodes = list(ast.walk(tree))
+    if len(nodes) > MAX_EXPRESSION_NODES:
+        raise StrategyError(f"{where}: more than {MAX_EXPRESSION_NODES} syntax nodes")
+    for node in nodes:
+        _check_node(node, where)
+    return tree
+
+
+def _check_node(node: ast.AST, where: str) -> None:
+    if isinstance(node, ast.Name):
+        if node.id not in VARIABLES and node.id not in _FUNCTIONS:
+            raise StrategyError(f"{where}: unknown name '{node.id}'")
+    elif isinstance(node, ast.Constant):
+        if not isinstance(node.value, (bool, int, float, str)):
+            raise StrategyError(f"{where}: unsupported literal {node.value!r}")
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords or not node.args:
+            raise StrategyError(f"{where}: only min(...), max(...) and abs(...) can be called")
+    elif isinstance(node, ast.Compare):
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)) and not (
+                isinstance(right, ast.Tuple) and all(isinstance(item, ast.Constant) for item in right.elts)
+            ):
+                raise StrategyError(f"{where}: 'in' needs a tuple of literals")
+    elif isinstance(node, ast.Tuple):
+        pass  # only reachable as the right-hand side of `in`, checked above
+    elif isinstance(node, (ast.BoolOp, ast.UnaryOp, ast.BinOp, ast.IfExp, ast.Load)):
+        pass
+    elif not isinstance(node, _BOOL_OPS + _UNARY_OPS + _BIN_OPS + _COMPARE_OPS):
+        raise StrategyError(f"{where}: '{type(node).__name__}' is not allowed in strategy rules")
+
+
+_STRING, _NUMBER = frozenset({"string"}), frozenset({"number"})
+_ORDERING_OPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+def _kinds(node: ast.expr, where: str) -> frozenset[str]:
+    """What a checked expression can evaluate to: a string, a number (booleans included) or either.
+
+    Rejects arithmetic, ``min``/``max``/``abs`` and ordering comparisons that
+    could see a string, so e.g. ``material_type * 1000000`` or
+    ``material_type > 5`` fail when the rules are saved, not per lot.
+    """
+    if isinstance(node, ast.Name):
+        return _STRING if node.id == "material_type" else _NUMBER
+    if isinstance(node, ast.Constant):
+        return _STRING if isinstance(node.value, str) else _NUMBER
+    if isinstance(node, ast.BinOp):
+        if "string" in _kinds(node.left, where) | _kinds(node.right, where):
+            raise StrategyError(f"{where}: arithmetic needs numbers, not strings")
+        return _NUMBER
+    if isinstance(node, ast.UnaryOp):
+        if "string" in _kinds(node.operand, where) and not isinstance(node.op, ast.Not):
+            raise StrategyError(f"{where}: arithmetic needs numbers, not strings")
+        return _NUMBER
+    if isinstance(node, ast.Call):
+        if any("string" in _kinds(arg, where) for arg in node.args):
+            raise StrategyError(f"{where}: {node.func.id}(...) needs numbers, not strings")
+        return _NUMBER
+    if isinstance(node, ast.Compare):
+        left = _kinds(node.left, where)
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            right = _kinds(comparator, where)
+            if isinstance(op, _ORDERING_OPS) and len(left | right) > 1:
+                raise StrategyError(f"{where}: cannot order strings against numbers")
+            left = right
+        return _NUMBER
+    if isinstance(node, ast.BoolOp):
+        return frozenset().union(*(_kinds(value, where) for value in node.values))
+    if isinstance(node, ast.IfExp):
+        _kinds(node.test, where)
+        return _kinds(node.body, where) | _kinds(node.orelse, where)
+    raise StrategyError(f"{where}: '{type(node).__name__}' is not allowed here")
+
+
+def _numeric(tree: ast.expr, where: str) -> ast.expr:
+    """`tree`, provided it always evaluates to a number or condition."""
+    if "string" in _kinds(tree, where):
+        raise StrategyError(f"{where}: expected a number or condition, not a string")
+    return tree
+
+
+def validate_rules(rules: Any) -> list[dict[str, ast.expr]]:
+    """Parsed `when`/`max_price`/`offer` expressions per rule, with defaults filled in."""
+    if not isinstance(rules, list):
+        raise StrategyError("rules: expected a list of rules")
+    parsed = []
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            raise StrategyError(f"rules[{index}]: expected an object")
+        unknown = set(rule) - set(RULE_KEYS)
+        if unknown:
+            raise StrategyError(f"rules[{index}]: unknown keys {sorted(unknown)}; expected {list(RULE_KEYS)}")
+        expressions = {
+            "when": ast.Constant(True),
+            "max_price": ast.Name("max_price", ast.Load()),
+            "offer": ast.Constant(float("nan")),
+        }
+        for key in RULE_KEYS:
+            if key in rule:
+                where = f"rules[{index}].{key}"
+                expressions[key] = _numeric(parse_expression(rule[key], where), where)
+        parsed.append(expressions)
+    return parsed
+
+
+def _np(name: str, *args: ast.expr) -> ast.Call:
+    return ast.Call(ast.Attribute(ast.Name("np", ast.Load()), name, ast.Load()), list(args), [])
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Rewrite a validated rule expression into elementwise NumPy calls."""
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.expr:
+        function = "logical_and" if isinstance(node.op, ast.And) else "logical_or"
+        return reduce(lambda left, right: _np(function, left, right), [self.visit(value) for value in node.values])
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        if isinstance(node.op, ast.Not):
+            return _np("logical_not", self.visit(node.operand))
+        return self.generic_visit(node)
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.expr:
+        return _np("where", self.visit(node.test), self.visit(node.body), self.visit(node.orelse))
+
+    def visit_Compare(self, node: ast.Compare) -> ast.expr:
+        operands = [self.visit(node.left), *(self.visit(comparator) for comparator in node.comparators)]
+        pairs = []
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                members = ast.List(right.elts, ast.Load())
+                test = _np("isin", left, members)
+                pairs.append(_np("logical_not", test) if isinstance(op, ast.NotIn) else test)
+            else:
+                pairs.append(ast.Compare(left, [op], [right]))
+        return reduce(lambda left, right: _np("logical_and", left, right), pairs)
+
+    def visit_Call(self, node: ast.Call) -> ast.expr:
+        function = _FUNCTIONS[node.func.id]
+        args = [self.visit(arg) for arg in node.args]
+        if function == "abs":
+            return _np("abs", *args)
+        return reduce(lambda left, right: _np(function, left, right), args)
+
+
+@dataclass(frozen=True)
+class StrategyLimits:
+    matched: np.ndarray  # bool: some rule matched the row
+    max_price: np.ndarray  # NaN where no rule matched or the matching rule's cap is unknown
+    offer: np.ndarray  # NaN where the matching rule sets no opening offer
+    failed: np.ndarray  # bool: the rules raised on the row (a division by zero, say); never matched
+
+
+class CompiledStrategy:
+    """A rule set compiled to NumPy functions of `VARIABLES`, one per rule."""
+
+    def __init__(self, rules: list[dict[str, Any]], version: Any = None) -> None:
+        self.rules = rules
+        self.version = version
+        parsed = validate_rules(rules)
+        self._functions = [self._compile(rule) for rule in parsed]
+        self._row_function = self._compile_rows(parsed)
+
+    @staticmethod
+    def _compile(rule: dict[str, ast.expr]) -> Callable[..., tuple[Any, Any, Any]]:
+        # lambda material_type='', quantity_tons=nan, ...: (when, max_price, offer)
+        names = list(VARIABLES)
+        body = ast.Tuple([_Vectorize().visit(rule[key]) for key in RULE_KEYS], ast.Load())
+        function = ast.Expression(
+            ast.Lambda(
+                ast.arguments(
+                    posonlyargs=[],
+                    args=[],
+                    vararg=None,
+                    kwonlyargs=[ast.arg(name) for name in names],
+                    kw_defaults=[ast.Constant("" if name == "material_type" else float("nan")) for name in names],
+                    kwarg=None,
+                    defaults=[],
+                ),
+                body,
+            )
+        )
+        return eval(compile(ast.fix_missing_locations(function), "<strategy>", "eval"), {"__builtins__": {}, "np": np})
+
+    @staticmethod
+    def _compile_rows(parsed: list[dict[str, ast.expr]]) -> Callable[..., tuple[float, float] | None]:
+        # The backend's compilation, for one row of Python scalars:
+        # lambda material_type='', quantity_tons=nan, ...: (m0, o0) if w0 else (m1, o1) if w1 else None
+        body: ast.expr = ast.Constant(None)
+        for rule in reversed(parsed):
+            body = ast.IfExp(rule["when"], ast.Tuple([rule["max_price"], rule["offer"]], ast.Load()), body)
+        names = list(VARIABLES)
+        function = ast.Expression(
+            ast.Lambda(
+                ast.arguments(
+                    posonlyargs=[],
+                    args=[],
+                    vararg=None,
+                    kwonlyargs=[ast.arg(name) for name in names],
+                    kw_defaults=[ast.Constant("" if name == "material_type" else float("nan")) for name in names],
+                    kwarg=None,
+                    defaults=[],
+                ),
+                body,
+            )
+        )
+        return eval(compile(ast.fix_missing_locations(function), "<strategy>", "eval"), dict(_ROW_NAMESPACE))
+
+    def evaluate(self, variables: Mapping[str, Any]) -> StrategyLimits:
+        """The first matching rule's limits per row.
+
+        `variables` maps names in `VARIABLES` to scalars or equally long
+        columns; missing names count as NaN (or '' for `material_type`).
+        Rows the rules raise on (e.g. `reference / quantity_tons` on an empty
+        lot) are marked `failed` and left unmatched, as in the backend.
+        """
+        shape = np.broadcast_shapes(*(np.shape(value) for value in variables.values()))
+        matched = np.zeros(shape, dtype=bool)
+        max_price = np.full(shape, np.nan)
+        offer = np.full(shape, np.nan)
+        try:
+            with np.errstate(all="raise"):
+                for function in self._functions:
+                    when, rule_max, rule_offer = function(**variables)
+                    hit = np.broadcast_to(np.asarray(when, dtype=bool), shape) & ~matched
+                    max_price = np.where(hit, rule_max, max_price).astype(float)
+                    offer = np.where(hit, rule_offer, offer).astype(float)
+                    matched |= hit
+        except (TypeError, ValueError, ArithmeticError):  # FloatingPointError included
+            return self._evaluate_rows(variables, shape)
+        return StrategyLimits(matched, max_price, offer, np.zeros(shape, dtype=bool))
+
+    def _evaluate_rows(self, variables: Mapping[str, Any], shape: tuple[int, ...]) -> StrategyLimits:
+        """`evaluate` one row at a time, with the backend's Python semantics."""
+        columns = {name: np.broadcast_to(value, shape) for name, value in variables.items()}
+        matched = np.zeros(shape, dtype=bool)
+        failed = np.zeros(shape, dtype=bool)
+        max_price = np.full(shape, np.nan)
+        offer = np.full(shape, np.nan)
+        for index in np.ndindex(shape):
+            try:
+                outcome = self._row_function(**{name: _scalar(column[index]) for name, column in columns.items()})
+                if outcome is not None:
+                    max_price[index], offer[index] = float(outcome[0]), float(outcome[1])
+            except (TypeError, ValueError, ArithmeticError):
+                failed[index] = True
+                continue
+            matched[index] = outcome is not None
+        return StrategyLimits(matched, max_price, offer, failed)
+
+
+def _scalar(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+_cache: dict[Any, CompiledStrategy] = {}
+
+
+def compile_strategy(agent_id: Any, metadata: Mapping[str, Any] | None) -> CompiledStrategy | None:
+    """The agent's compiled rule set, or None when its metadata has no `rules`.
+
+    Compiled rule sets are cached per agent and reused while the metadata's
+    `version` and rules are unchanged.
+    """
+    rules = (metadata or {}).get("rules")
+    if rules is None:
+        return None
+    version = metadata.get("version")
+    cached = _cache.get(agent_id)
+    if cached is None or cached.version != version or cached.rules != rules:
+        cached = _cache[agent_id] = CompiledStrategy(rules, version)
+    return cached
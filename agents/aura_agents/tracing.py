@@ -0,0 +1,129 @@
+"""Trace spans for agent steps and backend calls, propagated with W3C `traceparent`.
+
+`BaseAgent.run_forever` opens a root span per step; `AuraBackendClient` opens a
+client span per HTTP call and sends its `traceparent`, which the API continues
+down to SQL. Roots are sampled at `sample_rate` and children inherit the
+decision. Sampled spans go to the configured exporter; `FileExporter` writes
+the same JSON lines as the API's, so one trace file can hold both sides.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+SERVICE_NAME = "aura-agents"
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    sampled: bool
+    kind: str = "internal"
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    status: str = "ok"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "service": SERVICE_NAME,
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6 if self.end_ns else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class FileExporter:
+    """Appends finished spans to a JSON-lines file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class MemoryExporter:
+    """Keeps finished spans in a list (tests, ad-hoc inspection)."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+_current: ContextVar[Span | None] = ContextVar("aura_agent_trace_span", default=None)
+_exporter: SpanExporter | None = None
+_sample_rate = 0.0
+
+
+def configure(sample_rate: float, exporter: SpanExporter | None) -> None:
+    global _exporter, _sample_rate
+    _sample_rate = sample_rate
+    _exporter = exporter
+
+
+def start(name: str, *, kind: str = "internal", **attributes: Any) -> Span:
+    """A span parented on the current one (or a new root) that the caller must `finish`."""
+    parent = _current.get()
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+        sampled = _exporter is not None and random.random() < _sample_rate
+    return Span(name, trace_id, secrets.token_hex(8), parent_id, sampled, kind, attributes)
+
+
+def finish(finished: Span) -> None:
+    finished.end_ns = time.time_ns()
+    if finished.sampled and _exporter is not None:
+        _exporter.export(finished)
+
+
+@contextmanager
+def span(name: str, *, kind: str = "internal", **attributes: Any) -> Iterator[Span]:
+    """Open a span as the current one for the enclosed block."""
+    current = start(name, kind=kind, **attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.attributes["exception.type"] = type(exc).__name__
+        raise
+    finally:
+        _current.reset(token)
+        finish(current)
@@ -0,0 +1,119 @@
+"""Compare decode throughput and resident memory of Pydantic vs compact agent models.
+
+Usage (from ``agents/``)::
+
+    python -m benchmarks.models_decode --lots 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from aura_agents import compact
+from aura_agents.models import WasteLot
+
+
+def _payload(lot_count: int) -> bytes:
+    lots = []
+    for index in range(lot_count):
+        lots.append(
+            {
+                "id": index,
+                "producer_id": 1,
+                "external_reference": f"lot-{index}",
+                "material_type": "PET Bales",
+                "quantity_tons": 5.0,
+                "location": "Dallas, TX",
+                "price_floor_usd_per_ton": 200.0,
+                "status": "upcycling_pending",
+                "chemical_composition": {"grade": "PET-200"},
+                "photos": [f"https://example.com/photos/{index}.jpg"],
+                "created_at": "2025-01-01T12:00:00",
+                "updated_at": "2025-01-01T12:00:00.123456",
+                "token": {
+                    "id": index,
+                    "token_address": f"0xLOT{index:06d}",
+                    "token_name": f"LOT-{index}",
+                    "token_symbol": "AURA",
+                    "supply": 1,
+                    "transaction_hash": f"0xTX{index:06d}",
+                    "minted_at": "2025-01-01T12:00:00",
+                    "retired_at": None,
+                    "retire_transaction_hash": None,
+                },
+                "verification": {
+                    "id": index,
+                    "status": "verified",
+                    "method": "sensor_bundle",
+                    "evidence_uri": f"https://example.com/evidence/{index}",
+                    "sensor_checksum": "abc123",
+                    "verifier_notes": None,
+                    "requested_at": "2025-01-01T12:00:00",
+                    "verified_at": "2025-01-01T12:00:00",
+                },
+                "proofs": [
+                    {
+                        "id": index,
+                        "waste_lot_id": index,
+                        "recycler_agent_id": 2,
+                        "evidence_uri": f"https://example.com/proof/{index}",
+                        "sensor_checksum": "def456",
+                        "processing_notes": None,
+                        "ai_confidence": 0.9,
+                        "status": "pending",
+                        "certificate_uri": None,
+                        "submitted_at": "2025-01-01T12:00:00",
+                        "validated_at": None,
+                    }
+                ],
+            }
+        )
+    return json.dumps(lots).encode()
+
+
+def _pydantic(content: bytes):
+    return [WasteLot.model_validate(item) for item in json.loads(content)]
+
+
+def _compact(content: bytes):
+    return compact.decode_many(content, WasteLot)
+
+
+def _measure(label: str, decode, content: bytes, repeat: int) -> None:
+    best = min(_timed(decode, content) for _ in range(repeat))
+    gc.collect()
+    tracemalloc.start()
+    decoded = decode(content)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rate = len(decoded) / best
+    print(
+        f"{label:<9} decode={best * 1000:8.1f}ms  lots/s={rate:10.0f}  "
+        f"retained={retained / 2**20:7.1f}MiB  peak={peak / 2**20:7.1f}MiB"
+    )
+
+
+def _timed(decode, content: bytes) -> float:
+    start = time.perf_counter()
+    decode(content)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = _payload(args.lots)
+    print(f"payload={len(content) / 2**20:.1f}MiB lots={args.lots}")
+    _measure("pydantic", _pydantic, content, args.repeat)
+    _measure("compact", _compact, content, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare scalar and batch negotiation policy evaluation for a large recycler backlog.
+
+Usage (from ``agents/``)::
+
+    python -m benchmarks.policies_batch --negotiations 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from aura_agents.config import RecyclerAgentSettings
+from aura_agents.models import Negotiation, NegotiationStatus
+from aura_agents.policies import decide_negotiation, decide_negotiations, negotiation_columns
+
+
+def _book(size: int) -> list[Negotiation]:
+    rng = np.random.default_rng(0)
+    statuses = rng.choice([NegotiationStatus.OPEN.value, NegotiationStatus.COUNTER.value], size)
+    producer = rng.uniform(100, 400, size)
+    recycler = np.where(rng.random(size) < 0.5, np.nan, rng.uniform(100, 400, size))
+    return [
+        Negotiation(
+            id=index,
+            waste_lot_id=index,
+            producer_agent_id=1,
+            recycler_agent_id=2,
+            status=str(statuses[index]),
+            producer_offer_usd_per_ton=float(producer[index]),
+            recycler_offer_usd_per_ton=None if np.isnan(recycler[index]) else float(recycler[index]),
+            agreed_price_usd_per_ton=None,
+        )
+        for index in range(size)
+    ]
+
+
+def _best(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--negotiations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = RecyclerAgentSettings(owner_name="Bench Recycler", max_price_usd_per_ton=250)
+    book = _book(args.negotiations)
+    columns = negotiation_columns(book)
+
+    scalar = _best(args.repeat, lambda: [decide_negotiation(negotiation, settings) for negotiation in book])
+    build = _best(args.repeat, lambda: negotiation_columns(book))
+    batch = _best(args.repeat, lambda: decide_negotiations(*columns, settings))
+    print(f"negotiations={args.negotiations}")
+    print(f"scalar   {scalar * 1000:8.1f}ms")
+    print(f"columns  {build * 1000:8.1f}ms  (from model objects)")
+    print(f"batch    {batch * 1000:8.1f}ms  ({scalar / batch:.0f}x scalar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from pathlib import Path
 from typing import Optional
 
 import typer
 
 from aura_agents.config import AgentServiceSettings, load_settings_from_env_or_file
+from aura_agents.profiling import profile_agents
 from aura_agents.runner import run_agents
 
 app = typer.Typer(help="Aura autonomous agent service controller")
@@ -22,5 +24,59 @@ def start(config: Optional[Path] = typer.Option(None, help="Path to YAML/JSON ag
     asyncio.run(run_agents(settings))
 
 
+@app.command()
+def profile(
+    config: Optional[Path] = typer.Option(None, help="Path to YAML/JSON agent configuration."),
+    duration: float = typer.Option(60.0, min=0.1, help="Seconds to run the agents under the profiler."),
+    out: Path = typer.Option(Path("profiles"), help="Directory for collapsed stacks and summaries."),
+    interval_ms: float = typer.Option(5.0, min=0.5, help="Sampling interval in milliseconds."),
+    dump_every: Optional[float] = typer.Option(None, help="Also write a profile every N seconds of the window."),
+) -> None:
+    """Run enabled agents under a sampling profiler and write flamegraph-compatible output."""
+    settings = AgentServiceSettings.load(config) if config is not None else load_settings_from_env_or_file()
+    written = asyncio.run(
+        profile_agents(settings, duration=duration, directory=out, interval=interval_ms / 1000, dump_every=dump_every)
+    )
+    for paths in written:
+        summary = json.loads(paths["summary"].read_text())
+        typer.echo(f"{paths['wall']} ({summary['seconds']:.1f}s, {summary['samples']} samples)")
+        for tag, totals in summary["tags"].items():
+            typer.echo(f"  {tag:<12} wall {totals['wall_seconds']:8.3f}s  cpu {totals['cpu_seconds']:8.3f}s")
+
+
+@app.command()
+def simulate(
+    producers: int = typer.Option(200, min=1, help="Simulated producer agents."),
+    recyclers: int = typer.Option(20, min=1, help="Simulated recycler agents."),
+    compliance: int = typer.Option(2, min=1, help="Simulated compliance agents."),
+    hours: float = typer.Option(2.0, min=0.01, help="Simulated hours of marketplace activity."),
+    poll_interval: float = typer.Option(300.0, help="Agent poll interval in simulated seconds."),
+    matchmaking_interval: float = typer.Option(300.0, help="Matchmaking sweep interval in simulated seconds."),
+    lots_per_producer_hour: float = typer.Option(0.5, min=0, help="Mean new lots listed per producer per hour."),
+    seed: int = typer.Option(0, help="Random seed for prices, materials and arrivals."),
+    database_url: Optional[str] = typer.Option(None, help="Backend database; defaults to a fresh temporary SQLite file."),
+    report: Optional[Path] = typer.Option(None, help="Also write the full report as JSON here."),
+) -> None:
+    """Run simulated agents against the in-process backend on a virtual clock and report per simulated hour."""
+    from aura_agents.simulator import SimulationConfig
+    from aura_agents.simulator import simulate as run_simulation
+
+    config = SimulationConfig(
+        producers=producers,
+        recyclers=recyclers,
+        compliance=compliance,
+        hours=hours,
+        poll_interval_seconds=poll_interval,
+        matchmaking_interval_seconds=matchmaking_interval,
+        lots_per_producer_hour=lots_per_producer_hour,
+        seed=seed,
+        database_url=database_url,
+    )
+    result = run_simulation(config)
+    typer.echo(result.format())
+    if report is not None:
+        report.write_text(json.dumps(result.to_dict(), indent=2, default=str))
+
+
 if __name__ == "__main__":
     app()
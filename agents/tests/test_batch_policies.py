@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+
+from aura_agents.config import ComplianceAgentSettings, RecyclerAgentSettings
+from aura_agents.models import Negotiation, NegotiationStatus, UpcyclingProof, WasteLot, WasteLotStatus
+from aura_agents.policies import (
+    NegotiationAction,
+    decide_negotiation,
+    decide_negotiations,
+    negotiation_columns,
+    proof_validation_payload,
+    proof_validations,
+    should_submit_proof,
+    should_submit_proofs,
+)
+
+# Offers that exercise each branch of the scalar policy, including the falsy 0.0 and a tie with the cap.
+OFFERS = [None, 0.0, 120.0, 249.99, 250.0, 250.01, 400.0]
+
+
+def _negotiation(index: int, status: NegotiationStatus, recycler: float | None, producer: float | None) -> Negotiation:
+    return Negotiation(
+        id=index,
+        waste_lot_id=1,
+        producer_agent_id=10,
+        recycler_agent_id=20,
+        status=status,
+        producer_offer_usd_per_ton=producer,
+        recycler_offer_usd_per_ton=recycler,
+        agreed_price_usd_per_ton=None,
+    )
+
+
+def _proof(index: int, status: str, confidence: float | None) -> UpcyclingProof:
+    return UpcyclingProof(
+        id=index,
+        waste_lot_id=1,
+        recycler_agent_id=None,
+        evidence_uri=None,
+        sensor_checksum=None,
+        processing_notes=None,
+        ai_confidence=confidence,
+        status=status,
+        certificate_uri=None,
+        submitted_at=datetime.utcnow().isoformat(),
+        validated_at=None,
+    )
+
+
+def test_decide_negotiations_matches_scalar_policy_on_every_branch():
+    settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=250)
+    negotiations = [
+        _negotiation(index, status, recycler, producer)
+        for index, (status, recycler, producer) in enumerate(
+            (status, recycler, producer)
+            for status in NegotiationStatus
+            for recycler in OFFERS
+            for producer in OFFERS
+        )
+    ]
+
+    decisions = decide_negotiations(*negotiation_columns(negotiations), settings)
+
+    assert decisions.payloads() == [decide_negotiation(negotiation, settings) for negotiation in negotiations]
+    assert set(decisions.actions.tolist()) == set(NegotiationAction)
+
+
+def test_decide_negotiations_matches_scalar_policy_on_random_books():
+    rng = random.Random(7)
+    for _ in range(20):
+        settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=round(rng.uniform(0, 400), 2))
+        negotiations = [
+            _negotiation(
+                index,
+                rng.choice(list(NegotiationStatus)),
+                rng.choice([None, 0.0, round(rng.uniform(0, 400), 2)]),
+                rng.choice([None, 0.0, round(rng.uniform(0, 400), 2)]),
+            )
+            for index in range(200)
+        ]
+        decisions = decide_negotiations(*negotiation_columns(negotiations), settings)
+        assert decisions.payloads() == [decide_negotiation(negotiation, settings) for negotiation in negotiations]
+
+
+def test_decide_negotiations_accepts_plain_lists_and_enum_statuses():
+    settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=250)
+    decisions = decide_negotiations(
+        [NegotiationStatus.OPEN, "counter", NegotiationStatus.AGREED], [None, 300.0, 200.0], [240.0, None, None], settings
+    )
+    assert decisions.actions.tolist() == [NegotiationAction.AGREE, NegotiationAction.COUNTER, NegotiationAction.SKIP]
+    assert decisions.payload(1)["counter_offer_usd_per_ton"] == 250
+    assert len(decide_negotiations([], [], [], settings)) == 0
+
+
+def test_should_submit_proofs_matches_scalar_policy():
+    for submit in (True, False):
+        settings = RecyclerAgentSettings(owner_name="Recycler", submit_proof=submit)
+        lots = []
+        for index, status in enumerate(WasteLotStatus):
+            for proof_statuses in ([], ["approved"], ["pending"], ["rejected", "pending"]):
+                lot = WasteLot(
+                    id=index, producer_id=1, material_type="PET", quantity_tons=1.0, location="Austin, TX", status=status
+                )
+                lot.proofs.extend(_proof(n, proof_status, None) for n, proof_status in enumerate(proof_statuses))
+                lots.append(lot)
+
+        batch = should_submit_proofs(
+            [lot.status for lot in lots],
+            [sum(proof.status == "pending" for proof in lot.proofs) for lot in lots],
+            settings,
+        )
+
+        assert batch.tolist() == [should_submit_proof(lot, settings) for lot in lots]
+
+
+def test_proof_validations_match_scalar_payloads():
+    proofs = [_proof(index, "pending", confidence) for index, confidence in enumerate([None, 0.0, 0.5, 0.85, 0.8499, 1.0])]
+    for settings in (
+        ComplianceAgentSettings(),
+        ComplianceAgentSettings(reviewer_name="QA", approve_threshold=0.5, auto_certificate_uri="https://example.com/c"),
+    ):
+        batch = proof_validations([proof.id for proof in proofs], [proof.ai_confidence for proof in proofs], settings)
+        assert batch.payloads() == [proof_validation_payload(proof, settings) for proof in proofs]
+
+
+def test_a_hundred_thousand_negotiations_are_decided_in_milliseconds():
+    settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=250)
+    rng = np.random.default_rng(0)
+    size = 100_000
+    statuses = rng.choice(np.array([status.value for status in NegotiationStatus]), size)
+    recycler = np.where(rng.random(size) < 0.3, np.nan, rng.uniform(100, 400, size))
+    producer = rng.uniform(100, 400, size)
+
+    started = time.perf_counter()
+    decisions = decide_negotiations(statuses, recycler, producer, settings)
+    elapsed = time.perf_counter() - started
+
+    assert len(decisions) == size
+    assert elapsed < 0.1, f"batch decision took {elapsed * 1000:.1f} ms"
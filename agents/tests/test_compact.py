@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+
+from aura_agents import compact
+from aura_agents.config import ComplianceAgentSettings, RecyclerAgentSettings
+from aura_agents.models import Negotiation, NegotiationStatus, WasteLot, WasteLotStatus
+from aura_agents.policies import decide_negotiation, proof_validation_payload, should_submit_proof
+
+LOT_PAYLOAD = {
+    "id": 3,
+    "producer_id": 1,
+    "external_reference": "lot-003",
+    "material_type": "Aluminum Shavings",
+    "quantity_tons": 5.5,
+    "location": "Phoenix, AZ",
+    "price_floor_usd_per_ton": 180.0,
+    "status": "upcycling_pending",
+    "chemical_composition": {"purity": "98%"},
+    "photos": ["https://example.com/photo/3"],
+    "created_at": "2025-01-01T12:00:00",
+    "updated_at": "2025-01-01T12:30:00.500000",
+    "token": None,
+    "verification": None,
+    "proofs": [
+        {
+            "id": 9,
+            "waste_lot_id": 3,
+            "recycler_agent_id": 2,
+            "evidence_uri": "https://example.com/proof/3",
+            "sensor_checksum": "abc",
+            "processing_notes": None,
+            "ai_confidence": 0.7,
+            "status": "pending",
+            "certificate_uri": None,
+            "submitted_at": "2025-01-01T12:30:00",
+            "validated_at": None,
+        }
+    ],
+}
+
+
+def test_compact_lot_matches_pydantic_attributes():
+    content = json.dumps([LOT_PAYLOAD]).encode()
+    (slim,) = compact.decode_many(content, WasteLot)
+    full = WasteLot.model_validate(LOT_PAYLOAD)
+
+    assert slim.status is WasteLotStatus.UPCYCLING_PENDING
+    assert slim.updated_at == full.updated_at
+    assert slim.proofs[0].ai_confidence == full.proofs[0].ai_confidence
+    assert not hasattr(slim, "__dict__")
+
+    recycler = RecyclerAgentSettings(owner_name="Recycler")
+    compliance = ComplianceAgentSettings(approve_threshold=0.8)
+    assert should_submit_proof(slim, recycler) == should_submit_proof(full, recycler)
+    assert proof_validation_payload(slim.proofs[0], compliance) == proof_validation_payload(full.proofs[0], compliance)
+
+
+def test_compact_negotiation_drives_same_decision():
+    payload = {
+        "id": 4,
+        "waste_lot_id": 3,
+        "producer_agent_id": 1,
+        "recycler_agent_id": 2,
+        "status": "counter",
+        "producer_offer_usd_per_ton": 260.0,
+        "recycler_offer_usd_per_ton": None,
+        "agreed_price_usd_per_ton": None,
+        "expires_at": "2025-01-03T12:00:00",
+        "created_at": "2025-01-01T12:00:00",
+        "updated_at": "2025-01-01T12:00:00",
+    }
+    slim = compact.decode(json.dumps(payload).encode(), Negotiation)
+    full = Negotiation.model_validate(payload)
+    settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=200)
+
+    assert slim.status is NegotiationStatus.COUNTER
+    assert decide_negotiation(slim, settings) == decide_negotiation(full, settings)
+
+
+def _assert_same_attributes(slim, full, path: str) -> None:
+    """Every field of a compact struct equals the Pydantic attribute, with the same type."""
+    from dataclasses import fields, is_dataclass
+
+    for item in fields(slim):
+        value, expected = getattr(slim, item.name), getattr(full, item.name)
+        where = f"{path}.{item.name}"
+        if is_dataclass(value):
+            _assert_same_attributes(value, expected, where)
+        elif isinstance(value, list) and value and is_dataclass(value[0]):
+            assert len(value) == len(expected), where
+            for index, (slim_item, full_item) in enumerate(zip(value, expected)):
+                _assert_same_attributes(slim_item, full_item, f"{where}[{index}]")
+        else:
+            assert type(value) is type(expected) and value == expected, where
+
+
+def test_compact_lot_fields_match_models_types_and_values():
+    payload = {
+        **LOT_PAYLOAD,
+        "token": {
+            "id": 1,
+            "token_address": "0xLOT000003",
+            "token_name": "LOT-3",
+            "token_symbol": "ALU",
+            "supply": 5,
+            "transaction_hash": "0x3",
+            "minted_at": "2025-01-01T12:10:00",
+            "retired_at": None,
+            "retire_transaction_hash": None,
+        },
+        "verification": {
+            "id": 2,
+            "status": "verified",
+            "method": "video_upload",
+            "evidence_uri": None,
+            "sensor_checksum": None,
+            "verifier_notes": None,
+            "requested_at": "2025-01-01T12:05:00",
+            "verified_at": "2025-01-01T12:06:00.250000",
+        },
+    }
+    slim = compact.decode(json.dumps(payload).encode(), WasteLot)
+    _assert_same_attributes(slim, WasteLot.model_validate(payload), "lot")
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from aura_agents import metrics
+from aura_agents.base import BaseAgent
+from aura_agents.client import AuraBackendClient
+
+
+def test_endpoint_template_folds_ids():
+    assert metrics.endpoint_template("/lots/12/proofs/3/validate") == "/lots/{id}/proofs/{id}/validate"
+    assert metrics.endpoint_template("/negotiations") == "/negotiations"
+
+
+def test_agent_steps_record_duration_items_and_backlog():
+    class CountingAgent(BaseAgent):
+        async def step(self) -> int:
+            self.record_backlog("lots", 4)
+            self.stop()
+            return 3
+
+    async def scenario() -> None:
+        client = AuraBackendClient("http://127.0.0.1:9")
+        agent = CountingAgent("counting-agent", client, poll_interval=0.01)
+        await agent.run_forever()
+        await client.close()
+
+    before = metrics.STEP_ITEMS.count("counting-agent")
+    asyncio.run(scenario())
+    assert metrics.STEP_ITEMS.count("counting-agent") == before + 1
+    assert metrics.STEP_SECONDS.count("counting-agent") >= 1
+    assert metrics.BACKLOG.value("counting-agent", "lots") == 4
+    assert 'aura_agent_backlog{agent="counting-agent",queue="lots"} 4' in metrics.render()
+
+
+def test_exporter_serves_client_latency_by_endpoint_template():
+    async def scenario() -> str:
+        server = await metrics.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        # Point the backend client at the exporter itself: any API path is a 404 there.
+        client = AuraBackendClient(f"http://127.0.0.1:{port}")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_lot(41)
+        async with httpx.AsyncClient() as scraper:
+            response = await scraper.get(f"http://127.0.0.1:{port}/metrics")
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        assert response.headers["content-type"] == "text/plain; version=0.0.4"
+        return response.text
+
+    body = asyncio.run(scenario())
+    assert "# TYPE aura_agent_http_request_duration_seconds histogram" in body
+    assert 'aura_agent_http_request_duration_seconds_count{method="GET",endpoint="/lots/{id}",status="404"}' in body
+    assert "/lots/41" not in body
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aura_agents.base import BaseAgent
+from aura_agents.client import AuraBackendClient
+from aura_agents.profiling import SamplingProfiler, agent_tags
+from aura_agents.recycler import RecyclerAgent
+
+
+class SpinningAgent(BaseAgent):
+    """Burns CPU in `step`, then idles for its poll interval."""
+
+    steps = 0
+
+    async def step(self) -> int:
+        deadline = time.perf_counter() + 0.02
+        while time.perf_counter() < deadline:
+            sum(range(500))
+        self.steps += 1
+        if self.steps == 5:
+            self.stop()
+        return 1
+
+
+def test_agent_steps_are_charged_to_their_agent_type(tmp_path):
+    profiler = SamplingProfiler({SpinningAgent.step.__code__: "spinning"}, interval=0.002)
+
+    async def scenario() -> None:
+        client = AuraBackendClient("http://127.0.0.1:9")
+        await SpinningAgent("spinning-agent", client, poll_interval=0.02).run_forever()
+        await client.close()
+
+    profiler.start()
+    asyncio.run(scenario())
+    profile = profiler.stop()
+
+    tags = profile.summary()["tags"]
+    assert 0.05 < tags["spinning"]["wall_seconds"] < profile.seconds
+    assert tags["spinning"]["cpu_seconds"] > 0.03
+    assert tags["idle"]["wall_seconds"] > 0.03  # the loop parked in select between steps
+    assert tags["idle"]["cpu_seconds"] < tags["spinning"]["cpu_seconds"]
+
+    paths = profile.write(tmp_path, "agents")
+    wall = paths["wall"].read_text()
+    assert "spinning;" in wall and "SpinningAgent.step (" in wall
+    assert not any(line.startswith("idle;") for line in wall.splitlines())
+
+
+def test_agent_tags_cover_each_agent_type():
+    tags = agent_tags()
+    assert tags[RecyclerAgent.step.__code__] == "recycler"
+    assert {"producer", "recycler", "compliance", "matchmaking"} <= set(tags.values())
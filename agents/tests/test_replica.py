@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+from aura_agents.models import Negotiation, NegotiationStatus, WasteLot, WasteLotStatus
+from aura_agents.replica import WATERMARK_LAG, MarketplaceReplica
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+class FakeBackend:
+    """Serves lots and negotiations filtered by `updated_since` and scope like the API does."""
+
+    def __init__(self) -> None:
+        self.lots: dict[int, WasteLot] = {}
+        self.negotiations: dict[int, Negotiation] = {}
+        self.calls: list[tuple[str, datetime | None]] = []
+        self.lot_status_filters: list = []
+
+    async def list_lots(self, *, producer_id=None, recycler_agent_id=None, updated_since=None, status=None):
+        self.calls.append(("lots", updated_since))
+        self.lot_status_filters.append(status)
+        negotiated = {n.waste_lot_id for n in self.negotiations.values() if n.recycler_agent_id == recycler_agent_id}
+        return [
+            lot
+            for lot in self.lots.values()
+            if (updated_since is None or lot.updated_at >= updated_since)
+            and (producer_id is None or lot.producer_id == producer_id)
+            and (recycler_agent_id is None or lot.id in negotiated)
+            and (not status or lot.status in status)
+        ]
+
+    async def list_negotiations(self, *, recycler_agent_id=None, updated_since=None, statuses=None):
+        self.calls.append(("negotiations", updated_since))
+        return [
+            negotiation
+            for negotiation in self.negotiations.values()
+            if (updated_since is None or negotiation.updated_at >= updated_since)
+            and (recycler_agent_id is None or negotiation.recycler_agent_id == recycler_agent_id)
+        ]
+
+
+def make_lot(lot_id: int, status: WasteLotStatus, minutes: int, producer_id: int = 1) -> WasteLot:
+    return WasteLot(
+        id=lot_id,
+        producer_id=producer_id,
+        material_type="PET Bales",
+        quantity_tons=4.0,
+        location="Dallas, TX",
+        status=status,
+        updated_at=BASE_TIME + timedelta(minutes=minutes),
+    )
+
+
+def make_negotiation(negotiation_id: int, status: NegotiationStatus, minutes: int, recycler_agent_id: int = 7):
+    return Negotiation(
+        id=negotiation_id,
+        waste_lot_id=negotiation_id,
+        producer_agent_id=1,
+        recycler_agent_id=recycler_agent_id,
+        status=status,
+        producer_offer_usd_per_ton=200.0,
+        recycler_offer_usd_per_ton=None,
+        agreed_price_usd_per_ton=None,
+        updated_at=BASE_TIME + timedelta(minutes=minutes),
+    )
+
+
+def test_refresh_fetches_only_rows_changed_since_watermark():
+    backend = FakeBackend()
+    backend.lots = {
+        1: make_lot(1, WasteLotStatus.PENDING_VERIFICATION, minutes=0),
+        2: make_lot(2, WasteLotStatus.VERIFIED, minutes=5),
+        3: make_lot(3, WasteLotStatus.TOKENIZED, minutes=2),
+    }
+    replica = MarketplaceReplica(backend, producer_id=1)
+
+    delta = asyncio.run(replica.refresh())
+    assert delta.lots == 3
+    assert backend.calls[-1] == ("lots", None)
+
+    backend.lots[1] = make_lot(1, WasteLotStatus.VERIFIED, minutes=10)
+    delta = asyncio.run(replica.refresh())
+
+    assert backend.calls[-1] == ("lots", BASE_TIME + timedelta(minutes=5) - WATERMARK_LAG)
+    # The watermark trails the newest row, so the boundary row (lot 2) is re-sent alongside the change.
+    assert delta.lots == 2
+    assert replica.lots_by_status(WasteLotStatus.PENDING_VERIFICATION) == []
+    assert [lot.id for lot in replica.lots_by_status(WasteLotStatus.VERIFIED)] == [1, 2]
+
+
+def test_applied_mutations_move_the_status_index_but_not_the_watermark():
+    backend = FakeBackend()
+    backend.negotiations = {
+        3: make_negotiation(3, NegotiationStatus.OPEN, minutes=1),
+        4: make_negotiation(4, NegotiationStatus.OPEN, minutes=2, recycler_agent_id=99),
+    }
+    replica = MarketplaceReplica(backend, track_lots=False, track_negotiations=True, recycler_agent_id=7)
+    asyncio.run(replica.refresh())
+    assert [n.id for n in replica.negotiations()] == [3]
+
+    # The matchmaker opens negotiation 5 before this agent's own decision on 3 lands.
+    backend.negotiations[5] = make_negotiation(5, NegotiationStatus.OPEN, minutes=2)
+    backend.negotiations[3] = make_negotiation(3, NegotiationStatus.AGREED, minutes=3)
+    replica.apply_negotiation(backend.negotiations[3])
+
+    assert replica.negotiations_by_status(NegotiationStatus.OPEN) == []
+    assert replica.negotiation(3).status == NegotiationStatus.AGREED
+
+    asyncio.run(replica.refresh())
+    assert backend.calls[-1] == ("negotiations", BASE_TIME + timedelta(minutes=1) - WATERMARK_LAG)
+    assert [n.id for n in replica.negotiations_by_status(NegotiationStatus.OPEN)] == [5]
+
+
+def test_status_scoped_replica_keeps_only_tracked_lots():
+    backend = FakeBackend()
+    backend.lots = {
+        1: make_lot(1, WasteLotStatus.PENDING_VERIFICATION, minutes=0),
+        2: make_lot(2, WasteLotStatus.VERIFIED, minutes=1),
+        3: make_lot(3, WasteLotStatus.TOKENIZED, minutes=2),
+    }
+    replica = MarketplaceReplica(
+        backend, producer_id=1, lot_statuses=(WasteLotStatus.PENDING_VERIFICATION, WasteLotStatus.VERIFIED)
+    )
+    asyncio.run(replica.refresh())
+    assert [lot.id for lot in replica.lots()] == [1, 2]
+
+    # A mutation response that moves a lot out of the tracked statuses drops it.
+    backend.lots[2] = make_lot(2, WasteLotStatus.TOKENIZED, minutes=3)
+    replica.apply_lot(backend.lots[2])
+    assert replica.lot(2) is None
+
+    # Only the first sync is status-filtered; later ones see lots leave the scope through other actors.
+    backend.lots[1] = make_lot(1, WasteLotStatus.TOKENIZED, minutes=4)
+    backend.lots[4] = make_lot(4, WasteLotStatus.PENDING_VERIFICATION, minutes=4)
+    asyncio.run(replica.refresh())
+    assert backend.lot_status_filters[0] and backend.lot_status_filters[-1] is None
+    assert [lot.id for lot in replica.lots()] == [4]
+
+    # An authoritative ID list prunes lots the replica has not seen leave.
+    assert replica.retain_lots([2, 5]) == 1
+    assert replica.lots() == []
+
+
+def test_recycler_replica_tracks_only_lots_in_its_negotiations():
+    backend = FakeBackend()
+    backend.lots = {lot_id: make_lot(lot_id, WasteLotStatus.NEGOTIATING, minutes=lot_id) for lot_id in (1, 2, 3)}
+    backend.negotiations = {
+        1: make_negotiation(1, NegotiationStatus.OPEN, minutes=1),
+        2: make_negotiation(2, NegotiationStatus.OPEN, minutes=2, recycler_agent_id=99),
+    }
+    replica = MarketplaceReplica(backend, track_negotiations=True, recycler_agent_id=7)
+
+    asyncio.run(replica.refresh())
+    assert [lot.id for lot in replica.lots()] == [1]
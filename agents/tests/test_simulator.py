@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from aura_agents.simulator import SimulationConfig, VirtualClock, VirtualTimeLoop, simulate
+
+
+def _run(coro_factory):
+    clock = VirtualClock()
+    loop = VirtualTimeLoop(clock)
+    try:
+        return loop.run_until_complete(coro_factory(loop)), clock
+    finally:
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
+def test_idle_time_is_skipped_but_work_in_threads_is_waited_for():
+    async def scenario(loop):
+        started = loop.time()
+        await asyncio.sleep(3600)
+        slept = loop.time() - started
+        started = loop.time()
+        await asyncio.to_thread(time.sleep, 0.05)
+        return slept, loop.time() - started
+
+    wall = time.perf_counter()
+    (slept, threaded), clock = _run(scenario)
+    assert slept >= 3600
+    assert 0.05 <= threaded < 1.0  # no jump while the worker thread was busy
+    assert time.perf_counter() - wall < 2.0
+    assert clock.in_flight == 0
+
+
+def test_simulated_marketplace_trades_faster_than_real_time():
+    # Drives the backend app in process, so its dependencies must be importable.
+    pytest.importorskip("fastapi")
+    pytest.importorskip("sqlmodel")
+    report = simulate(
+        SimulationConfig(
+            producers=6,
+            recyclers=3,
+            compliance=1,
+            hours=1.0,
+            poll_interval_seconds=60,
+            matchmaking_interval_seconds=120,
+            lots_per_producer_hour=2,
+        )
+    )
+
+    assert report.agents == 10
+    assert report.simulated_seconds == pytest.approx(3600)
+    assert report.speedup > 10
+    (hour,) = report.hours
+    assert hour.requests > 100 and hour.server_errors == 0
+    assert hour.lots_created > 0
+    assert hour.negotiations_opened >= hour.negotiations_agreed > 0
+    assert 0 <= hour.convergence_seconds["p50"] <= 3600
+    assert hour.rows_added > 0 and hour.db_bytes > 0
+    assert report.rows_by_table["negotiation"] >= hour.negotiations_opened
+    assert "GET /lots" in hour.top_endpoints
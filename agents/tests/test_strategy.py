@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aura_agents.config import RecyclerAgentSettings
+from aura_agents.models import Negotiation, NegotiationStatus, OracleFeed, WasteLot, WasteLotStatus
+from aura_agents.policies import (
+    NegotiationAction,
+    decide_negotiation,
+    decide_negotiations,
+    lot_columns,
+    negotiation_columns,
+    reference_prices,
+)
+from aura_agents.strategy import CompiledStrategy, StrategyError, compile_strategy
+
+RULES = [
+    {
+        "when": "material_type == 'HDPE Regrind' and quantity_tons >= 10",
+        "max_price": "max_price + 60",
+        "offer": "floor + 15",
+    },
+    {
+        "when": "material_type in ('HDPE Regrind', 'PET Bales') and not floor > 300",
+        "max_price": "min(price, max_price)",
+    },
+    {
+        "when": "material_type not in ('Cullet Glass',)",
+        "max_price": "max_price - 50 if price > 2 * max_price else max_price",
+    },
+]
+MATERIALS = ["HDPE Regrind", "PET Bales", "Cullet Glass", "Copper Wire"]
+
+
+def _lot(index: int, rng: random.Random) -> WasteLot:
+    return WasteLot(
+        id=index,
+        producer_id=1,
+        material_type=rng.choice(MATERIALS),
+        quantity_tons=rng.choice([1.0, 10.0, 25.0]),
+        location="Akron, OH",
+        price_floor_usd_per_ton=rng.choice([None, 100.0, 350.0]),
+        status=WasteLotStatus.NEGOTIATING,
+    )
+
+
+def test_rules_evaluate_the_same_over_a_row_and_a_column():
+    strategy = CompiledStrategy(RULES)
+    rng = random.Random(3)
+    lots = [_lot(index, rng) for index in range(100)]
+    prices = np.asarray([rng.choice([np.nan, 150.0, 600.0]) for _ in lots])
+    columns = strategy.evaluate({**lot_columns(lots), "price": prices, "max_price": 250.0})
+
+    for index, lot in enumerate(lots):
+        row = strategy.evaluate({**lot_columns([lot]), "price": prices[index], "max_price": 250.0})
+        assert row.matched.tolist() == [columns.matched[index]]
+        np.testing.assert_array_equal(row.max_price, columns.max_price[index : index + 1])
+        np.testing.assert_array_equal(row.offer, columns.offer[index : index + 1])
+    assert not columns.matched[[lot.material_type == "Cullet Glass" for lot in lots]].any()
+
+
+def test_strategy_decisions_match_between_scalar_and_batch_policies():
+    rng = random.Random(11)
+    settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=250)
+    strategy = CompiledStrategy(RULES)
+    lots = [_lot(index, rng) for index in range(300)]
+    negotiations = [
+        Negotiation(
+            id=index,
+            waste_lot_id=lot.id,
+            producer_agent_id=1,
+            recycler_agent_id=2,
+            status=rng.choice(list(NegotiationStatus)),
+            producer_offer_usd_per_ton=rng.choice([None, 120.0, 280.0, 700.0]),
+            recycler_offer_usd_per_ton=rng.choice([None, 0.0, 240.0]),
+            agreed_price_usd_per_ton=None,
+        )
+        for index, lot in enumerate(lots)
+    ]
+
+    columns = negotiation_columns(negotiations)
+    decisions = decide_negotiations(*columns, settings, strategy=strategy, lots=lot_columns(lots))
+
+    assert decisions.payloads() == [
+        decide_negotiation(negotiation, settings, strategy=strategy, lot=lot)
+        for negotiation, lot in zip(negotiations, lots)
+    ]
+    assert set(decisions.actions.tolist()) == set(NegotiationAction)
+
+
+def test_bulk_rule_raises_the_cap_and_sets_the_opening_bid():
+    settings = RecyclerAgentSettings(owner_name="Recycler", max_price_usd_per_ton=200)
+    strategy = CompiledStrategy(RULES)
+    lot = WasteLot(
+        id=1,
+        producer_id=1,
+        material_type="HDPE Regrind",
+        quantity_tons=12,
+        location="Akron, OH",
+        price_floor_usd_per_ton=180,
+        status=WasteLotStatus.NEGOTIATING,
+    )
+
+    def negotiation(producer_offer: float | None) -> Negotiation:
+        return Negotiation(
+            id=1,
+            waste_lot_id=1,
+            producer_agent_id=1,
+            recycler_agent_id=2,
+            status=NegotiationStatus.OPEN,
+            producer_offer_usd_per_ton=producer_offer,
+            recycler_offer_usd_per_ton=None,
+            agreed_price_usd_per_ton=None,
+        )
+
+    opening = decide_negotiation(negotiation(None), settings, strategy=strategy, lot=lot)
+    assert opening["counter_offer_usd_per_ton"] == 195  # floor + 15, under the raised 260 cap
+    assert decide_negotiation(negotiation(255), settings, strategy=strategy, lot=lot)["agree"] is True
+    assert decide_negotiation(negotiation(255), settings)["agree"] is False
+
+
+def test_rules_see_the_reference_price_of_each_lot_material_from_the_oracle_feeds():
+    def feed(feed_id: int, payload: str) -> OracleFeed:
+        return OracleFeed(feed_id=feed_id, name=f"feed-{feed_id}", payload=payload, version=1, updated_at=0)
+
+    prices = reference_prices(
+        [
+            feed(1, '{"material_type": "HDPE Regrind", "usd_per_ton": 310}'),
+            feed(2, '{"material_type": "PET Bales"}'),
+            feed(3, "not json"),
+        ]
+    )
+    assert prices == {"hdpe regrind": 310.0}
+
+    rng = random.Random(7)
+    lots = [_lot(index, rng) for index in range(20)]
+    strategy = CompiledStrategy([{"when": "reference > 0", "max_price": "reference"}])
+    limits = strategy.evaluate({**lot_columns(lots, prices), "max_price": 250.0})
+    is_hdpe = np.asarray([lot.material_type == "HDPE Regrind" for lot in lots])
+    assert is_hdpe.any() and limits.matched.tolist() == is_hdpe.tolist()
+    assert set(limits.max_price[is_hdpe].tolist()) == {310.0}
+    assert "reference" not in lot_columns(lots)
+
+
+def test_compiled_rule_sets_are_cached_per_agent_and_version():
+    first = compile_strategy("agent-a", {"version": 1, "rules": RULES})
+    assert compile_strategy("agent-a", {"version": 1, "rules": RULES}) is first
+    assert compile_strategy("agent-a", {"version": 2, "rules": RULES}) is not first
+    assert compile_strategy("agent-b", {"aptos_address": "0x1"}) is None
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        [{"when": "__import__('os')"}],
+        [{"when": "material_type in ['PET']"}],
+        [{"offer": "price."}],
+        [{"bid": 1}],
+        {},
+        [{"offer": "material_type"}],
+        [{"when": "('a' * 100000) * 100000 == ''"}],
+        [{"when": "material_type > 5"}],
+        [{"when": " + ".join(["1"] * 2000)}],
+        [{"offer": "+".join(["1"] * 1000)}],
+        [{"when": "(" * 500 + "1" + ")" * 500}],
+    ],
+)
+def test_invalid_rules_are_rejected(rules):
+    with pytest.raises(StrategyError):
+        CompiledStrategy(rules)
+
+
+def test_rows_the_rules_fail_on_are_left_unmatched_over_scalars_and_columns():
+    strategy = CompiledStrategy([{"offer": "max_price / (quantity_tons - 12)"}])
+    row = strategy.evaluate({"quantity_tons": 12.0, "max_price": 200.0})
+    assert row.failed and not row.matched
+    column = strategy.evaluate({"quantity_tons": np.array([12.0, 14.0]), "max_price": 200.0})
+    assert column.failed.tolist() == [True, False]
+    assert column.matched.tolist() == [False, True] and column.offer[1] == 100
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """The backend's `app.services.strategy`, loaded on its own (it only needs the standard library)."""
+    path = Path(__file__).resolve().parents[2] / "backend" / "app" / "services" / "strategy.py"
+    spec = importlib.util.spec_from_file_location("backend_strategy", path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, module)  # for its dataclasses
+    spec.loader.exec_module(module)
+    return module
+
+
+DIVIDING_RULES = RULES[:1] + [
+    {"when": "quantity_tons > 0 and price / quantity_tons > 40", "max_price": "max_price * 1e308 * 10"},
+    {"when": "floor > 0", "offer": "reference / (quantity_tons - 10) if quantity_tons > 5 else floor / 0"},
+    {"when": "not material_type == 'Cullet Glass'", "offer": "min(price, floor - floor / quantity_tons)"},
+]
+
+
+@pytest.mark.parametrize("rules", [RULES, DIVIDING_RULES], ids=["vectorized", "row-by-row"])
+def test_rules_evaluate_like_the_backend_on_identical_rows(rules, backend):
+    rng = random.Random(5)
+    rows = [
+        {
+            "material_type": rng.choice(MATERIALS),
+            "quantity_tons": rng.choice([0.0, 1.0, 10.0, 25.0]),
+            "floor": rng.choice([np.nan, 0.0, 100.0]),
+            "price": rng.choice([np.nan, 150.0, 600.0]),
+            "reference": rng.choice([np.nan, 0.0, 180.0]),
+            "max_price": 250.0,
+            "target_price": 200.0,
+        }
+        for _ in range(400)
+    ]
+    columns = {name: np.asarray([row[name] for row in rows]) for name in rows[0]}
+    limits = CompiledStrategy(rules).evaluate(columns)
+    expected = backend.CompiledStrategy(rules)
+
+    for index, row in enumerate(rows):
+        try:
+            decision = expected.decide(row)
+        except backend.StrategyError:
+            assert limits.failed[index] and not limits.matched[index]
+            continue
+        assert not limits.failed[index]
+        assert limits.matched[index] == (decision is not None)
+        if decision is not None:
+            np.testing.assert_array_equal(
+                [limits.max_price[index], limits.offer[index]], [decision.max_price, decision.offer]
+            )
+    assert limits.matched.any() and limits.failed.any() == (rules is DIVIDING_RULES)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from aura_agents import metrics, tracing
+from aura_agents.base import BaseAgent
+from aura_agents.client import AuraBackendClient
+
+
+async def _capture_server(received: list[str]) -> asyncio.AbstractServer:
+    """Answers every request with 404 and records its `traceparent` header."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readline()
+        while line := (await reader.readline()).strip():
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "traceparent":
+                received.append(value.strip())
+        writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_agent_steps_propagate_trace_context_to_backend_calls():
+    exporter = tracing.MemoryExporter()
+    received: list[str] = []
+
+    class LookupAgent(BaseAgent):
+        async def step(self) -> int:
+            try:
+                await self.client.get_lot(7)
+            except httpx.HTTPStatusError:
+                pass
+            self.stop()
+            return 1
+
+    async def scenario() -> None:
+        server = await _capture_server(received)
+        client = AuraBackendClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        await LookupAgent("lookup-agent", client, poll_interval=0.01).run_forever()
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    tracing.configure(1.0, exporter)
+    try:
+        asyncio.run(scenario())
+    finally:
+        tracing.configure(0.0, None)
+
+    call, step = exporter.spans
+    assert step.name == "agent.step" and step.parent_span_id is None
+    assert step.attributes == {"agent": "lookup-agent", "items": 1}
+    assert call.name == "GET /lots/{id}" and call.kind == "client"
+    assert call.parent_span_id == step.span_id and call.trace_id == step.trace_id
+    assert call.attributes["http.status_code"] == 404
+    assert received == [call.traceparent]
+    assert call.traceparent.endswith("-01")
+
+
+def test_unsampled_roots_still_propagate_but_are_not_exported():
+    exporter = tracing.MemoryExporter()
+    tracing.configure(0.0, exporter)
+    try:
+        with tracing.span("agent.step") as root:
+            child = tracing.start("GET /lots")
+            tracing.finish(child)
+    finally:
+        tracing.configure(0.0, None)
+    assert not root.sampled and child.traceparent.endswith("-00")
+    assert child.trace_id == root.trace_id
+    assert exporter.spans == []
+
+
+def test_calls_failing_in_transport_finish_their_span_and_record_latency():
+    exporter = tracing.MemoryExporter()
+
+    async def scenario() -> None:
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()  # nothing listens on `port` any more
+        client = AuraBackendClient(f"http://127.0.0.1:{port}")
+        with pytest.raises(httpx.ConnectError):
+            await client.get_lot(5)
+        await client.close()
+
+    before = metrics.HTTP_SECONDS.count("GET", "/lots/{id}", "error")
+    tracing.configure(1.0, exporter)
+    try:
+        asyncio.run(scenario())
+    finally:
+        tracing.configure(0.0, None)
+
+    (call,) = exporter.spans
+    assert call.name == "GET /lots/{id}" and call.status == "error" and call.end_ns is not None
+    assert call.attributes["exception.type"] == "ConnectError"
+    assert metrics.HTTP_SECONDS.count("GET", "/lots/{id}", "error") == before + 1
@@ -0,0 +1,208 @@
+"""Operational commands for the Aura backend.
+
+Run from the ``backend/`` directory, e.g. ``python -m app.cli export --out exports``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+
+def _init_db(args: argparse.Namespace) -> None:
+    from .coordination import setup_lock
+    from .db import init_db, schema_fingerprint
+
+    with setup_lock():
+        changed = init_db(force=args.force)
+    print(f"Schema {schema_fingerprint()} {'applied' if changed else 'already current'}")
+
+
+def _seed(args: argparse.Namespace) -> None:
+    from .coordination import setup_lock
+    from .db import init_db
+    from .seed import seed_initial_data
+
+    with setup_lock():
+        init_db()
+        seeded = seed_initial_data()
+    print("Seeded demo data" if seeded else "Database already has data; nothing seeded")
+
+
+def _serve(args: argparse.Namespace) -> None:
+    # Settings are read from the environment on first import, and worker
+    # processes inherit it, so configure before importing anything from the app.
+    if args.db_connections is not None:
+        os.environ["AURA_DB_POOL_SIZE"] = str(max(1, args.db_connections // args.workers))
+        os.environ["AURA_DB_MAX_OVERFLOW"] = "0"
+    if args.workers > 1:
+        # Readers in one worker must not wait on a writer in another.
+        os.environ.setdefault("AURA_SQLITE_JOURNAL_MODE", "WAL")
+
+    import uvicorn
+
+    from .config import get_settings
+    from .coordination import setup_lock
+    from .db import init_db
+
+    if get_settings().auto_migrate:
+        # Migrate and seed once here rather than having every worker queue on the setup lock.
+        with setup_lock():
+            if init_db():
+                from .seed import seed_initial_data
+
+                seed_initial_data()
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        access_log=not args.no_access_log,
+    )
+
+
+def _export(args: argparse.Namespace) -> None:
+    from .services.export import MarketplaceExporter
+
+    exporter = MarketplaceExporter(batch_size=args.batch_size)
+    written = exporter.write_parquet(args.out, names=args.table or None)
+    for name, path in written.items():
+        print(f"{name}: {path}")
+
+
+def _rollups(args: argparse.Namespace) -> None:
+    from .db import init_db, session_scope
+    from .services import rollups
+
+    init_db()
+    with session_scope() as session:
+        if args.check:
+            problems = rollups.verify(session)
+            for problem in problems:
+                print(problem)
+            print(f"{len(problems)} mismatched rollup value(s)")
+            raise SystemExit(1 if problems else 0)
+        print(f"Rebuilt {rollups.rebuild(session)} rollup group(s)")
+
+
+def _composition(args: argparse.Namespace) -> None:
+    from .db import init_db, session_scope
+    from .services import composition
+
+    init_db()
+    with session_scope() as session:
+        print(f"Indexed {composition.rebuild(session)} composition reading(s)")
+
+
+def _anchor(args: argparse.Namespace) -> None:
+    from .db import init_db
+    from .services.anchoring import AnchoringService
+    from .services.aptos import AptosTokenService
+
+    init_db()
+    service = AnchoringService(AptosTokenService(), max_leaves=args.max_leaves)
+    anchored = 0
+    while batch := service.flush():
+        print(f"batch {batch.id}: {batch.leaf_count} leaf(s), root {batch.merkle_root}, tx {batch.transaction_hash}")
+        anchored += 1
+    print(f"Anchored {anchored} batch(es)")
+
+
+def _settle(args: argparse.Namespace) -> None:
+    from .db import init_db
+    from .services.aptos import AptosTokenService
+    from .services.settlement import SettlementEngine
+
+    init_db()
+    for settlement in SettlementEngine(AptosTokenService()).run_once():
+        print(
+            f"settlement {settlement.id}: producer {settlement.producer_id} <- agent {settlement.recycler_agent_id}, "
+            f"{settlement.negotiation_count} deal(s), ${settlement.amount_usd:.2f}, {settlement.status.value}"
+        )
+
+
+def _reindex(args: argparse.Namespace) -> None:
+    from .config import get_settings
+    from .db import init_db
+    from .services.chain import get_chain_backend
+    from .services.indexer import ChainIndexer
+
+    init_db()
+    chain_indexer = ChainIndexer(get_chain_backend(), batch_size=args.batch_size or get_settings().indexer_batch_size)
+    events = chain_indexer.reindex(args.from_version)
+    metrics = chain_indexer.metrics()
+    print(f"Indexed {events} event(s); checkpoint at version {metrics['checkpoint_version']}, lag {metrics['lag_versions']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Aura backend operations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init-db", help="Create or migrate the schema and record its version")
+    init.add_argument("--force", action="store_true", help="Re-run DDL even if the recorded version matches")
+    init.set_defaults(handler=_init_db)
+
+    seed = commands.add_parser("seed", help="Load the bundled demo data into an empty database")
+    seed.set_defaults(handler=_seed)
+
+    serve = commands.add_parser("serve", help="Run the API, optionally as several worker processes")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (defaults to the CPU count)"
+    )
+    serve.add_argument(
+        "--db-connections",
+        type=int,
+        help="Total database connections to split evenly across workers (defaults to AURA_DB_POOL_SIZE per worker)",
+    )
+    serve.add_argument("--log-level", default="info")
+    serve.add_argument("--no-access-log", action="store_true", help="Skip per-request access logging")
+    serve.set_defaults(handler=_serve)
+
+    export = commands.add_parser("export", help="Write marketplace tables to Parquet files")
+    export.add_argument("--out", type=Path, required=True, help="Directory to write <table>.parquet files into")
+    export.add_argument(
+        "--table",
+        action="append",
+        choices=["lots", "negotiations", "tokens", "proofs"],
+        help="Table to export (repeatable); defaults to all",
+    )
+    export.add_argument("--batch-size", type=int, default=50_000, help="Rows per record batch")
+    export.set_defaults(handler=_export)
+
+    rebuild = commands.add_parser("rebuild-rollups", help="Recompute price rollups from source tables")
+    rebuild.add_argument(
+        "--check", action="store_true", help="Only compare stored rollups against a full recomputation"
+    )
+    rebuild.set_defaults(handler=_rollups)
+
+    reindex_composition = commands.add_parser(
+        "rebuild-composition-index", help="Re-extract indexed composition readings from every lot"
+    )
+    reindex_composition.set_defaults(handler=_composition)
+
+    anchor = commands.add_parser("anchor", help="Anchor pending proof and verification leaves now")
+    anchor.add_argument("--max-leaves", type=int, default=4096, help="Leaves per Merkle batch")
+    anchor.set_defaults(handler=_anchor)
+
+    settle = commands.add_parser("settle", help="Net agreed negotiations into escrow settlements now")
+    settle.set_defaults(handler=_settle)
+
+    reindex = commands.add_parser("reindex", help="Rewind the chain event indexer and index up to the chain head")
+    reindex.add_argument("--from-version", type=int, default=0, help="Ledger version to start reindexing from")
+    reindex.add_argument("--batch-size", type=int, help="Events per batch (defaults to AURA_INDEXER_BATCH_SIZE)")
+    reindex.set_defaults(handler=_reindex)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
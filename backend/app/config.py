@@ -13,6 +13,38 @@ class Settings(BaseModel):
         "AURA_DATABASE_URL",
         f"sqlite:///{(Path(__file__).resolve().parent.parent / 'data' / 'aura.db').as_posix()}"
     )
+    db_pool_size: int = int(os.getenv("AURA_DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("AURA_DB_MAX_OVERFLOW", "10"))
+    sqlite_journal_mode: str | None = os.getenv("AURA_SQLITE_JOURNAL_MODE")
+    sqlite_busy_timeout_seconds: float = float(os.getenv("AURA_SQLITE_BUSY_TIMEOUT_SECONDS", "30"))
+    lock_file: str | None = os.getenv("AURA_LOCK_FILE")
+    auto_migrate: bool = os.getenv("AURA_AUTO_MIGRATE", "true").lower() not in {"0", "false", "no"}
+    expiry_enabled: bool = os.getenv("AURA_EXPIRY_ENABLED", "true").lower() not in {"0", "false", "no"}
+    expiry_tick_seconds: float = float(os.getenv("AURA_EXPIRY_TICK_SECONDS", "5"))
+    mint_queue_enabled: bool = os.getenv("AURA_MINT_QUEUE_ENABLED", "true").lower() not in {"0", "false", "no"}
+    mint_batch_size: int = int(os.getenv("AURA_MINT_BATCH_SIZE", "64"))
+    mint_batch_wait_seconds: float = float(os.getenv("AURA_MINT_BATCH_WAIT_SECONDS", "0.25"))
+    anchoring_enabled: bool = os.getenv("AURA_ANCHORING_ENABLED", "true").lower() not in {"0", "false", "no"}
+    anchoring_window_seconds: float = float(os.getenv("AURA_ANCHORING_WINDOW_SECONDS", "60"))
+    settlement_enabled: bool = os.getenv("AURA_SETTLEMENT_ENABLED", "true").lower() not in {"0", "false", "no"}
+    settlement_window_seconds: float = float(os.getenv("AURA_SETTLEMENT_WINDOW_SECONDS", "300"))
+    oracle_enabled: bool = os.getenv("AURA_ORACLE_ENABLED", "true").lower() not in {"0", "false", "no"}
+    oracle_poll_seconds: float = float(os.getenv("AURA_ORACLE_POLL_SECONDS", "5"))
+    indexer_enabled: bool = os.getenv("AURA_INDEXER_ENABLED", "true").lower() not in {"0", "false", "no"}
+    indexer_poll_seconds: float = float(os.getenv("AURA_INDEXER_POLL_SECONDS", "2"))
+    indexer_batch_size: int = int(os.getenv("AURA_INDEXER_BATCH_SIZE", "500"))
+    query_repeat_threshold: int = int(os.getenv("AURA_QUERY_REPEAT_THRESHOLD", "5"))
+    trace_sample_rate: float = float(os.getenv("AURA_TRACE_SAMPLE_RATE", "0"))
+    trace_file: str | None = os.getenv("AURA_TRACE_FILE")
+    profile_enabled: bool = os.getenv("AURA_PROFILE_ENABLED", "false").lower() in {"1", "true", "yes"}
+    profile_dir: str = os.getenv("AURA_PROFILE_DIR", "profiles")
+    profile_window_seconds: float = float(os.getenv("AURA_PROFILE_WINDOW_SECONDS", "60"))
+    profile_interval_ms: float = float(os.getenv("AURA_PROFILE_INTERVAL_MS", "5"))
+    chain_backend: str = os.getenv("AURA_CHAIN_BACKEND", "simulated")
+    chain_seed: int = int(os.getenv("AURA_CHAIN_SEED", "0"))
+    chain_block_time_seconds: float = float(os.getenv("AURA_CHAIN_BLOCK_TIME_SECONDS", "1"))
+    chain_realtime: bool = os.getenv("AURA_CHAIN_REALTIME", "false").lower() in {"1", "true", "yes"}
+    chain_failure_rate: float = float(os.getenv("AURA_CHAIN_FAILURE_RATE", "0"))
 
 
 @lru_cache
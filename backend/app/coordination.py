@@ -0,0 +1,122 @@
+"""Coordination between API worker processes that share one database.
+
+Under `python -m app.cli serve --workers N` (or any multi-process server)
+every worker runs the FastAPI startup hooks. Two advisory file locks keep
+that safe:
+
+* `setup_lock` serialises schema creation and seeding, so only the first
+  worker to get the lock runs DDL and inserts demo data; the rest find the
+  recorded schema fingerprint current and skip both.
+* `acquire_leadership` is a non-blocking lock held for the life of the
+  process. The one worker holding it runs the singleton background workers
+  (expiry, anchoring, settlement, indexing) that must not run twice against
+  the same rows, and the mint queue, because the simulated chain lives in
+  process memory and every chain write must land on the same chain. The
+  others serve requests, queue mints for the leader and refuse synchronous
+  chain writes.
+
+The locks live next to the SQLite file (or at `AURA_LOCK_FILE`), so they
+coordinate processes on one host, which is the only way to share a SQLite
+database. Platforms without `fcntl` run unlocked, as a single worker.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import socket
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+from sqlalchemy.engine import make_url
+
+from .config import get_settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger("aura.coordination")
+
+_STARTED_AT = time.time()
+_leader_handle: IO[str] | None = None
+
+
+def lock_path(suffix: str = "setup") -> Path:
+    """`<database>.<suffix>.lock` beside a SQLite file, else under the temp dir keyed by the database URL."""
+    settings = get_settings()
+    if settings.lock_file:
+        return Path(f"{settings.lock_file}.{suffix}")
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        return Path(f"{url.database}.{suffix}.lock")
+    digest = hashlib.sha256(settings.database_url.encode()).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"aura-{digest}.{suffix}.lock"
+
+
+def _open(path: Path) -> IO[str]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path.open("a+")
+
+
+@contextmanager
+def setup_lock() -> Iterator[None]:
+    """Block until this process is the only one creating the schema or seeding."""
+    if fcntl is None:
+        yield
+        return
+    with _open(lock_path("setup")) as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def acquire_leadership() -> bool:
+    """Try to become the process that runs singleton background workers; never blocks."""
+    global _leader_handle
+    if _leader_handle is not None:
+        return True
+    if fcntl is None:
+        return True
+    handle = _open(lock_path("leader"))
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return False
+    handle.seek(0)
+    handle.truncate()
+    handle.write(f"{os.getpid()}\n")
+    handle.flush()
+    _leader_handle = handle
+    return True
+
+
+def release_leadership() -> None:
+    global _leader_handle
+    if _leader_handle is not None:
+        fcntl.flock(_leader_handle, fcntl.LOCK_UN)
+        _leader_handle.close()
+        _leader_handle = None
+
+
+def is_leader() -> bool:
+    return _leader_handle is not None or fcntl is None
+
+
+def identity() -> dict[str, Any]:
+    """Which worker process answered: reported by `/health` and as `aura_process_info` in `/metrics`."""
+    return {
+        "pid": os.getpid(),
+        "host": socket.gethostname(),
+        "role": "leader" if is_leader() else "follower",
+        "started_at": _STARTED_AT,
+    }
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, TypeVar
 import uuid
 
 from fastapi import HTTPException, status
-from sqlmodel import Session, select
+from sqlalchemy import or_
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import Session, SQLModel, func, select
 
 from .db_models import (
     Agent,
+    AnchorLeaf,
+    MintJob,
+    MintJobStatus,
     Negotiation,
     NegotiationStatus,
     Producer,
+    Settlement,
+    SettlementStatus,
     WasteLot,
     WasteLotStatus,
     WasteLotToken,
@@ -19,13 +27,24 @@ from .db_models import (
 )
 from .models import (
     AgentCreate,
+    NegotiationRead,
     ProofValidationDecision,
     ProducerCreate,
     TokenMintRequest,
     UpcyclingProofCreate,
     WasteLotCreate,
+    WasteLotRead,
     WasteLotVerificationCreate,
 )
+from .services import anchoring, composition, expiry, rollups
+
+T = TypeVar("T")
+
+MAX_TRANSITION_ATTEMPTS = 3
+# Lots waiting on their producer: verification to request or approve, or a token to mint.
+ACTIONABLE_LOT_STATUSES = (WasteLotStatus.PENDING_VERIFICATION, WasteLotStatus.VERIFIED)
+# Mint jobs still to reach the chain or the lot; their lots stay out of matchmaking until recorded.
+PENDING_MINT_STATUSES = (MintJobStatus.QUEUED, MintJobStatus.SUBMITTED)
 
 
 def create_producer(session: Session, payload: ProducerCreate) -> Producer:
@@ -109,18 +128,76 @@ def create_waste_lot(session: Session, payload: WasteLotCreate) -> WasteLot:
     lot.status = WasteLotStatus.PENDING_VERIFICATION
 
     session.add(lot)
+    rollups.record_lot(session, lot)
+    composition.record_lot(session, lot)
     session.commit()
     session.refresh(lot)
     return lot
 
 
-def list_waste_lots(session: Session, status_filter: WasteLotStatus | None = None) -> list[WasteLot]:
+def list_waste_lots(
+    session: Session,
+    status_filter: list[WasteLotStatus] | None = None,
+    producer_id: int | None = None,
+    updated_since: datetime | None = None,
+    requirements: list[composition.Requirement] | None = None,
+    recycler_agent_id: int | None = None,
+) -> list[WasteLot]:
     query = select(WasteLot)
     if status_filter:
-        query = query.where(WasteLot.status == status_filter)
+        query = query.where(WasteLot.status.in_(status_filter))
+    if producer_id is not None:
+        query = query.where(WasteLot.producer_id == producer_id)
+    changed = WasteLot.updated_at >= updated_since if updated_since is not None else None
+    if recycler_agent_id is not None:
+        negotiated = select(Negotiation.waste_lot_id).where(Negotiation.recycler_agent_id == recycler_agent_id)
+        query = query.where(WasteLot.id.in_(negotiated))
+        if changed is not None:
+            # Opening a negotiation on a lot that is already NEGOTIATING does not touch the lot row,
+            # so a lot also counts as changed when its negotiation with this recycler did.
+            changed = or_(changed, WasteLot.id.in_(negotiated.where(Negotiation.updated_at >= updated_since)))
+    if changed is not None:
+        query = query.where(changed)
+    if requirements:
+        query = query.where(*composition.filters(requirements))
     return session.exec(query.order_by(WasteLot.created_at.desc())).all()
 
 
+def producer_lot_counts(session: Session, producer_id: int) -> dict[WasteLotStatus, int]:
+    """Lots per status for one producer, counted off `ix_wastelot_producer_status`."""
+    rows = session.exec(
+        select(WasteLot.status, func.count())
+        .where(WasteLot.producer_id == producer_id)
+        .group_by(WasteLot.status)
+    ).all()
+    return {WasteLotStatus(lot_status): count for lot_status, count in rows}
+
+
+def producer_lot_ids(session: Session, producer_id: int, statuses: Iterable[WasteLotStatus]) -> list[int]:
+    return list(
+        session.exec(
+            select(WasteLot.id)
+            .where(WasteLot.producer_id == producer_id, WasteLot.status.in_(list(statuses)))
+            .order_by(WasteLot.id)
+        ).all()
+    )
+
+
+def list_producer_lots(
+    session: Session,
+    producer_id: int,
+    *,
+    status_filter: list[WasteLotStatus] | None = None,
+    limit: int,
+    offset: int = 0,
+) -> list[WasteLot]:
+    """One page of a producer's lots, newest first."""
+    query = select(WasteLot).where(WasteLot.producer_id == producer_id)
+    if status_filter:
+        query = query.where(WasteLot.status.in_(status_filter))
+    return session.exec(query.order_by(WasteLot.id.desc()).limit(limit).offset(offset)).all()
+
+
 def get_waste_lot(session: Session, lot_id: int) -> WasteLot:
     lot = session.get(WasteLot, lot_id)
     if not lot:
@@ -143,10 +220,14 @@ def create_verification(
         verified_at=datetime.utcnow() if payload.mark_verified else None,
     )
     session.add(verification)
+    if payload.sensor_checksum:
+        session.flush()
+        anchoring.record_leaf(session, anchoring.VERIFICATION, verification.id, lot.id, payload.sensor_checksum)
 
     if payload.mark_verified:
         lot.status = WasteLotStatus.VERIFIED
-        session.add(lot)
+    lot.updated_at = datetime.utcnow()
+    session.add(lot)
 
     session.commit()
     session.refresh(verification)
@@ -166,6 +247,7 @@ def mark_lot_verified(session: Session, lot: WasteLot, verifier_notes: str | Non
         latest_verification.verifier_notes = verifier_notes
 
     lot.status = WasteLotStatus.VERIFIED
+    lot.updated_at = datetime.utcnow()
     session.add(latest_verification)
     session.add(lot)
     session.commit()
@@ -181,6 +263,45 @@ def get_latest_verification(session: Session, lot_id: int) -> WasteLotVerificati
     ).first()
 
 
+def latest_verifications_for_lots(session: Session, lot_ids: list[int]) -> dict[int, WasteLotVerification]:
+    latest: dict[int, WasteLotVerification] = {}
+    for chunk in _chunked(lot_ids):
+        verifications = session.exec(
+            select(WasteLotVerification)
+            .where(WasteLotVerification.waste_lot_id.in_(chunk))
+            .order_by(WasteLotVerification.requested_at.desc())
+        ).all()
+        for verification in verifications:
+            latest.setdefault(verification.waste_lot_id, verification)
+    return latest
+
+
+def tokens_for_lots(session: Session, lot_ids: list[int]) -> dict[int, WasteLotToken]:
+    tokens: dict[int, WasteLotToken] = {}
+    for chunk in _chunked(lot_ids):
+        for token in session.exec(select(WasteLotToken).where(WasteLotToken.waste_lot_id.in_(chunk))).all():
+            tokens[token.waste_lot_id] = token
+    return tokens
+
+
+def proofs_for_lots(session: Session, lot_ids: list[int]) -> dict[int, list[UpcyclingProof]]:
+    proofs: dict[int, list[UpcyclingProof]] = {}
+    for chunk in _chunked(lot_ids):
+        rows = session.exec(
+            select(UpcyclingProof)
+            .where(UpcyclingProof.waste_lot_id.in_(chunk))
+            .order_by(UpcyclingProof.submitted_at.desc())
+        ).all()
+        for proof in rows:
+            proofs.setdefault(proof.waste_lot_id, []).append(proof)
+    return proofs
+
+
+def _chunked(ids: list[int], size: int = 500):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
 def record_token_mint(
     session: Session,
     lot: WasteLot,
@@ -209,6 +330,7 @@ def record_token_mint(
         transaction_hash=transaction_hash,
     )
     lot.status = WasteLotStatus.TOKENIZED
+    lot.updated_at = datetime.utcnow()
 
     session.add(token)
     session.add(lot)
@@ -217,6 +339,41 @@ def record_token_mint(
     return token
 
 
+def enqueue_mint(session: Session, lot: WasteLot, payload: TokenMintRequest) -> MintJob:
+    """Queue a server-side mint, reusing the lot's pending job if one exists."""
+    if lot.status not in {WasteLotStatus.VERIFIED, WasteLotStatus.TOKENIZED}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Waste lot must be verified before tokenization",
+        )
+    if session.exec(select(WasteLotToken.id).where(WasteLotToken.waste_lot_id == lot.id)).first():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Waste lot already tokenized")
+
+    pending = session.exec(
+        select(MintJob).where(MintJob.waste_lot_id == lot.id).where(MintJob.status.in_(PENDING_MINT_STATUSES))
+    ).first()
+    if pending:
+        return pending
+
+    job = MintJob(
+        waste_lot_id=lot.id,
+        token_name=payload.token_name,
+        token_symbol=payload.token_symbol,
+        supply=payload.supply,
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_mint_job(session: Session, job_id: int) -> MintJob:
+    job = session.get(MintJob, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mint job not found")
+    return job
+
+
 def create_negotiation(
     session: Session,
     lot: WasteLot,
@@ -249,16 +406,42 @@ def create_negotiation(
     session.add(negotiation)
     session.commit()
     session.refresh(negotiation)
+    expiry.schedule(negotiation)
     return negotiation
 
 
-def list_negotiations(session: Session, status_filter: NegotiationStatus | None = None) -> list[Negotiation]:
+def list_negotiations(
+    session: Session,
+    status_filter: NegotiationStatus | None = None,
+    recycler_agent_id: int | None = None,
+    updated_since: datetime | None = None,
+) -> list[Negotiation]:
     query = select(Negotiation)
     if status_filter:
         query = query.where(Negotiation.status == status_filter)
+    if recycler_agent_id is not None:
+        query = query.where(Negotiation.recycler_agent_id == recycler_agent_id)
+    if updated_since is not None:
+        query = query.where(Negotiation.updated_at >= updated_since)
     return session.exec(query.order_by(Negotiation.created_at.desc())).all()
 
 
+def list_settlements(
+    session: Session,
+    producer_id: int | None = None,
+    recycler_agent_id: int | None = None,
+    status_filter: SettlementStatus | None = None,
+) -> list[Settlement]:
+    query = select(Settlement)
+    if producer_id is not None:
+        query = query.where(Settlement.producer_id == producer_id)
+    if recycler_agent_id is not None:
+        query = query.where(Settlement.recycler_agent_id == recycler_agent_id)
+    if status_filter:
+        query = query.where(Settlement.status == status_filter)
+    return session.exec(query.order_by(Settlement.created_at.desc())).all()
+
+
 def get_negotiation(session: Session, negotiation_id: int) -> Negotiation:
     negotiation = session.get(Negotiation, negotiation_id)
     if not negotiation:
@@ -266,43 +449,70 @@ def get_negotiation(session: Session, negotiation_id: int) -> Negotiation:
     return negotiation
 
 
+_NEGOTIABLE_LOT_STATUSES = {WasteLotStatus.VERIFIED, WasteLotStatus.TOKENIZED, WasteLotStatus.NEGOTIATING}
+
+
 def finalize_negotiation(
     session: Session,
     negotiation: Negotiation,
     agree: bool,
     counter_offer: float | None = None,
+    expected_version: int | None = None,
 ) -> Negotiation:
-    lot = session.get(WasteLot, negotiation.waste_lot_id)
-    if not lot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Waste lot not found")
-
-    if negotiation.status in {NegotiationStatus.AGREED, NegotiationStatus.SETTLED}:
+    def apply() -> Negotiation:
+        lot = session.get(WasteLot, negotiation.waste_lot_id)
+        if not lot:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Waste lot not found")
+
+        if expected_version is not None and negotiation.version != expected_version:
+            raise _version_conflict("Negotiation is no longer at the expected version", negotiation, lot)
+
+        if negotiation.status in {NegotiationStatus.AGREED, NegotiationStatus.SETTLED}:
+            return negotiation
+        if negotiation.status == NegotiationStatus.EXPIRED:
+            raise _version_conflict("Negotiation has expired", negotiation, lot)
+        # Re-checked on every attempt: a retry after a conflict may find the lot agreed through another negotiation.
+        if lot.status not in _NEGOTIABLE_LOT_STATUSES:
+            raise _version_conflict(f"Waste lot is {lot.status.value} and no longer negotiable", negotiation, lot)
+
+        if agree:
+            negotiation.status = NegotiationStatus.AGREED
+            if counter_offer is not None:
+                negotiation.agreed_price_usd_per_ton = counter_offer
+            elif negotiation.recycler_offer_usd_per_ton is not None:
+                negotiation.agreed_price_usd_per_ton = negotiation.recycler_offer_usd_per_ton
+            elif negotiation.producer_offer_usd_per_ton is not None:
+                negotiation.agreed_price_usd_per_ton = negotiation.producer_offer_usd_per_ton
+            negotiation.agreed_at = datetime.utcnow()
+            lot.status = WasteLotStatus.SETTLED
+            lot.updated_at = datetime.utcnow()
+            rollups.record_agreement(session, lot, negotiation)
+        else:
+            negotiation.status = NegotiationStatus.COUNTER
+            negotiation.recycler_offer_usd_per_ton = counter_offer or negotiation.recycler_offer_usd_per_ton
+            negotiation.expires_at = datetime.utcnow() + timedelta(hours=24)
+            if lot.status != WasteLotStatus.NEGOTIATING:
+                lot.status = WasteLotStatus.NEGOTIATING
+            lot.updated_at = datetime.utcnow()
+
+        negotiation.updated_at = datetime.utcnow()
+        session.add(negotiation)
+        session.add(lot)
+        session.commit()
+        session.refresh(negotiation)
+        expiry.schedule(negotiation)
         return negotiation
 
-    if agree:
-        negotiation.status = NegotiationStatus.AGREED
-        if counter_offer is not None:
-            negotiation.agreed_price_usd_per_ton = counter_offer
-        elif negotiation.recycler_offer_usd_per_ton is not None:
-            negotiation.agreed_price_usd_per_ton = negotiation.recycler_offer_usd_per_ton
-        elif negotiation.producer_offer_usd_per_ton is not None:
-            negotiation.agreed_price_usd_per_ton = negotiation.producer_offer_usd_per_ton
-        lot.status = WasteLotStatus.SETTLED
-        lot.updated_at = datetime.utcnow()
-    else:
-        negotiation.status = NegotiationStatus.COUNTER
-        negotiation.recycler_offer_usd_per_ton = counter_offer or negotiation.recycler_offer_usd_per_ton
-        negotiation.expires_at = datetime.utcnow() + timedelta(hours=24)
-        if lot.status != WasteLotStatus.NEGOTIATING:
-            lot.status = WasteLotStatus.NEGOTIATING
-        lot.updated_at = datetime.utcnow()
-
-    negotiation.updated_at = datetime.utcnow()
-    session.add(negotiation)
-    session.add(lot)
-    session.commit()
-    session.refresh(negotiation)
-    return negotiation
+    return _retry_on_conflict(
+        session,
+        apply,
+        reload=negotiation,
+        conflict=lambda: _version_conflict(
+            "Negotiation was modified concurrently",
+            negotiation,
+            session.get(WasteLot, negotiation.waste_lot_id),
+        ),
+    )
 
 
 def create_upcycling_proof(
@@ -351,33 +561,117 @@ def validate_upcycling_proof(
     proof: UpcyclingProof,
     decision: ProofValidationDecision,
     burn_transaction_hash: str | None = None,
+    defer_retirement: bool = False,
 ) -> UpcyclingProof:
-    lot = session.get(WasteLot, proof.waste_lot_id)
-    if not lot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Waste lot not found")
+    """Apply a validation decision.
+
+    With `defer_retirement` the token is marked retired now and its
+    `retire_lot` call rides along with the anchor transaction of the proof's
+    Merkle batch, which fills in `retire_transaction_hash`.
+    """
+
+    def apply() -> UpcyclingProof:
+        lot = session.get(WasteLot, proof.waste_lot_id)
+        if not lot:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Waste lot not found")
+
+        proof.ai_confidence = decision.ai_confidence
+        proof.processing_notes = decision.notes or proof.processing_notes
+        proof.validated_at = datetime.utcnow()
+
+        if decision.approve:
+            proof.status = "validated"
+            proof.certificate_uri = str(decision.certificate_uri) if decision.certificate_uri else proof.certificate_uri
+            lot.status = WasteLotStatus.RETIRED
+            lot.updated_at = datetime.utcnow()
+
+            token = session.exec(select(WasteLotToken).where(WasteLotToken.waste_lot_id == lot.id)).first()
+            if token:
+                token.retired_at = datetime.utcnow()
+                token.retire_transaction_hash = burn_transaction_hash
+                session.add(token)
+            already_anchored = session.exec(
+                select(AnchorLeaf.id).where(AnchorLeaf.kind == anchoring.PROOF, AnchorLeaf.source_id == proof.id)
+            ).first()
+            if not already_anchored:
+                anchoring.record_leaf(
+                    session,
+                    anchoring.PROOF,
+                    proof.id,
+                    lot.id,
+                    proof.sensor_checksum,
+                    extra=proof.certificate_uri,
+                    retire_token_address=token.token_address if token and defer_retirement else None,
+                )
+        else:
+            proof.status = "rejected"
+            lot.status = WasteLotStatus.SETTLED
+            lot.updated_at = datetime.utcnow()
+
+        session.add(proof)
+        session.add(lot)
+        session.commit()
+        session.refresh(proof)
+        return proof
+
+    return _retry_on_conflict(
+        session,
+        apply,
+        reload=proof,
+        conflict=lambda: _version_conflict(
+            "Waste lot was modified concurrently", session.get(WasteLot, proof.waste_lot_id)
+        ),
+    )
 
-    proof.ai_confidence = decision.ai_confidence
-    proof.processing_notes = decision.notes or proof.processing_notes
-    proof.validated_at = datetime.utcnow()
 
-    if decision.approve:
-        proof.status = "validated"
-        proof.certificate_uri = str(decision.certificate_uri) if decision.certificate_uri else proof.certificate_uri
-        lot.status = WasteLotStatus.RETIRED
+def mark_lot_negotiating(session: Session, lot: WasteLot) -> bool:
+    """Move a matchable lot to NEGOTIATING; returns False if a concurrent writer moved it elsewhere."""
+    matchable = {WasteLotStatus.VERIFIED, WasteLotStatus.TOKENIZED, WasteLotStatus.NEGOTIATING}
+    for _ in range(MAX_TRANSITION_ATTEMPTS):
+        if lot.status not in matchable:
+            return False
+        if lot.status == WasteLotStatus.NEGOTIATING:
+            return True
+        lot.status = WasteLotStatus.NEGOTIATING
         lot.updated_at = datetime.utcnow()
+        session.add(lot)
+        try:
+            session.commit()
+            return True
+        except StaleDataError:
+            session.rollback()
+            session.refresh(lot)
+    return False
 
-        token = session.exec(select(WasteLotToken).where(WasteLotToken.waste_lot_id == lot.id)).first()
-        if token:
-            token.retired_at = datetime.utcnow()
-            token.retire_transaction_hash = burn_transaction_hash
-            session.add(token)
-    else:
-        proof.status = "rejected"
-        lot.status = WasteLotStatus.SETTLED
-        lot.updated_at = datetime.utcnow()
 
-    session.add(proof)
-    session.add(lot)
-    session.commit()
-    session.refresh(proof)
-    return proof
\ No newline at end of file
+def _retry_on_conflict(
+    session: Session,
+    operation: Callable[[], T],
+    *,
+    reload: SQLModel,
+    conflict: Callable[[], HTTPException],
+) -> T:
+    """Run a read-modify-write transaction, retrying when a versioned UPDATE matches no row.
+
+    WasteLot and Negotiation carry a `version` column that SQLAlchemy checks on
+    every UPDATE; a concurrent writer makes the flush raise StaleDataError. We
+    roll back, reload the current state and re-run the transition a bounded
+    number of times before reporting 409 with the state we last observed.
+    """
+    for _ in range(MAX_TRANSITION_ATTEMPTS):
+        try:
+            return operation()
+        except StaleDataError:
+            session.rollback()
+            session.refresh(reload)
+    raise conflict()
+
+
+def _version_conflict(message: str, *rows: SQLModel | None) -> HTTPException:
+    current: dict[str, Any] = {}
+    for row in rows:
+        if isinstance(row, Negotiation):
+            current["negotiation"] = NegotiationRead.model_validate(row).model_dump(mode="json")
+        elif isinstance(row, WasteLot):
+            current["lot"] = WasteLotRead.model_validate(row).model_dump(mode="json")
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"message": message, "current": current})
@@ -1,25 +1,157 @@
 from __future__ import annotations
 
+import hashlib
 from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session, SQLModel, create_engine
 
+from . import querylog, tracing
 from .config import get_settings
 
-settings = get_settings()
-engine = create_engine(settings.database_url, echo=False, connect_args={"check_same_thread": False})
+_engine: Engine | None = None
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
 
 
-def init_db() -> None:
+def get_engine() -> Engine:
+    """The process-wide engine, created on first use so importing the app opens no connections."""
+    global _engine
+    if _engine is None:
+        _engine = _create_engine()
+        querylog.install(_engine)
+        tracing.install(_engine)
+    return _engine
+
+
+def _create_engine() -> Engine:
+    settings = get_settings()
+    url = make_url(settings.database_url)
+    options: dict = {}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_seconds}
+        file_backed = url.database not in (None, "", ":memory:")
+    else:
+        file_backed = True
+    if file_backed:
+        # Each worker process owns a pool, so total connections are workers x (size + overflow).
+        options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+    engine = create_engine(url, echo=False, **options)
+    if url.get_backend_name() == "sqlite" and settings.sqlite_journal_mode:
+        journal_mode = settings.sqlite_journal_mode.upper()
+        if journal_mode not in _JOURNAL_MODES:
+            raise ValueError(f"Unsupported AURA_SQLITE_JOURNAL_MODE {settings.sqlite_journal_mode!r}")
+
+        @event.listens_for(engine, "connect")
+        def _set_journal_mode(dbapi_connection, connection_record) -> None:
+            # WAL lets readers in other worker processes proceed while one writes.
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+            cursor.close()
+
+    return engine
+
+
+def __getattr__(name: str):
+    # `db.engine` predates `get_engine()`; keep it working without building the engine at import.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """Hash of every table's columns and indexes as the models declare them, plus the search index DDL."""
+    from . import db_models  # noqa: F401 - registers the tables on SQLModel.metadata
+    from .services import search
+
+    digest = hashlib.sha256()
+    for table in SQLModel.metadata.sorted_tables:
+        digest.update(table.name.encode())
+        for column in table.columns:
+            digest.update(f"|{column.name}:{column.type}:{column.nullable}:{column.primary_key}".encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(f"|{index.name}:{','.join(column.name for column in index.columns)}".encode())
+    for statement in search.schema_statements():
+        digest.update(statement.encode())
+    return digest.hexdigest()[:16]
+
+
+def schema_is_current() -> bool:
+    """One query: does the recorded schema fingerprint match the models?"""
+    try:
+        with get_engine().connect() as connection:
+            recorded = connection.execute(text("SELECT fingerprint FROM schemaversion WHERE id = 1")).scalar()
+    except OperationalError:  # no schemaversion table yet
+        return False
+    return recorded == schema_fingerprint()
+
+
+def init_db(*, force: bool = False) -> bool:
+    """Create missing tables and columns unless the recorded fingerprint says they exist.
+
+    Returns True when DDL ran. The fingerprint is recorded afterwards, so a
+    boot against an up-to-date database costs a single `SELECT`.
+    """
+    from .db_models import SchemaVersion
+    from .services import search
+
+    if not force and schema_is_current():
+        return False
+    engine = get_engine()
+    had_composition_index = inspect(engine).has_table("lotcomposition")
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+    with engine.begin() as connection:
+        search.install(connection)
+    with Session(engine) as session:
+        if not had_composition_index:
+            # Lots listed before the index existed would otherwise never match composition filters.
+            from .services import composition
+
+            composition.rebuild(session)
+        version = session.get(SchemaVersion, 1) or SchemaVersion(id=1, fingerprint="")
+        version.fingerprint = schema_fingerprint()
+        version.migrated_at = datetime.utcnow()
+        session.add(version)
+        session.commit()
+    return True
+
+
+def _add_missing_columns() -> None:
+    """Add columns and indexes introduced after a table was first created.
+
+    `create_all` only creates missing tables, so existing database files (such
+    as the bundled data/aura.db) would otherwise fall behind the models. New
+    columns must be nullable or carry a server default.
+    """
+    engine = get_engine()
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(dialect=engine.dialect)}'
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                connection.exec_driver_sql(ddl)
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
 
 
 @contextmanager
 def session_scope():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Any, Optional
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index, Integer
 from sqlalchemy.dialects.sqlite import JSON
 from sqlmodel import Field, SQLModel
 
@@ -21,6 +21,15 @@ class WasteLotStatus(str, Enum):
     RETIRED = "retired"
 
 
+def _version_column() -> Column:
+    """Optimistic-concurrency counter; SQLAlchemy adds `AND version = :old` to every ORM UPDATE."""
+    return Column("version", Integer, nullable=False, server_default="1")
+
+
+_lot_version = _version_column()
+_negotiation_version = _version_column()
+
+
 class Producer(SQLModel, table=True):
     id: Optional[int] = Field(primary_key=True, default=None)
     name: str
@@ -34,6 +43,10 @@ class Producer(SQLModel, table=True):
 
 
 class WasteLot(SQLModel, table=True):
+    # Serves a producer's per-status counts and status-filtered lot pages (see `crud.producer_lot_counts`).
+    __table_args__ = (Index("ix_wastelot_producer_status", "producer_id", "status"),)
+    __mapper_args__ = {"version_id_col": _lot_version}
+
     id: Optional[int] = Field(primary_key=True, default=None)
     producer_id: int = Field(foreign_key="producer.id")
     external_reference: Optional[str] = Field(
@@ -52,8 +65,20 @@ class WasteLot(SQLModel, table=True):
         sa_column=Column(JSON), default_factory=list, description="URIs for imagery or supporting media"
     )
     status: WasteLotStatus = Field(default=WasteLotStatus.DRAFT)
+    version: int = Field(default=1, sa_column=_lot_version)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
+
+
+class LotComposition(SQLModel, table=True):
+    """Numeric `chemical_composition` readings, one row per lot and element (see `services.composition`)."""
+
+    # Covering index: a range filter on one element reads lot IDs without touching the table.
+    __table_args__ = (Index("ix_lotcomposition_element_value", "element", "value", "waste_lot_id"),)
+
+    waste_lot_id: int = Field(foreign_key="wastelot.id", primary_key=True)
+    element: str = Field(primary_key=True)
+    value: float
 
 
 class WasteLotVerification(SQLModel, table=True):
@@ -109,17 +134,23 @@ class NegotiationStatus(str, Enum):
 
 
 class Negotiation(SQLModel, table=True):
+    __table_args__ = (Index("ix_negotiation_status_expires_at", "status", "expires_at"),)
+    __mapper_args__ = {"version_id_col": _negotiation_version}
+
     id: Optional[int] = Field(primary_key=True, default=None)
     waste_lot_id: int = Field(foreign_key="wastelot.id")
     producer_agent_id: int = Field(foreign_key="agent.id")
     recycler_agent_id: int = Field(foreign_key="agent.id")
     status: NegotiationStatus = Field(default=NegotiationStatus.OPEN)
+    version: int = Field(default=1, sa_column=_negotiation_version)
     producer_offer_usd_per_ton: Optional[float] = None
     recycler_offer_usd_per_ton: Optional[float] = None
     agreed_price_usd_per_ton: Optional[float] = None
+    agreed_at: Optional[datetime] = None
+    settlement_id: Optional[int] = Field(default=None, foreign_key="settlement.id", index=True)
     expires_at: datetime = Field(default_factory=datetime.utcnow)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
 
 
 class UpcyclingProof(SQLModel, table=True):
@@ -134,3 +165,182 @@ class UpcyclingProof(SQLModel, table=True):
     certificate_uri: Optional[str] = None
     submitted_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     validated_at: Optional[datetime] = None
+
+
+class PriceRollup(SQLModel, table=True):
+    """Daily listing and agreed-price aggregates per material and location.
+
+    Maintained incrementally by `services.rollups`; averages are derived from
+    the stored sums and counts at read time.
+    """
+
+    material_type: str = Field(primary_key=True)
+    location: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    lot_count: int = 0
+    tons: float = 0.0
+    floor_count: int = 0
+    floor_sum: float = 0.0
+    floor_min: Optional[float] = None
+    floor_max: Optional[float] = None
+    agreed_count: int = 0
+    agreed_tons: float = 0.0
+    agreed_sum: float = 0.0
+    agreed_min: Optional[float] = None
+    agreed_max: Optional[float] = None
+
+
+class MintJobStatus(str, Enum):
+    QUEUED = "queued"
+    SUBMITTED = "submitted"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class MintJob(SQLModel, table=True):
+    """A tokenization request waiting for (or returned from) a batched on-chain mint."""
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    waste_lot_id: int = Field(foreign_key="wastelot.id", index=True)
+    token_name: str
+    token_symbol: str
+    supply: int = 1
+    status: MintJobStatus = Field(default=MintJobStatus.QUEUED, index=True)
+    attempts: int = 0
+    token_address: Optional[str] = None
+    transaction_hash: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    completed_at: Optional[datetime] = None
+
+
+class AnchorBatch(SQLModel, table=True):
+    """A Merkle root over a window of proof/verification leaves, anchored on chain."""
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    merkle_root: str
+    leaf_count: int
+    transaction_hash: Optional[str] = None
+    chain_anchor_id: Optional[int] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    anchored_at: Optional[datetime] = None
+
+
+class AnchorLeaf(SQLModel, table=True):
+    __table_args__ = (Index("ix_anchorleaf_kind_source", "kind", "source_id", unique=True),)
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    kind: str = Field(description="proof or verification")
+    source_id: int
+    waste_lot_id: int = Field(foreign_key="wastelot.id")
+    leaf_hash: str
+    retire_token_address: Optional[str] = Field(
+        default=None, description="Token to retire in the same transaction that anchors this leaf"
+    )
+    batch_id: Optional[int] = Field(default=None, foreign_key="anchorbatch.id", index=True)
+    leaf_index: Optional[int] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class SettlementStatus(str, Enum):
+    PENDING = "pending"
+    SETTLED = "settled"
+    FAILED = "failed"
+
+
+class EscrowStep(str, Enum):
+    """Last escrow step a settlement completed on chain."""
+
+    OPENED = "opened"
+    SIGNED = "signed"
+    FINALIZED = "finalized"
+
+
+class Settlement(SQLModel, table=True):
+    """Netted obligation of one recycler to one producer over a settlement window.
+
+    Settled on chain as a single escrow covering every agreed negotiation
+    that references it. `escrow_step` records how far that escrow got, so a
+    PENDING settlement with an `escrow_id` resumes instead of reopening.
+    """
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    producer_id: int = Field(foreign_key="producer.id", index=True)
+    recycler_agent_id: int = Field(foreign_key="agent.id", index=True)
+    negotiation_count: int
+    total_tons: float
+    amount_usd: float
+    amount_cents: int
+    status: SettlementStatus = Field(default=SettlementStatus.PENDING, index=True)
+    escrow_id: Optional[int] = None
+    escrow_step: Optional[EscrowStep] = None
+    transaction_hash: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    settled_at: Optional[datetime] = None
+
+
+class IndexerCheckpoint(SQLModel, table=True):
+    """Next chain version an event indexer will read, committed with the rows it produced."""
+
+    name: str = Field(primary_key=True)
+    version: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class ChainLot(SQLModel, table=True):
+    """`waste_lot` state as seen in chain events; `waste_lot_id` comes from the `aura-lot-<id>` reference."""
+
+    chain_lot_id: int = Field(primary_key=True)
+    waste_lot_id: Optional[int] = Field(default=None, foreign_key="wastelot.id", index=True)
+    external_ref: Optional[str] = None
+    status: Optional[str] = None
+    holder: Optional[str] = None
+    token_symbol: Optional[str] = None
+    supply: Optional[int] = None
+    tokenize_transaction_hash: Optional[str] = None
+    retire_transaction_hash: Optional[str] = None
+    retired_reason: Optional[str] = None
+    last_version: int = 0
+
+
+class ChainEscrow(SQLModel, table=True):
+    """`escrow_settlement` state as seen in chain events."""
+
+    escrow_id: int = Field(primary_key=True)
+    lot_id: Optional[int] = None
+    status: Optional[str] = Field(default=None, index=True)
+    total_amount: Optional[int] = None
+    funded_amount: Optional[int] = None
+    producer_signed: Optional[bool] = None
+    recycler_signed: Optional[bool] = None
+    producer_share: Optional[int] = None
+    agent_share: Optional[int] = None
+    treasury_share: Optional[int] = None
+    producer_withdrawn: Optional[bool] = None
+    agent_withdrawn: Optional[bool] = None
+    treasury_withdrawn: Optional[bool] = None
+    open_transaction_hash: Optional[str] = None
+    finalize_transaction_hash: Optional[str] = None
+    last_version: int = 0
+
+
+class ChainCredential(SQLModel, table=True):
+    """Latest `certification` credential per recycler address."""
+
+    recycler: str = Field(primary_key=True)
+    credential_id: Optional[int] = None
+    active: Optional[bool] = None
+    issue_transaction_hash: Optional[str] = None
+    revoke_transaction_hash: Optional[str] = None
+    last_version: int = 0
+
+
+class SchemaVersion(SQLModel, table=True):
+    """Fingerprint of the models `init_db` last brought this database up to, so warm boots can skip DDL."""
+
+    id: int = Field(default=1, primary_key=True)
+    fingerprint: str
+    migrated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    seeded_at: Optional[datetime] = None
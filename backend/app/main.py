@@ -1,44 +1,69 @@
 from __future__ import annotations
 
-from datetime import datetime
-
-from fastapi import Depends, FastAPI, HTTPException, Query
+import logging
+import os
+import sys
+import time
+from datetime import date, datetime
+from types import ModuleType
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from sqlmodel import Session, select
 
 from .crud import (
+    ACTIONABLE_LOT_STATUSES,
     create_agent,
     create_producer,
     create_verification,
     create_waste_lot,
     create_upcycling_proof,
+    enqueue_mint,
     finalize_negotiation,
     get_agent,
     get_latest_verification,
+    get_mint_job,
     get_negotiation,
     get_producer,
     get_waste_lot,
+    latest_verifications_for_lots,
     list_agents,
     list_negotiations,
     list_upcycling_proofs,
+    list_producer_lots,
     list_producers,
+    list_settlements,
     list_waste_lots,
     mark_lot_verified,
+    producer_lot_counts,
+    producer_lot_ids,
+    proofs_for_lots,
     record_token_mint,
     get_upcycling_proof,
+    tokens_for_lots,
     validate_upcycling_proof,
 )
-from .db import get_session, init_db
-from .db_models import Agent, NegotiationStatus, WasteLot, WasteLotStatus, WasteLotToken
+from . import coordination, db, metrics, querylog, serialization, tracing
+from .db import get_session, init_db, schema_is_current
+from .db_models import Agent, NegotiationStatus, Producer, SettlementStatus, WasteLot, WasteLotStatus, WasteLotToken
 from .models import (
     AgentCreate,
     AgentRead,
+    LotSearchHit,
+    LotSearchPage,
+    MintJobRead,
     NegotiationDecision,
     NegotiationRead,
+    OracleFeedRead,
+    PriceRollupRead,
+    ProofInclusionRead,
     ProofValidationDecision,
     ProducerCreate,
     ProducerDetail,
     ProducerRead,
+    ProducerSummary,
+    SettlementRead,
     TokenMintRequest,
     UpcyclingProofCreate,
     UpcyclingProofRead,
@@ -50,15 +75,20 @@ from .models import (
     WasteLotTokenRead,
     VerificationApproval,
 )
-from .seed import seed_initial_data
+from .serialization import json_response
+from .config import get_settings
+from .services import anchoring, expiry, minting, rollups
 from .services.aptos import AptosTokenService
-from .services.agent_matcher import AgentMatchmaker
+from .services.composition import parse_requirements
+
+logger = logging.getLogger("aura.api")
 
 app = FastAPI(
     title="AURA Marketplace API",
     version="0.1.0",
     description="Prototype API serving Aura onboarding, verification, and tokenization workflows."
 )
+app.router.route_class = tracing.TracedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -69,19 +99,261 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def account_queries(request: Request, call_next):
+    """Count each request's SQL queries and latency; report them in a `Server-Timing` header and `/metrics`."""
+    started = time.perf_counter()
+    metrics.IN_FLIGHT.inc(1, request.method)
+    try:
+        with querylog.track() as counter:
+            response = await call_next(request)
+    finally:
+        metrics.IN_FLIGHT.dec(1, request.method)
+    elapsed = time.perf_counter() - started
+    route = request.scope.get("route")
+    # Unmatched paths share one label so scanners cannot blow up the series count.
+    template = route.path if route else "<unmatched>"
+    querylog.finish_request(f"{request.method} {template}", counter, get_settings().query_repeat_threshold)
+    metrics.REQUEST_SECONDS.observe(elapsed, request.method, template, response.status_code)
+    response.headers["Server-Timing"] = querylog.server_timing(counter, elapsed)
+    return response
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Open the request's server span, continuing the caller's `traceparent` if it sent one."""
+    with tracing.span(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get("traceparent"),
+        kind="server",
+        **{"http.method": request.method, "http.target": request.url.path},
+    ) as request_span:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        request_span.name = f"{request.method} {route.path if route else '<unmatched>'}"
+        request_span.attributes["http.status_code"] = response.status_code
+        request_span.status = "error" if response.status_code >= 500 else "ok"
+    response.headers["traceparent"] = request_span.traceparent
+    return response
+
+
 @app.on_event("startup")
 def startup_event() -> None:
-    init_db()
-    seed_initial_data()
+    settings = get_settings()
+    tracing.configure(
+        settings.trace_sample_rate,
+        tracing.FileExporter(settings.trace_file) if settings.trace_file else None,
+    )
+    if not settings.auto_migrate:
+        # Schema changes and seeding are release steps (`python -m app.cli init-db` / `seed`).
+        if not schema_is_current():
+            raise RuntimeError("Database schema is out of date; run `python -m app.cli init-db` before starting")
+        return
+    if schema_is_current():
+        return
+    # Sibling worker processes start together; the first through the lock migrates
+    # and seeds, the rest re-check the fingerprint and find nothing left to do.
+    with coordination.setup_lock():
+        if init_db():
+            # Only a new or just-migrated database can still need the demo data.
+            from .seed import seed_initial_data
+
+            seed_initial_data()
+
+
+_started_workers: list[ModuleType] = []
+
+
+@app.on_event("startup")
+async def start_background_workers() -> None:
+    # Worker modules other than the ones request handlers use are imported only
+    # when enabled, so replicas that run none of them do not pay for them.
+    settings = get_settings()
+    # Expiry, anchoring, settlement and indexing act on shared rows and run in one
+    # process only. The mint queue runs there too: the simulated chain is
+    # per-process, so every chain write goes through the leader's chain. The oracle
+    # cache and profiler are per-process and run in every worker.
+    leader = coordination.acquire_leadership()
+    if not leader:
+        logger.info("Worker %s is a follower; singleton background workers run in the leader", os.getpid())
+    if leader and settings.expiry_enabled:
+        expiry.start(tick_seconds=settings.expiry_tick_seconds)
+        _started_workers.append(expiry)
+    if leader and settings.anchoring_enabled:
+        anchoring.start(get_aptos_service(), window_seconds=settings.anchoring_window_seconds)
+        _started_workers.append(anchoring)
+    if leader and settings.mint_queue_enabled:
+        minting.start(
+            get_aptos_service(),
+            batch_size=settings.mint_batch_size,
+            batch_wait_seconds=settings.mint_batch_wait_seconds,
+        )
+        _started_workers.append(minting)
+    if leader and settings.settlement_enabled:
+        from .services import settlement
+
+        settlement.start(get_aptos_service(), window_seconds=settings.settlement_window_seconds)
+        _started_workers.append(settlement)
+    if settings.oracle_enabled:
+        from .services import oracle
+        from .services.chain import get_chain_backend
+
+        oracle.start(get_chain_backend(), poll_seconds=settings.oracle_poll_seconds)
+        _started_workers.append(oracle)
+    if leader and settings.indexer_enabled:
+        from .services import indexer
+        from .services.chain import get_chain_backend
+
+        indexer.start(
+            get_chain_backend(),
+            batch_size=settings.indexer_batch_size,
+            poll_seconds=settings.indexer_poll_seconds,
+        )
+        _started_workers.append(indexer)
+    if settings.profile_enabled:
+        from . import profiling
+
+        profiling.start(
+            profiling.route_tags(app.routes),
+            directory=settings.profile_dir,
+            window_seconds=settings.profile_window_seconds,
+            interval=settings.profile_interval_ms / 1000,
+        )
+        _started_workers.append(profiling)
+
+
+@app.on_event("shutdown")
+async def stop_background_workers() -> None:
+    while _started_workers:
+        await _started_workers.pop().stop()
+    coordination.release_leadership()
+
+
+def _require_chain_writer() -> None:
+    """Refuse a synchronous chain write outside the leader worker.
+
+    Each worker process has its own simulated chain, so a lot minted or
+    retired in a follower would be invisible to (or collide with) the chain
+    the leader's mint queue, anchoring and settlement write to.
+    """
+    if not coordination.is_leader():
+        raise HTTPException(
+            status_code=503,
+            detail="Chain writes run in the leader worker; enable the mint queue and anchoring to run several workers",
+        )
 
 
 def get_aptos_service() -> AptosTokenService:
-    return AptosTokenService()
+    settings = get_settings()
+    return AptosTokenService(max_batch_size=settings.mint_batch_size)
 
 
 @app.get("/health", tags=["System"])
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "worker": coordination.identity()}
+
+
+@app.get("/system/expiry", tags=["System"])
+def expiry_status():
+    engine = expiry.current()
+    return engine.metrics() if engine else {"running": False}
+
+
+@app.get("/system/anchoring", tags=["System"])
+def anchoring_status():
+    service = anchoring.current()
+    return service.metrics() if service else {"running": False}
+
+
+@app.get("/system/minting", tags=["System"])
+def minting_status():
+    worker = minting.current()
+    return worker.metrics() if worker else {"running": False}
+
+
+@app.get("/system/settlement", tags=["System"])
+def settlement_status():
+    from .services import settlement
+
+    engine = settlement.current()
+    return engine.metrics() if engine else {"running": False}
+
+
+@app.get("/system/oracle", tags=["System"])
+def oracle_status():
+    from .services import oracle
+
+    cache = oracle.current()
+    return cache.metrics() if cache else {"running": False}
+
+
+@app.get("/system/queries", tags=["System"])
+def query_stats():
+    return querylog.metrics()
+
+
+_WORKER_MODULES = ("expiry", "anchoring", "minting", "settlement", "oracle", "indexer")
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+def prometheus_metrics():
+    """Prometheus text exposition of request latency, DB pool, cache and worker metrics."""
+    worker_metrics = {}
+    for name in _WORKER_MODULES:
+        # A worker module nobody imported has no worker running; scrapes must not import it.
+        module = sys.modules.get(f"{__package__}.services.{name}")
+        worker = module.current() if module else None
+        worker_metrics[name] = worker.metrics() if worker else None
+    adapters = serialization._adapter.cache_info()
+    caches = {"serialization_adapters": (adapters.hits, adapters.misses)}
+    if worker_metrics["oracle"]:
+        caches["oracle_feed_snapshot"] = (
+            worker_metrics["oracle"]["snapshot_hits_total"],
+            worker_metrics["oracle"]["snapshot_misses_total"],
+        )
+    body = metrics.render(
+        [
+            metrics.process_lines(coordination.identity()),
+            metrics.REQUEST_SECONDS.render(),
+            metrics.IN_FLIGHT.render(),
+            metrics.pool_lines(db.engine),
+            metrics.query_lines(querylog.metrics()),
+            metrics.cache_lines(caches),
+            metrics.worker_lines(worker_metrics),
+        ]
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@app.get("/system/profiling", tags=["System"])
+def profiling_status():
+    from . import profiling
+
+    worker = profiling.current()
+    return worker.metrics() if worker else {"running": False}
+
+
+@app.post("/system/profiling/capture", tags=["System"])
+async def capture_profile(seconds: float = Query(10.0, gt=0, le=300)):
+    """Sample every thread for `seconds` and write wall/CPU flamegraph stacks per route to the profile directory."""
+    from . import profiling
+
+    settings = get_settings()
+    files, summary = await profiling.capture(
+        profiling.route_tags(app.routes),
+        seconds=seconds,
+        directory=settings.profile_dir,
+        interval=settings.profile_interval_ms / 1000,
+    )
+    return {"files": {kind: str(path) for kind, path in files.items()}, **summary}
+
+
+@app.get("/system/indexer", tags=["System"])
+def indexer_status():
+    from .services import indexer
+
+    chain_indexer = indexer.current()
+    return chain_indexer.metrics() if chain_indexer else {"running": False}
 
 
 @app.post("/producers", response_model=ProducerRead, status_code=201, tags=["Producers"])
@@ -97,14 +369,44 @@ def list_registered_producers(session: Session = Depends(get_session)):
     return [ProducerRead.model_validate(producer) for producer in list_producers(session)]
 
 
-@app.get("/producers/{producer_id}", response_model=ProducerDetail, tags=["Producers"])
-def get_producer_detail_route(producer_id: int, session: Session = Depends(get_session)):
+@app.get("/producers/{producer_id}", response_model=ProducerDetail | ProducerSummary, tags=["Producers"])
+def get_producer_detail_route(
+    producer_id: int,
+    summary: bool = Query(
+        False, description="Return per-status lot counts and the IDs of lots awaiting the producer instead of lots"
+    ),
+    status_filter: list[WasteLotStatus] | None = Query(
+        None, alias="status", description="Only nested lots in these statuses"
+    ),
+    limit: int = Query(100, ge=1, le=500, description="Nested lots per page"),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+):
     producer = get_producer(session, producer_id)
-    lots = session.exec(select(WasteLot).where(WasteLot.producer_id == producer.id)).all()
-    lots_schemas = [WasteLotRead.model_validate(lot) for lot in lots]
     agents = session.exec(select(Agent).where(Agent.producer_id == producer.id)).all()
     agent_schemas = [AgentRead.model_validate(agent) for agent in agents]
-    return ProducerDetail.model_validate(producer).model_copy(update={"lots": lots_schemas, "agents": agent_schemas})
+    counts = producer_lot_counts(session, producer.id)
+    if summary:
+        detail = ProducerSummary.model_validate(producer).model_copy(
+            update={
+                "lot_counts": counts,
+                "actionable_lot_ids": producer_lot_ids(session, producer.id, ACTIONABLE_LOT_STATUSES),
+                "agents": agent_schemas,
+            }
+        )
+        return json_response(detail, ProducerSummary)
+
+    lots = list_producer_lots(session, producer.id, status_filter=status_filter, limit=limit, offset=offset)
+    total = sum(count for lot_status, count in counts.items() if not status_filter or lot_status in status_filter)
+    detail = ProducerDetail.model_validate(producer).model_copy(
+        update={
+            "lots": [WasteLotRead.model_validate(lot) for lot in lots],
+            "lots_total": total,
+            "next_offset": offset + len(lots) if lots and offset + len(lots) < total else None,
+            "agents": agent_schemas,
+        }
+    )
+    return json_response(detail, ProducerDetail)
 
 
 @app.post("/agents", response_model=AgentRead, status_code=201, tags=["Agents"])
@@ -125,12 +427,15 @@ def list_agents_endpoint(
 @app.get("/snapshot", tags=["System"])
 def marketplace_snapshot(session: Session = Depends(get_session)):
     lots = list_waste_lots(session)
+    producer_names = dict(
+        session.exec(
+            select(Producer.id, Producer.name).where(Producer.id.in_({lot.producer_id for lot in lots}))
+        ).all()
+    )
     lot_payload: list[dict] = []
-    for lot in lots:
-        detail = _build_waste_lot_detail(session, lot.id)
+    for detail in _build_waste_lot_details(session, lots):
         data = detail.model_dump(mode="json")
-        producer = get_producer(session, detail.producer_id)
-        data["producer"] = producer.name
+        data["producer"] = producer_names[detail.producer_id]
         lot_payload.append(data)
 
     agents_payload: list[dict] = []
@@ -161,9 +466,49 @@ def marketplace_snapshot(session: Session = Depends(get_session)):
     }
 
 
+@app.get("/analytics/prices", response_model=list[PriceRollupRead], tags=["Analytics"])
+def price_rollups(
+    material_type: str | None = Query(None),
+    location: str | None = Query(None),
+    start: date | None = Query(None, description="First day (inclusive)"),
+    end: date | None = Query(None, description="Last day (inclusive)"),
+    by_day: bool = Query(False, description="Return one row per day instead of per material and location"),
+    session: Session = Depends(get_session),
+):
+    return rollups.query_prices(
+        session,
+        material_type=material_type,
+        location=location,
+        start=start,
+        end=end,
+        by_day=by_day,
+    )
+
+
+@app.get("/export/{table}", response_class=StreamingResponse, tags=["Analytics"])
+def export_table(
+    table: str,
+    batch_size: int = Query(50_000, ge=1, le=1_000_000, description="Rows per Arrow record batch"),
+):
+    """Stream a marketplace table (lots, negotiations, tokens, proofs) as an Arrow IPC stream."""
+    from .services.export import ARROW_STREAM_MEDIA_TYPE, EXPORT_TABLES, MarketplaceExporter
+
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export table '{table}'")
+    exporter = MarketplaceExporter(batch_size=batch_size)
+    return StreamingResponse(
+        exporter.ipc_stream(table),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{table}.arrows"'},
+    )
+
+
 @app.post("/agents/matchmaking", response_model=list[NegotiationRead], tags=["Agents"])
 def run_matchmaking(session: Session = Depends(get_session)):
-    matcher = AgentMatchmaker(session)
+    from .services import oracle
+    from .services.agent_matcher import AgentMatchmaker
+
+    matcher = AgentMatchmaker(session, feeds=oracle.feed_cache())
     negotiations = matcher.propose_matches()
     return [NegotiationRead.model_validate(item) for item in negotiations]
 
@@ -171,12 +516,34 @@ def run_matchmaking(session: Session = Depends(get_session)):
 @app.get("/negotiations", response_model=list[NegotiationRead], tags=["Agents"])
 def list_negotiations_endpoint(
     status_filter: NegotiationStatus | None = Query(None, alias="status"),
+    recycler_agent_id: int | None = Query(None, description="Only negotiations addressed to this recycler agent"),
+    updated_since: datetime | None = Query(
+        None, description="Only negotiations updated at or after this timestamp (incremental sync watermark)"
+    ),
     session: Session = Depends(get_session),
 ):
-    negotiations = list_negotiations(session, status_filter=status_filter)
+    negotiations = list_negotiations(
+        session,
+        status_filter=status_filter,
+        recycler_agent_id=recycler_agent_id,
+        updated_since=updated_since,
+    )
     return [NegotiationRead.model_validate(item) for item in negotiations]
 
 
+@app.get("/settlements", response_model=list[SettlementRead], tags=["Agents"])
+def list_settlements_endpoint(
+    producer_id: int | None = Query(None),
+    recycler_agent_id: int | None = Query(None),
+    status_filter: SettlementStatus | None = Query(None, alias="status"),
+    session: Session = Depends(get_session),
+):
+    settlements = list_settlements(
+        session, producer_id=producer_id, recycler_agent_id=recycler_agent_id, status_filter=status_filter
+    )
+    return [SettlementRead.model_validate(item) for item in settlements]
+
+
 @app.post("/negotiations/{negotiation_id}/decision", response_model=NegotiationRead, tags=["Agents"])
 def decide_on_negotiation(
     negotiation_id: int,
@@ -184,7 +551,13 @@ def decide_on_negotiation(
     session: Session = Depends(get_session),
 ):
     negotiation = get_negotiation(session, negotiation_id)
-    updated = finalize_negotiation(session, negotiation, agree=payload.agree, counter_offer=payload.counter_offer_usd_per_ton)
+    updated = finalize_negotiation(
+        session,
+        negotiation,
+        agree=payload.agree,
+        counter_offer=payload.counter_offer_usd_per_ton,
+        expected_version=payload.expected_version,
+    )
     return NegotiationRead.model_validate(updated)
 
 
@@ -194,22 +567,70 @@ def create_lot(
     session: Session = Depends(get_session),
 ):
     lot = create_waste_lot(session, payload)
-    return _build_waste_lot_detail(session, lot.id)
+    return json_response(_build_waste_lot_detail(session, lot.id), WasteLotDetail, status_code=201)
 
 
 @app.get("/lots", response_model=list[WasteLotDetail], tags=["Waste Lots"])
 def list_lots(
-    status_filter: WasteLotStatus | None = Query(None, alias="status"),
+    status_filter: list[WasteLotStatus] | None = Query(None, alias="status", description="Only lots in these statuses"),
+    producer_id: int | None = Query(None, description="Only lots owned by this producer"),
+    recycler_agent_id: int | None = Query(None, description="Only lots negotiated with this recycler agent"),
+    updated_since: datetime | None = Query(
+        None, description="Only lots updated at or after this timestamp (incremental sync watermark)"
+    ),
+    composition: list[str] | None = Query(
+        None,
+        description="Assay thresholds on chemical_composition readings such as `Cu>5` or `Pb<=0.1`; all must hold",
+    ),
     session: Session = Depends(get_session),
 ):
-    lots = list_waste_lots(session, status_filter=status_filter)
-    return [_build_waste_lot_detail(session, lot.id) for lot in lots]
+    try:
+        requirements = parse_requirements(composition)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    lots = list_waste_lots(
+        session,
+        status_filter=status_filter,
+        producer_id=producer_id,
+        updated_since=updated_since,
+        requirements=requirements,
+        recycler_agent_id=recycler_agent_id,
+    )
+    return json_response(_build_waste_lot_details(session, lots), list[WasteLotDetail])
+
+
+@app.get("/lots/search", response_model=LotSearchPage, tags=["Waste Lots"])
+def search_lots(
+    q: str = Query(..., description="Terms matched anywhere in material type, location or external reference"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+):
+    from .services import search
+
+    try:
+        results = search.search(session, q, limit=limit, offset=offset)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    more = len(results.hits) == limit and offset + limit < results.ranked
+    page = LotSearchPage(
+        query=q,
+        limit=limit,
+        offset=offset,
+        ranked=results.ranked,
+        truncated=results.truncated,
+        next_offset=offset + limit if more else None,
+        results=[
+            LotSearchHit.model_validate(lot).model_copy(update={"score": score}) for lot, score in results.hits
+        ],
+    )
+    return json_response(page, LotSearchPage)
 
 
 @app.get("/lots/{lot_id}", response_model=WasteLotDetail, tags=["Waste Lots"])
 def retrieve_lot(lot_id: int, session: Session = Depends(get_session)):
     get_waste_lot(session, lot_id)
-    return _build_waste_lot_detail(session, lot_id)
+    return json_response(_build_waste_lot_detail(session, lot_id), WasteLotDetail)
 
 
 @app.post(
@@ -225,7 +646,7 @@ def submit_verification(
 ):
     lot = get_waste_lot(session, lot_id)
     create_verification(session, lot, payload)
-    return _build_waste_lot_detail(session, lot_id)
+    return json_response(_build_waste_lot_detail(session, lot_id), WasteLotDetail, status_code=202)
 
 
 @app.post(
@@ -241,12 +662,13 @@ def approve_verification(
     lot = get_waste_lot(session, lot_id)
     notes = payload.verifier_notes if payload else None
     mark_lot_verified(session, lot, verifier_notes=notes)
-    return _build_waste_lot_detail(session, lot_id)
+    return json_response(_build_waste_lot_detail(session, lot_id), WasteLotDetail)
 
 
 @app.post(
     "/lots/{lot_id}/tokenize",
     response_model=WasteLotDetail,
+    responses={202: {"model": MintJobRead, "description": "Mint queued; poll /mint-jobs/{job_id}"}},
     tags=["Waste Lots"],
 )
 def tokenize_lot(
@@ -264,6 +686,18 @@ def tokenize_lot(
     transaction_hash = payload.transaction_hash
 
     if not token_address or not transaction_hash:
+        # Configuration, not `minting.current()`: follower workers queue the job for the leader's mint worker.
+        if get_settings().mint_queue_enabled:
+            job = enqueue_mint(session, lot, payload)
+            worker = minting.current()
+            if worker is not None:
+                worker.notify()
+            return JSONResponse(
+                status_code=202,
+                content=MintJobRead.model_validate(job).model_dump(mode="json"),
+                headers={"Location": f"/mint-jobs/{job.id}"},
+            )
+        _require_chain_writer()
         result = aptos_service.mint_waste_lot(lot.id, payload.token_name, payload.token_symbol, payload.supply)
         token_address = result.token_address
         transaction_hash = result.transaction_hash
@@ -272,7 +706,12 @@ def tokenize_lot(
         raise HTTPException(status_code=500, detail="Tokenization failed to produce on-chain identifiers")
 
     record_token_mint(session, lot, payload, token_address, transaction_hash)
-    return _build_waste_lot_detail(session, lot_id)
+    return json_response(_build_waste_lot_detail(session, lot_id), WasteLotDetail)
+
+
+@app.get("/mint-jobs/{job_id}", response_model=MintJobRead, tags=["Waste Lots"])
+def get_mint_job_route(job_id: int, session: Session = Depends(get_session)):
+    return MintJobRead.model_validate(get_mint_job(session, job_id))
 
 
 @app.post(
@@ -309,40 +748,80 @@ def validate_upcycling_proof_endpoint(
         raise HTTPException(status_code=400, detail="Proof does not belong to this waste lot")
 
     burn_hash = None
-    if payload.approve:
+    # Configuration, not `anchoring.current()`: follower workers defer to the leader's anchoring run too.
+    defer_retirement = get_settings().anchoring_enabled
+    if payload.approve and not defer_retirement:
         token = session.exec(
             select(WasteLotToken).where(WasteLotToken.waste_lot_id == lot.id)
         ).first()
         if token:
+            _require_chain_writer()
             burn_result = aptos_service.retire_waste_lot(token.token_address)
             burn_hash = burn_result.transaction_hash
 
-    updated = validate_upcycling_proof(session, proof, payload, burn_transaction_hash=burn_hash)
+    updated = validate_upcycling_proof(
+        session, proof, payload, burn_transaction_hash=burn_hash, defer_retirement=defer_retirement
+    )
     return UpcyclingProofRead.model_validate(updated)
 
 
+@app.get("/proofs/{proof_id}/inclusion", response_model=ProofInclusionRead, tags=["Waste Lots"])
+def get_proof_inclusion(proof_id: int, session: Session = Depends(get_session)):
+    proof = get_upcycling_proof(session, proof_id)
+    inclusion = anchoring.inclusion(session, anchoring.PROOF, proof.id)
+    if inclusion is None:
+        raise HTTPException(status_code=404, detail="Proof has not been approved for anchoring")
+    return ProofInclusionRead(proof_id=proof.id, **inclusion)
+
+
+@app.get("/oracle/feeds", response_model=list[OracleFeedRead], tags=["Oracle"])
+def list_oracle_feeds(if_none_match: str | None = Header(None)):
+    """Latest value of every oracle feed, served from the in-memory feed cache.
+
+    Clients that send back the previous `ETag` get a 304 until a feed changes.
+    """
+    from .services import oracle
+
+    etag, body = oracle.feed_cache().snapshot()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/oracle/feeds/{feed_id}", response_model=OracleFeedRead, tags=["Oracle"])
+def get_oracle_feed(feed_id: int):
+    from .services import oracle
+
+    feed = oracle.feed_cache().get(feed_id)
+    if feed is None:
+        raise HTTPException(status_code=404, detail="Oracle feed not found")
+    return feed
+
+
 def _build_waste_lot_detail(session: Session, lot_id: int) -> WasteLotDetail:
     lot = get_waste_lot(session, lot_id)
-    lot_schema = WasteLotRead.model_validate(lot)
-
-    token = session.exec(
-        select(WasteLotToken).where(WasteLotToken.waste_lot_id == lot.id)
-    ).first()
-    token_schema = None
-    if token:
-        token_schema = WasteLotTokenRead.model_validate(token)
-
-    verification = get_latest_verification(session, lot.id)
-    verification_schema = None
-    if verification:
-        verification_schema = WasteLotVerificationRead.model_validate(verification)
-
-    proofs = list_upcycling_proofs(session, lot.id)
-    proof_schemas = [UpcyclingProofRead.model_validate(proof) for proof in proofs]
-
-    return WasteLotDetail(
-        **lot_schema.model_dump(),
-        token=token_schema,
-        verification=verification_schema,
-        proofs=proof_schemas,
-    )
+    return _build_waste_lot_details(session, [lot])[0]
+
+
+def _build_waste_lot_details(session: Session, lots: list[WasteLot]) -> list[WasteLotDetail]:
+    """Assemble lot details with one query per child table and a single validation pass."""
+    lot_ids = [lot.id for lot in lots]
+    tokens = tokens_for_lots(session, lot_ids)
+    verifications = latest_verifications_for_lots(session, lot_ids)
+    proofs = proofs_for_lots(session, lot_ids)
+
+    details: list[WasteLotDetail] = []
+    for lot in lots:
+        token = tokens.get(lot.id)
+        verification = verifications.get(lot.id)
+        details.append(
+            WasteLotDetail.model_validate(lot).model_copy(
+                update={
+                    "token": WasteLotTokenRead.model_validate(token) if token else None,
+                    "verification": WasteLotVerificationRead.model_validate(verification) if verification else None,
+                    "proofs": [UpcyclingProofRead.model_validate(proof) for proof in proofs.get(lot.id, [])],
+                }
+            )
+        )
+    return details
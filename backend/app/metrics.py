@@ -0,0 +1,194 @@
+"""Prometheus text exposition for the API.
+
+The HTTP middleware feeds `REQUEST_SECONDS` and `IN_FLIGHT`; everything else
+(process identity, connection pool, caches, per-route query totals and background workers) is
+read from its owner at scrape time by `render`, so instrumented code does not
+have to remember to push. The text format is written by hand to avoid a
+client-library dependency for what is a few dozen lines of formatting.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def family(name: str, kind: str, help_text: str, samples: Iterable[tuple[str, Mapping[str, Any], float]]) -> list[str]:
+    """HELP/TYPE header plus `(suffix, labels, value)` samples as exposition lines."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        lines.append(f"{name}{suffix}{_labels(labels)} {_format(value)}")
+    return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            # One slot per finite bucket, then +Inf (the count), then the sum.
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = {key: list(values) for key, values in sorted(self._series.items())}
+        samples = []
+        for key, values in series.items():
+            labels = dict(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, values):
+                samples.append(("_bucket", {**labels, "le": _format(bound)}, count))
+            samples.append(("_bucket", {**labels, "le": "+Inf"}, values[-2]))
+            samples.append(("_sum", labels, values[-1]))
+            samples.append(("_count", labels, values[-2]))
+        return family(self.name, "histogram", self.help_text, samples)
+
+
+class Gauge:
+    """Settable/incrementable gauge keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, *labels: Any) -> None:
+        self.inc(-amount, *labels)
+
+    def set(self, value: float, *labels: Any) -> None:
+        with self._lock:
+            self._values[tuple(str(label) for label in labels)] = value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        samples = [("", dict(zip(self.labelnames, key)), value) for key, value in values]
+        return family(self.name, "gauge", self.help_text, samples)
+
+
+REQUEST_SECONDS = Histogram(
+    "aura_http_request_duration_seconds",
+    "Time to serve an HTTP request, by route template.",
+    ("method", "route", "status"),
+)
+IN_FLIGHT = Gauge("aura_http_requests_in_flight", "HTTP requests currently being served.", ("method",))
+
+
+def _numeric(value: Any) -> float | None:
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def process_lines(identity: Mapping[str, Any]) -> list[str]:
+    """Which worker process served this scrape; each worker keeps its own series under multi-process serving."""
+    labels = {"pid": identity["pid"], "host": identity["host"], "role": identity["role"]}
+    lines = family("aura_process_info", "gauge", "API worker process identity.", [("", labels, 1.0)])
+    lines += family(
+        "aura_process_start_time_seconds", "gauge", "Start time of the API worker process since the epoch.",
+        [("", labels, identity["started_at"])],
+    )
+    return lines
+
+
+def pool_lines(engine) -> list[str]:
+    """Connection pool occupancy; pools without a fixed size (SQLite memory/static) report what they can."""
+    pool = engine.pool
+    samples = []
+    for stat, reader in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow"), ("idle", "checkedin")):
+        method = getattr(pool, reader, None)
+        if callable(method):
+            samples.append(("", {"pool": type(pool).__name__, "stat": stat}, float(method())))
+    return family("aura_db_pool_connections", "gauge", "Database connection pool usage.", samples)
+
+
+def cache_lines(caches: Mapping[str, tuple[int, int]]) -> list[str]:
+    """Hit and miss counters for each `name -> (hits, misses)` cache."""
+    lines = family(
+        "aura_cache_hits_total", "counter", "Cache lookups served from the cache.",
+        [("", {"cache": name}, hits) for name, (hits, _) in sorted(caches.items())],
+    )
+    lines += family(
+        "aura_cache_misses_total", "counter", "Cache lookups that had to rebuild or fetch.",
+        [("", {"cache": name}, misses) for name, (_, misses) in sorted(caches.items())],
+    )
+    return lines
+
+
+def query_lines(query_metrics: Mapping[str, Any]) -> list[str]:
+    """Per-route SQL totals from `querylog.metrics()`."""
+    routes = query_metrics["routes"]
+    lines = family(
+        "aura_db_queries_total", "counter", "SQL statements executed while serving a route.",
+        [("", {"route": route}, stats["queries_total"]) for route, stats in routes.items()],
+    )
+    lines += family(
+        "aura_db_query_seconds_total", "counter", "Time spent in SQL while serving a route.",
+        [("", {"route": route}, stats["db_seconds_total"]) for route, stats in routes.items()],
+    )
+    lines += family(
+        "aura_db_repeated_statement_requests_total", "counter",
+        "Requests that ran one statement shape at least the repeat threshold (likely N+1).",
+        [("", {"route": route}, stats["requests_with_repeats"]) for route, stats in routes.items()],
+    )
+    return lines
+
+
+def worker_lines(workers: Mapping[str, Mapping[str, Any] | None]) -> list[str]:
+    """Numeric fields of each background worker's `metrics()` as `aura_worker_<field>{worker=...}` gauges."""
+    by_field: dict[str, list[tuple[str, Mapping[str, Any], float]]] = {}
+    for worker, values in sorted(workers.items()):
+        by_field.setdefault("running", []).append(("", {"worker": worker}, 1.0 if values else 0.0))
+        for field, value in (values or {}).items():
+            number = _numeric(value)
+            if field != "running" and number is not None:
+                by_field.setdefault(field, []).append(("", {"worker": worker}, number))
+    lines: list[str] = []
+    for field, samples in sorted(by_field.items()):
+        kind = "counter" if field.endswith("_total") else "gauge"
+        lines += family(f"aura_worker_{field}", kind, f"Background worker metric `{field}`.", samples)
+    return lines
+
+
+def render(sections: Iterable[list[str]]) -> str:
+    return "\n".join(line for section in sections for line in section) + "\n"
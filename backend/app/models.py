@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 
-from .db_models import NegotiationStatus, WasteLotStatus
+from .db_models import EscrowStep, MintJobStatus, NegotiationStatus, SettlementStatus, WasteLotStatus
+from .services.composition import parse_requirements
+from .services.strategy import validate_rules
 
 
 class ProducerBase(BaseModel):
@@ -40,17 +42,21 @@ class WasteLotBase(BaseModel):
         None, description="Producer-supplied reference such as manifest number"
     )
     chemical_composition: dict[str, Any] = Field(default_factory=dict)
-    photos: list[HttpUrl] = Field(default_factory=list)
 
 
 class WasteLotCreate(WasteLotBase):
     producer_id: int
+    photos: list[HttpUrl] = Field(default_factory=list)
 
 
 class WasteLotRead(WasteLotBase):
     id: int
+    # URLs are validated as HttpUrl on ingestion (`WasteLotCreate`) and persisted as
+    # strings, so read models carry them as plain `str` instead of re-parsing per response.
+    photos: list[str] = Field(default_factory=list)
     producer_id: int
     status: WasteLotStatus
+    version: int = 1
     created_at: datetime
     updated_at: datetime
 
@@ -71,7 +77,7 @@ class WasteLotVerificationRead(BaseModel):
     id: int
     status: str
     method: str
-    evidence_uri: Optional[HttpUrl]
+    evidence_uri: Optional[str]
     sensor_checksum: Optional[str]
     verifier_notes: Optional[str]
     requested_at: datetime
@@ -102,14 +108,85 @@ class WasteLotTokenRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class MintJobRead(BaseModel):
+    id: int
+    waste_lot_id: int
+    token_name: str
+    token_symbol: str
+    supply: int
+    status: MintJobStatus
+    attempts: int
+    token_address: Optional[str]
+    transaction_hash: Optional[str]
+    error: Optional[str]
+    created_at: datetime
+    completed_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SettlementRead(BaseModel):
+    id: int
+    producer_id: int
+    recycler_agent_id: int
+    negotiation_count: int
+    total_tons: float
+    amount_usd: float
+    status: SettlementStatus
+    escrow_id: Optional[int]
+    escrow_step: Optional[EscrowStep]
+    transaction_hash: Optional[str]
+    error: Optional[str]
+    created_at: datetime
+    settled_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OracleFeedRead(BaseModel):
+    feed_id: int
+    name: str
+    payload: str
+    lot_id: Optional[int] = None
+    expires_at: Optional[int] = None
+    version: int
+    updated_at: int = Field(description="Chain timestamp (seconds) of the latest publish")
+
+
 class WasteLotDetail(WasteLotRead):
     token: Optional[WasteLotTokenRead] = None
     verification: Optional[WasteLotVerificationRead] = None
     proofs: list["UpcyclingProofRead"] = Field(default_factory=list)
 
 
+class LotSearchHit(WasteLotRead):
+    score: float = Field(0.0, description="bm25 relevance; lower is better")
+
+
+class LotSearchPage(BaseModel):
+    query: str
+    limit: int
+    offset: int
+    ranked: int = Field(description="Matches ranked for this query (the newest ones when truncated)")
+    truncated: bool = Field(description="More lots match than were ranked; narrow the query to reach older ones")
+    next_offset: Optional[int] = None
+    results: list[LotSearchHit] = Field(default_factory=list)
+
+
 class ProducerDetail(ProducerRead):
-    lots: list[WasteLotRead] = Field(default_factory=list)
+    lots: list[WasteLotRead] = Field(default_factory=list, description="One page of lots, newest first")
+    lots_total: int = Field(0, description="Lots matching the status filter across all pages")
+    next_offset: Optional[int] = None
+    agents: list["AgentRead"] = Field(default_factory=list)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProducerSummary(ProducerRead):
+    lot_counts: dict[WasteLotStatus, int] = Field(default_factory=dict, description="Lots per status")
+    actionable_lot_ids: list[int] = Field(
+        default_factory=list, description="Lots waiting on the producer (pending verification or verified)"
+    )
     agents: list["AgentRead"] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
@@ -132,7 +209,13 @@ class AgentBase(BaseModel):
     radius_miles: Optional[int] = Field(None, ge=0)
     auto_negotiate: Optional[bool] = True
     bundle_preference: Optional[bool] = False
-    strategy_metadata: dict[str, Any] = Field(default_factory=dict)
+    strategy_metadata: dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Free-form strategy settings; `rules` holds a strategy rule set (see services.strategy) and "
+            "`composition` assay requirements such as 'Cu>5' that matched lots must meet"
+        ),
+    )
 
 
 class AgentCreate(AgentBase):
@@ -140,6 +223,17 @@ class AgentCreate(AgentBase):
         default=None, description="Custom identifier; autogenerated if omitted"
     )
 
+    @field_validator("strategy_metadata")
+    @classmethod
+    def _validate_rules(cls, value: dict[str, Any]) -> dict[str, Any]:
+        if "rules" in value:
+            validate_rules(value["rules"])
+        if "composition" in value:
+            if not isinstance(value["composition"], list):
+                raise ValueError("composition: expected a list of requirements such as 'Cu>5'")
+            parse_requirements(value["composition"])
+        return value
+
 
 class AgentRead(AgentBase):
     id: int
@@ -157,9 +251,11 @@ class NegotiationRead(BaseModel):
     producer_agent_id: int
     recycler_agent_id: int
     status: NegotiationStatus
+    version: int = 1
     producer_offer_usd_per_ton: Optional[float]
     recycler_offer_usd_per_ton: Optional[float]
     agreed_price_usd_per_ton: Optional[float]
+    settlement_id: Optional[int] = None
     expires_at: datetime
     created_at: datetime
     updated_at: datetime
@@ -171,6 +267,9 @@ class NegotiationDecision(BaseModel):
     agree: bool
     counter_offer_usd_per_ton: Optional[float] = None
     notes: Optional[str] = None
+    expected_version: Optional[int] = Field(
+        None, description="Reject with 409 unless the negotiation is still at this version"
+    )
 
 
 class UpcyclingProofCreate(BaseModel):
@@ -184,20 +283,55 @@ class UpcyclingProofRead(BaseModel):
     id: int
     waste_lot_id: int
     recycler_agent_id: Optional[int]
-    evidence_uri: Optional[HttpUrl]
+    evidence_uri: Optional[str]
     sensor_checksum: Optional[str]
     processing_notes: Optional[str]
     ai_confidence: Optional[float]
     status: str
-    certificate_uri: Optional[HttpUrl]
+    certificate_uri: Optional[str]
     submitted_at: datetime
     validated_at: Optional[datetime]
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class MerklePathStep(BaseModel):
+    hash: str
+    side: str = Field(description="Whether the sibling hash is concatenated on the left or right")
+
+
+class ProofInclusionRead(BaseModel):
+    proof_id: int
+    leaf_hash: str
+    anchored: bool
+    batch_id: Optional[int] = None
+    leaf_index: Optional[int] = None
+    leaf_count: Optional[int] = None
+    merkle_root: Optional[str] = None
+    transaction_hash: Optional[str] = None
+    chain_anchor_id: Optional[int] = None
+    anchored_at: Optional[datetime] = None
+    path: list[MerklePathStep] = Field(default_factory=list)
+
+
 class ProofValidationDecision(BaseModel):
     approve: bool
     ai_confidence: Optional[float] = Field(None, ge=0, le=1)
     certificate_uri: Optional[HttpUrl] = None
     notes: Optional[str] = None
+
+
+class PriceRollupRead(BaseModel):
+    material_type: str
+    location: str
+    day: Optional[date] = Field(None, description="Present when grouping by day")
+    lot_count: int
+    tons: float
+    floor_min_usd_per_ton: Optional[float]
+    floor_avg_usd_per_ton: Optional[float]
+    floor_max_usd_per_ton: Optional[float]
+    agreed_count: int
+    agreed_tons: float
+    agreed_min_usd_per_ton: Optional[float]
+    agreed_avg_usd_per_ton: Optional[float]
+    agreed_max_usd_per_ton: Optional[float]
@@ -0,0 +1,294 @@
+"""Low-overhead sampling profiler with per-route attribution.
+
+A daemon thread snapshots every other thread's Python stack each `interval`
+seconds (`sys._current_frames`) and charges the elapsed wall time, plus the
+CPU time that thread consumed since the previous sample (from its POSIX
+thread CPU clock), to the sampled stack. Stacks are tagged by the first frame,
+walking from the leaf, whose code object is in `tags`. For the API that is
+each route's endpoint function, so `/snapshot` work shows up under
+`GET /snapshot` whichever worker thread ran it. Untagged threads that used
+less than half a sample of CPU (or, without thread CPU clocks, sit in a known
+wait) are counted as `idle` and left out of the flamegraphs.
+
+`Profile.write` emits collapsed stacks (`tag;frame;frame <microseconds>`)
+for wall and CPU time, which flamegraph.pl, speedscope and inferno read
+directly, plus a JSON summary of wall/CPU seconds per tag.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+logger = logging.getLogger("aura.profiling")
+
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+@dataclass
+class Profile:
+    started_at: datetime
+    seconds: float = 0.0
+    samples: int = 0
+    wall: Counter = field(default_factory=Counter)
+    cpu: Counter = field(default_factory=Counter)
+    tag_wall: Counter = field(default_factory=Counter)
+    tag_cpu: Counter = field(default_factory=Counter)
+    tag_samples: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "seconds": round(self.seconds, 3),
+            "samples": self.samples,
+            "tags": {
+                tag: {
+                    "samples": self.tag_samples[tag],
+                    "wall_seconds": round(self.tag_wall[tag], 6),
+                    "cpu_seconds": round(self.tag_cpu[tag], 6),
+                }
+                for tag, _ in self.tag_wall.most_common()
+            },
+        }
+
+    def write(self, directory: str | Path, prefix: str) -> dict[str, Path]:
+        """Write `<prefix>.wall.collapsed`, `<prefix>.cpu.collapsed` and `<prefix>.summary.json`."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "wall": directory / f"{prefix}.wall.collapsed",
+            "cpu": directory / f"{prefix}.cpu.collapsed",
+            "summary": directory / f"{prefix}.summary.json",
+        }
+        for kind, stacks in (("wall", self.wall), ("cpu", self.cpu)):
+            lines = [f"{stack} {round(seconds * 1e6)}" for stack, seconds in stacks.most_common() if seconds >= 5e-7]
+            paths[kind].write_text("\n".join(lines) + ("\n" if lines else ""))
+        paths["summary"].write_text(json.dumps(self.summary(), indent=2))
+        return paths
+
+
+def _thread_cpu(thread_id: int) -> float | None:
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):  # pragma: no cover - non-POSIX or thread already gone
+        return None
+
+
+class SamplingProfiler:
+    def __init__(self, tags: Mapping[CodeType, str] | None = None, *, interval: float = 0.005) -> None:
+        self.tags = dict(tags or {})
+        self.interval = interval
+        self._labels: dict[CodeType, str] = {}
+        self._lock = threading.Lock()
+        self._profile = Profile(datetime.utcnow())
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last: float | None = None
+        self._last_cpu: dict[int, float] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._last = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="aura-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> Profile:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.reset()
+
+    def reset(self) -> Profile:
+        """Return the profile gathered so far and start a new one."""
+        with self._lock:
+            profile, self._profile = self._profile, Profile(datetime.utcnow())
+        return profile
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for root in sys.path:
+                if root and filename.startswith(root):
+                    filename = filename[len(root) :].lstrip(os.sep)
+                    break
+            label = self._labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ",")
+        return label
+
+    def sample(self) -> None:
+        now = time.perf_counter()
+        elapsed = now - (self._last or now)
+        self._last = now
+        own = threading.get_ident()
+        frames = sys._current_frames()
+        with self._lock:
+            profile = self._profile
+            profile.seconds += elapsed
+            profile.samples += 1
+            for thread_id, frame in frames.items():
+                if thread_id == own:
+                    continue
+                cpu_now = _thread_cpu(thread_id)
+                cpu = None
+                if cpu_now is not None:
+                    cpu = max(cpu_now - self._last_cpu.get(thread_id, cpu_now), 0.0)
+                    self._last_cpu[thread_id] = cpu_now
+                self._record(profile, frame, elapsed, cpu)
+
+    def _record(self, profile: Profile, leaf: FrameType, wall: float, cpu: float | None) -> None:
+        tag = None
+        codes: list[CodeType] = []
+        frame: FrameType | None = leaf
+        while frame is not None:
+            codes.append(frame.f_code)
+            if tag is None:
+                tag = self.tags.get(frame.f_code)
+            frame = frame.f_back
+        if tag is None:
+            if cpu is not None:
+                # An untagged thread that barely ran is parked (event loop poll, idle pool worker).
+                idle = cpu < wall / 2
+            else:
+                idle = (os.path.basename(leaf.f_code.co_filename), leaf.f_code.co_name) in IDLE_FRAMES
+            tag = "idle" if idle else "other"
+        cpu = cpu or 0.0
+        profile.tag_wall[tag] += wall
+        profile.tag_cpu[tag] += cpu
+        profile.tag_samples[tag] += 1
+        if tag == "idle":
+            return
+        stack = ";".join([tag, *(self._label(code) for code in reversed(codes))])
+        profile.wall[stack] += wall
+        if cpu:
+            profile.cpu[stack] += cpu
+
+
+def route_tags(routes) -> dict[CodeType, str]:
+    """Endpoint code object -> `METHOD /path` for each API route."""
+    tags = {}
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        methods = getattr(route, "methods", None)
+        if endpoint is None or not methods:
+            continue
+        code = getattr(inspect.unwrap(endpoint), "__code__", None)
+        if code is not None:
+            tags[code] = f"{'|'.join(sorted(methods))} {route.path}"
+    return tags
+
+
+class ProfilingWorker:
+    """Samples continuously and writes one set of profile files per window."""
+
+    def __init__(
+        self, tags: Mapping[CodeType, str], *, directory: str | Path, window_seconds: float = 60.0, interval: float = 0.005
+    ) -> None:
+        self.directory = Path(directory)
+        self.window_seconds = window_seconds
+        self.profiler = SamplingProfiler(tags, interval=interval)
+        self._windows_total = 0
+        self._last_paths: dict[str, Path] | None = None
+        self._last_summary: dict[str, Any] | None = None
+
+    def flush(self) -> dict[str, Path]:
+        return self._write(self.profiler.reset())
+
+    def _write(self, profile: Profile) -> dict[str, Path]:
+        prefix = f"api-{profile.started_at:%Y%m%dT%H%M%S}-{os.getpid()}"
+        self._last_paths = profile.write(self.directory, prefix)
+        self._last_summary = profile.summary()
+        self._windows_total += 1
+        return self._last_paths
+
+    async def run(self) -> None:
+        self.profiler.start()
+        try:
+            while True:
+                await asyncio.sleep(self.window_seconds)
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as exc:  # pragma: no cover - defensive logging
+                    logger.warning("Writing profile failed: %s", exc)
+        finally:
+            profile = self.profiler.stop()
+            if profile.samples:
+                self._write(profile)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": True,
+            "directory": str(self.directory),
+            "window_seconds": self.window_seconds,
+            "interval_seconds": self.profiler.interval,
+            "windows_total": self._windows_total,
+            "last_files": {kind: str(path) for kind, path in (self._last_paths or {}).items()},
+            "last_window": self._last_summary,
+        }
+
+
+async def capture(
+    tags: Mapping[CodeType, str], *, seconds: float, directory: str | Path, interval: float = 0.005
+) -> tuple[dict[str, Path], dict[str, Any]]:
+    """Profile the process for `seconds` and write the result; the event loop keeps serving meanwhile."""
+    profiler = SamplingProfiler(tags, interval=interval)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = await asyncio.to_thread(profiler.stop)
+    prefix = f"api-capture-{profile.started_at:%Y%m%dT%H%M%S}-{os.getpid()}"
+    return profile.write(directory, prefix), profile.summary()
+
+
+_worker: ProfilingWorker | None = None
+_task: asyncio.Task | None = None
+
+
+def start(tags: Mapping[CodeType, str], **options: Any) -> ProfilingWorker:
+    """Start continuous profiling on the running event loop (FastAPI startup)."""
+    global _worker, _task
+    _worker = ProfilingWorker(tags, **options)
+    _task = asyncio.get_running_loop().create_task(_worker.run())
+    return _worker
+
+
+async def stop() -> None:
+    global _worker, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _worker = None
+    _task = None
+
+
+def current() -> ProfilingWorker | None:
+    return _worker
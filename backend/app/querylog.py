@@ -0,0 +1,147 @@
+"""Per-request SQL accounting.
+
+`install` hooks an engine's cursor events. Queries run while a `QueryCounter`
+is active (the HTTP middleware activates one per request) are counted and
+timed, and grouped by statement shape so a statement repeated once per row
+(an N+1 pattern) stands out. Finished requests are folded into per-route
+totals for `/system/queries` and handed to any registered request hooks,
+which is how the `query_budget` test fixture observes requests served on the
+test client's thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("aura.queries")
+
+_IN_LIST = re.compile(r"\bIN \(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace collapsed and `IN (?, ?, ...)` lists folded to `IN (?...)`."""
+    return _IN_LIST.sub("IN (?...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryCounter:
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def redundant(self) -> int:
+        """Executions beyond the first of each statement shape."""
+        return self.count - len(self.shapes)
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        """Statement shapes executed at least `threshold` times."""
+        return {shape: count for shape, count in self.shapes.most_common() if count >= threshold}
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    queries: int = 0
+    seconds: float = 0.0
+    max_queries: int = 0
+    repeated_requests: int = 0
+
+
+_current: ContextVar[QueryCounter | None] = ContextVar("aura_query_counter", default=None)
+_lock = threading.Lock()
+_routes: dict[str, RouteStats] = {}
+_totals = {"queries": 0, "seconds": 0.0}
+request_hooks: list[Callable[[str, QueryCounter], None]] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("aura_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["aura_query_start"].pop()
+    with _lock:
+        _totals["queries"] += 1
+        _totals["seconds"] += elapsed
+    counter = _current.get()
+    if counter is not None:
+        counter.record(statement, elapsed)
+
+
+def install(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track() -> Iterator[QueryCounter]:
+    """Count the queries run in this context (and threads that copy it)."""
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+def finish_request(route: str, counter: QueryCounter, repeat_threshold: int) -> None:
+    """Fold a finished request into the per-route totals and warn about repeated statements."""
+    repeated = counter.repeated(repeat_threshold)
+    with _lock:
+        stats = _routes.setdefault(route, RouteStats())
+        stats.requests += 1
+        stats.queries += counter.count
+        stats.seconds += counter.seconds
+        stats.max_queries = max(stats.max_queries, counter.count)
+        stats.repeated_requests += 1 if repeated else 0
+    if repeated:
+        shape, count = next(iter(repeated.items()))
+        logger.warning("%s ran the same statement %d times (possible N+1): %s", route, count, shape[:200])
+    for hook in list(request_hooks):
+        hook(route, counter)
+
+
+def server_timing(counter: QueryCounter, total_seconds: float) -> str:
+    return (
+        f'db;dur={counter.seconds * 1000:.2f};desc="{counter.count} queries", '
+        f'db-repeated;desc="{counter.redundant()} repeated", '
+        f"app;dur={total_seconds * 1000:.2f}"
+    )
+
+
+def metrics() -> dict[str, Any]:
+    with _lock:
+        return {
+            "queries_total": _totals["queries"],
+            "db_seconds_total": _totals["seconds"],
+            "routes": {
+                route: {
+                    "requests": stats.requests,
+                    "queries_total": stats.queries,
+                    "avg_queries": stats.queries / stats.requests,
+                    "max_queries": stats.max_queries,
+                    "db_seconds_total": stats.seconds,
+                    "requests_with_repeats": stats.repeated_requests,
+                }
+                for route, stats in sorted(_routes.items())
+            },
+        }
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime
 from pathlib import Path
 
 from sqlmodel import Session, select
 
-from .db import engine
-from .db_models import Agent, Producer, WasteLot, WasteLotStatus
+from .db import get_engine
+from .db_models import Agent, Producer, SchemaVersion, WasteLot, WasteLotStatus
+from .services import composition, rollups
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 
-def seed_initial_data() -> None:
-    with Session(engine) as session:
+def seed_initial_data() -> bool:
+    """Load the bundled demo producers, lots and agents into an empty database; returns True if it did."""
+    with Session(get_engine()) as session:
         if session.exec(select(Producer)).first():
-            return
+            _mark_seeded(session)
+            return False
 
         waste_lots_data = _load_json("waste_lots.json")
         agents_data = _load_json("agents.json")
@@ -65,6 +69,8 @@ def seed_initial_data() -> None:
                 waste_lot.photos = [verification.get("evidence_uri")] if verification.get("evidence_uri") else []
 
             session.add(waste_lot)
+            rollups.record_lot(session, waste_lot)
+            composition.record_lot(session, waste_lot)
 
         for agent in agents_data:
             owner_name = agent.get("owner", "Unknown")
@@ -88,7 +94,16 @@ def seed_initial_data() -> None:
                 )
             )
 
-        session.commit()
+        _mark_seeded(session)
+        return True
+
+
+def _mark_seeded(session: Session) -> None:
+    version = session.get(SchemaVersion, 1)
+    if version is not None and version.seeded_at is None:
+        version.seeded_at = datetime.utcnow()
+        session.add(version)
+    session.commit()
 
 
 def _load_json(filename: str):
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def json_response(value: Any, annotation: Any, status_code: int = 200) -> Response:
+    """Serialize already-validated models straight to JSON bytes.
+
+    Returning a `Response` lets FastAPI skip re-validating the payload against
+    the route's `response_model`, which stays on the decorator for the OpenAPI
+    schema only. Callers must pass values that already match `annotation`.
+    """
+    return Response(
+        content=_adapter(annotation).dump_json(value),
+        media_type="application/json",
+        status_code=status_code,
+    )
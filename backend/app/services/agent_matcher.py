@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable
+import logging
+import math
+from typing import TYPE_CHECKING, Iterable
 
 from sqlmodel import Session, select
 
-from ..db_models import Agent, Negotiation, WasteLot, WasteLotStatus
-from ..crud import create_negotiation
+from ..db_models import Agent, MintJob, Negotiation, WasteLot, WasteLotStatus
+from ..crud import PENDING_MINT_STATUSES, create_negotiation, mark_lot_negotiating
+from . import composition
+from .strategy import CompiledStrategy, StrategyError, compile_strategy
+
+if TYPE_CHECKING:
+    from .oracle import OracleFeedCache
+
+logger = logging.getLogger("aura.matchmaking")
+
+_ELIGIBLE_STATUSES = (WasteLotStatus.VERIFIED, WasteLotStatus.TOKENIZED)
 
 
 class AgentMatchmaker:
@@ -14,29 +24,39 @@ class AgentMatchmaker:
 
     This class inspects verified/tokenized waste lots, pairs them with
     recycler agents whose bidding constraints are satisfied, and records
-    negotiation stubs that can later be accepted or countered.
+    negotiation stubs that can later be accepted or countered. When an oracle
+    feed cache is supplied, recycler offers track its reference prices.
+    Recyclers with strategy rules (see `services.strategy`) get their price
+    cap and opening offer per lot from the first matching rule instead, and
+    recyclers declaring `composition` requirements only see lots whose
+    indexed assay readings meet them.
     """
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, feeds: OracleFeedCache | None = None) -> None:
         self.session = session
+        self.feeds = feeds
 
     def propose_matches(self) -> list[Negotiation]:
         lots = self._eligible_lots()
         recycler_agents = self._recycler_agents()
+        strategies = self._strategies(recycler_agents)
+        assays = self._lots_meeting_composition(recycler_agents)
+
+        producer_agents = self._producer_agents()
 
         negotiations: list[Negotiation] = []
         for lot in lots:
-            producer_agent = self._producer_agent_for_lot(lot)
+            producer_agent = producer_agents.get(lot.producer_id)
             if not producer_agent:
                 continue
 
-            for recycler_agent in recycler_agents:
-                if not self._meets_price_expectations(lot, recycler_agent):
-                    continue
-
-                producer_offer = producer_agent.target_price_usd_per_ton or lot.price_floor_usd_per_ton
-                recycler_offer = self._suggest_recycler_offer(lot, recycler_agent)
+            producer_offer = producer_agent.target_price_usd_per_ton or lot.price_floor_usd_per_ton
+            candidates = [agent for agent in recycler_agents if agent.id not in assays or lot.id in assays[agent.id]]
+            offers = self._recycler_offers(lot, candidates, strategies, producer_offer)
+            if not offers or not mark_lot_negotiating(self.session, lot):
+                continue
 
+            for recycler_agent, recycler_offer in offers:
                 negotiation = create_negotiation(
                     self.session,
                     lot,
@@ -47,44 +67,125 @@ class AgentMatchmaker:
                 )
                 negotiations.append(negotiation)
 
-                if lot.status != WasteLotStatus.NEGOTIATING:
-                    lot.status = WasteLotStatus.NEGOTIATING
-                    lot.updated_at = datetime.utcnow()
-                    self.session.add(lot)
-                    self.session.commit()
-
         return negotiations
 
     def _eligible_lots(self) -> Iterable[WasteLot]:
-        statuses = {WasteLotStatus.VERIFIED, WasteLotStatus.TOKENIZED}
+        # A lot with a mint in flight would be NEGOTIATING when the worker records its token, which then fails.
+        minting = select(MintJob.waste_lot_id).where(MintJob.status.in_(PENDING_MINT_STATUSES))
         return self.session.exec(
-            select(WasteLot).where(WasteLot.status.in_(statuses)).order_by(WasteLot.updated_at.desc())
+            select(WasteLot)
+            .where(WasteLot.status.in_(_ELIGIBLE_STATUSES), WasteLot.id.not_in(minting))
+            .order_by(WasteLot.updated_at.desc())
         ).all()
 
-    def _producer_agent_for_lot(self, lot: WasteLot) -> Agent | None:
-        return self.session.exec(
-            select(Agent)
-            .where(Agent.agent_type == "producer")
-            .where(Agent.producer_id == lot.producer_id)
-            .order_by(Agent.updated_at.desc())
-        ).first()
+    def _producer_agents(self) -> dict[int, Agent]:
+        """Most recently updated producer agent per producer, loaded in one query."""
+        agents: dict[int, Agent] = {}
+        for agent in self.session.exec(
+            select(Agent).where(Agent.agent_type == "producer").order_by(Agent.updated_at.desc())
+        ).all():
+            agents.setdefault(agent.producer_id, agent)
+        return agents
 
     def _recycler_agents(self) -> list[Agent]:
         return self.session.exec(
             select(Agent).where(Agent.agent_type == "recycler").order_by(Agent.updated_at.desc())
         ).all()
 
-    def _meets_price_expectations(self, lot: WasteLot, recycler_agent: Agent) -> bool:
-        if recycler_agent.max_price_usd_per_ton is None:
+    def _strategies(self, recycler_agents: list[Agent]) -> dict[int, CompiledStrategy | None]:
+        """Compiled rule sets of the recyclers that have one (None if invalid), compiled once per agent version."""
+        strategies = {}
+        for agent in recycler_agents:
+            try:
+                strategy = compile_strategy(agent.id, agent.strategy_metadata)
+            except StrategyError as exc:
+                logger.warning("Skipping recycler agent %s with invalid strategy: %s", agent.id, exc)
+                strategies[agent.id] = None
+                continue
+            if strategy is not None:
+                strategies[agent.id] = strategy
+        return strategies
+
+    def _lots_meeting_composition(self, recycler_agents: list[Agent]) -> dict[int, set[int]]:
+        """Eligible lot IDs per recycler declaring `composition` requirements, one indexed query each."""
+        assays = {}
+        for agent in recycler_agents:
+            declared = (agent.strategy_metadata or {}).get("composition")
+            if not declared:
+                continue
+            try:
+                requirements = composition.parse_requirements(declared)
+            except (ValueError, TypeError) as exc:
+                logger.warning("Skipping recycler agent %s with invalid composition requirements: %s", agent.id, exc)
+                assays[agent.id] = set()
+                continue
+            query = select(WasteLot.id).where(
+                WasteLot.status.in_(_ELIGIBLE_STATUSES), *composition.filters(requirements)
+            )
+            assays[agent.id] = set(self.session.exec(query).all())
+        return assays
+
+    def _recycler_offers(
+        self,
+        lot: WasteLot,
+        recycler_agents: list[Agent],
+        strategies: dict[int, CompiledStrategy | None],
+        producer_offer: float | None,
+    ) -> list[tuple[Agent, float | None]]:
+        """`(recycler agent, opening offer)` for each recycler interested in `lot`."""
+        offers = []
+        for agent in recycler_agents:
+            if agent.id not in strategies:
+                max_bid = agent.max_price_usd_per_ton
+                if self._meets_price_expectations(lot, max_bid):
+                    offers.append((agent, self._suggest_recycler_offer(lot, max_bid, agent.target_price_usd_per_ton)))
+                continue
+
+            strategy = strategies[agent.id]
+            if strategy is None:
+                continue
+            try:
+                decision = strategy.decide(
+                    {
+                        "material_type": lot.material_type,
+                        "quantity_tons": lot.quantity_tons,
+                        "floor": lot.price_floor_usd_per_ton,
+                        "price": producer_offer,
+                        "reference": self.feeds.reference_price(lot.material_type) if self.feeds else None,
+                        "max_price": agent.max_price_usd_per_ton,
+                        "target_price": agent.target_price_usd_per_ton,
+                    }
+                )
+            except StrategyError as exc:
+                logger.warning("Strategy of recycler agent %s failed on lot %s: %s", agent.id, lot.id, exc)
+                continue
+            if decision is None:
+                continue
+            max_bid = None if math.isnan(decision.max_price) else decision.max_price
+            if not self._meets_price_expectations(lot, max_bid):
+                continue
+            if math.isnan(decision.offer):
+                offer = self._suggest_recycler_offer(lot, max_bid, agent.target_price_usd_per_ton)
+            else:
+                offer = min(max_bid, decision.offer) if max_bid is not None else decision.offer
+            offers.append((agent, offer))
+        return offers
+
+    def _meets_price_expectations(self, lot: WasteLot, max_price: float | None) -> bool:
+        if max_price is None:
             return True
         if lot.price_floor_usd_per_ton is None:
             return True
-        return lot.price_floor_usd_per_ton <= recycler_agent.max_price_usd_per_ton
+        return lot.price_floor_usd_per_ton <= max_price
 
-    def _suggest_recycler_offer(self, lot: WasteLot, recycler_agent: Agent) -> float | None:
+    def _suggest_recycler_offer(self, lot: WasteLot, max_bid: float | None, target: float | None) -> float | None:
         floor = lot.price_floor_usd_per_ton or 0
-        max_bid = recycler_agent.max_price_usd_per_ton
-        target = recycler_agent.target_price_usd_per_ton or max_bid
+        target = target or max_bid
+
+        reference = self.feeds.reference_price(lot.material_type) if self.feeds else None
+        if reference is not None:
+            offer = max(floor, reference)
+            return min(max_bid, offer) if max_bid is not None else offer
 
         if max_bid is None and target is None:
             return floor
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import Session, select
+
+from .. import db
+from ..db_models import AnchorBatch, AnchorLeaf, WasteLotToken
+from .aptos import AptosTokenService, PartialChainError
+
+logger = logging.getLogger("aura.anchoring")
+
+PROOF = "proof"
+VERIFICATION = "verification"
+
+
+def leaf_hash(kind: str, source_id: int, waste_lot_id: int, checksum: str | None, extra: str | None = None) -> str:
+    payload = f"{kind}:{source_id}:{waste_lot_id}:{checksum or ''}:{extra or ''}".encode()
+    return hashlib.sha256(b"\x00" + payload).hexdigest()
+
+
+def _node(left: str, right: str) -> str:
+    return hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def merkle_levels(leaves: list[str]) -> list[list[str]]:
+    """All tree levels from the leaves up; an odd node is carried up unchanged."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_node(level[index], level[index + 1]) for index in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(leaves: list[str]) -> str:
+    return merkle_levels(leaves)[-1][0]
+
+
+def inclusion_path(leaves: list[str], index: int) -> list[dict[str, str]]:
+    """Sibling hashes from leaf to root; `side` says where the sibling sits."""
+    path: list[dict[str, str]] = []
+    for level in merkle_levels(leaves)[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append({"hash": level[sibling], "side": "left" if sibling < index else "right"})
+        index //= 2
+    return path
+
+
+def verify_inclusion(leaf: str, path: list[dict[str, str]], root: str) -> bool:
+    current = leaf
+    for step in path:
+        current = _node(step["hash"], current) if step["side"] == "left" else _node(current, step["hash"])
+    return current == root
+
+
+def record_leaf(
+    session: Session,
+    kind: str,
+    source_id: int,
+    waste_lot_id: int,
+    checksum: str | None,
+    *,
+    extra: str | None = None,
+    retire_token_address: str | None = None,
+) -> None:
+    """Queue a leaf for the next anchor batch, inside the caller's transaction."""
+    session.add(
+        AnchorLeaf(
+            kind=kind,
+            source_id=source_id,
+            waste_lot_id=waste_lot_id,
+            leaf_hash=leaf_hash(kind, source_id, waste_lot_id, checksum, extra),
+            retire_token_address=retire_token_address,
+        )
+    )
+
+
+def inclusion(session: Session, kind: str, source_id: int) -> dict[str, Any] | None:
+    leaf = session.exec(select(AnchorLeaf).where(AnchorLeaf.kind == kind, AnchorLeaf.source_id == source_id)).first()
+    if leaf is None:
+        return None
+    result: dict[str, Any] = {"leaf_hash": leaf.leaf_hash, "anchored": leaf.batch_id is not None}
+    if leaf.batch_id is None:
+        return result
+    batch = session.get(AnchorBatch, leaf.batch_id)
+    hashes = session.exec(
+        select(AnchorLeaf.leaf_hash).where(AnchorLeaf.batch_id == batch.id).order_by(AnchorLeaf.leaf_index)
+    ).all()
+    result.update(
+        batch_id=batch.id,
+        leaf_index=leaf.leaf_index,
+        leaf_count=batch.leaf_count,
+        merkle_root=batch.merkle_root,
+        transaction_hash=batch.transaction_hash,
+        chain_anchor_id=batch.chain_anchor_id,
+        anchored_at=batch.anchored_at,
+        path=inclusion_path(list(hashes), leaf.leaf_index),
+    )
+    return result
+
+
+class AnchoringService:
+    """Anchors pending leaves as one Merkle root per window.
+
+    Every `window_seconds` the pending leaves (up to `max_leaves`) are hashed
+    into a tree and only the root goes on chain, together with the token
+    retirements of the proofs approved in that window. On-chain transactions
+    per proof drop from one to roughly 1/N for a window of N leaves.
+    """
+
+    def __init__(self, service: AptosTokenService, *, window_seconds: float = 60.0, max_leaves: int = 4096) -> None:
+        self.service = service
+        self.window_seconds = window_seconds
+        self.max_leaves = max_leaves
+        self._batches_total = 0
+        self._leaves_total = 0
+        self._last_anchored_at: datetime | None = None
+
+    def flush(self) -> AnchorBatch | None:
+        with db.session_scope() as session:
+            leaves = session.exec(
+                select(AnchorLeaf).where(AnchorLeaf.batch_id.is_(None)).order_by(AnchorLeaf.id).limit(self.max_leaves)
+            ).all()
+            if not leaves:
+                return None
+            hashes = [leaf.leaf_hash for leaf in leaves]
+            root = merkle_root(hashes)
+            retire = [leaf.retire_token_address for leaf in leaves if leaf.retire_token_address]
+            try:
+                result = self.service.anchor_batch(root, len(leaves), retire)
+            except PartialChainError as exc:
+                # The leaves wait for the next flush, but tokens already burned on chain stay recorded.
+                self._record_retirements(session, exc.partial)
+                session.commit()
+                raise
+
+            now = datetime.utcnow()
+            batch = AnchorBatch(
+                merkle_root=root,
+                leaf_count=len(leaves),
+                transaction_hash=result.transaction_hash,
+                chain_anchor_id=result.anchor_id,
+                anchored_at=now,
+            )
+            session.add(batch)
+            session.flush()
+            for index, leaf in enumerate(leaves):
+                leaf.batch_id = batch.id
+                leaf.leaf_index = index
+                session.add(leaf)
+            self._record_retirements(session, result.retire_transaction_hashes)
+            session.commit()
+            session.refresh(batch)
+
+        self._batches_total += 1
+        self._leaves_total += batch.leaf_count
+        self._last_anchored_at = now
+        logger.info("Anchored %d leaf(s) in batch %d (%s)", batch.leaf_count, batch.id, batch.transaction_hash)
+        return batch
+
+    @staticmethod
+    def _record_retirements(session: Session, retire_transaction_hashes: dict[str, str]) -> None:
+        if not retire_transaction_hashes:
+            return
+        tokens = session.exec(
+            select(WasteLotToken).where(WasteLotToken.token_address.in_(list(retire_transaction_hashes)))
+        ).all()
+        for token in tokens:
+            token.retire_transaction_hash = retire_transaction_hashes[token.token_address]
+            session.add(token)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            try:
+                while (batch := await asyncio.to_thread(self.flush)) and batch.leaf_count >= self.max_leaves:
+                    pass
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Anchoring failed: %s", exc)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": True,
+            "window_seconds": self.window_seconds,
+            "batches_total": self._batches_total,
+            "leaves_total": self._leaves_total,
+            "avg_leaves_per_batch": self._leaves_total / self._batches_total if self._batches_total else None,
+            "last_anchored_at": self._last_anchored_at,
+        }
+
+
+_service: AnchoringService | None = None
+_task: asyncio.Task | None = None
+
+
+def start(service: AptosTokenService, **options: Any) -> AnchoringService:
+    """Start the anchoring loop on the running event loop (FastAPI startup)."""
+    global _service, _task
+    _service = AnchoringService(service, **options)
+    _task = asyncio.get_running_loop().create_task(_service.run())
+    return _service
+
+
+async def stop() -> None:
+    global _service, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _service = None
+    _task = None
+
+
+def current() -> AnchoringService | None:
+    return _service
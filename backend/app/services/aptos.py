@@ -1,8 +1,61 @@
 from __future__ import annotations
 
-import secrets
+import logging
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+from .chain import (
+    AURA_ADDRESS,
+    ESCROW_CREATED,
+    ESCROW_FUNDED,
+    LOT_TOKENIZED,
+    ChainBackend,
+    ChainError,
+    MoveAbort,
+    TransactionReceipt,
+    entry,
+    get_chain_backend,
+)
+
+logger = logging.getLogger("aura.aptos")
+
+TOKEN_PREFIX = "0xLOT"
+_TOKEN_HASH_CHARS = 16
+
+
+def token_address(chain_lot_id: int, transaction_hash: str) -> str:
+    """`0xLOT`, the chain lot ID (zero-padded to at least six digits), then 16 hex digits of the mint hash."""
+    return f"{TOKEN_PREFIX}{chain_lot_id:06d}{transaction_hash[2:2 + _TOKEN_HASH_CHARS]}"
+
+
+def chain_lot_id_of(address: str) -> int | None:
+    """The chain lot ID a `token_address` embeds, or None for addresses not minted here.
+
+    The hash suffix has a fixed width, so the ID is read as everything between
+    the prefix and the suffix; it may have more than six digits.
+    """
+    digits = address[len(TOKEN_PREFIX):-_TOKEN_HASH_CHARS]
+    if not address.startswith(TOKEN_PREFIX) or not (digits.isascii() and digits.isdigit()):
+        return None
+    return int(digits)
+
+
+def token_address_pattern(chain_lot_id: int) -> str:
+    """A LIKE pattern matching exactly the token addresses minted for one chain lot."""
+    return f"{TOKEN_PREFIX}{chain_lot_id:06d}" + "_" * _TOKEN_HASH_CHARS
+
+
+class PartialChainError(ChainError):
+    """A batched operation failed after some of its transactions had landed.
+
+    `partial` describes what the landed transactions did; each method that
+    raises it documents the shape.
+    """
+
+    def __init__(self, message: str, partial: Any) -> None:
+        super().__init__(message)
+        self.partial = partial
 
 
 @dataclass(frozen=True)
@@ -11,39 +64,285 @@ class MintResult:
     transaction_hash: str
 
 
+@dataclass(frozen=True)
+class MintRequest:
+    lot_id: int
+    token_name: str
+    token_symbol: str
+    supply: int
+
+
 @dataclass(frozen=True)
 class BurnResult:
+    transaction_hash: str | None
+
+
+@dataclass(frozen=True)
+class AnchorResult:
     transaction_hash: str
+    anchor_id: int
+    retire_transaction_hashes: dict[str, str]
+
+
+@dataclass(frozen=True)
+class EscrowInstruction:
+    producer_address: str
+    recycler_address: str
+    amount: int
+    memo: str
+
+
+@dataclass(frozen=True)
+class EscrowResult:
+    escrow_id: int
+    transaction_hash: str | None
+
+
+@dataclass(frozen=True)
+class FeedUpdate:
+    feed_id: int
+    name: str
+    payload: str
+    lot_id: int | None = None
+    expires_at: int | None = None
 
 
 class AptosTokenService:
-    """Lightweight facade for the Aptos Move waste lot module.
+    """Facade over the Aptos Move waste lot module.
 
-    This implementation generates deterministic placeholder identifiers so the
-    backend can exercise happy paths without requiring on-chain connectivity.
-    When integrating with a live Aptos network, replace the `_simulate_*`
-    helpers with calls into the Aptos SDK or CLI.
+    Calls go through a `ChainBackend` (by default the process-wide
+    `SimulatedChain`). The backend database is the source of truth for
+    verification, so a mint registers, verifies and tokenizes the lot on chain
+    in three pipelined phases. Token addresses embed the on-chain lot id so
+    `retire_waste_lot` can address the lot later.
     """
 
-    def __init__(self, package_path: Path | None = None, network: str = "local") -> None:
+    def __init__(
+        self,
+        package_path: Path | None = None,
+        network: str = "local",
+        *,
+        backend: ChainBackend | None = None,
+        account: str = AURA_ADDRESS,
+        max_batch_size: int = 64,
+    ) -> None:
         self.package_path = package_path or Path(__file__).resolve().parents[3] / "blockchain"
         self.network = network
+        self.backend = backend or get_chain_backend()
+        self.account = account
+        self.max_batch_size = max_batch_size
 
     def mint_waste_lot(self, lot_id: int, token_name: str, token_symbol: str, supply: int) -> MintResult:
-        token_address = self._simulate_token_address(lot_id)
-        transaction_hash = self._simulate_transaction_hash(token_address)
-        return MintResult(token_address=token_address, transaction_hash=transaction_hash)
+        return self.mint_waste_lots([MintRequest(lot_id, token_name, token_symbol, supply)])[0]
+
+    def mint_waste_lots(self, requests: list[MintRequest]) -> list[MintResult]:
+        """Mint lots with up to `max_batch_size` `waste_lot::tokenize_lot` calls per transaction.
+
+        Raises `ChainError` if any transaction fails; lots registered before the
+        failure stay registered on chain and are registered again on retry.
+        """
+        results: list[MintResult] = []
+        for start in range(0, len(requests), self.max_batch_size):
+            batch = requests[start:start + self.max_batch_size]
+            registered = self._execute(
+                [entry("waste_lot", "register_lot", f"aura-lot-{request.lot_id}", "", 0, "") for request in batch]
+            )
+            chain_ids = [
+                event.data["lot_id"]
+                for receipt in registered
+                for event in receipt.events
+                if event.type.endswith("::LotRegistered")
+            ]
+            self._execute([entry("waste_lot", "submit_verification", chain_id, "aura-backend") for chain_id in chain_ids])
+            tokenized = self._execute(
+                [
+                    entry("waste_lot", "tokenize_lot", chain_id, request.token_symbol, request.supply)
+                    for chain_id, request in zip(chain_ids, batch)
+                ]
+            )
+            hashes = {event.data["lot_id"]: receipt.hash for receipt in tokenized for event in receipt.events}
+            results.extend(
+                MintResult(token_address=token_address(chain_id, hashes[chain_id]), transaction_hash=hashes[chain_id])
+                for chain_id in chain_ids
+            )
+        return results
 
     def retire_waste_lot(self, token_address: str) -> BurnResult:
-        transaction_hash = self._simulate_transaction_hash(token_address)
-        return BurnResult(transaction_hash=transaction_hash)
+        chain_id = self._chain_lot_id(token_address)
+        if chain_id is None:
+            logger.info("Token %s was not minted on this chain; skipping retire_lot", token_address)
+            return BurnResult(transaction_hash=None)
+        (receipt,) = self._execute([entry("waste_lot", "retire_lot", chain_id, "upcycled")])
+        return BurnResult(transaction_hash=receipt.hash)
 
-    @staticmethod
-    def _simulate_token_address(lot_id: int) -> str:
-        random_bits = secrets.token_hex(8)
-        return f"0xLOT{lot_id:06d}{random_bits}"
+    def anchor_batch(self, merkle_root: str, leaf_count: int, retire_token_addresses: list[str]) -> AnchorResult:
+        """Anchor a Merkle root, retiring the given tokens in the same transaction(s).
+
+        Tokens not minted on this chain (or already retired) are skipped. The
+        anchor call goes last; with more calls than fit in one transaction the
+        retirements spill into earlier transactions. If a transaction fails,
+        raises `PartialChainError` whose `partial` maps the token addresses
+        retired by the transactions that landed to their transaction hashes.
+        """
+        retirements = {
+            address: chain_id
+            for address in retire_token_addresses
+            if (chain_id := self._chain_lot_id(address)) is not None
+        }
+        calls = [entry("waste_lot", "retire_lot", chain_id, "upcycled") for chain_id in retirements.values()]
+        calls.append(entry("proof_anchor", "anchor_root", merkle_root, leaf_count))
+        try:
+            receipts = self._execute(calls)
+        except PartialChainError as exc:
+            retired_in = self._retired_in(receipt for _, receipt in exc.partial)
+            retired = {
+                address: retired_in[chain_id] for address, chain_id in retirements.items() if chain_id in retired_in
+            }
+            raise PartialChainError(str(exc), retired) from None
+
+        retired_in = self._retired_in(receipts)
+        anchor_id = next((
+            event.data["anchor_id"]
+            for receipt in receipts
+            for event in receipt.events
+            if event.type.endswith("::RootAnchored")
+        ), None)
+        return AnchorResult(
+            transaction_hash=receipts[-1].hash,
+            anchor_id=anchor_id,
+            retire_transaction_hashes={address: retired_in[chain_id] for address, chain_id in retirements.items()},
+        )
+
+    def settle_escrows(self, instructions: list[EscrowInstruction]) -> list[EscrowResult]:
+        """Open, fund, sign and finalize one escrow per instruction with batched calls.
+
+        `open` and `finalize` are batched from the marketplace account; each
+        recycler funds and signs all of its escrows in one transaction and each
+        producer signs all of its escrows in one, so the transaction count grows
+        with the number of distinct accounts rather than escrows. The
+        transaction hash reported per escrow is the one that finalized it.
+        Callers that must survive a failure between steps run `open_escrows`,
+        `sign_escrows` and `finalize_escrows` themselves and record progress.
+        """
+        if not instructions:
+            return []
+        escrow_ids = self.open_escrows(instructions)
+        self.sign_escrows(list(zip(escrow_ids, instructions)))
+        return self.finalize_escrows(escrow_ids)
+
+    def open_escrows(self, instructions: list[EscrowInstruction]) -> list[int]:
+        """Open one escrow per instruction; returns their IDs in order.
+
+        The opens may span several transactions. If one fails, raises
+        `PartialChainError` whose `partial` lists the escrow ID per
+        instruction, None where its transaction failed, so escrows that were
+        opened are not lost.
+        """
+        calls = [
+            entry("escrow_settlement", "open", 0, item.producer_address, item.recycler_address, item.amount, item.memo)
+            for item in instructions
+        ]
+        try:
+            opened = self._execute(calls)
+        except PartialChainError as exc:
+            escrow_ids: list[int | None] = []
+            for batch, receipt in exc.partial:
+                if receipt.success:
+                    escrow_ids += [event.data["escrow_id"] for event in receipt.events]
+                else:
+                    escrow_ids += [None] * len(batch)
+            raise PartialChainError(str(exc), escrow_ids) from None
+        return [event.data["escrow_id"] for receipt in opened for event in receipt.events]
+
+    def sign_escrows(self, escrows: list[tuple[int, EscrowInstruction]]) -> None:
+        """Fund and sign open escrows, submitting only the calls each one still lacks.
+
+        The escrow's on-chain state decides what is missing, so re-running this
+        after a partial failure never funds an escrow twice.
+        """
+        signer_calls: dict[str, list] = {}
+        for escrow_id, item in escrows:
+            status = self.backend.view("escrow_settlement", "escrow_status", escrow_id)
+            if status not in (ESCROW_CREATED, ESCROW_FUNDED):
+                continue
+            producer_signed, recycler_signed = self.backend.view("escrow_settlement", "signatures", escrow_id)
+            recycler_calls = signer_calls.setdefault(item.recycler_address, [])
+            if status == ESCROW_CREATED:
+                recycler_calls.append(entry("escrow_settlement", "fund", escrow_id, item.amount))
+            if not recycler_signed:
+                recycler_calls.append(entry("escrow_settlement", "sign_recycler", escrow_id))
+            if not producer_signed:
+                signer_calls.setdefault(item.producer_address, []).append(
+                    entry("escrow_settlement", "sign_producer", escrow_id)
+                )
+        signer_calls = {sender: calls for sender, calls in signer_calls.items() if calls}
+        if signer_calls:
+            self._execute_as(signer_calls)
+
+    def finalize_escrows(self, escrow_ids: list[int]) -> list[EscrowResult]:
+        """Finalize funded, fully signed escrows; already finalized ones report no transaction hash."""
+        pending = [
+            escrow_id
+            for escrow_id in escrow_ids
+            if self.backend.view("escrow_settlement", "escrow_status", escrow_id) == ESCROW_FUNDED
+        ]
+        finalized_in: dict[int, str | None] = {}
+        if pending:
+            finalized = self._execute([entry("escrow_settlement", "finalize", escrow_id) for escrow_id in pending])
+            finalized_in = {event.data["escrow_id"]: receipt.hash for receipt in finalized for event in receipt.events}
+        return [EscrowResult(escrow_id=escrow_id, transaction_hash=finalized_in.get(escrow_id)) for escrow_id in escrow_ids]
+
+    def publish_feeds(self, updates: list[FeedUpdate]) -> list[str]:
+        """Publish oracle feed values, batching `oracle_interface::publish` calls."""
+        receipts = self._execute(
+            [
+                entry("oracle_interface", "publish", item.feed_id, item.name, item.payload, item.lot_id, item.expires_at)
+                for item in updates
+            ]
+        )
+        return [receipt.hash for receipt in receipts]
+
+    def _execute(self, calls) -> list[TransactionReceipt]:
+        return self._execute_as({self.account: calls})
+
+    def _execute_as(self, calls_by_sender: dict[str, list]) -> list[TransactionReceipt]:
+        """Submit every sender's transactions before waiting so they can share blocks.
+
+        If any transaction fails, raises `PartialChainError` whose `partial` is
+        every `(calls, receipt)` pair in submission order, failed ones included.
+        """
+        step = self.backend.max_calls_per_transaction
+        batches = [
+            (sender, calls[start:start + step])
+            for sender, calls in calls_by_sender.items()
+            for start in range(0, len(calls), step)
+        ]
+        hashes = [self.backend.submit(sender, calls) for sender, calls in batches]
+        receipts = [self.backend.wait_for_transaction(txn_hash) for txn_hash in hashes]
+        failed = next((receipt for receipt in receipts if not receipt.success), None)
+        if failed is not None:
+            raise PartialChainError(
+                f"Transaction {failed.hash} failed: {failed.vm_status}",
+                [(calls, receipt) for (_, calls), receipt in zip(batches, receipts)],
+            )
+        return receipts
 
     @staticmethod
-    def _simulate_transaction_hash(token_address: str) -> str:
-        random_bits = secrets.token_hex(16)
-        return f"0xTX{random_bits}{token_address[-6:]}"
+    def _retired_in(receipts) -> dict[int, str]:
+        """Chain lot ID -> hash of the transaction that retired it."""
+        return {
+            event.data["lot_id"]: receipt.hash
+            for receipt in receipts
+            for event in receipt.events
+            if event.type.endswith("::LotRetired")
+        }
+
+    def _chain_lot_id(self, address: str) -> int | None:
+        chain_id = chain_lot_id_of(address)
+        if chain_id is None:
+            return None
+        try:
+            status = self.backend.view("waste_lot", "lot_status", chain_id)
+        except MoveAbort:
+            return None
+        return chain_id if status == LOT_TOKENIZED else None
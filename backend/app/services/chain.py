@@ -0,0 +1,844 @@
+"""Pluggable chain backends for the Aptos Move package in `blockchain/sources`.
+
+`ChainBackend` is the narrow interface the backend's chain paths use: submit
+a transaction of entry-function calls, wait for it, read views and follow the
+event log. `SimulatedChain` implements it in-process with a deterministic
+model of the `roles`, `waste_lot`, `escrow_settlement`, `certification`,
+`proof_anchor` and `oracle_interface` modules so chain-heavy paths can be benchmarked without a node.
+
+A `SimulatedChain` is process memory: under `serve --workers N` each worker
+has its own, and lot IDs, escrows and feeds on one are unknown to the others.
+The API therefore keeps every chain write in the leader worker (see
+`app.coordination`); followers' chain views only reflect their own, empty
+chain, and a restart starts a new chain.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import inspect
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from ..config import get_settings
+
+AURA_ADDRESS = "0xa11ce"
+TREASURY_ADDRESS = "0x7ea5"
+
+
+class ChainError(Exception):
+    """A transaction was rejected before execution or could not be confirmed."""
+
+
+class MoveAbort(Exception):
+    def __init__(self, code: int, location: str = "") -> None:
+        super().__init__(f"Move abort in {location or 'unknown'}: code {code}")
+        self.code = code
+        self.location = location
+
+
+@dataclass(frozen=True)
+class EntryFunction:
+    module: str
+    function: str
+    args: tuple[Any, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return f"{self.module}::{self.function}"
+
+
+def entry(module: str, function: str, *args: Any) -> EntryFunction:
+    return EntryFunction(module, function, args)
+
+
+@dataclass(frozen=True)
+class ChainEvent:
+    version: int
+    index: int
+    type: str
+    data: dict[str, Any]
+    transaction_hash: str = ""
+    timestamp: int = 0
+
+
+@dataclass
+class TransactionReceipt:
+    hash: str
+    sender: str
+    sequence_number: int
+    version: int
+    block_height: int
+    timestamp: int
+    success: bool
+    vm_status: str
+    gas_used: int
+    events: list[ChainEvent] = field(default_factory=list)
+
+
+class ChainBackend(ABC):
+    max_calls_per_transaction: int = 64
+
+    @abstractmethod
+    def submit(self, sender: str, calls: list[EntryFunction]) -> str:
+        """Queue a transaction and return its hash without waiting for execution."""
+
+    @abstractmethod
+    def wait_for_transaction(self, txn_hash: str) -> TransactionReceipt:
+        """Block until the transaction is committed and confirmed."""
+
+    @abstractmethod
+    def sequence_number(self, account: str) -> int:
+        ...
+
+    @abstractmethod
+    def view(self, module: str, function: str, *args: Any) -> Any:
+        ...
+
+    @abstractmethod
+    def events(self, start_version: int = 0, limit: int = 1000) -> list[ChainEvent]:
+        ...
+
+    @abstractmethod
+    def ledger_version(self) -> int:
+        """Version of the latest committed transaction."""
+
+    def execute(self, sender: str, calls: list[EntryFunction]) -> TransactionReceipt:
+        return self.wait_for_transaction(self.submit(sender, calls))
+
+    def execute_batched(self, sender: str, calls: list[EntryFunction]) -> list[TransactionReceipt]:
+        """Split `calls` into transactions of at most `max_calls_per_transaction`.
+
+        All transactions are submitted before waiting so consecutive sequence
+        numbers can land in the same block.
+        """
+        step = self.max_calls_per_transaction
+        hashes = [self.submit(sender, calls[start:start + step]) for start in range(0, len(calls), step)]
+        return [self.wait_for_transaction(txn_hash) for txn_hash in hashes]
+
+
+@dataclass
+class _Pending:
+    hash: str
+    sender: str
+    sequence_number: int
+    calls: list[EntryFunction]
+
+
+class _Frame:
+    """Execution context for one transaction; writes are undone if it aborts."""
+
+    def __init__(self, chain: SimulatedChain, sender: str) -> None:
+        self.chain = chain
+        self.sender = sender
+        self.undo: list[tuple[dict, Any, Any]] = []
+        self.events: list[tuple[str, dict[str, Any]]] = []
+
+    def get(self, table: str, key: Any) -> Any:
+        return self.chain._tables[table].get(key)
+
+    def put(self, table: str, key: Any, value: Any) -> None:
+        store = self.chain._tables[table]
+        self.undo.append((store, key, store.get(key, _MISSING)))
+        store[key] = value
+
+    def next_id(self, counter: str) -> int:
+        value = self.get("counters", counter)
+        self.put("counters", counter, value + 1)
+        return value
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        self.events.append((event_type, data))
+
+    def rollback(self) -> None:
+        for store, key, previous in reversed(self.undo):
+            if previous is _MISSING:
+                store.pop(key, None)
+            else:
+                store[key] = previous
+
+
+_MISSING = object()
+_ENTRY_FUNCTIONS: dict[str, Callable[..., None]] = {}
+_GAS = {"register_lot": 900, "tokenize_lot": 600, "open": 1200, "finalize": 800, "issue": 700}
+
+
+def _entry(name: str):
+    def register(handler: Callable[..., None]) -> Callable[..., None]:
+        _ENTRY_FUNCTIONS[name] = handler
+        return handler
+
+    return register
+
+
+def read_events(backend: ChainBackend, start_version: int, limit: int) -> tuple[list[ChainEvent], int, bool]:
+    """Read about `limit` events from `start_version`, cut at a transaction boundary.
+
+    Returns the events, the version to resume from and whether more events may
+    follow. Only whole transactions are returned, so consumers never see an
+    event twice; a transaction with more than `limit` events is read whole.
+    """
+    events = backend.events(start_version, limit)
+    while len(events) == limit and events[0].version == events[-1].version:
+        limit *= 2
+        events = backend.events(start_version, limit)
+    if len(events) < limit:
+        return events, events[-1].version + 1 if events else start_version, False
+    last = events[-1].version
+    return [event for event in events if event.version < last], last, True
+
+
+def _validate_arguments(call: EntryFunction) -> None:
+    handler = _ENTRY_FUNCTIONS.get(call.name)
+    if handler is None:
+        raise ChainError(f"FUNCTION_NOT_FOUND: {call.name}")
+    try:
+        inspect.signature(handler).bind(None, None, *call.args)
+    except TypeError as exc:
+        raise ChainError(f"NUMBER_OF_ARGUMENTS_MISMATCH: {call.name}: {exc}") from exc
+
+
+def _check(condition: bool, code: int) -> None:
+    if not condition:
+        raise MoveAbort(code)
+
+
+class SimulatedChain(ChainBackend):
+    """Deterministic in-process model of an Aptos node running the AURA package.
+
+    Transactions wait in a mempool until a block is produced; blocks are
+    produced on demand by `wait_for_transaction` (or `produce_block`), advance
+    the chain clock by `block_time_seconds` and include at most
+    `max_transactions_per_block` transactions whose sequence numbers are next
+    for their sender. A transaction is confirmed `confirmation_blocks` blocks
+    after inclusion. With `realtime=True` each block also sleeps for the block
+    time, which makes latency visible to benchmarks.
+
+    Failures: `failure_rate` aborts a seeded-random fraction of transactions
+    and `inject_failures` aborts the next N. Aborted transactions still use
+    their sequence number and gas, and none of their writes are kept.
+
+    The Move sources do not emit events; the simulator records one per state
+    change (e.g. `waste_lot::LotTokenized`) so indexers have a feed to follow.
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        block_time_seconds: float = 1.0,
+        confirmation_blocks: int = 1,
+        max_calls_per_transaction: int = 64,
+        max_transactions_per_block: int = 100,
+        failure_rate: float = 0.0,
+        realtime: bool = False,
+        genesis_timestamp: int = 1_700_000_000,
+        admin: str = AURA_ADDRESS,
+        treasury: str = TREASURY_ADDRESS,
+        agent_fee_bps: int = 250,
+        treasury_fee_bps: int = 100,
+    ) -> None:
+        self.block_time_seconds = block_time_seconds
+        self.confirmation_blocks = max(confirmation_blocks, 1)
+        self.max_calls_per_transaction = max_calls_per_transaction
+        self.max_transactions_per_block = max_transactions_per_block
+        self.failure_rate = failure_rate
+        self.realtime = realtime
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._clock = float(genesis_timestamp)
+        self._block_height = 0
+        self._version = 0
+        self._submitted = 0
+        self._forced_failures: list[str] = []
+        self._committed_sequence: dict[str, int] = {}
+        self._next_sequence: dict[str, int] = {}
+        self._mempool: list[_Pending] = []
+        self._receipts: dict[str, TransactionReceipt] = {}
+        self._events: list[ChainEvent] = []
+        self._event_versions: list[int] = []  # parallel to `_events`, for bisecting by version
+        self._gas_used_total = 0
+        self._failed_total = 0
+        self._tables: dict[str, dict[Any, Any]] = {
+            "counters": {"waste_lot": 1, "escrow": 1, "certification": 1, "proof_anchor": 1},
+            "roles": {},
+            "config": {
+                "admin": admin,
+                "treasury": treasury,
+                "agent_fee_bps": agent_fee_bps,
+                "treasury_fee_bps": treasury_fee_bps,
+            },
+            "waste_lot": {},
+            "escrow": {},
+            "certification": {},
+            "proof_anchor": {},
+            "oracle": {},
+        }
+        # Local genesis: the admin account holds every role, as in a dev deployment.
+        for role in ("producer", "marketplace", "compliance", "oracle"):
+            self._tables["roles"][(role, admin)] = True
+
+    # -- ChainBackend -------------------------------------------------
+
+    def submit(self, sender: str, calls: list[EntryFunction]) -> str:
+        if not calls:
+            raise ChainError("Transaction has no entry function calls")
+        if len(calls) > self.max_calls_per_transaction:
+            raise ChainError(
+                f"TRANSACTION_TOO_LARGE: {len(calls)} calls exceeds limit of {self.max_calls_per_transaction}"
+            )
+        for call in calls:
+            _validate_arguments(call)
+        with self._lock:
+            sequence_number = self._next_sequence.get(sender, self._committed_sequence.get(sender, 0))
+            self._next_sequence[sender] = sequence_number + 1
+            self._submitted += 1
+            digest = hashlib.sha256(f"{sender}:{sequence_number}:{calls!r}:{self._submitted}".encode()).hexdigest()
+            txn_hash = f"0x{digest}"
+            self._mempool.append(_Pending(txn_hash, sender, sequence_number, list(calls)))
+            return txn_hash
+
+    def wait_for_transaction(self, txn_hash: str) -> TransactionReceipt:
+        stalled = False
+        while True:
+            with self._lock:
+                receipt = self._receipts.get(txn_hash)
+                if receipt is not None and self._block_height - receipt.block_height + 1 >= self.confirmation_blocks:
+                    return receipt
+                if receipt is None and not any(pending.hash == txn_hash for pending in self._mempool):
+                    raise ChainError(f"Unknown transaction {txn_hash}")
+                if receipt is None and stalled:
+                    raise ChainError(f"Transaction {txn_hash} cannot be included (sequence number gap)")
+            # Not under the lock: in realtime mode a block sleeps, and other threads
+            # may produce the block that includes this transaction meanwhile.
+            stalled = not self.produce_block()
+
+    def sequence_number(self, account: str) -> int:
+        with self._lock:
+            return self._committed_sequence.get(account, 0)
+
+    def view(self, module: str, function: str, *args: Any) -> Any:
+        with self._lock:
+            handler = _VIEWS.get(f"{module}::{function}")
+            if handler is None:
+                raise ChainError(f"FUNCTION_NOT_FOUND: {module}::{function}")
+            return handler(self, *args)
+
+    def ledger_version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def events(self, start_version: int = 0, limit: int = 1000) -> list[ChainEvent]:
+        with self._lock:
+            # Events are appended in version order.
+            start = bisect.bisect_left(self._event_versions, start_version)
+            return self._events[start:start + limit]
+
+    # -- simulation controls ------------------------------------------
+
+    def inject_failures(self, count: int = 1, vm_status: str = "SIMULATED_FAILURE") -> None:
+        with self._lock:
+            self._forced_failures.extend([vm_status] * count)
+
+    def produce_block(self) -> int:
+        """Produce one block; returns the number of transactions it included."""
+        if self.realtime and self.block_time_seconds:
+            # Outside the lock, so views, submissions and event reads are not held up by block time.
+            time.sleep(self.block_time_seconds)
+        with self._lock:
+            self._block_height += 1
+            self._clock += self.block_time_seconds
+            included = 0
+            progressed = True
+            while progressed and included < self.max_transactions_per_block:
+                progressed = False
+                for pending in list(self._mempool):
+                    if included >= self.max_transactions_per_block:
+                        break
+                    if pending.sequence_number != self._committed_sequence.get(pending.sender, 0):
+                        continue
+                    self._mempool.remove(pending)
+                    self._execute(pending)
+                    included += 1
+                    progressed = True
+            return included
+
+    @property
+    def timestamp(self) -> int:
+        return int(self._clock)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "block_height": self._block_height,
+                "ledger_version": self._version,
+                "timestamp": self.timestamp,
+                "mempool": len(self._mempool),
+                "transactions_total": len(self._receipts),
+                "failed_total": self._failed_total,
+                "gas_used_total": self._gas_used_total,
+                "events_total": len(self._events),
+            }
+
+    # -- execution ----------------------------------------------------
+
+    def _execute(self, pending: _Pending) -> None:
+        self._version += 1
+        self._committed_sequence[pending.sender] = pending.sequence_number + 1
+        frame = _Frame(self, pending.sender)
+        gas_used = 10 + sum(_GAS.get(call.function, 300) for call in pending.calls)
+        vm_status = "Executed successfully"
+        success = True
+        if self._forced_failures:
+            vm_status, success = self._forced_failures.pop(0), False
+        elif self.failure_rate and self._rng.random() < self.failure_rate:
+            vm_status, success = "SIMULATED_FAILURE", False
+        else:
+            for call in pending.calls:
+                try:
+                    _ENTRY_FUNCTIONS[call.name](self, frame, *call.args)
+                except MoveAbort as abort:
+                    frame.rollback()
+                    vm_status = f"Move abort in {AURA_ADDRESS}::{call.name}: code {abort.code}"
+                    success = False
+                    break
+
+        events = (
+            [
+                ChainEvent(self._version, index, f"{AURA_ADDRESS}::{event_type}", data, pending.hash, self.timestamp)
+                for index, (event_type, data) in enumerate(frame.events)
+            ]
+            if success
+            else []
+        )
+        self._events.extend(events)
+        self._event_versions.extend(event.version for event in events)
+        self._gas_used_total += gas_used
+        self._failed_total += 0 if success else 1
+        self._receipts[pending.hash] = TransactionReceipt(
+            hash=pending.hash,
+            sender=pending.sender,
+            sequence_number=pending.sequence_number,
+            version=self._version,
+            block_height=self._block_height,
+            timestamp=self.timestamp,
+            success=success,
+            vm_status=vm_status,
+            gas_used=gas_used,
+            events=events,
+        )
+
+    def _has_role(self, role: str, account: str) -> bool:
+        return bool(self._tables["roles"].get((role, account)))
+
+    def _assert_role(self, role: str, account: str) -> None:
+        _check(self._has_role(role, account), 3)  # roles::ERR_ROLE_MISSING
+
+
+# -- roles --------------------------------------------------------------
+
+
+def _grant(role: str, add: bool):
+    def handler(chain: SimulatedChain, frame: _Frame, account: str) -> None:
+        _check(chain._tables["config"]["admin"] == frame.sender, 2)  # ERR_NOT_ADMIN
+        if add:
+            frame.put("roles", (role, account), True)
+        else:
+            _check(chain._has_role(role, account), 3)
+            frame.put("roles", (role, account), False)
+        frame.emit(f"roles::Role{'Granted' if add else 'Revoked'}", role=role, account=account)
+
+    return handler
+
+
+for _role in ("producer", "marketplace", "compliance", "oracle"):
+    _ENTRY_FUNCTIONS[f"roles::grant_{_role}"] = _grant(_role, True)
+    _ENTRY_FUNCTIONS[f"roles::revoke_{_role}"] = _grant(_role, False)
+
+
+# -- waste_lot ----------------------------------------------------------
+
+LOT_PENDING_VERIFICATION, LOT_VERIFIED, LOT_TOKENIZED, LOT_RETIRED = 0, 1, 2, 3
+
+
+def _lot(frame: _Frame, lot_id: int) -> dict[str, Any]:
+    lot = frame.get("waste_lot", lot_id)
+    _check(lot is not None, 2)  # ERR_UNKNOWN_LOT
+    return dict(lot)
+
+
+@_entry("waste_lot::register_lot")
+def _register_lot(
+    chain: SimulatedChain, frame: _Frame, external_ref: str, material_code: str, quantity_kg: int, metadata_uri: str
+) -> None:
+    chain._assert_role("producer", frame.sender)
+    lot_id = frame.next_id("waste_lot")
+    frame.put(
+        "waste_lot",
+        lot_id,
+        {
+            "id": lot_id,
+            "producer": frame.sender,
+            "holder": frame.sender,
+            "material_code": material_code,
+            "external_ref": external_ref,
+            "quantity_kg": quantity_kg,
+            "metadata_uri": metadata_uri,
+            "status": LOT_PENDING_VERIFICATION,
+            "created_at": chain.timestamp,
+            "updated_at": chain.timestamp,
+            "verified": False,
+            "verifier": None,
+            "token_symbol": "",
+            "token_supply": 0,
+            "retired": False,
+            "retired_reason": "",
+        },
+    )
+    frame.emit("waste_lot::LotRegistered", lot_id=lot_id, external_ref=external_ref, producer=frame.sender)
+
+
+@_entry("waste_lot::submit_verification")
+def _submit_verification(chain: SimulatedChain, frame: _Frame, lot_id: int, method: str) -> None:
+    chain._assert_role("compliance", frame.sender)
+    lot = _lot(frame, lot_id)
+    _check(lot["status"] == LOT_PENDING_VERIFICATION, 3)  # ERR_INVALID_STATUS
+    lot.update(verified=True, verification_method=method, verifier=frame.sender, status=LOT_VERIFIED)
+    lot["updated_at"] = chain.timestamp
+    frame.put("waste_lot", lot_id, lot)
+    frame.emit("waste_lot::LotVerified", lot_id=lot_id, method=method)
+
+
+@_entry("waste_lot::tokenize_lot")
+def _tokenize_lot(chain: SimulatedChain, frame: _Frame, lot_id: int, symbol: str, supply: int) -> None:
+    chain._assert_role("marketplace", frame.sender)
+    lot = _lot(frame, lot_id)
+    _check(lot["status"] == LOT_VERIFIED, 3)
+    lot.update(token_symbol=symbol, token_supply=supply, status=LOT_TOKENIZED, updated_at=chain.timestamp)
+    frame.put("waste_lot", lot_id, lot)
+    frame.emit("waste_lot::LotTokenized", lot_id=lot_id, symbol=symbol, supply=supply)
+
+
+@_entry("waste_lot::transfer_lot")
+def _transfer_lot(chain: SimulatedChain, frame: _Frame, lot_id: int, new_holder: str) -> None:
+    lot = _lot(frame, lot_id)
+    _check(lot["holder"] == frame.sender, 4)  # ERR_NOT_HOLDER
+    lot.update(holder=new_holder, updated_at=chain.timestamp)
+    frame.put("waste_lot", lot_id, lot)
+    frame.emit("waste_lot::LotTransferred", lot_id=lot_id, holder=new_holder)
+
+
+@_entry("waste_lot::retire_lot")
+def _retire_lot(chain: SimulatedChain, frame: _Frame, lot_id: int, reason: str) -> None:
+    chain._assert_role("compliance", frame.sender)
+    lot = _lot(frame, lot_id)
+    _check(lot["status"] in (LOT_VERIFIED, LOT_TOKENIZED), 3)
+    lot.update(status=LOT_RETIRED, retired=True, retired_reason=reason, updated_at=chain.timestamp)
+    frame.put("waste_lot", lot_id, lot)
+    frame.emit("waste_lot::LotRetired", lot_id=lot_id, reason=reason)
+
+
+# -- escrow_settlement --------------------------------------------------
+
+ESCROW_CREATED, ESCROW_FUNDED, ESCROW_FINALIZED, ESCROW_COMPLETED = 0, 1, 2, 3
+
+
+def _escrow(frame: _Frame, escrow_id: int) -> dict[str, Any]:
+    record = frame.get("escrow", escrow_id)
+    _check(record is not None, 3)  # ERR_NOT_FOUND
+    return dict(record)
+
+
+@_entry("escrow_settlement::open")
+def _escrow_open(
+    chain: SimulatedChain, frame: _Frame, lot_id: int, producer: str, recycler: str, total_amount: int, memo: str
+) -> None:
+    chain._assert_role("marketplace", frame.sender)
+    escrow_id = frame.next_id("escrow")
+    frame.put(
+        "escrow",
+        escrow_id,
+        {
+            "id": escrow_id,
+            "lot_id": lot_id,
+            "producer": producer,
+            "recycler": recycler,
+            "agent": frame.sender,
+            "total_amount": total_amount,
+            "status": ESCROW_CREATED,
+            "producer_signed": False,
+            "recycler_signed": False,
+            "agent_signed": True,
+            "funded_amount": 0,
+            "producer_share": 0,
+            "agent_share": 0,
+            "treasury_share": 0,
+            "producer_withdrawn": False,
+            "agent_withdrawn": False,
+            "treasury_withdrawn": False,
+            "memo": memo,
+        },
+    )
+    frame.emit("escrow_settlement::EscrowOpened", escrow_id=escrow_id, lot_id=lot_id, total_amount=total_amount)
+
+
+def _sign(party: str):
+    def handler(chain: SimulatedChain, frame: _Frame, escrow_id: int) -> None:
+        record = _escrow(frame, escrow_id)
+        _check(record["status"] in (ESCROW_CREATED, ESCROW_FUNDED), 4)  # ERR_INVALID_STATUS
+        _check(record[party] == frame.sender, 5)  # ERR_INVALID_SIGNER
+        _check(not record[f"{party}_signed"], 6)  # ERR_ALREADY_SIGNED
+        record[f"{party}_signed"] = True
+        frame.put("escrow", escrow_id, record)
+        frame.emit("escrow_settlement::EscrowSigned", escrow_id=escrow_id, party=party)
+
+    return handler
+
+
+_ENTRY_FUNCTIONS["escrow_settlement::sign_producer"] = _sign("producer")
+_ENTRY_FUNCTIONS["escrow_settlement::sign_recycler"] = _sign("recycler")
+
+
+@_entry("escrow_settlement::fund")
+def _escrow_fund(chain: SimulatedChain, frame: _Frame, escrow_id: int, amount: int) -> None:
+    record = _escrow(frame, escrow_id)
+    _check(record["recycler"] == frame.sender, 5)
+    _check(record["status"] == ESCROW_CREATED, 4)
+    _check(amount == record["total_amount"], 9)  # ERR_AMOUNT_MISMATCH
+    record.update(funded_amount=amount, status=ESCROW_FUNDED)
+    frame.put("escrow", escrow_id, record)
+    frame.emit("escrow_settlement::EscrowFunded", escrow_id=escrow_id, amount=amount)
+
+
+@_entry("escrow_settlement::finalize")
+def _escrow_finalize(chain: SimulatedChain, frame: _Frame, escrow_id: int) -> None:
+    chain._assert_role("compliance", frame.sender)
+    record = _escrow(frame, escrow_id)
+    _check(record["status"] == ESCROW_FUNDED, 4)
+    _check(record["producer_signed"] and record["recycler_signed"] and record["agent_signed"], 7)  # ERR_NOT_SIGNED
+    config = chain._tables["config"]
+    total = record["total_amount"]
+    agent_fee = total * config["agent_fee_bps"] // 10_000
+    treasury_fee = total * config["treasury_fee_bps"] // 10_000
+    record.update(
+        producer_share=total - agent_fee - treasury_fee,
+        agent_share=agent_fee,
+        treasury_share=treasury_fee,
+        status=ESCROW_FINALIZED,
+    )
+    frame.put("escrow", escrow_id, record)
+    frame.emit(
+        "escrow_settlement::EscrowFinalized",
+        escrow_id=escrow_id,
+        producer_share=record["producer_share"],
+        agent_share=agent_fee,
+        treasury_share=treasury_fee,
+    )
+
+
+@_entry("escrow_settlement::mark_withdrawn")
+def _escrow_mark_withdrawn(chain: SimulatedChain, frame: _Frame, escrow_id: int) -> None:
+    record = _escrow(frame, escrow_id)
+    _check(record["status"] in (ESCROW_FINALIZED, ESCROW_COMPLETED), 4)
+    if frame.sender == record["producer"]:
+        party = "producer"
+    elif frame.sender == record["agent"]:
+        party = "agent"
+    elif frame.sender == chain._tables["config"]["treasury"]:
+        party = "treasury"
+    else:
+        raise MoveAbort(5)
+    _check(record[f"{party}_share"] > 0 and not record[f"{party}_withdrawn"], 8)  # ERR_NO_SHARE
+    record[f"{party}_withdrawn"] = True
+    if record["producer_withdrawn"] and record["agent_withdrawn"] and record["treasury_withdrawn"]:
+        record["status"] = ESCROW_COMPLETED
+    frame.put("escrow", escrow_id, record)
+    frame.emit("escrow_settlement::EscrowWithdrawn", escrow_id=escrow_id, party=party)
+
+
+# -- certification ------------------------------------------------------
+
+
+@_entry("certification::issue")
+def _certification_issue(
+    chain: SimulatedChain,
+    frame: _Frame,
+    recycler: str,
+    credential_type: str,
+    metadata_uri: str,
+    has_expiry: bool,
+    expires_at: int,
+) -> None:
+    chain._assert_role("compliance", frame.sender)
+    existing = frame.get("certification", recycler)
+    if existing is not None:
+        _check(not existing["revoked"], 3)  # ERR_ALREADY_ACTIVE
+        if existing["has_expiry"]:
+            _check(existing["expires_at"] < chain.timestamp, 3)
+    credential_id = frame.next_id("certification")
+    frame.put(
+        "certification",
+        recycler,
+        {
+            "credential_id": credential_id,
+            "recycler": recycler,
+            "credential_type": credential_type,
+            "metadata_uri": metadata_uri,
+            "issuer": frame.sender,
+            "issued_at": chain.timestamp,
+            "has_expiry": has_expiry,
+            "expires_at": expires_at,
+            "revoked": False,
+            "revoked_at": 0,
+            "revoke_reason": "",
+        },
+    )
+    frame.emit("certification::CredentialIssued", credential_id=credential_id, recycler=recycler)
+
+
+@_entry("certification::revoke")
+def _certification_revoke(chain: SimulatedChain, frame: _Frame, recycler: str, reason: str) -> None:
+    chain._assert_role("compliance", frame.sender)
+    record = frame.get("certification", recycler)
+    _check(record is not None, 4)  # ERR_NOT_FOUND
+    _check(not record["revoked"], 5)  # ERR_ALREADY_REVOKED
+    frame.put("certification", recycler, {**record, "revoked": True, "revoked_at": chain.timestamp, "revoke_reason": reason})
+    frame.emit("certification::CredentialRevoked", credential_id=record["credential_id"], recycler=recycler)
+
+
+# -- proof_anchor -------------------------------------------------------
+
+
+@_entry("proof_anchor::anchor_root")
+def _anchor_root(chain: SimulatedChain, frame: _Frame, root: str, leaf_count: int) -> None:
+    chain._assert_role("marketplace", frame.sender)
+    _check(leaf_count > 0, 4)  # ERR_EMPTY_BATCH
+    anchor_id = frame.next_id("proof_anchor")
+    frame.put(
+        "proof_anchor",
+        anchor_id,
+        {
+            "anchor_id": anchor_id,
+            "root": root,
+            "leaf_count": leaf_count,
+            "submitter": frame.sender,
+            "anchored_at": chain.timestamp,
+        },
+    )
+    frame.emit("proof_anchor::RootAnchored", anchor_id=anchor_id, root=root, leaf_count=leaf_count)
+
+
+# -- oracle_interface ---------------------------------------------------
+
+
+@_entry("oracle_interface::publish")
+def _oracle_publish(
+    chain: SimulatedChain,
+    frame: _Frame,
+    feed_id: int,
+    feed_name: str,
+    payload: str,
+    lot_id: int | None,
+    expires_at: int | None,
+) -> None:
+    chain._assert_role("oracle", frame.sender)
+    record = frame.get("oracle", feed_id)
+    version = record["version"] + 1 if record else 1
+    frame.put(
+        "oracle",
+        feed_id,
+        {
+            "name": record["name"] if record else feed_name,
+            "payload": payload,
+            "lot_id": lot_id,
+            "expires_at": expires_at,
+            "version": version,
+            "updated_at": chain.timestamp,
+        },
+    )
+    frame.emit("oracle_interface::FeedPublished", feed_id=feed_id, version=version)
+
+
+# -- views --------------------------------------------------------------
+
+
+def _view_lot_status(chain: SimulatedChain, lot_id: int) -> int:
+    lot = chain._tables["waste_lot"].get(lot_id)
+    _check(lot is not None, 2)
+    return lot["status"]
+
+
+def _view_escrow_status(chain: SimulatedChain, escrow_id: int) -> int:
+    record = chain._tables["escrow"].get(escrow_id)
+    _check(record is not None, 3)
+    return record["status"]
+
+
+def _view_signatures(chain: SimulatedChain, escrow_id: int) -> tuple[bool, bool]:
+    record = chain._tables["escrow"].get(escrow_id)
+    _check(record is not None, 3)
+    return record["producer_signed"], record["recycler_signed"]
+
+
+def _view_outstanding_share(chain: SimulatedChain, escrow_id: int, participant: str) -> int:
+    record = chain._tables["escrow"].get(escrow_id)
+    _check(record is not None, 3)
+    for party, account in (
+        ("producer", record["producer"]),
+        ("agent", record["agent"]),
+        ("treasury", chain._tables["config"]["treasury"]),
+    ):
+        if participant == account:
+            return 0 if record[f"{party}_withdrawn"] else record[f"{party}_share"]
+    return 0
+
+
+def _view_is_active(chain: SimulatedChain, recycler: str) -> bool:
+    record = chain._tables["certification"].get(recycler)
+    if record is None or record["revoked"]:
+        return False
+    return not record["has_expiry"] or chain.timestamp <= record["expires_at"]
+
+
+def _view_root_of(chain: SimulatedChain, anchor_id: int) -> str:
+    record = chain._tables["proof_anchor"].get(anchor_id)
+    _check(record is not None, 3)
+    return record["root"]
+
+
+def _view_oracle_read(chain: SimulatedChain, feed_id: int) -> dict[str, Any] | None:
+    record = chain._tables["oracle"].get(feed_id)
+    return dict(record) if record is not None else None
+
+
+_VIEWS: dict[str, Callable[..., Any]] = {
+    "waste_lot::lot_status": _view_lot_status,
+    "escrow_settlement::escrow_status": _view_escrow_status,
+    "escrow_settlement::outstanding_share": _view_outstanding_share,
+    "escrow_settlement::signatures": _view_signatures,
+    "certification::is_active": _view_is_active,
+    "proof_anchor::root_of": _view_root_of,
+    "oracle_interface::read": _view_oracle_read,
+}
+
+
+@lru_cache
+def get_chain_backend() -> ChainBackend:
+    """Process-wide chain backend configured from settings; not shared with other worker processes."""
+    settings = get_settings()
+    if settings.chain_backend != "simulated":
+        raise ValueError(f"Unsupported chain backend '{settings.chain_backend}'")
+    return SimulatedChain(
+        seed=settings.chain_seed,
+        block_time_seconds=settings.chain_block_time_seconds,
+        realtime=settings.chain_realtime,
+        failure_rate=settings.chain_failure_rate,
+        max_calls_per_transaction=settings.mint_batch_size,
+    )
@@ -0,0 +1,101 @@
+"""Indexed numeric readings from `WasteLot.chemical_composition`.
+
+Every numeric top-level entry of a lot's composition (``{"Cu": 6.2}``,
+``{"Pb": "0.05%"}``) is copied into `LotComposition` when the lot is listed,
+and the ``(element, value, waste_lot_id)`` index turns assay thresholds such
+as ``Cu>5`` into range scans instead of a JSON decode per lot. Elements are
+matched case-sensitively (``Co`` is not ``CO``), and a lot without a reading
+for an element never satisfies a requirement on it.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from sqlalchemy import delete, insert
+from sqlalchemy.sql import ColumnElement
+from sqlmodel import Session, select
+
+from ..db_models import LotComposition, WasteLot
+
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z][\w.\-]*)\s*(>=|<=|>|<|=)\s*([-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)\s*%?\s*$")
+_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq}
+
+
+@dataclass(frozen=True)
+class Requirement:
+    element: str
+    op: str
+    value: float
+
+
+def parse_requirement(text: str) -> Requirement:
+    """`"Cu>5"`, `"Pb <= 0.1%"` -> Requirement; raises ValueError on anything else."""
+    match = _REQUIREMENT.match(text) if isinstance(text, str) else None
+    if match is None:
+        raise ValueError(f"invalid composition requirement {text!r}; expected e.g. 'Cu>5' or 'Pb<=0.1'")
+    element, op, value = match.groups()
+    return Requirement(element, op, float(value))
+
+
+def parse_requirements(texts: Iterable[str] | None) -> list[Requirement]:
+    return [parse_requirement(text) for text in texts or ()]
+
+
+def readings(composition: dict[str, Any] | None) -> dict[str, float]:
+    """The numeric entries of a composition; numbers and numeric strings (an optional `%` is dropped)."""
+    values: dict[str, float] = {}
+    for element, raw in (composition or {}).items():
+        if isinstance(raw, bool):
+            continue
+        if isinstance(raw, str):
+            try:
+                raw = float(raw.strip().removesuffix("%"))
+            except ValueError:
+                continue
+        if isinstance(raw, (int, float)) and math.isfinite(raw):
+            values[str(element).strip()] = float(raw)
+    return values
+
+
+def record_lot(session: Session, lot: WasteLot) -> None:
+    """Index a newly listed lot's readings inside the caller's transaction."""
+    values = readings(lot.chemical_composition)
+    if not values:
+        return
+    if lot.id is None:
+        session.flush()
+    session.exec(
+        insert(LotComposition),
+        params=[{"waste_lot_id": lot.id, "element": element, "value": value} for element, value in values.items()],
+    )
+
+
+def filters(requirements: Iterable[Requirement]) -> list[ColumnElement[bool]]:
+    """WHERE clauses on `WasteLot.id`, one indexed range subquery per requirement."""
+    clauses = []
+    for requirement in requirements:
+        matching = select(LotComposition.waste_lot_id).where(
+            LotComposition.element == requirement.element,
+            _OPERATORS[requirement.op](LotComposition.value, requirement.value),
+        )
+        clauses.append(WasteLot.id.in_(matching))
+    return clauses
+
+
+def rebuild(session: Session) -> int:
+    """Re-extract every lot's readings (full scan); returns the number of rows written."""
+    session.exec(delete(LotComposition))
+    rows = [
+        {"waste_lot_id": lot_id, "element": element, "value": value}
+        for lot_id, composition in session.exec(select(WasteLot.id, WasteLot.chemical_composition)).all()
+        for element, value in readings(composition).items()
+    ]
+    if rows:
+        session.exec(insert(LotComposition), params=rows)
+    session.commit()
+    return len(rows)
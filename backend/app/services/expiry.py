@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import exists, update
+from sqlmodel import select
+
+from .. import db
+from ..db_models import Negotiation, NegotiationStatus, WasteLot, WasteLotStatus, WasteLotToken
+
+logger = logging.getLogger("aura.expiry")
+
+_ACTIVE_STATUSES = (NegotiationStatus.OPEN, NegotiationStatus.COUNTER)
+_BLOCKING_STATUSES = (
+    NegotiationStatus.OPEN,
+    NegotiationStatus.COUNTER,
+    NegotiationStatus.AGREED,
+    NegotiationStatus.SETTLED,
+)
+
+
+class NegotiationExpiryEngine:
+    """Moves OPEN/COUNTER negotiations to EXPIRED once `expires_at` passes.
+
+    Upcoming deadlines live in an in-memory min-heap fed by `schedule` (called
+    from the CRUD layer) and by periodic index scans over
+    (status, expires_at) that pick up rows written by other workers. Due
+    negotiations are expired with one bulk UPDATE per batch; the UPDATE re-checks
+    status and deadline, so stale heap entries (e.g. a countered negotiation
+    whose deadline moved) are harmless. Lots left without an active or agreed
+    negotiation return to VERIFIED/TOKENIZED so matchmaking picks them up again.
+    """
+
+    def __init__(
+        self,
+        *,
+        tick_seconds: float = 5.0,
+        refresh_seconds: float = 60.0,
+        batch_size: int = 500,
+    ) -> None:
+        self.tick_seconds = tick_seconds
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+        self._heap: list[tuple[datetime, int]] = []
+        self._deadlines: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._loaded_until: datetime | None = None
+        self._expired_total = 0
+        self._lots_released_total = 0
+        self._lag_seconds_sum = 0.0
+        self._lag_seconds_max = 0.0
+        self._last_lag_seconds: float | None = None
+        self._last_run_at: datetime | None = None
+
+    def schedule(self, negotiation_id: int, expires_at: datetime) -> None:
+        with self._lock:
+            if self._deadlines.get(negotiation_id) == expires_at:
+                return
+            self._deadlines[negotiation_id] = expires_at
+            heapq.heappush(self._heap, (expires_at, negotiation_id))
+
+    def load(self, now: datetime | None = None) -> int:
+        """Scan deadlines falling within the next refresh horizon into the heap."""
+        now = now or datetime.utcnow()
+        horizon = now + timedelta(seconds=self.refresh_seconds * 2)
+        with db.session_scope() as session:
+            rows = session.exec(
+                select(Negotiation.id, Negotiation.expires_at)
+                .where(Negotiation.status.in_(_ACTIVE_STATUSES))
+                .where(Negotiation.expires_at <= horizon)
+            ).all()
+        for negotiation_id, expires_at in rows:
+            self.schedule(negotiation_id, expires_at)
+        self._loaded_until = now
+        return len(rows)
+
+    def next_deadline(self) -> datetime | None:
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def expire_due(self, now: datetime | None = None) -> int:
+        now = now or datetime.utcnow()
+        expired = 0
+        while True:
+            due = self._pop_due(now)
+            if not due:
+                break
+            try:
+                expired += self._expire([negotiation_id for _, negotiation_id in due], now)
+            except Exception:
+                self._restore(due)  # the UPDATE did not commit; retry these on the next sweep
+                raise
+        self._last_run_at = now
+        return expired
+
+    def _pop_due(self, now: datetime) -> list[tuple[datetime, int]]:
+        due: list[tuple[datetime, int]] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                expires_at, negotiation_id = heapq.heappop(self._heap)
+                if self._deadlines.get(negotiation_id) != expires_at:
+                    continue  # superseded by a later schedule() call
+                del self._deadlines[negotiation_id]
+                due.append((expires_at, negotiation_id))
+        return due
+
+    def _restore(self, due: list[tuple[datetime, int]]) -> None:
+        """Put popped deadlines back, unless `schedule` replaced them in the meantime."""
+        with self._lock:
+            for expires_at, negotiation_id in due:
+                if negotiation_id not in self._deadlines:
+                    self._deadlines[negotiation_id] = expires_at
+                    heapq.heappush(self._heap, (expires_at, negotiation_id))
+
+    def _expire(self, negotiation_ids: list[int], now: datetime) -> int:
+        with db.session_scope() as session:
+            rows = session.exec(
+                update(Negotiation)
+                .where(Negotiation.id.in_(negotiation_ids))
+                .where(Negotiation.status.in_(_ACTIVE_STATUSES))
+                .where(Negotiation.expires_at <= now)
+                .values(status=NegotiationStatus.EXPIRED, updated_at=now, version=Negotiation.version + 1)
+                .returning(Negotiation.waste_lot_id, Negotiation.expires_at)
+            ).all()
+            lot_ids = sorted({lot_id for lot_id, _ in rows})
+            released = 0
+            if lot_ids:
+                still_engaged = exists().where(
+                    Negotiation.waste_lot_id == WasteLot.id,
+                    Negotiation.status.in_(_BLOCKING_STATUSES),
+                )
+                tokenized = exists().where(WasteLotToken.waste_lot_id == WasteLot.id)
+                for condition, status in (
+                    (tokenized, WasteLotStatus.TOKENIZED),
+                    (~tokenized, WasteLotStatus.VERIFIED),
+                ):
+                    result = session.exec(
+                        update(WasteLot)
+                        .where(WasteLot.id.in_(lot_ids))
+                        .where(WasteLot.status == WasteLotStatus.NEGOTIATING)
+                        .where(~still_engaged)
+                        .where(condition)
+                        .values(status=status, updated_at=now, version=WasteLot.version + 1)
+                    )
+                    released += result.rowcount
+            session.commit()
+
+        for _, expires_at in rows:
+            lag = max((now - expires_at).total_seconds(), 0.0)
+            self._lag_seconds_sum += lag
+            self._lag_seconds_max = max(self._lag_seconds_max, lag)
+            self._last_lag_seconds = lag
+        self._expired_total += len(rows)
+        self._lots_released_total += released
+        if rows:
+            logger.info("Expired %d negotiation(s), released %d lot(s)", len(rows), released)
+        return len(rows)
+
+    async def run(self) -> None:
+        while True:
+            now = datetime.utcnow()
+            try:
+                if self._loaded_until is None or (now - self._loaded_until).total_seconds() >= self.refresh_seconds:
+                    await asyncio.to_thread(self.load, now)
+                await asyncio.to_thread(self.expire_due)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Expiry sweep failed: %s", exc)
+            await asyncio.sleep(self._sleep_seconds())
+
+    def _sleep_seconds(self) -> float:
+        deadline = self.next_deadline()
+        if deadline is None:
+            return self.tick_seconds
+        until_due = (deadline - datetime.utcnow()).total_seconds()
+        return min(max(until_due, 0.05), self.tick_seconds)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            pending = len(self._deadlines)
+            next_deadline = self._heap[0][0] if self._heap else None
+        return {
+            "running": True,
+            "pending_deadlines": pending,
+            "next_deadline": next_deadline,
+            "expired_total": self._expired_total,
+            "lots_released_total": self._lots_released_total,
+            "lag_seconds_last": self._last_lag_seconds,
+            "lag_seconds_max": self._lag_seconds_max,
+            "lag_seconds_avg": self._lag_seconds_sum / self._expired_total if self._expired_total else None,
+            "last_run_at": self._last_run_at,
+        }
+
+
+_engine: NegotiationExpiryEngine | None = None
+_task: asyncio.Task | None = None
+
+
+def start(**options: Any) -> NegotiationExpiryEngine:
+    """Start the expiry loop on the running event loop (FastAPI startup)."""
+    global _engine, _task
+    _engine = NegotiationExpiryEngine(**options)
+    _task = asyncio.get_running_loop().create_task(_engine.run())
+    return _engine
+
+
+async def stop() -> None:
+    global _engine, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _engine = None
+    _task = None
+
+
+def current() -> NegotiationExpiryEngine | None:
+    return _engine
+
+
+def schedule(negotiation: Negotiation) -> None:
+    """Register a negotiation deadline with the running engine, if any."""
+    if _engine is not None and negotiation.status in _ACTIVE_STATUSES:
+        _engine.schedule(negotiation.id, negotiation.expires_at)
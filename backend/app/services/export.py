@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Table, select
+
+from .. import db
+from ..db_models import Negotiation, UpcyclingProof, WasteLot, WasteLotToken
+
+DEFAULT_BATCH_SIZE = 50_000
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+EXPORT_TABLES: dict[str, Table] = {
+    "lots": WasteLot.__table__,
+    "negotiations": Negotiation.__table__,
+    "tokens": WasteLotToken.__table__,
+    "proofs": UpcyclingProof.__table__,
+}
+
+
+class MarketplaceExporter:
+    """Streams marketplace tables out of the database as Arrow record batches.
+
+    Rows are read with keyset pagination on the primary key using Core selects,
+    so no ORM objects or Pydantic models are built and memory stays bounded by
+    `batch_size` regardless of table size. JSON columns are exported as JSON
+    encoded strings.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+
+    def schema(self, name: str) -> pa.Schema:
+        return pa.schema(
+            [
+                pa.field(column.name, _arrow_type(column.type), nullable=column.nullable)
+                for column in _table(name).columns
+            ]
+        )
+
+    def record_batches(self, name: str) -> Iterator[pa.RecordBatch]:
+        table = _table(name)
+        schema = self.schema(name)
+        converters = [_converter(column.type) for column in table.columns]
+        last_id = 0
+        with db.engine.connect() as connection:
+            while True:
+                rows = connection.execute(
+                    select(*table.columns).where(table.c.id > last_id).order_by(table.c.id).limit(self.batch_size)
+                ).all()
+                if not rows:
+                    return
+                columns = list(zip(*rows))
+                arrays = [
+                    pa.array([convert(value) for value in values] if convert else values, type=field.type)
+                    for values, convert, field in zip(columns, converters, schema)
+                ]
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+                last_id = rows[-1].id
+
+    def ipc_stream(self, name: str) -> Iterator[bytes]:
+        """Yield an Arrow IPC stream chunk per record batch (schema first)."""
+        sink = _ChunkSink()
+        writer = pa.ipc.new_stream(sink, self.schema(name))
+        yield sink.drain()
+        for batch in self.record_batches(name):
+            writer.write_batch(batch)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    def write_parquet(self, directory: Path, names: list[str] | None = None) -> dict[str, Path]:
+        directory.mkdir(parents=True, exist_ok=True)
+        written: dict[str, Path] = {}
+        for name in names or list(EXPORT_TABLES):
+            path = directory / f"{name}.parquet"
+            with pq.ParquetWriter(path, self.schema(name)) as writer:
+                for batch in self.record_batches(name):
+                    writer.write_batch(batch)
+            written[name] = path
+        return written
+
+
+def _table(name: str) -> Table:
+    try:
+        return EXPORT_TABLES[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown export table '{name}'. Choose from: {', '.join(EXPORT_TABLES)}") from exc
+
+
+def _arrow_type(column_type: Any) -> pa.DataType:
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _converter(column_type: Any):
+    if isinstance(column_type, JSON):
+        return lambda value: json.dumps(value) if value is not None else None
+    if isinstance(column_type, (Boolean, Integer, Float, DateTime)):
+        return None
+    return lambda value: value.value if isinstance(value, Enum) else value
+
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back to a generator."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, bindparam, func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, SQLModel
+
+from .. import db
+from ..db_models import ChainCredential, ChainEscrow, ChainLot, IndexerCheckpoint, WasteLotToken
+from .aptos import token_address_pattern
+from .chain import ChainBackend, ChainEvent, read_events
+
+logger = logging.getLogger("aura.indexer")
+
+INDEXED_MODULES = ("waste_lot", "escrow_settlement", "certification")
+
+_LOT_STATUS = {
+    "LotRegistered": "registered",
+    "LotVerified": "verified",
+    "LotTokenized": "tokenized",
+    "LotRetired": "retired",
+}
+
+
+def backend_lot_id(external_ref: str | None) -> int | None:
+    """Backend lot id from the `aura-lot-<id>` reference `AptosTokenService` registers lots with."""
+    if not external_ref or not external_ref.startswith("aura-lot-"):
+        return None
+    try:
+        return int(external_ref.removeprefix("aura-lot-"))
+    except ValueError:
+        return None
+
+
+def decode(events: list[ChainEvent]) -> dict[type[SQLModel], dict[Any, dict[str, Any]]]:
+    """Fold a batch of events into the latest column values per indexed row.
+
+    Each row only carries the columns its events set, so rows first seen in an
+    earlier batch are updated without clobbering what that batch wrote.
+    """
+    lots: dict[int, dict[str, Any]] = {}
+    escrows: dict[int, dict[str, Any]] = {}
+    credentials: dict[str, dict[str, Any]] = {}
+    for event in events:
+        _, module, name = event.type.split("::")
+        data = event.data
+        if module == "waste_lot":
+            row = lots.setdefault(data["lot_id"], {"chain_lot_id": data["lot_id"]})
+            if name in _LOT_STATUS:
+                row["status"] = _LOT_STATUS[name]
+            if name == "LotRegistered":
+                row.update(
+                    external_ref=data["external_ref"],
+                    waste_lot_id=backend_lot_id(data["external_ref"]),
+                    holder=data["producer"],
+                )
+            elif name == "LotTokenized":
+                row.update(
+                    token_symbol=data["symbol"], supply=data["supply"], tokenize_transaction_hash=event.transaction_hash
+                )
+            elif name == "LotTransferred":
+                row["holder"] = data["holder"]
+            elif name == "LotRetired":
+                row.update(retired_reason=data["reason"], retire_transaction_hash=event.transaction_hash)
+        elif module == "escrow_settlement":
+            row = escrows.setdefault(data["escrow_id"], {"escrow_id": data["escrow_id"]})
+            if name == "EscrowOpened":
+                row.update(
+                    lot_id=data["lot_id"],
+                    total_amount=data["total_amount"],
+                    status="created",
+                    funded_amount=0,
+                    producer_signed=False,
+                    recycler_signed=False,
+                    open_transaction_hash=event.transaction_hash,
+                )
+            elif name == "EscrowSigned":
+                row[f"{data['party']}_signed"] = True
+            elif name == "EscrowFunded":
+                row.update(status="funded", funded_amount=data["amount"])
+            elif name == "EscrowFinalized":
+                row.update(
+                    status="finalized",
+                    producer_share=data["producer_share"],
+                    agent_share=data["agent_share"],
+                    treasury_share=data["treasury_share"],
+                    finalize_transaction_hash=event.transaction_hash,
+                )
+            elif name == "EscrowWithdrawn":
+                row[f"{data['party']}_withdrawn"] = True
+        elif module == "certification":
+            row = credentials.setdefault(data["recycler"], {"recycler": data["recycler"]})
+            row["credential_id"] = data["credential_id"]
+            if name == "CredentialIssued":
+                row.update(active=True, issue_transaction_hash=event.transaction_hash, revoke_transaction_hash=None)
+            elif name == "CredentialRevoked":
+                row.update(active=False, revoke_transaction_hash=event.transaction_hash)
+        else:
+            continue
+        row["last_version"] = event.version
+    return {ChainLot: lots, ChainEscrow: escrows, ChainCredential: credentials}
+
+
+def upsert(session: Session, model: type[SQLModel], rows: list[dict[str, Any]]) -> None:
+    """Insert-or-update `rows` with one multi-row statement per distinct column set."""
+    table = model.__table__
+    (key,) = [column.name for column in table.primary_key.columns]
+    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for columns, group in groups.items():
+        statement = insert(table).values(group)
+        updates = {name: statement.excluded[name] for name in columns if name != key}
+        session.exec(statement.on_conflict_do_update(index_elements=[key], set_=updates))
+
+
+class ChainIndexer:
+    """Tails `waste_lot`, `escrow_settlement` and `certification` events into SQL.
+
+    Each batch reads up to `batch_size` events from the checkpointed version,
+    folds them per row with `decode`, bulk-upserts `ChainLot`, `ChainEscrow`
+    and `ChainCredential`, reconciles token retirements into `WasteLotToken`
+    and advances the `IndexerCheckpoint` in the same transaction, so a crash
+    never loses or double-applies a batch. Upserts are idempotent, which is
+    what makes `reindex` from any version safe.
+    """
+
+    def __init__(
+        self, backend: ChainBackend, *, name: str = "chain", batch_size: int = 500, poll_seconds: float = 2.0
+    ) -> None:
+        self.backend = backend
+        self.name = name
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._checkpoint: int | None = None
+        self._batches_total = 0
+        self._events_total = 0
+        self._rows_total = 0
+        self._last_batch_seconds: float | None = None
+        self._last_indexed_at: datetime | None = None
+
+    def checkpoint(self) -> int:
+        with db.session_scope() as session:
+            checkpoint = session.get(IndexerCheckpoint, self.name)
+            return checkpoint.version if checkpoint else 0
+
+    def reindex(self, from_version: int = 0) -> int:
+        """Rewind the checkpoint to `from_version` and index up to the chain head."""
+        with self._lock, db.session_scope() as session:
+            session.merge(IndexerCheckpoint(name=self.name, version=from_version, updated_at=datetime.utcnow()))
+            session.commit()
+            self._checkpoint = from_version
+        return self.catch_up()
+
+    def index_batch(self) -> int:
+        """Index one page of events; returns the number of events read."""
+        with self._lock:
+            started = time.perf_counter()
+            cursor = self.checkpoint()
+            # Read the head first: once the event feed is exhausted, nothing up to it is left to index.
+            head = self.backend.ledger_version()
+            events, next_version, more = read_events(self.backend, cursor, self.batch_size)
+            if not more:
+                next_version = max(next_version, head + 1)
+            if next_version == cursor:
+                self._checkpoint = cursor
+                return 0
+
+            decoded = decode([event for event in events if event.type.split("::")[1] in INDEXED_MODULES])
+            with db.session_scope() as session:
+                for model, rows in decoded.items():
+                    if rows:
+                        upsert(session, model, list(rows.values()))
+                self._reconcile(session, decoded[ChainLot], decoded[ChainEscrow])
+                session.merge(IndexerCheckpoint(name=self.name, version=next_version, updated_at=datetime.utcnow()))
+                session.commit()
+
+            self._checkpoint = next_version
+            if events:
+                self._batches_total += 1
+                self._events_total += len(events)
+                self._rows_total += sum(len(rows) for rows in decoded.values())
+                self._last_batch_seconds = time.perf_counter() - started
+                self._last_indexed_at = datetime.utcnow()
+            return len(events)
+
+    def catch_up(self) -> int:
+        """Index until the checkpoint passes the head seen on entry; returns the events read."""
+        indexed = 0
+        head = self.backend.ledger_version()
+        while True:
+            indexed += self.index_batch()
+            if self._checkpoint > head:
+                return indexed
+
+    def _reconcile(self, session: Session, lots: dict[int, dict[str, Any]], escrows: dict[int, dict[str, Any]]) -> None:
+        """Carry on-chain retirements into `WasteLotToken` and mark fully withdrawn escrows completed."""
+        retirements = [
+            {
+                "b_pattern": token_address_pattern(row["chain_lot_id"]),
+                "b_hash": row["retire_transaction_hash"],
+                "b_at": datetime.utcnow(),
+            }
+            for row in lots.values()
+            if row.get("retire_transaction_hash")
+        ]
+        if retirements:
+            table = WasteLotToken.__table__
+            session.exec(
+                table.update()
+                .where(table.c.token_address.like(bindparam("b_pattern")))
+                .where(table.c.retire_transaction_hash.is_(None))
+                .values(
+                    retire_transaction_hash=bindparam("b_hash"),
+                    retired_at=func.coalesce(table.c.retired_at, bindparam("b_at")),
+                ),
+                params=retirements,
+            )
+        withdrawn = [escrow_id for escrow_id, row in escrows.items() if any(k.endswith("_withdrawn") for k in row)]
+        if withdrawn:
+            session.exec(
+                update(ChainEscrow)
+                .where(ChainEscrow.escrow_id.in_(withdrawn))
+                .where(
+                    and_(ChainEscrow.producer_withdrawn, ChainEscrow.agent_withdrawn, ChainEscrow.treasury_withdrawn)
+                )
+                .values(status="completed")
+            )
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.catch_up)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Chain indexing failed: %s", exc)
+            await asyncio.sleep(self.poll_seconds)
+
+    def metrics(self) -> dict[str, Any]:
+        checkpoint = self._checkpoint if self._checkpoint is not None else self.checkpoint()
+        head = self.backend.ledger_version()
+        return {
+            "running": True,
+            "checkpoint_version": checkpoint,
+            "head_version": head,
+            # The checkpoint is the next version to read (versions start at 1),
+            # so a caught-up indexer sits at head + 1.
+            "lag_versions": max(head + 1 - max(checkpoint, 1), 0),
+            "batches_total": self._batches_total,
+            "events_total": self._events_total,
+            "rows_upserted_total": self._rows_total,
+            "last_batch_seconds": self._last_batch_seconds,
+            "last_indexed_at": self._last_indexed_at,
+        }
+
+
+_indexer: ChainIndexer | None = None
+_task: asyncio.Task | None = None
+
+
+def start(backend: ChainBackend, **options: Any) -> ChainIndexer:
+    """Start tailing chain events on the running event loop (FastAPI startup)."""
+    global _indexer, _task
+    _indexer = ChainIndexer(backend, **options)
+    _task = asyncio.get_running_loop().create_task(_indexer.run())
+    return _indexer
+
+
+async def stop() -> None:
+    global _indexer, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _indexer = None
+    _task = None
+
+
+def current() -> ChainIndexer | None:
+    return _indexer
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import func, update
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import select
+
+from .. import db
+from ..crud import MAX_TRANSITION_ATTEMPTS, record_token_mint
+from ..db_models import MintJob, MintJobStatus, WasteLot
+from ..models import TokenMintRequest
+from .aptos import AptosTokenService, MintRequest
+
+logger = logging.getLogger("aura.minting")
+
+
+class MintQueueWorker:
+    """Drains queued `MintJob` rows into batched `tokenize_lot` submissions.
+
+    Jobs are claimed with a single UPDATE (QUEUED -> SUBMITTED), so several
+    workers can share the queue without minting a lot twice. After a request
+    wakes the worker it waits `batch_wait_seconds` for more requests to arrive,
+    then submits up to `batch_size` mints through
+    `AptosTokenService.mint_waste_lots` and records each result with
+    `record_token_mint`. Chain errors requeue the batch until `max_attempts`.
+
+    The chain result is saved on the job before the lot is updated, so a job
+    requeued after a successful mint (a lot write conflict, a crash) only
+    retries the recording step and never mints the lot a second time.
+    """
+
+    def __init__(
+        self,
+        service: AptosTokenService,
+        *,
+        batch_size: int = 64,
+        batch_wait_seconds: float = 0.25,
+        idle_seconds: float = 5.0,
+        max_attempts: int = 3,
+        stale_after_seconds: float = 300.0,
+    ) -> None:
+        self.service = service
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.idle_seconds = idle_seconds
+        self.max_attempts = max_attempts
+        self.stale_after_seconds = stale_after_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._batches_total = 0
+        self._minted_total = 0
+        self._failed_total = 0
+        self._submit_seconds_total = 0.0
+        self._last_batch_size = 0
+        self._last_run_at: datetime | None = None
+
+    def notify(self) -> None:
+        """Wake the worker; safe to call from request threads."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def recover(self, now: datetime | None = None) -> int:
+        """Requeue jobs left SUBMITTED by a worker that stopped mid-batch."""
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=self.stale_after_seconds)
+        with db.session_scope() as session:
+            result = session.exec(
+                update(MintJob)
+                .where(MintJob.status == MintJobStatus.SUBMITTED)
+                .where(MintJob.updated_at <= cutoff)
+                .values(status=MintJobStatus.QUEUED, updated_at=datetime.utcnow())
+            )
+            session.commit()
+            return result.rowcount
+
+    def process_batch(self) -> int:
+        """Claim and mint one batch; returns the number of jobs claimed."""
+        jobs = self._claim()
+        if not jobs:
+            return 0
+
+        unminted = [job for job in jobs if job.token_address is None]
+        if unminted:
+            started = time.perf_counter()
+            try:
+                results = self.service.mint_waste_lots(
+                    [MintRequest(job.waste_lot_id, job.token_name, job.token_symbol, job.supply) for job in unminted]
+                )
+            except Exception as exc:
+                logger.warning("Mint submission of %d job(s) failed: %s", len(unminted), exc)
+                self._release([job.id for job in unminted], str(exc))
+                jobs = [job for job in jobs if job.token_address is not None]
+            else:
+                self._submit_seconds_total += time.perf_counter() - started
+                self._save_results(unminted, results)
+        self._record(jobs)
+
+        self._batches_total += 1
+        self._last_batch_size = len(jobs)
+        self._last_run_at = datetime.utcnow()
+        return len(jobs)
+
+    def _save_results(self, jobs: list[MintJob], results: list[Any]) -> None:
+        """Persist each job's on-chain token before touching its lot."""
+        with db.session_scope() as session:
+            for job, result in zip(jobs, results):
+                job.token_address = result.token_address
+                job.transaction_hash = result.transaction_hash
+                row = session.get(MintJob, job.id)
+                row.token_address = result.token_address
+                row.transaction_hash = result.transaction_hash
+                row.updated_at = datetime.utcnow()
+                session.add(row)
+            session.commit()
+
+    def _record(self, jobs: list[MintJob]) -> None:
+        """Record minted tokens on their lots, retrying lot write conflicts in place."""
+        with db.session_scope() as session:
+            for job in jobs:
+                job = session.get(MintJob, job.id)
+                payload = TokenMintRequest(token_name=job.token_name, token_symbol=job.token_symbol, supply=job.supply)
+                for _ in range(MAX_TRANSITION_ATTEMPTS):
+                    lot = session.get(WasteLot, job.waste_lot_id)
+                    try:
+                        record_token_mint(session, lot, payload, job.token_address, job.transaction_hash)
+                    except HTTPException as exc:
+                        session.rollback()
+                        error = f"{exc.detail} (minted on chain as {job.token_address})"
+                        logger.warning("Recording mint job %s failed: %s", job.id, error)
+                        self._finish(session, job, MintJobStatus.FAILED, error=error)
+                    except StaleDataError:
+                        session.rollback()
+                        continue
+                    else:
+                        self._finish(session, job, MintJobStatus.COMPLETED)
+                    break
+                else:
+                    self._release([job.id], "Waste lot was modified concurrently")
+
+    def drain(self) -> int:
+        processed = 0
+        while batch := self.process_batch():
+            processed += batch
+        return processed
+
+    def _claim(self) -> list[MintJob]:
+        now = datetime.utcnow()
+        with db.session_scope() as session:
+            candidates = (
+                select(MintJob.id)
+                .where(MintJob.status == MintJobStatus.QUEUED)
+                .order_by(MintJob.id)
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            claimed = session.exec(
+                update(MintJob)
+                .where(MintJob.id.in_(candidates))
+                .where(MintJob.status == MintJobStatus.QUEUED)
+                .values(status=MintJobStatus.SUBMITTED, attempts=MintJob.attempts + 1, updated_at=now)
+                .returning(MintJob.id)
+            ).scalars().all()
+            session.commit()
+            if not claimed:
+                return []
+            jobs = session.exec(select(MintJob).where(MintJob.id.in_(claimed)).order_by(MintJob.id)).all()
+            for job in jobs:
+                session.expunge(job)
+            return jobs
+
+    def _release(self, job_ids: list[int], error: str) -> None:
+        with db.session_scope() as session:
+            for job in session.exec(select(MintJob).where(MintJob.id.in_(job_ids))).all():
+                # A job already minted on chain only has its recording left; never give up on it.
+                if job.attempts >= self.max_attempts and job.token_address is None:
+                    self._finish(session, job, MintJobStatus.FAILED, error=error)
+                else:
+                    job.status = MintJobStatus.QUEUED
+                    job.error = error
+                    job.updated_at = datetime.utcnow()
+                    session.add(job)
+                    session.commit()
+
+    def _finish(self, session, job: MintJob, job_status: MintJobStatus, error: str | None = None) -> None:
+        job.status = job_status
+        job.error = error
+        job.updated_at = job.completed_at = datetime.utcnow()
+        session.add(job)
+        session.commit()
+        if job_status == MintJobStatus.COMPLETED:
+            self._minted_total += 1
+        else:
+            self._failed_total += 1
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            await asyncio.to_thread(self.recover)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("Mint queue recovery failed: %s", exc)
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.idle_seconds)
+                await asyncio.sleep(self.batch_wait_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while await asyncio.to_thread(self.process_batch) >= self.batch_size:
+                    pass
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Mint batch failed: %s", exc)
+
+    def metrics(self) -> dict[str, Any]:
+        with db.session_scope() as session:
+            queued = session.exec(
+                select(func.count()).select_from(MintJob).where(MintJob.status == MintJobStatus.QUEUED)
+            ).one()
+        return {
+            "running": True,
+            "queued": queued,
+            "batches_total": self._batches_total,
+            "minted_total": self._minted_total,
+            "failed_total": self._failed_total,
+            "last_batch_size": self._last_batch_size,
+            "avg_batch_size": self._minted_total / self._batches_total if self._batches_total else None,
+            "submit_seconds_total": self._submit_seconds_total,
+            "last_run_at": self._last_run_at,
+        }
+
+
+_worker: MintQueueWorker | None = None
+_task: asyncio.Task | None = None
+
+
+def start(service: AptosTokenService, **options: Any) -> MintQueueWorker:
+    """Start the mint worker on the running event loop (FastAPI startup)."""
+    global _worker, _task
+    _worker = MintQueueWorker(service, **options)
+    _task = asyncio.get_running_loop().create_task(_worker.run())
+    return _worker
+
+
+async def stop() -> None:
+    global _worker, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _worker = None
+    _task = None
+
+
+def current() -> MintQueueWorker | None:
+    return _worker
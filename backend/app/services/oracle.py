@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from ..models import OracleFeedRead
+from .chain import ChainBackend, get_chain_backend, read_events
+
+logger = logging.getLogger("aura.oracle")
+
+_FEEDS = TypeAdapter(list[OracleFeedRead])
+
+
+def reference_price(feed: OracleFeedRead) -> tuple[str, float] | None:
+    """`(material_type, usd_per_ton)` for price feeds, whose payload is a JSON object."""
+    try:
+        payload = json.loads(feed.payload)
+        return str(payload["material_type"]).lower(), float(payload["usd_per_ton"])
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+class OracleFeedCache:
+    """Latest `oracle_interface::FeedView` per feed, kept in memory.
+
+    `poll` follows the chain event log from a cursor in pages of `batch_size`
+    and only calls the `read` view for feeds whose published version is newer
+    than the cached one, once per feed however often it was republished.
+    Serialized responses are rebuilt only when a feed version changes, so
+    `/oracle/feeds` is a dictionary lookup plus an ETag comparison.
+    """
+
+    def __init__(self, backend: ChainBackend, *, poll_seconds: float = 5.0, batch_size: int = 1000) -> None:
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._feeds: dict[int, OracleFeedRead] = {}
+        self._prices: dict[str, float] = {}
+        self._cursor = 0
+        self._generation = 0
+        self._body: bytes | None = None
+        self._polls_total = 0
+        self._events_scanned_total = 0
+        self._reads_total = 0
+        self._snapshot_hits = 0
+        self._snapshot_misses = 0
+        self._last_polled_at: datetime | None = None
+
+    def poll(self) -> int:
+        """Pull feed updates published since the last poll; returns the number of feeds refreshed."""
+        with self._poll_lock:
+            return self._poll()
+
+    def _poll(self) -> int:
+        stale: set[int] = set()
+        more = True
+        while more:
+            events, self._cursor, more = read_events(self.backend, self._cursor, self.batch_size)
+            self._events_scanned_total += len(events)
+            for event in events:
+                if not event.type.endswith("::FeedPublished"):
+                    continue
+                cached = self._feeds.get(event.data["feed_id"])
+                if cached is None or cached.version < event.data["version"]:
+                    stale.add(event.data["feed_id"])
+
+        refreshed = {}
+        for feed_id in sorted(stale):
+            view = self.backend.view("oracle_interface", "read", feed_id)
+            self._reads_total += 1
+            if view is not None:
+                refreshed[feed_id] = OracleFeedRead(feed_id=feed_id, **view)
+
+        with self._lock:
+            if refreshed:
+                self._feeds.update(refreshed)
+                self._prices = dict(filter(None, (reference_price(feed) for feed in self._feeds.values())))
+                self._generation += 1
+                self._body = None
+            self._polls_total += 1
+            self._last_polled_at = datetime.utcnow()
+        return len(refreshed)
+
+    def feeds(self) -> list[OracleFeedRead]:
+        with self._lock:
+            return [self._feeds[feed_id] for feed_id in sorted(self._feeds)]
+
+    def get(self, feed_id: int) -> OracleFeedRead | None:
+        return self._feeds.get(feed_id)
+
+    def reference_price(self, material_type: str) -> float | None:
+        return self._prices.get(material_type.lower())
+
+    def snapshot(self) -> tuple[str, bytes]:
+        """ETag and JSON body of every cached feed, serialized once per generation."""
+        with self._lock:
+            if self._body is None:
+                self._snapshot_misses += 1
+                self._body = _FEEDS.dump_json([self._feeds[feed_id] for feed_id in sorted(self._feeds)])
+            else:
+                self._snapshot_hits += 1
+            return f'"feeds-{self._generation}"', self._body
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.poll)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Oracle feed poll failed: %s", exc)
+            await asyncio.sleep(self.poll_seconds)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": True,
+            "poll_seconds": self.poll_seconds,
+            "feeds": len(self._feeds),
+            "generation": self._generation,
+            "cursor_version": self._cursor,
+            "polls_total": self._polls_total,
+            "events_scanned_total": self._events_scanned_total,
+            "reads_total": self._reads_total,
+            "snapshot_hits_total": self._snapshot_hits,
+            "snapshot_misses_total": self._snapshot_misses,
+            "last_polled_at": self._last_polled_at,
+        }
+
+
+_cache: OracleFeedCache | None = None
+_task: asyncio.Task | None = None
+
+
+def start(backend: ChainBackend, **options: Any) -> OracleFeedCache:
+    """Start polling oracle feeds on the running event loop (FastAPI startup)."""
+    global _cache, _task
+    _cache = OracleFeedCache(backend, **options)
+    _task = asyncio.get_running_loop().create_task(_cache.run())
+    return _cache
+
+
+async def stop() -> None:
+    global _cache, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _cache = None
+    _task = None
+
+
+def current() -> OracleFeedCache | None:
+    return _cache
+
+
+_request_cache: OracleFeedCache | None = None
+_request_cache_lock = threading.Lock()
+
+
+def feed_cache() -> OracleFeedCache:
+    """The polling worker's cache or, with the worker off, one cache the request handlers share.
+
+    The shared cache is created on first use and polled on each call; it keeps
+    its cursor, so a poll only reads events published since the previous one.
+    """
+    global _request_cache
+    if _cache is not None:
+        return _cache
+    with _request_cache_lock:
+        if _request_cache is None:
+            _request_cache = OracleFeedCache(get_chain_backend())
+    _request_cache.poll()
+    return _request_cache
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import math
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from ..db_models import Negotiation, NegotiationStatus, PriceRollup, WasteLot
+
+_KEY = ("material_type", "location", "day")
+_ADDITIVE = ("lot_count", "tons", "floor_count", "floor_sum", "agreed_count", "agreed_tons", "agreed_sum")
+_AGREED_STATUSES = (NegotiationStatus.AGREED, NegotiationStatus.SETTLED)
+
+
+def record_lot(session: Session, lot: WasteLot) -> None:
+    """Fold a newly listed lot into its (material, location, day) rollup.
+
+    Runs inside the caller's transaction so the rollup commits with the lot.
+    """
+    floor = lot.price_floor_usd_per_ton
+    _upsert(
+        session,
+        _key(lot, lot.created_at),
+        lot_count=1,
+        tons=lot.quantity_tons,
+        floor_count=1 if floor is not None else 0,
+        floor_sum=floor or 0.0,
+        floor_min=floor,
+        floor_max=floor,
+    )
+
+
+def record_agreement(session: Session, lot: WasteLot, negotiation: Negotiation) -> None:
+    """Fold an agreed negotiation price into the rollup for the day it was agreed."""
+    price = negotiation.agreed_price_usd_per_ton
+    if price is None:
+        return
+    _upsert(
+        session,
+        _key(lot, negotiation.agreed_at or datetime.utcnow()),
+        agreed_count=1,
+        agreed_tons=lot.quantity_tons,
+        agreed_sum=price,
+        agreed_min=price,
+        agreed_max=price,
+    )
+
+
+def query_prices(
+    session: Session,
+    material_type: str | None = None,
+    location: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    by_day: bool = False,
+) -> list[dict[str, Any]]:
+    """Aggregate stored rollups; cost is proportional to the number of groups, not lots."""
+    group_columns = [PriceRollup.material_type, PriceRollup.location]
+    if by_day:
+        group_columns.append(PriceRollup.day)
+    query = select(
+        *group_columns,
+        func.sum(PriceRollup.lot_count),
+        func.sum(PriceRollup.tons),
+        func.sum(PriceRollup.floor_count),
+        func.sum(PriceRollup.floor_sum),
+        func.min(PriceRollup.floor_min),
+        func.max(PriceRollup.floor_max),
+        func.sum(PriceRollup.agreed_count),
+        func.sum(PriceRollup.agreed_tons),
+        func.sum(PriceRollup.agreed_sum),
+        func.min(PriceRollup.agreed_min),
+        func.max(PriceRollup.agreed_max),
+    )
+    if material_type:
+        query = query.where(PriceRollup.material_type == material_type)
+    if location:
+        query = query.where(PriceRollup.location == location)
+    if start:
+        query = query.where(PriceRollup.day >= start)
+    if end:
+        query = query.where(PriceRollup.day <= end)
+    query = query.group_by(*group_columns).order_by(*group_columns)
+
+    results: list[dict[str, Any]] = []
+    for row in session.exec(query).all():
+        key = dict(zip(("material_type", "location", "day"), row[: len(group_columns)]))
+        (
+            lot_count,
+            tons,
+            floor_count,
+            floor_sum,
+            floor_min,
+            floor_max,
+            agreed_count,
+            agreed_tons,
+            agreed_sum,
+            agreed_min,
+            agreed_max,
+        ) = row[len(group_columns):]
+        results.append(
+            {
+                **key,
+                "lot_count": lot_count,
+                "tons": tons,
+                "floor_min_usd_per_ton": floor_min,
+                "floor_avg_usd_per_ton": floor_sum / floor_count if floor_count else None,
+                "floor_max_usd_per_ton": floor_max,
+                "agreed_count": agreed_count,
+                "agreed_tons": agreed_tons,
+                "agreed_min_usd_per_ton": agreed_min,
+                "agreed_avg_usd_per_ton": agreed_sum / agreed_count if agreed_count else None,
+                "agreed_max_usd_per_ton": agreed_max,
+            }
+        )
+    return results
+
+
+def compute_rollups(session: Session) -> dict[tuple, PriceRollup]:
+    """Recompute every rollup from the source tables (full scan)."""
+    rollups: dict[tuple, PriceRollup] = {}
+
+    def bucket(lot: WasteLot, moment: datetime) -> PriceRollup:
+        key = _key(lot, moment)
+        row = rollups.get(tuple(key.values()))
+        if row is None:
+            row = rollups[tuple(key.values())] = PriceRollup(**key)
+        return row
+
+    for lot in session.exec(select(WasteLot)).all():
+        row = bucket(lot, lot.created_at)
+        row.lot_count += 1
+        row.tons += lot.quantity_tons
+        if lot.price_floor_usd_per_ton is not None:
+            row.floor_count += 1
+            row.floor_sum += lot.price_floor_usd_per_ton
+            row.floor_min = _min(row.floor_min, lot.price_floor_usd_per_ton)
+            row.floor_max = _max(row.floor_max, lot.price_floor_usd_per_ton)
+
+    agreements = session.exec(
+        select(Negotiation, WasteLot)
+        .join(WasteLot, WasteLot.id == Negotiation.waste_lot_id)
+        .where(Negotiation.status.in_(_AGREED_STATUSES))
+        .where(Negotiation.agreed_price_usd_per_ton.is_not(None))
+    ).all()
+    for negotiation, lot in agreements:
+        price = negotiation.agreed_price_usd_per_ton
+        row = bucket(lot, negotiation.agreed_at or negotiation.updated_at)
+        row.agreed_count += 1
+        row.agreed_tons += lot.quantity_tons
+        row.agreed_sum += price
+        row.agreed_min = _min(row.agreed_min, price)
+        row.agreed_max = _max(row.agreed_max, price)
+    return rollups
+
+
+def rebuild(session: Session) -> int:
+    rollups = compute_rollups(session)
+    session.exec(delete(PriceRollup))
+    session.add_all(rollups.values())
+    session.commit()
+    return len(rollups)
+
+
+def verify(session: Session) -> list[str]:
+    """Compare stored rollups with a full recomputation; returns human-readable mismatches."""
+    expected = compute_rollups(session)
+    stored = {tuple(getattr(row, name) for name in _KEY): row for row in session.exec(select(PriceRollup)).all()}
+
+    problems: list[str] = []
+    for key in sorted(set(expected) | set(stored), key=str):
+        want, have = expected.get(key), stored.get(key)
+        if want is None or have is None:
+            problems.append(f"{key}: {'unexpected' if want is None else 'missing'} rollup row")
+            continue
+        for name in _ADDITIVE + ("floor_min", "floor_max", "agreed_min", "agreed_max"):
+            if not _close(getattr(want, name), getattr(have, name)):
+                problems.append(f"{key}: {name} stored={getattr(have, name)} expected={getattr(want, name)}")
+    return problems
+
+
+def _key(lot: WasteLot, moment: datetime) -> dict[str, Any]:
+    return {"material_type": lot.material_type, "location": lot.location, "day": moment.date()}
+
+
+def _upsert(session: Session, key: dict[str, Any], **values: Any) -> None:
+    row = {name: 0 for name in _ADDITIVE}
+    row.update(key)
+    row.update(values)
+    table = PriceRollup.__table__
+    statement = insert(table).values(**row)
+    excluded = statement.excluded
+    updates = {name: table.c[name] + excluded[name] for name in _ADDITIVE}
+    # SQLite's two-argument min()/max() are scalar and return NULL if either side is NULL.
+    for name, pick in (
+        ("floor_min", func.min),
+        ("agreed_min", func.min),
+        ("floor_max", func.max),
+        ("agreed_max", func.max),
+    ):
+        updates[name] = pick(func.coalesce(table.c[name], excluded[name]), func.coalesce(excluded[name], table.c[name]))
+    session.exec(statement.on_conflict_do_update(index_elements=list(_KEY), set_=updates))
+
+
+def _min(current: float | None, value: float) -> float:
+    return value if current is None else min(current, value)
+
+
+def _max(current: float | None, value: float) -> float:
+    return value if current is None else max(current, value)
+
+
+def _close(left: Any, right: Any) -> bool:
+    if isinstance(left, float) or isinstance(right, float):
+        if left is None or right is None:
+            return left is right
+        return math.isclose(left, right, rel_tol=1e-9, abs_tol=1e-9)
+    return left == right
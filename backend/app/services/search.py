@@ -0,0 +1,132 @@
+"""Full-text lot search backed by an SQLite FTS5 index.
+
+`lotsearch` is an external-content FTS5 table over the searchable
+`WasteLot` columns: it stores only the index and reads text back from
+`wastelot`, and triggers keep it in step with every insert, delete and
+edit of those columns (status changes do not touch it). The trigram
+tokenizer matches any substring of three or more characters, which suits
+manifest numbers and partial place names; on SQLite builds older than
+3.34, which lack it, a unicode61 index with prefix queries is used instead.
+
+Ranking every match of a broad term ("pet") by bm25 costs hundreds of
+milliseconds at a million lots, so only the newest `CANDIDATES` matches,
+which FTS5 reads straight off its rowid-ordered index, are ranked.
+Narrower queries reach older lots.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select
+
+from ..db_models import WasteLot
+
+TABLE = "lotsearch"
+COLUMNS = ("material_type", "location", "external_reference")
+# bm25 column weights: a manifest number hit outranks a material or location hit.
+WEIGHTS = (1.0, 1.0, 2.0)
+MIN_TERM_LENGTH = 3
+CANDIDATES = 1000
+TRIGRAM = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+_TERM = re.compile(r"[^\s\"]+")
+
+
+def schema_statements() -> list[str]:
+    columns = ", ".join(COLUMNS)
+    new = ", ".join(f"new.{column}" for column in COLUMNS)
+    old = ", ".join(f"old.{column}" for column in COLUMNS)
+    tokenize = "trigram" if TRIGRAM else "unicode61"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+        f"{columns}, content='wastelot', content_rowid='id', tokenize='{tokenize}'"
+        f"{'' if TRIGRAM else ', prefix=' + repr(str(MIN_TERM_LENGTH))})",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_insert AFTER INSERT ON wastelot BEGIN "
+        f"INSERT INTO {TABLE}(rowid, {columns}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_delete AFTER DELETE ON wastelot BEGIN "
+        f"INSERT INTO {TABLE}({TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_update AFTER UPDATE OF {columns} ON wastelot BEGIN "
+        f"INSERT INTO {TABLE}({TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {TABLE}(rowid, {columns}) VALUES (new.id, {new}); END",
+    ]
+
+
+def install(connection: Connection) -> bool:
+    """Create the index and its triggers if missing; a new index is filled from existing lots.
+
+    Returns True when the index was created.
+    """
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": TABLE}
+    ).first()
+    for statement in schema_statements():
+        connection.exec_driver_sql(statement)
+    if exists:
+        return False
+    rebuild(connection)
+    return True
+
+
+def rebuild(connection: Connection) -> None:
+    """Re-index every lot from `wastelot`."""
+    connection.exec_driver_sql(f"INSERT INTO {TABLE}({TABLE}) VALUES ('rebuild')")
+
+
+def match_expression(query: str) -> str:
+    """An FTS5 MATCH expression requiring every term of `query` (terms are quoted, so operators are literal).
+
+    Raises ValueError when no term has at least `MIN_TERM_LENGTH` characters.
+    """
+    terms = [term for term in _TERM.findall(query) if len(term) >= MIN_TERM_LENGTH]
+    if not terms:
+        raise ValueError(f"search needs at least one term of {MIN_TERM_LENGTH} or more characters")
+    suffix = "" if TRIGRAM else " *"
+    return " ".join(f'"{term}"{suffix}' for term in terms)
+
+
+@dataclass(frozen=True)
+class SearchResults:
+    hits: list[tuple[WasteLot, float]]  # (lot, bm25 score), best (lowest) first
+    ranked: int  # matches considered, at most CANDIDATES
+
+    @property
+    def truncated(self) -> bool:
+        """More lots match than were ranked."""
+        return self.ranked >= CANDIDATES
+
+
+def search(session: Session, query: str, *, limit: int, offset: int = 0) -> SearchResults:
+    """One page of lots matching every term of `query`, ranked among the newest `CANDIDATES` matches.
+
+    `ranked` is counted separately from the page, so every page, including
+    one past the last match, reports the same total.
+    """
+    weights = ", ".join(str(weight) for weight in WEIGHTS)
+    params = {"match": match_expression(query), "candidates": CANDIDATES}
+    connection = session.connection()
+    ranked = connection.execute(
+        text(
+            "SELECT count(*) FROM ("
+            f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH :match ORDER BY rowid DESC LIMIT :candidates"
+            ")"
+        ),
+        params,
+    ).scalar_one()
+    if not ranked or offset >= ranked:
+        return SearchResults([], ranked)
+    rows = connection.execute(
+        text(
+            "SELECT rowid, score FROM ("
+            f"SELECT rowid, bm25({TABLE}, {weights}) AS score FROM {TABLE} WHERE {TABLE} MATCH :match "
+            "ORDER BY rowid DESC LIMIT :candidates"
+            ") ORDER BY score, rowid DESC LIMIT :limit OFFSET :offset"
+        ),
+        {**params, "limit": limit, "offset": offset},
+    ).all()
+    lots = {lot.id: lot for lot in session.exec(select(WasteLot).where(WasteLot.id.in_([row[0] for row in rows])))}
+    return SearchResults([(lots[lot_id], score) for lot_id, score in rows if lot_id in lots], ranked)
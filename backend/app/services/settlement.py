@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from .. import db
+from ..db_models import Agent, EscrowStep, Negotiation, NegotiationStatus, Producer, Settlement, SettlementStatus, WasteLot
+from .aptos import AptosTokenService, EscrowInstruction, PartialChainError
+
+logger = logging.getLogger("aura.settlement")
+
+
+def producer_address(producer: Producer) -> str:
+    return producer.aptos_address or f"0xproducer{producer.id}"
+
+
+def recycler_address(agent: Agent) -> str:
+    return (agent.strategy_metadata or {}).get("aptos_address") or f"0xagent{agent.id}"
+
+
+class SettlementEngine:
+    """Nets agreed negotiations into one escrow per (producer, recycler) pair.
+
+    Every `window_seconds` the AGREED negotiations that are not yet part of a
+    settlement are grouped by pair and summed (agreed price x lot tons) into
+    `Settlement` rows. The settlements are paid through the batched
+    `AptosTokenService` escrow steps (open, sign, finalize), recording each
+    completed step so an interrupted settlement resumes with the same escrow,
+    and their negotiations move to SETTLED with one UPDATE per settlement. Chain
+    transactions therefore scale with the number of distinct accounts in a
+    window, not with the number of deals.
+    """
+
+    def __init__(self, service: AptosTokenService, *, window_seconds: float = 300.0) -> None:
+        self.service = service
+        self.window_seconds = window_seconds
+        self._runs_total = 0
+        self._settlements_total = 0
+        self._negotiations_total = 0
+        self._failed_total = 0
+        self._last_run_at: datetime | None = None
+
+    def run_once(self) -> list[Settlement]:
+        """Settle everything agreed so far; returns the settlements worked on.
+
+        PENDING settlements whose escrow was already opened resume from their
+        last completed step. New settlements are opened first and their escrow
+        IDs stored before any escrow is funded, so a failure after `open`
+        leaves them PENDING for the next run rather than reopening them.
+        """
+        work = self._resumable()
+        collected = self._collect()
+        failed: list[Settlement] = []
+        if collected:
+            error = None
+            try:
+                escrow_ids = self.service.open_escrows([instruction for _, instruction in collected])
+            except PartialChainError as exc:
+                # Escrows opened by the transactions that landed are kept and settled below.
+                escrow_ids, error = exc.partial, str(exc)
+            except Exception as exc:
+                escrow_ids, error = [None] * len(collected), str(exc)
+            opened = []
+            for (settlement, instruction), escrow_id in zip(collected, escrow_ids):
+                if escrow_id is None:
+                    settlement.status = SettlementStatus.FAILED
+                    settlement.error = error
+                    failed.append(settlement)
+                else:
+                    settlement.escrow_id = escrow_id
+                    opened.append((settlement, instruction))
+            if failed:
+                logger.warning("Opening %d of %d escrow(s) failed: %s", len(failed), len(collected), error)
+                self._fail([settlement.id for settlement in failed], error)
+            if opened:
+                self._advance([settlement for settlement, _ in opened], EscrowStep.OPENED)
+                work += opened
+        if not work:
+            return failed
+
+        settlements = [settlement for settlement, _ in work]
+        try:
+            self.service.sign_escrows([(settlement.escrow_id, instruction) for settlement, instruction in work])
+            self._advance(settlements, EscrowStep.SIGNED)
+            results = self.service.finalize_escrows([settlement.escrow_id for settlement in settlements])
+        except Exception as exc:
+            logger.warning("Settlement of %d escrow(s) interrupted, resuming next run: %s", len(settlements), exc)
+            self._interrupt([settlement.id for settlement in settlements], str(exc))
+            for settlement in settlements:
+                settlement.error = str(exc)
+            return failed + settlements
+
+        now = datetime.utcnow()
+        with db.session_scope() as session:
+            for settlement, result in zip(settlements, results):
+                settlement.status = SettlementStatus.SETTLED
+                settlement.escrow_step = EscrowStep.FINALIZED
+                settlement.transaction_hash = result.transaction_hash or settlement.transaction_hash
+                settlement.error = None
+                settlement.settled_at = now
+                session.exec(
+                    update(Settlement)
+                    .where(Settlement.id == settlement.id)
+                    .values(
+                        status=SettlementStatus.SETTLED,
+                        escrow_step=EscrowStep.FINALIZED,
+                        transaction_hash=settlement.transaction_hash,
+                        error=None,
+                        settled_at=now,
+                    )
+                )
+                session.exec(
+                    update(Negotiation)
+                    .where(Negotiation.settlement_id == settlement.id)
+                    .values(status=NegotiationStatus.SETTLED, version=Negotiation.version + 1, updated_at=now)
+                )
+            session.commit()
+
+        self._runs_total += 1
+        self._settlements_total += len(settlements)
+        self._negotiations_total += sum(settlement.negotiation_count for settlement in settlements)
+        self._last_run_at = now
+        logger.info(
+            "Settled %d negotiation(s) in %d escrow(s)",
+            sum(settlement.negotiation_count for settlement in settlements),
+            len(settlements),
+        )
+        return failed + settlements
+
+    def _resumable(self) -> list[tuple[Settlement, EscrowInstruction]]:
+        """PENDING settlements whose escrow is open on chain but not yet finalized by us."""
+        with db.session_scope() as session:
+            settlements = session.exec(
+                select(Settlement)
+                .where(Settlement.status == SettlementStatus.PENDING)
+                .where(Settlement.escrow_id.is_not(None))
+                .order_by(Settlement.id)
+            ).all()
+            if not settlements:
+                return []
+            logger.info("Resuming %d interrupted settlement(s)", len(settlements))
+            return self._instructions(session, settlements)
+
+    def _collect(self) -> list[tuple[Settlement, EscrowInstruction]]:
+        """Create PENDING settlements and claim their negotiations in one transaction."""
+        with db.session_scope() as session:
+            rows = session.exec(
+                select(Negotiation.id, Negotiation.recycler_agent_id, Negotiation.agreed_price_usd_per_ton, WasteLot)
+                .join(WasteLot, WasteLot.id == Negotiation.waste_lot_id)
+                .where(Negotiation.status == NegotiationStatus.AGREED)
+                .where(Negotiation.settlement_id.is_(None))
+                .order_by(Negotiation.id)
+            ).all()
+            if not rows:
+                return []
+
+            pairs: dict[tuple[int, int], list[tuple[int, float, float]]] = {}
+            for negotiation_id, recycler_agent_id, price, lot in rows:
+                pairs.setdefault((lot.producer_id, recycler_agent_id), []).append(
+                    (negotiation_id, price or 0.0, lot.quantity_tons)
+                )
+
+            settlements: list[tuple[Settlement, list[int]]] = []
+            for (producer_id, recycler_agent_id), deals in pairs.items():
+                amount_usd = round(sum(price * tons for _, price, tons in deals), 2)
+                settlement = Settlement(
+                    producer_id=producer_id,
+                    recycler_agent_id=recycler_agent_id,
+                    negotiation_count=len(deals),
+                    total_tons=sum(tons for _, _, tons in deals),
+                    amount_usd=amount_usd,
+                    amount_cents=round(amount_usd * 100),
+                )
+                session.add(settlement)
+                settlements.append((settlement, [negotiation_id for negotiation_id, _, _ in deals]))
+            session.flush()
+
+            for settlement, negotiation_ids in settlements:
+                session.exec(
+                    update(Negotiation)
+                    .where(Negotiation.id.in_(negotiation_ids))
+                    .where(Negotiation.settlement_id.is_(None))
+                    .values(settlement_id=settlement.id, version=Negotiation.version + 1)
+                )
+            session.commit()
+            for settlement, _ in settlements:
+                session.refresh(settlement)
+            return self._instructions(session, [settlement for settlement, _ in settlements])
+
+    @staticmethod
+    def _instructions(session: Session, settlements: list[Settlement]) -> list[tuple[Settlement, EscrowInstruction]]:
+        """Detach settlements and pair each with the escrow instruction that pays it."""
+        producers = {
+            producer.id: producer
+            for producer in session.exec(
+                select(Producer).where(Producer.id.in_({settlement.producer_id for settlement in settlements}))
+            ).all()
+        }
+        agents = {
+            agent.id: agent
+            for agent in session.exec(
+                select(Agent).where(Agent.id.in_({settlement.recycler_agent_id for settlement in settlements}))
+            ).all()
+        }
+        paired = []
+        for settlement in settlements:
+            session.expunge(settlement)
+            instruction = EscrowInstruction(
+                producer_address=producer_address(producers[settlement.producer_id]),
+                recycler_address=recycler_address(agents[settlement.recycler_agent_id]),
+                amount=settlement.amount_cents,
+                memo=f"settlement:{settlement.id}",
+            )
+            paired.append((settlement, instruction))
+        return paired
+
+    def _advance(self, settlements: list[Settlement], step: EscrowStep) -> None:
+        """Record the escrow step the settlements completed, with their escrow IDs."""
+        with db.session_scope() as session:
+            for settlement in settlements:
+                settlement.escrow_step = step
+                session.exec(
+                    update(Settlement)
+                    .where(Settlement.id == settlement.id)
+                    .values(escrow_id=settlement.escrow_id, escrow_step=step)
+                )
+            session.commit()
+
+    def _interrupt(self, settlement_ids: list[int], error: str) -> None:
+        """Keep opened settlements PENDING with their negotiations claimed, so the next run resumes them."""
+        with db.session_scope() as session:
+            session.exec(update(Settlement).where(Settlement.id.in_(settlement_ids)).values(error=error))
+            session.commit()
+        self._failed_total += len(settlement_ids)
+
+    def _fail(self, settlement_ids: list[int], error: str) -> None:
+        """Mark settlements FAILED and release their negotiations for the next window."""
+        with db.session_scope() as session:
+            session.exec(
+                update(Settlement)
+                .where(Settlement.id.in_(settlement_ids))
+                .values(status=SettlementStatus.FAILED, error=error)
+            )
+            session.exec(
+                update(Negotiation)
+                .where(Negotiation.settlement_id.in_(settlement_ids))
+                .values(settlement_id=None, version=Negotiation.version + 1)
+            )
+            session.commit()
+        self._failed_total += len(settlement_ids)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning("Settlement run failed: %s", exc)
+
+    def metrics(self) -> dict[str, Any]:
+        with db.session_scope() as session:
+            pending = session.exec(
+                select(func.count())
+                .select_from(Negotiation)
+                .where(Negotiation.status == NegotiationStatus.AGREED)
+                .where(Negotiation.settlement_id.is_(None))
+            ).one()
+        return {
+            "running": True,
+            "window_seconds": self.window_seconds,
+            "pending_negotiations": pending,
+            "runs_total": self._runs_total,
+            "settlements_total": self._settlements_total,
+            "negotiations_total": self._negotiations_total,
+            "failed_total": self._failed_total,
+            "avg_negotiations_per_settlement": (
+                self._negotiations_total / self._settlements_total if self._settlements_total else None
+            ),
+            "last_run_at": self._last_run_at,
+        }
+
+
+_engine: SettlementEngine | None = None
+_task: asyncio.Task | None = None
+
+
+def start(service: AptosTokenService, **options: Any) -> SettlementEngine:
+    """Start the settlement loop on the running event loop (FastAPI startup)."""
+    global _engine, _task
+    _engine = SettlementEngine(service, **options)
+    _task = asyncio.get_running_loop().create_task(_engine.run())
+    return _engine
+
+
+async def stop() -> None:
+    global _engine, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+    _engine = None
+    _task = None
+
+
+def current() -> SettlementEngine | None:
+    return _engine
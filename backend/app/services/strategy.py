@@ -0,0 +1,275 @@
+"""Strategy rule sets stored under ``Agent.strategy_metadata["rules"]``.
+
+A recycler agent's metadata may carry an ordered list of rules::
+
+    {
+        "version": 2,
+        "rules": [
+            {"when": "material_type in ('PET Bales', 'HDPE Regrind') and quantity_tons >= 5",
+             "max_price": "max_price + 20", "offer": "min(reference, max_price + 20)"},
+            {"when": "floor <= 150"}
+        ]
+    }
+
+The first rule whose ``when`` holds decides a lot: ``max_price`` is the most
+the agent pays for it (default: the agent's configured maximum) and ``offer``
+its opening bid (default: the matchmaker's usual suggestion). A lot no rule
+matches is skipped. Expressions are a small Python subset -- arithmetic,
+comparisons, ``and``/``or``/``not``, ``in`` against a literal tuple,
+``a if cond else b`` and ``min``/``max``/``abs`` -- over the names in
+``VARIABLES``, capped in size (``MAX_EXPRESSION_LENGTH``,
+``MAX_EXPRESSION_NODES``) so saving a rule set cannot exhaust the stack.
+Missing prices are NaN: comparisons with them are false and
+``min``/``max`` skip them.
+
+Rule sets are compiled once into a Python function and cached per agent ID
+and ``version``, so matchmaking does not re-parse them per lot and agent
+pair. The agents package evaluates the same language over NumPy columns
+(``aura_agents.strategy``).
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+VARIABLES: dict[str, str] = {
+    "material_type": "lot material, e.g. 'PET Bales'",
+    "quantity_tons": "lot quantity",
+    "floor": "lot price floor (USD/ton)",
+    "price": "price on the table: the producer's ask when matching, the latest offer when negotiating",
+    "reference": "oracle reference price for the lot material",
+    "max_price": "agent's configured maximum price",
+    "target_price": "agent's configured target price",
+}
+RULE_KEYS = ("when", "max_price", "offer")
+MAX_EXPRESSION_LENGTH = 2000  # characters per expression
+MAX_EXPRESSION_NODES = 500  # syntax tree nodes per expression, which also bounds its nesting depth
+
+_NAN = float("nan")
+_BOOL_OPS = (ast.And, ast.Or)
+_UNARY_OPS = (ast.Not, ast.USub, ast.UAdd)
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_COMPARE_OPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.In, ast.NotIn)
+_FUNCTIONS = ("min", "max", "abs")
+
+
+class StrategyError(ValueError):
+    """A rule set that does not parse or uses something outside the rule language."""
+
+
+def _nan_skipping(reduce: Callable[..., float]) -> Callable[..., float]:
+    def call(*values: float) -> float:
+        known = [value for value in values if not (isinstance(value, float) and math.isnan(value))]
+        return reduce(known) if known else _NAN
+
+    return call
+
+
+_NAMESPACE = {"__builtins__": {}, "min": _nan_skipping(min), "max": _nan_skipping(max), "abs": abs}
+
+
+def parse_expression(source: Any, where: str) -> ast.expr:
+    """Parse one rule expression, rejecting anything outside the rule language."""
+    if isinstance(source, bool) or isinstance(source, (int, float)):
+        source = repr(source)
+    if not isinstance(source, str):
+        raise StrategyError(f"{where}: expected an expression string, got {type(source).__name__}")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise StrategyError(f"{where}: longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(source, mode="eval").body
+    except SyntaxError as exc:
+        raise StrategyError(f"{where}: {exc.msg}") from None
+    except (RecursionError, MemoryError):  # the parser's own nesting limits
+        raise StrategyError(f"{where}: too deeply nested") from None
+    nodes = list(ast.walk(tree))
+    if len(nodes) > MAX_EXPRESSION_NODES:
+        raise StrategyError(f"{where}: more than {MAX_EXPRESSION_NODES} syntax nodes")
+    for node in nodes:
+        _check_node(node, where)
+    return tree
+
+
+def _check_node(node: ast.AST, where: str) -> None:
+    if isinstance(node, ast.Name):
+        if node.id not in VARIABLES and node.id not in _FUNCTIONS:
+            raise StrategyError(f"{where}: unknown name '{node.id}'")
+    elif isinstance(node, ast.Constant):
+        if not isinstance(node.value, (bool, int, float, str)):
+            raise StrategyError(f"{where}: unsupported literal {node.value!r}")
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords or not node.args:
+            raise StrategyError(f"{where}: only min(...), max(...) and abs(...) can be called")
+    elif isinstance(node, ast.Compare):
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)) and not (
+                isinstance(right, ast.Tuple) and all(isinstance(item, ast.Constant) for item in right.elts)
+            ):
+                raise StrategyError(f"{where}: 'in' needs a tuple of literals")
+    elif isinstance(node, ast.Tuple):
+        pass  # only reachable as the right-hand side of `in`, checked above
+    elif isinstance(node, (ast.BoolOp, ast.UnaryOp, ast.BinOp, ast.IfExp, ast.Load)):
+        pass
+    elif not isinstance(node, _BOOL_OPS + _UNARY_OPS + _BIN_OPS + _COMPARE_OPS):
+        raise StrategyError(f"{where}: '{type(node).__name__}' is not allowed in strategy rules")
+
+
+_STRING, _NUMBER = frozenset({"string"}), frozenset({"number"})
+_ORDERING_OPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+def _kinds(node: ast.expr, where: str) -> frozenset[str]:
+    """What a checked expression can evaluate to: a string, a number (booleans included) or either.
+
+    Rejects arithmetic, ``min``/``max``/``abs`` and ordering comparisons that
+    could see a string, so e.g. ``material_type * 1000000`` or
+    ``material_type > 5`` fail when the rules are saved, not per lot.
+    """
+    if isinstance(node, ast.Name):
+        return _STRING if node.id == "material_type" else _NUMBER
+    if isinstance(node, ast.Constant):
+        return _STRING if isinstance(node.value, str) else _NUMBER
+    if isinstance(node, ast.BinOp):
+        if "string" in _kinds(node.left, where) | _kinds(node.right, where):
+            raise StrategyError(f"{where}: arithmetic needs numbers, not strings")
+        return _NUMBER
+    if isinstance(node, ast.UnaryOp):
+        if "string" in _kinds(node.operand, where) and not isinstance(node.op, ast.Not):
+            raise StrategyError(f"{where}: arithmetic needs numbers, not strings")
+        return _NUMBER
+    if isinstance(node, ast.Call):
+        if any("string" in _kinds(arg, where) for arg in node.args):
+            raise StrategyError(f"{where}: {node.func.id}(...) needs numbers, not strings")
+        return _NUMBER
+    if isinstance(node, ast.Compare):
+        left = _kinds(node.left, where)
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            right = _kinds(comparator, where)
+            if isinstance(op, _ORDERING_OPS) and len(left | right) > 1:
+                raise StrategyError(f"{where}: cannot order strings against numbers")
+            left = right
+        return _NUMBER
+    if isinstance(node, ast.BoolOp):
+        return frozenset().union(*(_kinds(value, where) for value in node.values))
+    if isinstance(node, ast.IfExp):
+        _kinds(node.test, where)
+        return _kinds(node.body, where) | _kinds(node.orelse, where)
+    raise StrategyError(f"{where}: '{type(node).__name__}' is not allowed here")
+
+
+def _numeric(tree: ast.expr, where: str) -> ast.expr:
+    """`tree`, provided it always evaluates to a number or condition."""
+    if "string" in _kinds(tree, where):
+        raise StrategyError(f"{where}: expected a number or condition, not a string")
+    return tree
+
+
+def validate_rules(rules: Any) -> list[dict[str, ast.expr]]:
+    """Parsed `when`/`max_price`/`offer` expressions per rule, with defaults filled in."""
+    if not isinstance(rules, list):
+        raise StrategyError("rules: expected a list of rules")
+    parsed = []
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            raise StrategyError(f"rules[{index}]: expected an object")
+        unknown = set(rule) - set(RULE_KEYS)
+        if unknown:
+            raise StrategyError(f"rules[{index}]: unknown keys {sorted(unknown)}; expected {list(RULE_KEYS)}")
+        expressions = {
+            "when": ast.Constant(True),
+            "max_price": ast.Name("max_price", ast.Load()),
+            "offer": ast.Constant(_NAN),
+        }
+        for key in RULE_KEYS:
+            if key in rule:
+                where = f"rules[{index}].{key}"
+                expressions[key] = _numeric(parse_expression(rule[key], where), where)
+        parsed.append(expressions)
+    return parsed
+
+
+@dataclass(frozen=True)
+class StrategyDecision:
+    max_price: float  # NaN: no cap
+    offer: float  # NaN: fall back to the matchmaker's suggestion
+
+
+class CompiledStrategy:
+    """A rule set compiled to one function of `VARIABLES`."""
+
+    def __init__(self, rules: list[dict[str, Any]], version: Any = None) -> None:
+        self.rules = rules
+        self.version = version
+        self._function = self._compile(validate_rules(rules))
+
+    @staticmethod
+    def _compile(parsed: list[dict[str, ast.expr]]) -> Callable[..., tuple[float, float] | None]:
+        # lambda material_type='', quantity_tons=nan, ...: (m0, o0) if w0 else (m1, o1) if w1 else None
+        body: ast.expr = ast.Constant(None)
+        for rule in reversed(parsed):
+            outcome = ast.Tuple([rule["max_price"], rule["offer"]], ast.Load())
+            body = ast.IfExp(rule["when"], outcome, body)
+        names = list(VARIABLES)
+        function = ast.Expression(
+            ast.Lambda(
+                ast.arguments(
+                    posonlyargs=[],
+                    args=[],
+                    vararg=None,
+                    kwonlyargs=[ast.arg(name) for name in names],
+                    kw_defaults=[ast.Constant("" if name == "material_type" else _NAN) for name in names],
+                    kwarg=None,
+                    defaults=[],
+                ),
+                body,
+            )
+        )
+        return eval(compile(ast.fix_missing_locations(function), "<strategy>", "eval"), dict(_NAMESPACE))
+
+    def decide(self, variables: Mapping[str, Any]) -> StrategyDecision | None:
+        """The first matching rule's limits for one lot, or None when no rule matches.
+
+        `variables` maps names in `VARIABLES` to values; None and missing
+        entries count as NaN. Errors raised by the rules on these values (a
+        division by zero, say) surface as `StrategyError`.
+        """
+        try:
+            outcome = self._function(**{name: value for name, value in variables.items() if value is not None})
+            if outcome is None:
+                return None
+            max_price, offer = outcome
+            return StrategyDecision(float(max_price), float(offer))
+        except (TypeError, ValueError, ArithmeticError) as exc:  # e.g. `reference / quantity_tons` on an empty lot
+            raise StrategyError(f"rules: {exc}") from None
+
+
+_cache: dict[Any, CompiledStrategy] = {}
+_compiled_total = 0
+
+
+def compile_strategy(agent_id: Any, metadata: Mapping[str, Any] | None) -> CompiledStrategy | None:
+    """The agent's compiled rule set, or None when its metadata has no `rules`.
+
+    Compiled rule sets are cached per agent and reused while the metadata's
+    `version` and rules are unchanged.
+    """
+    global _compiled_total
+    rules = (metadata or {}).get("rules")
+    if rules is None:
+        return None
+    version = metadata.get("version")
+    cached = _cache.get(agent_id)
+    if cached is None or cached.version != version or cached.rules != rules:
+        cached = CompiledStrategy(rules, version)
+        _cache[agent_id] = cached
+        _compiled_total += 1
+    return cached
+
+
+def metrics() -> dict[str, int]:
+    return {"compiled_total": _compiled_total, "cached": len(_cache)}
@@ -0,0 +1,226 @@
+"""Request tracing compatible with W3C Trace Context.
+
+A span is opened per HTTP request (continuing the caller's `traceparent`
+header when there is one), per endpoint call (via `TracedRoute`, so the time
+FastAPI spends validating and serializing around the handler is visible as
+the gap between the two) and per SQL statement. Spans live in a context
+variable, which Starlette and anyio copy into the thread that runs a sync
+endpoint, so nesting follows the request without threading state through
+calls.
+
+Root spans are sampled at `sample_rate`; children inherit the decision, and a
+caller's sampled flag is honoured so an agent's trace continues through the
+API. Finished sampled spans go to the configured exporter: a JSON-lines file
+in the same format the agents write, so both sides can share one file and be
+read back offline.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SERVICE_NAME = "aura-api"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    sampled: bool
+    kind: str = "internal"
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    status: str = "ok"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "service": SERVICE_NAME,
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6 if self.end_ns else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class FileExporter:
+    """Appends finished spans to a JSON-lines file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class MemoryExporter:
+    """Keeps finished spans in a list (tests, ad-hoc inspection)."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+_current: ContextVar[Span | None] = ContextVar("aura_trace_span", default=None)
+_exporter: SpanExporter | None = None
+_sample_rate = 0.0
+
+
+def configure(sample_rate: float, exporter: SpanExporter | None) -> None:
+    global _exporter, _sample_rate
+    _sample_rate = sample_rate
+    _exporter = exporter
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """`(trace_id, parent_span_id, sampled)` from a W3C `traceparent` header, or None if malformed."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+@contextmanager
+def span(name: str, *, traceparent: str | None = None, kind: str = "internal", **attributes: Any) -> Iterator[Span]:
+    """Open a child of the current span, of a remote `traceparent`, or a new sampled-or-not root."""
+    parent = _current.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    elif remote is not None:
+        trace_id, parent_id, sampled = remote
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+        sampled = _exporter is not None and random.random() < _sample_rate
+    current = Span(name, trace_id, secrets.token_hex(8), parent_id, sampled, kind, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.attributes["exception.type"] = type(exc).__name__
+        raise
+    finally:
+        _current.reset(token)
+        finish(current)
+
+
+def finish(finished: Span) -> None:
+    finished.end_ns = time.time_ns()
+    if finished.sampled and _exporter is not None:
+        _exporter.export(finished)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return
+    child = Span(
+        "db.query",
+        parent.trace_id,
+        secrets.token_hex(8),
+        parent.span_id,
+        True,
+        "client",
+        {"db.system": "sqlite", "db.statement": statement[:500], "db.executemany": executemany},
+    )
+    conn.info.setdefault("aura_trace_spans", []).append(child)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    spans = conn.info.get("aura_trace_spans")
+    if spans:
+        finished = spans.pop()
+        finished.attributes["db.rowcount"] = cursor.rowcount
+        finish(finished)
+
+
+def _handle_error(context) -> None:
+    spans = context.connection.info.get("aura_trace_spans") if context.connection is not None else None
+    if spans:
+        failed = spans.pop()
+        failed.status = "error"
+        failed.attributes["exception.type"] = type(context.original_exception).__name__
+        finish(failed)
+
+
+def install(engine: Engine) -> None:
+    """Record each SQL statement run under a sampled span as a `db.query` child span."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _traced(endpoint: Callable[..., Any], name: str) -> Callable[..., Any]:
+    # FastAPI reads parameters from the signature and evaluates string annotations
+    # against `__globals__`, which a wrapper does not share, so hand it the resolved one.
+    signature = inspect.signature(endpoint, eval_str=True)
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, **{"code.function": endpoint.__name__}):
+                return await endpoint(*args, **kwargs)
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, **{"code.function": endpoint.__name__}):
+                return endpoint(*args, **kwargs)
+
+    wrapper.__signature__ = signature
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """Route class that opens an `endpoint` span around the handler itself."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _traced(endpoint, f"endpoint {path}"), **kwargs)
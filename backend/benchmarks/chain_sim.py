@@ -0,0 +1,63 @@
+"""Sweep mint batch sizes against the simulated chain in virtual time.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.chain_sim --lots 2000 --batch-sizes 1,8,32,64 --failure-rate 0.01
+
+No database is involved: each run mints ``--lots`` lots through
+``AptosTokenService`` on a fresh ``SimulatedChain`` and reports chain-side cost
+(blocks, virtual seconds, gas, failed transactions) alongside CPU time spent in
+the simulator itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, default=2000)
+    parser.add_argument("--batch-sizes", default="1,8,32,64")
+    parser.add_argument("--block-time", type=float, default=1.0)
+    parser.add_argument("--block-limit", type=int, default=100, help="Max transactions per block")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    from app.services.aptos import AptosTokenService, MintRequest
+    from app.services.chain import ChainError, SimulatedChain
+
+    requests = [MintRequest(lot_id, f"LOT-{lot_id}", "AURA", 1) for lot_id in range(1, args.lots + 1)]
+    for batch_size in (int(value) for value in args.batch_sizes.split(",")):
+        chain = SimulatedChain(
+            block_time_seconds=args.block_time,
+            max_calls_per_transaction=batch_size,
+            max_transactions_per_block=args.block_limit,
+            failure_rate=args.failure_rate,
+        )
+        service = AptosTokenService(backend=chain, max_batch_size=batch_size)
+        genesis = chain.timestamp
+        minted = retries = 0
+        cpu_start = time.process_time()
+        for start in range(0, len(requests), batch_size):
+            batch = requests[start:start + batch_size]
+            while True:
+                try:
+                    minted += len(service.mint_waste_lots(batch))
+                    break
+                except ChainError:
+                    retries += 1
+        cpu = time.process_time() - cpu_start
+        metrics = chain.metrics()
+        elapsed = max(chain.timestamp - genesis, 1)
+        print(
+            f"batch={batch_size:>4} minted={minted} blocks={metrics['block_height']} "
+            f"chain_seconds={elapsed} mints_per_chain_second={minted / elapsed:.1f} "
+            f"txns={metrics['transactions_total']} failed={metrics['failed_total']} retries={retries} "
+            f"gas={metrics['gas_used_total']} cpu={cpu:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
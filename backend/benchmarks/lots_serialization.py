@@ -0,0 +1,115 @@
+"""Measure CPU time spent serving ``GET /lots`` for a large marketplace.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.lots_serialization --lots 10000
+
+The script seeds a throwaway SQLite database, then times the full request
+(query, detail assembly, validation and JSON encoding) through the ASGI app.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+def _seed(database_url: str, lot_count: int) -> None:
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from app.db_models import Producer, UpcyclingProof, WasteLot, WasteLotStatus, WasteLotToken, WasteLotVerification
+
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        producer = Producer(name="Bench Producer", contact_email="bench@example.com")
+        session.add(producer)
+        session.commit()
+        session.refresh(producer)
+
+        now = datetime.utcnow()
+        lots = [
+            WasteLot(
+                producer_id=producer.id,
+                external_reference=f"bench-{index}",
+                material_type="PET Bales",
+                quantity_tons=5.0,
+                location="Dallas, TX",
+                price_floor_usd_per_ton=200.0,
+                photos=[f"https://example.com/photos/{index}/a.jpg", f"https://example.com/photos/{index}/b.jpg"],
+                chemical_composition={"grade": "PET-200"},
+                status=WasteLotStatus.TOKENIZED,
+                created_at=now,
+                updated_at=now,
+            )
+            for index in range(lot_count)
+        ]
+        session.add_all(lots)
+        session.flush()
+        for lot in lots:
+            session.add(
+                WasteLotVerification(
+                    waste_lot_id=lot.id,
+                    method="sensor_bundle",
+                    evidence_uri=f"https://example.com/evidence/{lot.id}",
+                    status="verified",
+                    verified_at=now,
+                )
+            )
+            session.add(
+                WasteLotToken(
+                    waste_lot_id=lot.id,
+                    token_address=f"0xLOT{lot.id:06d}",
+                    token_name=f"LOT-{lot.id}",
+                    token_symbol="AURA",
+                    transaction_hash=f"0xTX{lot.id:06d}",
+                )
+            )
+            session.add(
+                UpcyclingProof(
+                    waste_lot_id=lot.id,
+                    evidence_uri=f"https://example.com/proof/{lot.id}",
+                    certificate_uri=f"https://example.com/certificates/{lot.id}",
+                    status="pending",
+                )
+            )
+        session.commit()
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["AURA_DATABASE_URL"] = database_url
+        _seed(database_url, args.lots)
+
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        with TestClient(app) as client:
+            client.get("/lots", params={"status": "draft"})  # warm up routing and adapters
+            samples = []
+            for _ in range(args.repeat):
+                cpu_start = time.process_time()
+                wall_start = time.perf_counter()
+                resp = client.get("/lots")
+                resp.raise_for_status()
+                samples.append((time.process_time() - cpu_start, time.perf_counter() - wall_start, len(resp.content)))
+
+    best_cpu, best_wall, size = min(samples)
+    per_10k = best_cpu * 10_000 / max(args.lots, 1)
+    print(f"lots={args.lots} cpu={best_cpu:.3f}s wall={best_wall:.3f}s bytes={size} cpu_per_10k_lots={per_10k:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare per-request minting with the batched mint queue against a slow chain.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.mint_queue --lots 500 --confirmation 0.05 --batch-size 64
+
+Both modes run offline against ``AptosTokenService`` backed by a real-time
+``SimulatedChain``, so every block costs ``--confirmation`` seconds. "inline"
+mints one lot per request as the synchronous tokenize endpoint does; "queued"
+drains the same number of ``MintJob`` rows through ``MintQueueWorker``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def _seed(lot_count: int) -> list[int]:
+    from app import db
+    from app.db_models import Producer, WasteLot, WasteLotStatus
+
+    db.init_db()
+    with db.session_scope() as session:
+        producer = Producer(name="Bench Producer", contact_email="bench@example.com")
+        session.add(producer)
+        session.commit()
+        lots = [
+            WasteLot(
+                producer_id=producer.id,
+                material_type="PET Bales",
+                quantity_tons=5.0,
+                location="Dallas, TX",
+                status=WasteLotStatus.VERIFIED,
+            )
+            for _ in range(lot_count)
+        ]
+        session.add_all(lots)
+        session.commit()
+        return [lot.id for lot in lots]
+
+
+def _inline(lot_ids: list[int], service) -> None:
+    from app import db
+    from app.crud import record_token_mint
+    from app.db_models import WasteLot
+    from app.models import TokenMintRequest
+
+    with db.session_scope() as session:
+        for lot_id in lot_ids:
+            payload = TokenMintRequest(token_name=f"LOT-{lot_id}", token_symbol="AURA")
+            result = service.mint_waste_lot(lot_id, payload.token_name, payload.token_symbol, payload.supply)
+            record_token_mint(session, session.get(WasteLot, lot_id), payload, result.token_address, result.transaction_hash)
+
+
+def _queued(lot_ids: list[int], service, batch_size: int) -> None:
+    from app import db
+    from app.crud import enqueue_mint
+    from app.db_models import WasteLot
+    from app.models import TokenMintRequest
+    from app.services.minting import MintQueueWorker
+
+    with db.session_scope() as session:
+        for lot_id in lot_ids:
+            enqueue_mint(session, session.get(WasteLot, lot_id), TokenMintRequest(token_name=f"LOT-{lot_id}", token_symbol="AURA"))
+    MintQueueWorker(service, batch_size=batch_size).drain()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, default=500)
+    parser.add_argument("--confirmation", type=float, default=0.05, help="Simulated block time in seconds")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AURA_DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        from app.services.aptos import AptosTokenService
+        from app.services.chain import SimulatedChain
+
+        chain = SimulatedChain(
+            block_time_seconds=args.confirmation, realtime=True, max_calls_per_transaction=args.batch_size
+        )
+        service = AptosTokenService(backend=chain, max_batch_size=args.batch_size)
+        lot_ids = _seed(args.lots * 2)
+
+        for label, run in (
+            ("inline", lambda ids: _inline(ids, service)),
+            ("queued", lambda ids: _queued(ids, service, args.batch_size)),
+        ):
+            ids = lot_ids[: args.lots] if label == "inline" else lot_ids[args.lots:]
+            started = time.perf_counter()
+            run(ids)
+            elapsed = time.perf_counter() - started
+            print(f"{label}: lots={len(ids)} wall={elapsed:.2f}s throughput={len(ids) / elapsed:.1f} mints/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Load-test read endpoints against 1..N API worker processes.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.multiworker --workers 1,2,4 --clients 16 --seconds 10
+
+For each worker count the script starts ``python -m app.cli serve`` on a copy
+of the bundled database, drives it with ``--clients`` keep-alive HTTP clients
+(spread over client processes so the load generator is not GIL-bound) cycling
+through ``--paths``, and reports requests per second and scaling efficiency
+against the single-worker run. Background workers are disabled so only
+request serving is measured. Scaling is bounded by free cores: on a box with
+C cores, clients and servers share them, so expect near-linear gains only up
+to roughly C/2 workers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PATHS = "/health,/lots,/producers,/lots/1,/analytics/prices"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def _client_process(base_url: str, paths: list[str], threads: int, seconds: float, results) -> None:
+    import threading
+
+    import httpx
+
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def drive(offset: int) -> None:
+        done = errors = 0
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            index = offset
+            while time.monotonic() < deadline:
+                response = client.get(paths[index % len(paths)])
+                index += 1
+                if response.status_code == 200:
+                    done += 1
+                else:
+                    errors += 1
+        with lock:
+            counts["requests"] += done
+            counts["errors"] += errors
+
+    pool = [threading.Thread(target=drive, args=(offset,)) for offset in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(dict(counts))
+
+
+def _pids_seen(base_url: str, probes: int = 200) -> int:
+    import httpx
+
+    # New connections are spread across workers by the kernel, so probe with fresh ones.
+    return len({httpx.get(f"{base_url}/health").json()["worker"]["pid"] for _ in range(probes)})
+
+
+def run(workers: int, database: Path, paths: list[str], clients: int, processes: int, seconds: float) -> dict:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "AURA_DATABASE_URL": f"sqlite:///{database}",
+        **{
+            f"AURA_{name}_ENABLED": "false"
+            for name in ("EXPIRY", "MINT_QUEUE", "ANCHORING", "SETTLEMENT", "ORACLE", "INDEXER")
+        },
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.cli", "serve", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_ROOT,
+        env=env,
+    )
+    try:
+        _wait_ready(base_url)
+        pids = _pids_seen(base_url)
+        results = multiprocessing.Queue()
+        per_process = max(1, clients // processes)
+        started = time.perf_counter()
+        procs = [
+            multiprocessing.Process(target=_client_process, args=(base_url, paths, per_process, seconds, results))
+            for _ in range(processes)
+        ]
+        for proc in procs:
+            proc.start()
+        totals: Counter = Counter()
+        for _ in procs:
+            totals.update(results.get())
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {"workers": workers, "pids": pids, "rps": totals["requests"] / elapsed, "errors": totals["errors"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--paths", default=DEFAULT_PATHS, help="Comma-separated GET paths to cycle through")
+    args = parser.parse_args()
+
+    paths = args.paths.split(",")
+    baseline = None
+    print(f"cpus={os.cpu_count()} clients={args.clients} client_processes={args.client_processes} paths={paths}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in (int(value) for value in args.workers.split(",")):
+            database = Path(tmp) / f"bench-{workers}.db"
+            shutil.copy(BACKEND_ROOT / "data" / "aura.db", database)
+            result = run(workers, database, paths, args.clients, args.client_processes, args.seconds)
+            baseline = baseline or result["rps"]
+            efficiency = result["rps"] / (baseline * workers)
+            print(
+                f"workers={workers} pids_seen={result['pids']} rps={result['rps']:.0f} "
+                f"speedup={result['rps'] / baseline:.2f}x efficiency={efficiency:.0%} errors={result['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
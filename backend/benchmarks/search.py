@@ -0,0 +1,106 @@
+"""Measure ``GET /lots/search`` query latency against a large synthetic lot table.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.search --lots 1000000 --queries "pet bales,houston,MAN-0042,copper akron"
+
+The script migrates a temporary SQLite database, bulk-inserts ``--lots``
+lots (the FTS triggers index them as they land, so insert throughput
+includes index maintenance), then times each query through
+``services.search`` for the first page and a deep page. Materials and cities
+repeat, so broad queries match a large share of the table while manifest
+numbers match a handful of rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+MATERIALS = ["PET Bales", "HDPE Regrind", "Copper Wire", "Aluminum Cans", "Cullet Glass", "OCC Cardboard",
+             "E-waste (Server Boards)", "LDPE Film", "Steel Turnings", "Mixed Rigid Plastics"]
+CITIES = ["Austin, TX", "Houston, TX", "San Jose, CA", "Akron, OH", "Toledo, OH", "Gary, IN", "Newark, NJ",
+          "Tacoma, WA", "Savannah, GA", "Denver, CO"]
+
+
+def _populate(database: Path, lots: int, batch: int = 50_000) -> float:
+    import sqlite3
+
+    rng = random.Random(0)
+    connection = sqlite3.connect(database)
+    connection.execute(
+        "INSERT INTO producer (name, contact_email, created_at, updated_at)"
+        " VALUES ('Bench', 'bench@example.com', '2024-01-01', '2024-01-01')"
+    )
+    started = time.perf_counter()
+    for first in range(0, lots, batch):
+        rows = [
+            (
+                1,
+                f"MAN-{index:07d}",
+                rng.choice(MATERIALS),
+                "{}",
+                rng.uniform(1, 40),
+                rng.choice(CITIES),
+                rng.uniform(50, 900),
+                "[]",
+                "VERIFIED",
+                "2024-01-01 00:00:00",
+                "2024-01-01 00:00:00",
+            )
+            for index in range(first, min(first + batch, lots))
+        ]
+        connection.executemany(
+            "INSERT INTO wastelot (producer_id, external_reference, material_type, chemical_composition, quantity_tons,"
+            " location, price_floor_usd_per_ton, photos, status, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        connection.commit()
+    elapsed = time.perf_counter() - started
+    connection.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, default=1_000_000)
+    parser.add_argument("--queries", default="pet bales,houston,MAN-0042,MAN-0999999,copper akron")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "search.db"
+        os.environ["AURA_DATABASE_URL"] = f"sqlite:///{database}"
+        from app.db import init_db, session_scope
+        from app.services import search
+
+        init_db()
+        elapsed = _populate(database, args.lots)
+        print(
+            f"lots={args.lots} tokenizer={'trigram' if search.TRIGRAM else 'unicode61'}"
+            f" insert={args.lots / elapsed:,.0f} lots/s db={database.stat().st_size / 1e6:.0f}MB"
+        )
+
+        with session_scope() as session:
+            for query in args.queries.split(","):
+                for offset in (0, 10 * args.limit):
+                    timings = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        results = search.search(session, query, limit=args.limit, offset=offset)
+                        timings.append(time.perf_counter() - started)
+                    print(
+                        f"{query!r:>22} offset={offset:<4} hits={len(results.hits):<3} ranked={results.ranked:<5}"
+                        f" median={statistics.median(timings) * 1000:7.1f}ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from importlib import reload
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+
+@pytest.fixture(name="client")
+def client_fixture(tmp_path, monkeypatch) -> TestClient:
+    db_path = tmp_path / "test.db"
+    monkeypatch.setenv("AURA_DATABASE_URL", f"sqlite:///{db_path}")
+
+    # Reload modules that cache configuration to ensure the temp DB is used.
+    from app import config, db, main, seed
+
+    reload(config)
+    reload(db)
+    reload(seed)
+    reload(main)
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, route=None): fail if a request (or only `METHOD /path` requests) "
+        "runs more than max_queries SQL queries",
+    )
+
+
+@pytest.fixture(name="query_budget")
+def query_budget_fixture():
+    """`with query_budget(n, "GET /lots"):` fails if a matching request in the block runs more than n queries.
+
+    Yields the `(route, QueryCounter)` pairs observed, for finer assertions.
+    """
+    from app import querylog
+
+    @contextmanager
+    def budget(max_queries: int, route: str | None = None):
+        seen: list[tuple[str, querylog.QueryCounter]] = []
+
+        def hook(name: str, counter: querylog.QueryCounter) -> None:
+            if route is None or name == route:
+                seen.append((name, counter))
+
+        querylog.request_hooks.append(hook)
+        try:
+            yield seen
+        finally:
+            querylog.request_hooks.remove(hook)
+        over = [
+            f"{name}: {counter.count} queries, repeated {counter.repeated()}"
+            for name, counter in seen
+            if counter.count > max_queries
+        ]
+        if over:
+            raise AssertionError(f"query budget of {max_queries} exceeded:\n" + "\n".join(over))
+
+    return budget
+
+
+@pytest.fixture(autouse=True)
+def _query_budget_marker(request):
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    with request.getfixturevalue("query_budget")(*marker.args, **marker.kwargs):
+        yield
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+
+def test_merkle_inclusion_paths_verify_for_every_leaf():
+    from app.services.anchoring import inclusion_path, leaf_hash, merkle_root, verify_inclusion
+
+    for size in range(1, 10):
+        leaves = [leaf_hash("proof", index, 1, f"checksum-{index}") for index in range(size)]
+        root = merkle_root(leaves)
+        for index, leaf in enumerate(leaves):
+            assert verify_inclusion(leaf, inclusion_path(leaves, index), root)
+        assert not verify_inclusion(leaf_hash("proof", 99, 1, "forged"), inclusion_path(leaves, 0), root)
+
+
+def _tokenized_lot(client: TestClient, index: int) -> int:
+    from app.services import minting
+
+    producer_id = client.post(
+        "/producers", json={"name": f"Anchor Metals {index}", "contact_email": f"ops{index}@anchor.example"}
+    ).json()["id"]
+    lot_id = client.post(
+        "/lots",
+        json={"producer_id": producer_id, "material_type": "Steel Turnings", "quantity_tons": 2, "location": "Gary, IN"},
+    ).json()["id"]
+    client.post(
+        f"/lots/{lot_id}/verification",
+        json={"method": "sensor_bundle", "sensor_checksum": f"verify-{index}", "mark_verified": True},
+    ).raise_for_status()
+    job_id = client.post(
+        f"/lots/{lot_id}/tokenize", json={"token_name": f"LOT-{lot_id}", "token_symbol": "STL"}
+    ).json()["id"]
+    for _ in range(100):
+        minting.current().drain()
+        if client.get(f"/mint-jobs/{job_id}").json()["status"] == "completed":
+            return lot_id
+        time.sleep(0.05)
+    raise AssertionError("mint did not complete")
+
+
+def test_approved_proofs_are_anchored_in_one_transaction_with_their_retirements(client: TestClient):
+    from app.services import anchoring
+
+    proofs = []
+    for index in range(3):
+        lot_id = _tokenized_lot(client, index)
+        proof_id = client.post(
+            f"/lots/{lot_id}/proofs", json={"sensor_checksum": f"proof-{index}"}
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/proofs/{proof_id}/validate", json={"approve": True}).raise_for_status()
+        proofs.append((lot_id, proof_id))
+
+    pending = client.get(f"/proofs/{proofs[0][1]}/inclusion").json()
+    assert pending["anchored"] is False
+    assert client.get(f"/lots/{proofs[0][0]}").json()["token"]["retire_transaction_hash"] is None
+
+    batch = anchoring.current().flush()
+    assert batch.leaf_count >= 6  # three verification checksums + three approved proofs
+
+    for lot_id, proof_id in proofs:
+        inclusion = client.get(f"/proofs/{proof_id}/inclusion").json()
+        assert inclusion["anchored"] is True
+        assert inclusion["transaction_hash"] == batch.transaction_hash
+        assert anchoring.verify_inclusion(inclusion["leaf_hash"], inclusion["path"], inclusion["merkle_root"])
+        token = client.get(f"/lots/{lot_id}").json()["token"]
+        assert token["retire_transaction_hash"] == batch.transaction_hash
+
+    assert anchoring.current().flush() is None
+    assert client.get("/proofs/999999/inclusion").status_code == 404
+
+
+def test_retirements_that_land_before_a_failed_anchor_are_recorded(client: TestClient, monkeypatch):
+    from app.services import anchoring
+    from app.services.aptos import PartialChainError
+    from app.services.chain import get_chain_backend
+
+    lots = []
+    for index in range(2):
+        lot_id = _tokenized_lot(client, 10 + index)
+        proof_id = client.post(
+            f"/lots/{lot_id}/proofs", json={"sensor_checksum": f"partial-{index}"}
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/proofs/{proof_id}/validate", json={"approve": True}).raise_for_status()
+        lots.append((lot_id, proof_id))
+
+    chain = get_chain_backend()
+    execute = chain._execute
+
+    def fail_anchor(pending):
+        if pending.calls[-1].name == "proof_anchor::anchor_root":
+            chain.inject_failures(1)
+        return execute(pending)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(chain, "max_calls_per_transaction", 1)  # each retirement lands in its own transaction
+        patch.setattr(chain, "_execute", fail_anchor)
+        with pytest.raises(PartialChainError):
+            anchoring.current().flush()
+
+    retire_hashes = [client.get(f"/lots/{lot_id}").json()["token"]["retire_transaction_hash"] for lot_id, _ in lots]
+    assert all(retire_hashes) and len(set(retire_hashes)) == 2
+    assert client.get(f"/proofs/{lots[0][1]}/inclusion").json()["anchored"] is False
+
+    batch = anchoring.current().flush()
+    assert client.get(f"/proofs/{lots[0][1]}/inclusion").json()["transaction_hash"] == batch.transaction_hash
+    tokens = [client.get(f"/lots/{lot_id}").json()["token"] for lot_id, _ in lots]
+    assert [token["retire_transaction_hash"] for token in tokens] == retire_hashes
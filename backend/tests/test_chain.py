@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import pytest
+
+
+def _chain(**options):
+    from app.services.chain import SimulatedChain
+
+    return SimulatedChain(**options)
+
+
+def test_simulated_chain_orders_by_sequence_number_and_confirms_after_delay():
+    from app.services.chain import AURA_ADDRESS, entry
+
+    chain = _chain(block_time_seconds=2, confirmation_blocks=3, max_transactions_per_block=1)
+    genesis = chain.timestamp
+    first = chain.submit(AURA_ADDRESS, [entry("waste_lot", "register_lot", "a", "PET", 1000, "")])
+    second = chain.submit(AURA_ADDRESS, [entry("waste_lot", "register_lot", "b", "PET", 1000, "")])
+
+    receipt = chain.wait_for_transaction(second)
+    assert receipt.success
+    assert receipt.sequence_number == 1
+    assert chain.wait_for_transaction(first).block_height == receipt.block_height - 1
+    assert chain.metrics()["block_height"] == receipt.block_height + 2  # confirmation depth
+    assert chain.timestamp == genesis + 2 * chain.metrics()["block_height"]
+    assert chain.sequence_number(AURA_ADDRESS) == 2
+    assert [event.data["lot_id"] for event in chain.events()] == [1, 2]
+
+
+def test_events_page_from_a_version_and_blocks_sleep_without_holding_the_lock():
+    import threading
+    import time
+
+    from app.services.chain import AURA_ADDRESS, entry
+
+    chain = _chain()
+    for index in range(5):
+        chain.execute(AURA_ADDRESS, [entry("waste_lot", "register_lot", str(index), "PET", 1, "")])
+    versions = [event.version for event in chain.events()]
+    assert [event.version for event in chain.events(versions[2], limit=2)] == versions[2:4]
+    assert [event.version for event in chain.events(versions[2] + 1)] == versions[3:]
+    assert chain.events(versions[-1] + 1) == []
+
+    chain.realtime, chain.block_time_seconds = True, 0.5
+    producer = threading.Thread(target=chain.produce_block)
+    producer.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    chain.view("waste_lot", "lot_status", 1)
+    assert time.perf_counter() - started < 0.25
+    producer.join()
+
+
+def test_aborted_transaction_rolls_back_every_call_but_consumes_sequence_number():
+    from app.services.chain import AURA_ADDRESS, entry
+
+    chain = _chain()
+    receipt = chain.execute(
+        AURA_ADDRESS,
+        [
+            entry("waste_lot", "register_lot", "a", "PET", 1000, ""),
+            entry("waste_lot", "tokenize_lot", 1, "PET", 1),  # not verified yet -> ERR_INVALID_STATUS
+        ],
+    )
+    assert not receipt.success
+    assert receipt.vm_status.endswith("waste_lot::tokenize_lot: code 3")
+    assert receipt.events == []
+    assert chain.sequence_number(AURA_ADDRESS) == 1
+
+    retry = chain.execute(AURA_ADDRESS, [entry("waste_lot", "register_lot", "a", "PET", 1000, "")])
+    assert retry.events[0].data["lot_id"] == 1  # the aborted registration never took the id
+
+
+def test_submission_limits_and_failure_injection():
+    from app.services.chain import AURA_ADDRESS, ChainError, entry
+
+    chain = _chain(max_calls_per_transaction=2)
+    calls = [entry("waste_lot", "register_lot", str(index), "PET", 1, "") for index in range(3)]
+    with pytest.raises(ChainError, match="TRANSACTION_TOO_LARGE"):
+        chain.submit(AURA_ADDRESS, calls)
+    with pytest.raises(ChainError, match="NUMBER_OF_ARGUMENTS_MISMATCH"):
+        chain.submit(AURA_ADDRESS, [entry("waste_lot", "tokenize_lot", 1)])
+
+    chain.inject_failures(1)
+    receipts = chain.execute_batched(AURA_ADDRESS, calls)
+    assert [receipt.success for receipt in receipts] == [False, True]
+    assert receipts[0].vm_status == "SIMULATED_FAILURE"
+    assert chain.metrics()["failed_total"] == 1
+
+
+def test_escrow_settlement_splits_fees_and_enforces_roles():
+    from app.services.chain import AURA_ADDRESS, ESCROW_COMPLETED, ESCROW_FINALIZED, entry
+
+    producer, recycler = "0xp1", "0xr1"
+    chain = _chain(agent_fee_bps=250, treasury_fee_bps=100, treasury="0x7ea5")
+    denied = chain.execute(recycler, [entry("escrow_settlement", "open", 1, producer, recycler, 10_000, "")])
+    assert not denied.success and denied.vm_status.endswith("code 3")  # roles::ERR_ROLE_MISSING
+
+    opened = chain.execute(AURA_ADDRESS, [entry("escrow_settlement", "open", 1, producer, recycler, 10_000, "")])
+    escrow_id = opened.events[0].data["escrow_id"]
+    chain.execute(recycler, [entry("escrow_settlement", "fund", escrow_id, 10_000)])
+    chain.execute(recycler, [entry("escrow_settlement", "sign_recycler", escrow_id)])
+    chain.execute(producer, [entry("escrow_settlement", "sign_producer", escrow_id)])
+    assert chain.execute(AURA_ADDRESS, [entry("escrow_settlement", "finalize", escrow_id)]).success
+    assert chain.view("escrow_settlement", "escrow_status", escrow_id) == ESCROW_FINALIZED
+    assert chain.view("escrow_settlement", "outstanding_share", escrow_id, producer) == 9_650
+
+    for account in (producer, AURA_ADDRESS, "0x7ea5"):
+        assert chain.execute(account, [entry("escrow_settlement", "mark_withdrawn", escrow_id)]).success
+    assert chain.view("escrow_settlement", "escrow_status", escrow_id) == ESCROW_COMPLETED
+
+
+def test_token_service_mints_in_batches_and_retires_on_chain():
+    from app.services.aptos import AptosTokenService, MintRequest
+    from app.services.chain import LOT_RETIRED
+
+    chain = _chain(max_calls_per_transaction=2)
+    service = AptosTokenService(backend=chain, max_batch_size=2)
+    results = service.mint_waste_lots([MintRequest(lot_id, f"LOT-{lot_id}", "AURA", 1) for lot_id in (10, 11, 12)])
+
+    assert len({result.transaction_hash for result in results[:2]}) == 1
+    assert results[2].transaction_hash != results[0].transaction_hash
+    burn = service.retire_waste_lot(results[0].token_address)
+    assert burn.transaction_hash
+    assert chain.view("waste_lot", "lot_status", 1) == LOT_RETIRED
+    assert service.retire_waste_lot("0xDEADBEEF").transaction_hash is None
+
+
+def test_token_addresses_round_trip_chain_lot_ids_past_six_digits():
+    from app.services.aptos import AptosTokenService, MintRequest, chain_lot_id_of
+    from app.services.chain import LOT_RETIRED, LOT_TOKENIZED
+
+    chain = _chain()
+    service = AptosTokenService(backend=chain)
+    chain._tables["counters"]["waste_lot"] = 123_456
+    (six_digits,) = service.mint_waste_lots([MintRequest(1, "LOT-1", "AURA", 1)])
+    chain._tables["counters"]["waste_lot"] = 1_234_567
+    (seven_digits,) = service.mint_waste_lots([MintRequest(2, "LOT-2", "AURA", 1)])
+
+    assert chain_lot_id_of(six_digits.token_address) == 123_456
+    assert chain_lot_id_of(seven_digits.token_address) == 1_234_567
+    assert chain_lot_id_of("0xLOT000001") is None
+
+    service.retire_waste_lot(seven_digits.token_address)
+    assert chain.view("waste_lot", "lot_status", 1_234_567) == LOT_RETIRED
+    assert chain.view("waste_lot", "lot_status", 123_456) == LOT_TOKENIZED
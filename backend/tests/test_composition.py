@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+ASSAYS = {
+    "rich": {"Cu": 7.5, "Pb": 0.05, "moisture": "2.1%"},
+    "leaded": {"Cu": 9.0, "Pb": 0.4},
+    "lean": {"Cu": 3.2, "Pb": 0.01},
+    "unassayed": {"notes": "pending lab report"},
+}
+
+
+def _listing(client: TestClient) -> dict[str, int]:
+    producer_id = client.post(
+        "/producers", json={"name": "Wire Salvage", "contact_email": "ops@wire.example"}
+    ).json()["id"]
+    client.post("/agents", json={"owner_name": "Wire Salvage", "agent_type": "producer", "producer_id": producer_id})
+    lots = {}
+    for name, assay in ASSAYS.items():
+        lot_id = client.post(
+            "/lots",
+            json={
+                "producer_id": producer_id,
+                "material_type": "Copper Wire",
+                "quantity_tons": 3,
+                "location": "Gary, IN",
+                "price_floor_usd_per_ton": 100,
+                "chemical_composition": assay,
+            },
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+        lots[name] = lot_id
+    return lots
+
+
+def _ids(client: TestClient, *requirements: str) -> set[int]:
+    response = client.get("/lots", params=[("composition", requirement) for requirement in requirements])
+    response.raise_for_status()
+    return {lot["id"] for lot in response.json()}
+
+
+def test_lots_filter_by_indexed_assay_thresholds(client: TestClient):
+    lots = _listing(client)
+
+    assert _ids(client, "Cu>5") == {lots["rich"], lots["leaded"]}
+    assert _ids(client, "Cu>5", "Pb<0.1") == {lots["rich"]}
+    assert _ids(client, "Pb <= 0.05%") == {lots["rich"], lots["lean"]}
+    assert _ids(client, "moisture>=2.1") == {lots["rich"]}
+    assert _ids(client, "cu>5") == set()  # elements are case-sensitive
+    assert client.get("/lots", params={"composition": "Cu>>5"}).status_code == 422
+
+
+def test_composition_filters_use_the_covering_index(client: TestClient):
+    from sqlalchemy.dialects import sqlite
+
+    from app.db import session_scope
+    from app.db_models import WasteLot
+    from app.services import composition
+    from sqlmodel import select
+
+    query = select(WasteLot.id).where(*composition.filters(composition.parse_requirements(["Cu>5"])))
+    sql = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    with session_scope() as session:
+        plan = " ".join(row[-1] for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "ix_lotcomposition_element_value" in plan
+
+
+def test_rebuild_reindexes_every_lot(client: TestClient):
+    from app.db import session_scope
+    from app.services import composition
+
+    _listing(client)
+    with session_scope() as session:
+        # rich: Cu, Pb, moisture; leaded: Cu, Pb; lean: Cu, Pb; unassayed has no numeric readings.
+        assert composition.rebuild(session) == 7
+    assert len(_ids(client, "Cu>0")) == 3
+
+
+def test_matchmaking_respects_recycler_composition_requirements(client: TestClient):
+    lots = _listing(client)
+    picky = client.post(
+        "/agents",
+        json={
+            "owner_name": "Picky Smelter",
+            "agent_type": "recycler",
+            "max_price_usd_per_ton": 500,
+            "strategy_metadata": {"composition": ["Cu>5", "Pb<0.1"]},
+        },
+    ).json()["id"]
+    assert (
+        client.post(
+            "/agents",
+            json={"owner_name": "Bad Assay", "agent_type": "recycler", "strategy_metadata": {"composition": ["Cu"]}},
+        ).status_code
+        == 422
+    )
+
+    matched = {
+        negotiation["waste_lot_id"]
+        for negotiation in client.post("/agents/matchmaking").json()
+        if negotiation["recycler_agent_id"] == picky
+    }
+    assert matched == {lots["rich"]}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+
+def _negotiating_lot(client: TestClient) -> tuple[int, dict]:
+    producer_id = client.post(
+        "/producers", json={"name": "Racing Metals", "contact_email": "ops@racing.example"}
+    ).json()["id"]
+    client.post(
+        "/agents",
+        json={"owner_name": "Eager Recycler", "agent_type": "recycler", "max_price_usd_per_ton": 900},
+    ).raise_for_status()
+    lot_id = client.post(
+        "/lots",
+        json={
+            "producer_id": producer_id,
+            "material_type": "Copper Scrap",
+            "quantity_tons": 4,
+            "location": "Reno, NV",
+            "price_floor_usd_per_ton": 300,
+        },
+    ).json()["id"]
+    client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+    client.post("/agents/matchmaking").raise_for_status()
+    negotiation = next(n for n in client.get("/negotiations").json() if n["waste_lot_id"] == lot_id)
+    return lot_id, negotiation
+
+
+def test_stale_expected_version_returns_conflict_with_current_state(client: TestClient):
+    lot_id, negotiation = _negotiating_lot(client)
+    version = negotiation["version"]
+
+    countered = client.post(
+        f"/negotiations/{negotiation['id']}/decision",
+        json={"agree": False, "counter_offer_usd_per_ton": 320, "expected_version": version},
+    )
+    assert countered.status_code == 200
+    assert countered.json()["version"] == version + 1
+
+    stale = client.post(
+        f"/negotiations/{negotiation['id']}/decision",
+        json={"agree": True, "expected_version": version},
+    )
+    assert stale.status_code == 409
+    current = stale.json()["detail"]["current"]
+    assert current["negotiation"]["version"] == version + 1
+    assert current["negotiation"]["status"] == "counter"
+    assert current["lot"]["id"] == lot_id
+
+    agreed = client.post(
+        f"/negotiations/{negotiation['id']}/decision",
+        json={"agree": True, "expected_version": version + 1},
+    )
+    assert agreed.status_code == 200
+    assert agreed.json()["status"] == "agreed"
+
+
+def test_concurrent_writer_is_detected_and_retried(client: TestClient):
+    from sqlalchemy import update
+
+    from app import crud, db
+    from app.db_models import Negotiation
+
+    _, negotiation = _negotiating_lot(client)
+    with db.session_scope() as session:
+        stale = session.get(Negotiation, negotiation["id"])
+        # Another replica bumps the row after we loaded it.
+        with db.session_scope() as other:
+            other.exec(
+                update(Negotiation)
+                .where(Negotiation.id == stale.id)
+                .values(version=Negotiation.version + 1)
+            )
+            other.commit()
+
+        updated = crud.finalize_negotiation(session, stale, agree=True)
+        assert updated.status == "agreed"
+        assert updated.version == negotiation["version"] + 2
+
+
+def test_second_agreement_on_a_lot_conflicts_after_retrying(client: TestClient):
+    from app import crud, db
+    from app.db_models import Negotiation, WasteLot
+
+    lot_id, first = _negotiating_lot(client)
+    late = client.post(
+        "/agents",
+        json={"owner_name": "Late Recycler", "agent_type": "recycler", "max_price_usd_per_ton": 950},
+    ).json()["id"]
+
+    with db.session_scope() as session:
+        racing = Negotiation(
+            waste_lot_id=lot_id, producer_agent_id=first["producer_agent_id"], recycler_agent_id=late
+        )
+        session.add(racing)
+        session.commit()
+        # Both loaded while the lot is still negotiating, as a concurrent request would have them.
+        session.refresh(racing)
+        assert session.get(WasteLot, lot_id).status == "negotiating"
+
+        assert client.post(f"/negotiations/{first['id']}/decision", json={"agree": True}).status_code == 200
+
+        for agree in (True, False):
+            try:
+                crud.finalize_negotiation(session, racing, agree=agree, counter_offer=None if agree else 400)
+            except HTTPException as exc:
+                assert exc.status_code == 409
+                assert exc.detail["current"]["lot"]["status"] == "settled"
+            else:
+                raise AssertionError("a decision on a settled lot must conflict")
+
+    lot = client.get(f"/lots/{lot_id}").json()
+    assert lot["status"] == "settled"
+    assert client.get("/negotiations", params={"status": "agreed"}).json()[0]["id"] == first["id"]
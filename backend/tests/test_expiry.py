@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+
+def test_expiry_engine_expires_due_negotiations_and_releases_lot(client: TestClient):
+    from app.services.expiry import NegotiationExpiryEngine
+
+    producer_id = client.post(
+        "/producers", json={"name": "Expiring Goods", "contact_email": "ops@expiring.example"}
+    ).json()["id"]
+    client.post(
+        "/agents",
+        json={"owner_name": "Patient Recycler", "agent_type": "recycler", "max_price_usd_per_ton": 900},
+    ).raise_for_status()
+    lot_id = client.post(
+        "/lots",
+        json={
+            "producer_id": producer_id,
+            "material_type": "Glass Cullet",
+            "quantity_tons": 12,
+            "location": "Tucson, AZ",
+            "price_floor_usd_per_ton": 40,
+        },
+    ).json()["id"]
+    client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+    client.post("/agents/matchmaking").raise_for_status()
+    assert client.get(f"/lots/{lot_id}").json()["status"] == "negotiating"
+
+    engine = NegotiationExpiryEngine(refresh_seconds=3600)
+    assert engine.load() == 0  # deadlines are 48h out, beyond the scan horizon
+
+    later = datetime.utcnow() + timedelta(hours=49)
+    assert engine.load(now=later) >= 1
+    assert engine.expire_due(now=later) >= 1
+
+    negotiations = [n for n in client.get("/negotiations").json() if n["waste_lot_id"] == lot_id]
+    assert negotiations and all(n["status"] == "expired" for n in negotiations)
+    assert client.get(f"/lots/{lot_id}").json()["status"] == "verified"
+
+    metrics = engine.metrics()
+    assert metrics["expired_total"] >= len(negotiations)
+    assert metrics["lag_seconds_max"] > 0
+    assert client.get("/system/expiry").json()["running"] is True
+
+
+def test_deadlines_stay_scheduled_when_the_expiry_update_fails(client: TestClient, monkeypatch):
+    import pytest
+    from sqlalchemy.exc import OperationalError
+
+    from app.services.expiry import NegotiationExpiryEngine
+
+    engine = NegotiationExpiryEngine()
+    due = datetime.utcnow() - timedelta(seconds=1)
+    engine.schedule(901, due)
+    engine.schedule(902, due)
+
+    def locked(negotiation_ids, now):
+        raise OperationalError("UPDATE negotiation", {}, Exception("database is locked"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(engine, "_expire", locked)
+        with pytest.raises(OperationalError):
+            engine.expire_due()
+    assert engine.metrics()["pending_deadlines"] == 2
+    assert engine.next_deadline() == due
+
+    engine.expire_due()
+    assert engine.metrics()["pending_deadlines"] == 0
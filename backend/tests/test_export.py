@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+
+
+def test_export_streams_arrow_ipc(client: TestClient):
+    resp = client.get("/export/lots", params={"batch_size": 1})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(resp.content).read_all()
+    lots = client.get("/lots").json()
+    assert table.num_rows == len(lots)
+    assert sorted(table.column("id").to_pylist()) == sorted(lot["id"] for lot in lots)
+    assert set(table.column("status").to_pylist()) <= {lot["status"] for lot in lots}
+
+
+def test_export_rejects_unknown_table(client: TestClient):
+    assert client.get("/export/agents").status_code == 404
+
+
+def test_write_parquet(client: TestClient, tmp_path):
+    from app.services.export import MarketplaceExporter
+
+    written = MarketplaceExporter(batch_size=1).write_parquet(tmp_path / "out", names=["lots", "negotiations"])
+
+    lots = pq.read_table(written["lots"])
+    assert lots.num_rows == len(client.get("/lots").json())
+    assert lots.schema.field("updated_at").type == pa.timestamp("us")
+    assert pq.read_table(written["negotiations"]).num_rows == len(client.get("/negotiations").json())
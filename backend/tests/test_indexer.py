@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+
+def _minted_token(client: TestClient) -> tuple[int, str]:
+    from app.services import minting
+
+    producer_id = client.post(
+        "/producers", json={"name": "Indexed Fibers", "contact_email": "ops@indexed.example"}
+    ).json()["id"]
+    lot_id = client.post(
+        "/lots",
+        json={"producer_id": producer_id, "material_type": "Cardboard", "quantity_tons": 6, "location": "Macon, GA"},
+    ).json()["id"]
+    client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+    job_id = client.post(f"/lots/{lot_id}/tokenize", json={"token_name": f"LOT-{lot_id}", "token_symbol": "OCC"}).json()["id"]
+    for _ in range(100):
+        minting.current().drain()
+        job = client.get(f"/mint-jobs/{job_id}").json()
+        if job["status"] == "completed":
+            return lot_id, job["token_address"]
+        time.sleep(0.05)
+    raise AssertionError("mint did not complete")
+
+
+def _rows(model):
+    from sqlmodel import select
+
+    from app import db
+
+    with db.session_scope() as session:
+        (key,) = model.__table__.primary_key.columns.keys()
+        return {getattr(row, key): row.model_dump() for row in session.exec(select(model)).all()}
+
+
+def test_indexer_upserts_chain_state_and_reconciles_retirements(client: TestClient):
+    from app.db_models import ChainEscrow, ChainLot
+    from app.services import indexer
+    from app.services.aptos import AptosTokenService, EscrowInstruction, chain_lot_id_of
+
+    lot_id, token_address = _minted_token(client)
+    service = AptosTokenService()
+    burn = service.retire_waste_lot(token_address)
+    (escrow,) = service.settle_escrows([EscrowInstruction("0xproducer", "0xrecycler", 12_500, "settlement:test")])
+
+    chain_indexer = indexer.current()
+    chain_indexer.catch_up()
+    assert client.get("/system/indexer").json()["lag_versions"] == 0
+
+    chain_lot = _rows(ChainLot)[chain_lot_id_of(token_address)]
+    assert chain_lot["waste_lot_id"] == lot_id
+    assert chain_lot["status"] == "retired"
+    assert chain_lot["retire_transaction_hash"] == burn.transaction_hash
+    token = client.get(f"/lots/{lot_id}").json()["token"]
+    assert token["retire_transaction_hash"] == burn.transaction_hash
+    assert token["retired_at"] is not None
+
+    indexed = _rows(ChainEscrow)[escrow.escrow_id]
+    assert indexed["status"] == "finalized"
+    assert indexed["producer_signed"] and indexed["recycler_signed"]
+    assert indexed["finalize_transaction_hash"] == escrow.transaction_hash
+
+
+def test_reindex_from_any_version_converges_to_the_same_state(client: TestClient):
+    from app.db_models import ChainEscrow, ChainLot
+    from app.services import indexer
+    from app.services.aptos import AptosTokenService, EscrowInstruction, MintRequest
+    from app.services.chain import get_chain_backend
+
+    service = AptosTokenService()
+    service.mint_waste_lots([MintRequest(lot_id, f"LOT-{lot_id}", "MIX", 1) for lot_id in range(1, 9)])
+    service.settle_escrows([EscrowInstruction(f"0xp{index}", f"0xr{index}", 1_000 + index, "netted") for index in range(5)])
+
+    chain_indexer = indexer.current()
+    chain_indexer.catch_up()
+    expected = (_rows(ChainLot), _rows(ChainEscrow))
+
+    small_pages = indexer.ChainIndexer(get_chain_backend(), batch_size=3)
+    head = get_chain_backend().ledger_version()
+    small_pages.reindex(head // 2)
+    assert (_rows(ChainLot), _rows(ChainEscrow)) == expected
+    small_pages.reindex(0)
+    assert (_rows(ChainLot), _rows(ChainEscrow)) == expected
+    assert small_pages.metrics()["lag_versions"] == 0
+    assert small_pages.checkpoint() == head + 1
+
+
+def test_retirements_reconcile_only_the_token_of_that_chain_lot(client: TestClient):
+    from app import db
+    from app.db_models import WasteLotToken
+    from app.services.aptos import AptosTokenService, MintRequest
+    from app.services.chain import SimulatedChain
+    from app.services.indexer import ChainIndexer
+
+    producer_id = client.post(
+        "/producers", json={"name": "Wide Ids", "contact_email": "ops@wide.example"}
+    ).json()["id"]
+    lot_ids = [
+        client.post(
+            "/lots",
+            json={"producer_id": producer_id, "material_type": "Cardboard", "quantity_tons": 1, "location": "Macon, GA"},
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    chain = SimulatedChain()
+    service = AptosTokenService(backend=chain)
+    minted = []
+    # `0xLOT100000...` is also a prefix of chain lots 1000000-1000009.
+    for lot_id, chain_lot_id in zip(lot_ids, (100_000, 1_000_005)):
+        chain._tables["counters"]["waste_lot"] = chain_lot_id
+        (result,) = service.mint_waste_lots([MintRequest(lot_id, f"LOT-{lot_id}", "OCC", 1)])
+        minted.append(result)
+    with db.session_scope() as session:
+        for lot_id, result in zip(lot_ids, minted):
+            session.add(
+                WasteLotToken(
+                    waste_lot_id=lot_id,
+                    token_address=result.token_address,
+                    token_name=f"LOT-{lot_id}",
+                    token_symbol="OCC",
+                    transaction_hash=result.transaction_hash,
+                )
+            )
+        session.commit()
+
+    burn = service.retire_waste_lot(minted[0].token_address)
+    ChainIndexer(chain, name="wide-ids").catch_up()
+
+    retired = client.get(f"/lots/{lot_ids[0]}").json()["token"]
+    untouched = client.get(f"/lots/{lot_ids[1]}").json()["token"]
+    assert retired["retire_transaction_hash"] == burn.transaction_hash
+    assert untouched["retire_transaction_hash"] is None and untouched["retired_at"] is None
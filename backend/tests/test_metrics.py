@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import re
+
+from fastapi.testclient import TestClient
+
+
+def _sample(body: str, name: str, **labels: str) -> float:
+    """Value of the exposition line for `name` whose labels include `labels` (0 when absent)."""
+    for line in body.splitlines():
+        if line.startswith("#") or not line.startswith(name):
+            continue
+        metric, _, value = line.rpartition(" ")
+        found = dict(re.findall(r'(\w+)="([^"]*)"', metric))
+        if metric.split("{")[0] == name and all(found.get(key) == wanted for key, wanted in labels.items()):
+            return float(value)
+    return 0.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    from app.metrics import Histogram
+
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "GET /x")
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{route="GET /x",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="GET /x",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{route="GET /x",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{route="GET /x"} 5.55' in lines
+
+
+def test_metrics_endpoint_labels_requests_by_route_template(client: TestClient):
+    # Request metrics are process-wide, so compare against a scrape taken first.
+    before = client.get("/metrics").text
+    producer_id = client.post("/producers", json={"name": "Metered Mill", "contact_email": "ops@metered.example"}).json()["id"]
+    client.get(f"/producers/{producer_id}")
+    client.get(f"/producers/{producer_id}")
+    client.get("/no-such-path")
+    client.get("/oracle/feeds")
+    client.get("/oracle/feeds")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+
+    def delta(**labels: str) -> float:
+        count = "aura_http_request_duration_seconds_count"
+        return _sample(body, count, **labels) - _sample(before, count, **labels)
+
+    assert delta(method="GET", route="/producers/{producer_id}", status="200") == 2
+    assert delta(method="POST", route="/producers", status="201") == 1
+    assert delta(route="<unmatched>", status="404") == 1
+    assert "/no-such-path" not in body
+    # The scrape itself is still being served.
+    assert _sample(body, "aura_http_requests_in_flight", method="GET") == 1
+
+    assert _sample(body, "aura_db_queries_total", route="GET /producers/{producer_id}") >= 2
+    assert _sample(body, "aura_db_pool_connections", stat="checked_out") >= 0
+    assert _sample(body, "aura_cache_hits_total", cache="oracle_feed_snapshot") >= 1
+    assert _sample(body, "aura_worker_running", worker="indexer") == 1
+    assert "aura_worker_batches_total{worker=\"indexer\"}" in body
+
+
+def test_scrapes_read_worker_modules_without_importing_them(client: TestClient, monkeypatch):
+    import sys
+
+    monkeypatch.delitem(sys.modules, "app.services.settlement")
+    body = client.get("/metrics").text
+    assert "app.services.settlement" not in sys.modules
+    assert _sample(body, "aura_worker_running", worker="settlement") == 0
+    assert _sample(body, "aura_worker_running", worker="indexer") == 1
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _verified_lots(client: TestClient, count: int) -> list[int]:
+    producer_id = client.post(
+        "/producers", json={"name": "Batch Mint Co", "contact_email": "ops@batchmint.example"}
+    ).json()["id"]
+    lot_ids = []
+    for index in range(count):
+        lot_id = client.post(
+            "/lots",
+            json={
+                "producer_id": producer_id,
+                "material_type": "HDPE Regrind",
+                "quantity_tons": 3,
+                "location": "Boise, ID",
+            },
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+        lot_ids.append(lot_id)
+    return lot_ids
+
+
+def _enqueue(lot_ids: list[int]) -> list[int]:
+    from app import crud, db
+    from app.db_models import WasteLot
+    from app.models import TokenMintRequest
+
+    with db.session_scope() as session:
+        return [
+            crud.enqueue_mint(
+                session, session.get(WasteLot, lot_id), TokenMintRequest(token_name=f"LOT-{lot_id}", token_symbol="HDPE")
+            ).id
+            for lot_id in lot_ids
+        ]
+
+
+def test_mint_worker_submits_queued_jobs_in_batches(client: TestClient):
+    from app.services.aptos import AptosTokenService
+    from app.services.minting import MintQueueWorker
+
+    lot_ids = _verified_lots(client, 5)
+    job_ids = _enqueue(lot_ids)
+
+    worker = MintQueueWorker(AptosTokenService(max_batch_size=3), batch_size=3)
+    assert worker.process_batch() == 3
+    assert worker.drain() == 2
+
+    jobs = [client.get(f"/mint-jobs/{job_id}").json() for job_id in job_ids]
+    assert all(job["status"] == "completed" for job in jobs)
+    assert len({job["transaction_hash"] for job in jobs[:3]}) == 1  # one transaction per batch
+    assert jobs[3]["transaction_hash"] != jobs[0]["transaction_hash"]
+    for lot_id, job in zip(lot_ids, jobs):
+        lot = client.get(f"/lots/{lot_id}").json()
+        assert lot["status"] == "tokenized"
+        assert lot["token"]["token_address"] == job["token_address"]
+    assert worker.metrics()["batches_total"] == 2
+
+
+def test_mint_worker_retries_then_fails_jobs_on_chain_errors(client: TestClient):
+    from app.services.aptos import AptosTokenService
+    from app.services.minting import MintQueueWorker
+
+    class UnavailableChain(AptosTokenService):
+        def mint_waste_lots(self, requests):
+            raise RuntimeError("node unavailable")
+
+    (lot_id,) = _verified_lots(client, 1)
+    (job_id,) = _enqueue([lot_id])
+
+    worker = MintQueueWorker(UnavailableChain(), max_attempts=2)
+    worker.process_batch()
+    assert client.get(f"/mint-jobs/{job_id}").json()["status"] == "queued"
+    worker.process_batch()
+    job = client.get(f"/mint-jobs/{job_id}").json()
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert job["error"] == "node unavailable"
+    assert client.get(f"/lots/{lot_id}").json()["status"] == "verified"
+
+
+def test_a_job_requeued_after_minting_only_retries_the_recording(client: TestClient, monkeypatch):
+    from sqlalchemy.orm.exc import StaleDataError
+
+    from app.services import minting
+    from app.services.aptos import AptosTokenService
+
+    class CountingChain(AptosTokenService):
+        calls = 0
+
+        def mint_waste_lots(self, requests):
+            CountingChain.calls += 1
+            return super().mint_waste_lots(requests)
+
+    def always_conflicting(*args, **kwargs):
+        raise StaleDataError("lot version moved")
+
+    (lot_id,) = _verified_lots(client, 1)
+    (job_id,) = _enqueue([lot_id])
+    worker = minting.MintQueueWorker(CountingChain(), max_attempts=1)
+
+    monkeypatch.setattr(minting, "record_token_mint", always_conflicting)
+    worker.process_batch()
+    job = client.get(f"/mint-jobs/{job_id}").json()
+    assert job["status"] == "queued" and job["token_address"]  # requeued, chain result kept, past max_attempts
+
+    monkeypatch.undo()
+    worker.process_batch()
+    assert CountingChain.calls == 1
+    assert client.get(f"/mint-jobs/{job_id}").json()["status"] == "completed"
+    assert client.get(f"/lots/{lot_id}").json()["token"]["token_address"] == job["token_address"]
+
+
+def test_lots_with_a_pending_mint_stay_out_of_matchmaking(client: TestClient):
+    from app.services.aptos import AptosTokenService
+    from app.services.minting import MintQueueWorker
+
+    (lot_id,) = _verified_lots(client, 1)
+    producer_id = client.get(f"/lots/{lot_id}").json()["producer_id"]
+    client.post("/agents", json={"owner_name": "Minter", "agent_type": "producer", "producer_id": producer_id})
+    client.post("/agents", json={"owner_name": "Buyer", "agent_type": "recycler", "max_price_usd_per_ton": 900})
+    (job_id,) = _enqueue([lot_id])
+
+    assert [n for n in client.post("/agents/matchmaking").json() if n["waste_lot_id"] == lot_id] == []
+    MintQueueWorker(AptosTokenService()).process_batch()
+    assert client.get(f"/mint-jobs/{job_id}").json()["status"] == "completed"
+    assert lot_id in {n["waste_lot_id"] for n in client.post("/agents/matchmaking").json()}
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from importlib import reload
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+_START_WORKER = """
+import json
+from app import main
+from app.db import session_scope
+from app.db_models import Producer, SchemaVersion
+from sqlmodel import select
+
+main.startup_event()
+with session_scope() as session:
+    producers = session.exec(select(Producer.name)).all()
+    versions = session.exec(select(SchemaVersion)).all()
+print(json.dumps({"producers": sorted(producers), "versions": len(versions)}))
+"""
+
+
+def test_concurrent_worker_startup_migrates_and_seeds_once(tmp_path):
+    env = {**os.environ, "AURA_DATABASE_URL": f"sqlite:///{tmp_path / 'shared.db'}"}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", _START_WORKER], cwd=BACKEND_ROOT, env=env, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(4)
+    ]
+    results = []
+    for worker in workers:
+        stdout, _ = worker.communicate(timeout=60)
+        assert worker.returncode == 0
+        results.append(json.loads(stdout))
+
+    expected = sorted({lot["producer"] for lot in json.loads((BACKEND_ROOT / "data" / "waste_lots.json").read_text())})
+    for result in results:
+        assert result == {"producers": expected, "versions": 1}
+
+
+def test_only_the_leader_runs_singleton_workers(tmp_path, monkeypatch):
+    import fcntl
+
+    monkeypatch.setenv("AURA_DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("AURA_DB_POOL_SIZE", "3")
+    from app import config, coordination, db, main, seed
+
+    reload(config)
+    reload(db)
+    reload(seed)
+    reload(main)
+
+    # Another worker process already holds the leader lock.
+    with coordination.lock_path("leader").open("a+") as other_leader:
+        fcntl.flock(other_leader, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with TestClient(main.app) as client:
+            worker = client.get("/health").json()["worker"]
+            assert worker["pid"] == os.getpid()
+            assert worker["role"] == "follower"
+            assert client.get("/system/expiry").json() == {"running": False}
+            assert client.get("/system/anchoring").json() == {"running": False}
+            assert client.get("/system/minting").json() == {"running": False}
+
+            body = client.get("/metrics").text
+            assert f'aura_process_info{{pid="{os.getpid()}",host="{worker["host"]}",role="follower"}} 1' in body
+            assert db.get_engine().pool.size() == 3
+
+    # Once the lock is free the next worker to start takes over.
+    with TestClient(main.app) as client:
+        assert client.get("/health").json()["worker"]["role"] == "leader"
+        assert client.get("/system/expiry").json()["running"] is True
+    assert not coordination.is_leader()
+
+
+def test_followers_leave_chain_writes_to_the_leader(tmp_path, monkeypatch):
+    import fcntl
+
+    monkeypatch.setenv("AURA_DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("AURA_ANCHORING_ENABLED", "false")
+    from app import config, coordination, db, main, seed
+    from app.services import minting
+
+    reload(config)
+    reload(db)
+    reload(seed)
+    reload(main)
+
+    def verified_lot(client: TestClient, index: int) -> int:
+        producer_id = client.post(
+            "/producers", json={"name": f"Follower Metals {index}", "contact_email": f"ops{index}@follower.example"}
+        ).json()["id"]
+        lot_id = client.post(
+            "/lots",
+            json={"producer_id": producer_id, "material_type": "Steel Turnings", "quantity_tons": 2, "location": "Gary, IN"},
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+        return lot_id
+
+    with coordination.lock_path("leader").open("a+") as other_leader:
+        fcntl.flock(other_leader, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with TestClient(main.app) as client:
+            # No mint worker here: the job waits in the shared queue for the leader's.
+            queued_lot = verified_lot(client, 0)
+            job = client.post(f"/lots/{queued_lot}/tokenize", json={"token_name": "LOT", "token_symbol": "STL"})
+            assert job.status_code == 202 and job.json()["status"] == "queued"
+            assert minting.current() is None
+
+            # Retiring without anchoring is a synchronous chain write, which only the leader may make.
+            recorded_lot = verified_lot(client, 1)
+            client.post(
+                f"/lots/{recorded_lot}/tokenize",
+                json={"token_name": "LOT", "token_symbol": "STL", "token_address": "0xLOT000001", "transaction_hash": "0x1"},
+            ).raise_for_status()
+            proof_id = client.post(f"/lots/{recorded_lot}/proofs", json={"sensor_checksum": "follower"}).json()["id"]
+            response = client.post(f"/lots/{recorded_lot}/proofs/{proof_id}/validate", json={"approve": True})
+            assert response.status_code == 503
+
+    with TestClient(main.app) as client:
+        minting.current().drain()
+        assert client.get(f"/mint-jobs/{job.json()['id']}").json()["status"] == "completed"
+        assert client.get(f"/lots/{queued_lot}").json()["token"]["token_address"].startswith("0xLOT")
@@ -1,35 +1,21 @@
 from __future__ import annotations
 
-from importlib import reload
-from pathlib import Path
-import sys
+import time
 
-import pytest
 from fastapi.testclient import TestClient
 
 
-BACKEND_ROOT = Path(__file__).resolve().parents[1]
-if str(BACKEND_ROOT) not in sys.path:
-    sys.path.insert(0, str(BACKEND_ROOT))
+def _wait_for_mint(client: TestClient, job_id: int) -> dict:
+    """Drain the mint queue in-process; the background worker may hold the batch briefly."""
+    from app.services import minting
 
-
-@pytest.fixture(name="client")
-def client_fixture(tmp_path, monkeypatch) -> TestClient:
-    db_path = tmp_path / "test.db"
-    monkeypatch.setenv("AURA_DATABASE_URL", f"sqlite:///{db_path}")
-
-    # Reload modules that cache configuration to ensure the temp DB is used.
-    from app import config, db, main, seed
-
-    reload(config)
-    reload(db)
-    reload(seed)
-    reload(main)
-
-    from app.main import app
-
-    with TestClient(app) as test_client:
-        yield test_client
+    for _ in range(100):
+        minting.current().drain()
+        job = client.get(f"/mint-jobs/{job_id}").json()
+        if job["status"] in {"completed", "failed"}:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"mint job {job_id} did not finish")
 
 
 def test_producer_onboarding_flow(client: TestClient):
@@ -100,8 +86,18 @@ def test_waste_lot_tokenization_flow(client: TestClient):
 
     token_payload = {"token_name": "LOT-010", "token_symbol": "LOT", "supply": 1}
     tokenize_resp = client.post(f"/lots/{lot_id}/tokenize", json=token_payload)
-    assert tokenize_resp.status_code == 200
-    data = tokenize_resp.json()
+    assert tokenize_resp.status_code == 202
+    job = tokenize_resp.json()
+    assert job["status"] == "queued"
+    assert tokenize_resp.headers["location"] == f"/mint-jobs/{job['id']}"
+    # A repeated request while the mint is pending returns the same job.
+    assert client.post(f"/lots/{lot_id}/tokenize", json=token_payload).json()["id"] == job["id"]
+
+    finished = _wait_for_mint(client, job["id"])
+    assert finished["status"] == "completed"
+    assert finished["transaction_hash"]
+
+    data = client.get(f"/lots/{lot_id}").json()
     assert data["status"] == "tokenized"
     assert data["token"]["token_name"] == "LOT-010"
     assert data["token"]["token_symbol"] == "LOT"
@@ -236,6 +232,7 @@ def test_upcycling_proof_flow(client: TestClient):
         json={"token_name": "LOT-030", "token_symbol": "ALU", "supply": 1},
     )
     tokenize_resp.raise_for_status()
+    _wait_for_mint(client, tokenize_resp.json()["id"])
 
     matchmaking_resp = client.post("/agents/matchmaking")
     matchmaking_resp.raise_for_status()
@@ -278,4 +275,73 @@ def test_upcycling_proof_flow(client: TestClient):
     detail = lot_detail.json()
     assert detail["status"] == "retired"
     assert detail["proofs"][0]["status"] == "validated"
-    assert detail["token"]["retired_at"] is not None
\ No newline at end of file
+    assert detail["token"]["retired_at"] is not None
+
+def test_lots_updated_since_returns_only_changed_rows(client: TestClient):
+    producer_resp = client.post(
+        "/producers",
+        json={"name": "DeltaWorks", "contact_email": "ops@deltaworks.example"},
+    )
+    producer_resp.raise_for_status()
+    producer_id = producer_resp.json()["id"]
+
+    lot_ids = []
+    for index in range(2):
+        lot_resp = client.post(
+            "/lots",
+            json={
+                "producer_id": producer_id,
+                "material_type": "Copper Wire",
+                "quantity_tons": 3 + index,
+                "location": "Reno, NV",
+            },
+        )
+        lot_resp.raise_for_status()
+        lot_ids.append(lot_resp.json()["id"])
+
+    all_lots = client.get("/lots", params={"producer_id": producer_id}).json()
+    assert sorted(lot["id"] for lot in all_lots) == sorted(lot_ids)
+    watermark = max(lot["updated_at"] for lot in all_lots)
+
+    client.post(
+        f"/lots/{lot_ids[0]}/verification",
+        json={"method": "sensor_bundle", "mark_verified": True},
+    ).raise_for_status()
+
+    changed = client.get("/lots", params={"producer_id": producer_id, "updated_since": watermark}).json()
+    changed_ids = {lot["id"] for lot in changed}
+    assert lot_ids[0] in changed_ids
+    assert all(lot["updated_at"] >= watermark for lot in changed)
+
+
+def test_lots_scoped_to_a_recycler_include_lots_whose_negotiation_changed(client: TestClient):
+    from datetime import datetime
+
+    from app.db import session_scope
+    from app.db_models import Negotiation
+
+    producer_id = client.post(
+        "/producers", json={"name": "ScopeWorks", "contact_email": "ops@scope.example"}
+    ).json()["id"]
+    producer_agent = client.post(
+        "/agents", json={"owner_name": "ScopeWorks", "agent_type": "producer", "producer_id": producer_id}
+    ).json()["id"]
+    recycler = client.post("/agents", json={"owner_name": "Scope Smelter", "agent_type": "recycler"}).json()["id"]
+    lot_ids = [
+        client.post(
+            "/lots",
+            json={"producer_id": producer_id, "material_type": "Copper Wire", "quantity_tons": 2, "location": "Erie"},
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    assert client.get("/lots", params={"recycler_agent_id": recycler}).json() == []
+
+    watermark = datetime.utcnow().isoformat()
+    # A negotiation opened on an existing lot leaves the lot row untouched.
+    with session_scope() as session:
+        session.add(Negotiation(waste_lot_id=lot_ids[1], producer_agent_id=producer_agent, recycler_agent_id=recycler))
+        session.commit()
+
+    scoped = client.get("/lots", params={"recycler_agent_id": recycler, "updated_since": watermark}).json()
+    assert [lot["id"] for lot in scoped] == [lot_ids[1]]
+    assert [lot["id"] for lot in client.get("/lots", params={"recycler_agent_id": recycler}).json()] == [lot_ids[1]]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+
+
+def _price(material_type: str, usd_per_ton: float) -> str:
+    return json.dumps({"material_type": material_type, "usd_per_ton": usd_per_ton})
+
+
+def test_feed_cache_refreshes_each_changed_feed_once_and_serves_etags(client: TestClient):
+    from app.services import oracle
+    from app.services.aptos import AptosTokenService, FeedUpdate
+
+    service = AptosTokenService()
+    cache = oracle.current()
+    cache.poll()
+    reads_before = cache.metrics()["reads_total"]
+
+    service.publish_feeds(
+        [FeedUpdate(1, "price:pet", _price("PET Bales", 410)), FeedUpdate(2, "price:hdpe", _price("HDPE Regrind", 520))]
+    )
+    service.publish_feeds([FeedUpdate(1, "price:pet", _price("PET Bales", 425)) for _ in range(3)])
+    assert cache.poll() == 2
+    assert cache.metrics()["reads_total"] - reads_before == 2
+
+    response = client.get("/oracle/feeds")
+    feeds = {feed["feed_id"]: feed for feed in response.json()}
+    assert feeds[1]["version"] == 4
+    assert json.loads(feeds[1]["payload"])["usd_per_ton"] == 425
+    assert cache.reference_price("pet bales") == 425
+
+    etag = response.headers["etag"]
+    assert client.get("/oracle/feeds", headers={"If-None-Match": etag}).status_code == 304
+    assert cache.poll() == 0
+    assert client.get("/oracle/feeds", headers={"If-None-Match": etag}).status_code == 304
+
+    service.publish_feeds([FeedUpdate(2, "price:hdpe", _price("HDPE Regrind", 505))])
+    cache.poll()
+    refreshed = client.get("/oracle/feeds", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert client.get("/oracle/feeds/2").json()["version"] == 2
+    assert client.get("/oracle/feeds/999").status_code == 404
+
+
+def _matched_glass_offer(client: TestClient, name: str) -> float:
+    producer_id = client.post(
+        "/producers", json={"name": f"{name} Glassworks", "contact_email": f"ops@{name.lower()}.example"}
+    ).json()["id"]
+    client.post(
+        "/agents", json={"owner_name": f"{name} Glassworks", "agent_type": "producer", "producer_id": producer_id}
+    )
+    recycler_id = client.post(
+        "/agents", json={"owner_name": f"{name} Cullet Buyer", "agent_type": "recycler", "max_price_usd_per_ton": 300}
+    ).json()["id"]
+    lot_id = client.post(
+        "/lots",
+        json={
+            "producer_id": producer_id,
+            "material_type": "Cullet Glass",
+            "quantity_tons": 8,
+            "location": "Toledo, OH",
+            "price_floor_usd_per_ton": 90,
+        },
+    ).json()["id"]
+    client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+
+    negotiations = client.post("/agents/matchmaking").json()
+    offer = next(n for n in negotiations if n["waste_lot_id"] == lot_id and n["recycler_agent_id"] == recycler_id)
+    return offer["recycler_offer_usd_per_ton"]
+
+
+def test_matchmaking_offers_follow_reference_prices(client: TestClient):
+    from app.services import oracle
+    from app.services.aptos import AptosTokenService, FeedUpdate
+
+    AptosTokenService().publish_feeds([FeedUpdate(10, "price:glass", _price("Cullet Glass", 140))])
+    oracle.current().poll()
+    assert _matched_glass_offer(client, "Clear") == 140
+
+
+def test_matchmaking_follows_reference_prices_without_the_poller(client: TestClient, monkeypatch):
+    from app.services import oracle
+    from app.services.aptos import AptosTokenService, FeedUpdate
+
+    monkeypatch.setattr(oracle, "_cache", None)
+    monkeypatch.setattr(oracle, "_request_cache", None)
+    AptosTokenService().publish_feeds([FeedUpdate(10, "price:glass", _price("Cullet Glass", 135))])
+    assert _matched_glass_offer(client, "Amber") == 135
+
+
+def test_feeds_are_served_from_one_shared_cache_without_the_poller(client: TestClient, monkeypatch):
+    from app.services import oracle
+    from app.services.aptos import AptosTokenService, FeedUpdate
+
+    monkeypatch.setattr(oracle, "_cache", None)
+    monkeypatch.setattr(oracle, "_request_cache", None)
+    service = AptosTokenService()
+    service.publish_feeds([FeedUpdate(20, "price:alu", _price("Aluminum Scrap", 1200))])
+
+    assert client.get("/oracle/feeds/20").json()["version"] >= 1
+    shared = oracle.feed_cache()
+    assert oracle.feed_cache() is shared
+
+    scanned = shared.metrics()["events_scanned_total"]
+    etag = client.get("/oracle/feeds").headers["etag"]
+    assert client.get("/oracle/feeds", headers={"If-None-Match": etag}).status_code == 304
+    assert shared.metrics()["events_scanned_total"] == scanned
+
+    service.publish_feeds([FeedUpdate(20, "price:alu", _price("Aluminum Scrap", 1150))])
+    assert json.loads(client.get("/oracle/feeds/20").json()["payload"])["usd_per_ton"] == 1150
+    assert client.get("/oracle/feeds", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _producer_with_lots(client: TestClient) -> tuple[int, dict[str, list[int]]]:
+    producer_id = client.post("/producers", json={"name": "Paged Co", "contact_email": "p@example.com"}).json()["id"]
+    client.post("/agents", json={"owner_name": "Paged Co", "agent_type": "producer", "producer_id": producer_id})
+    lots: dict[str, list[int]] = {"pending_verification": [], "verified": []}
+    for index in range(7):
+        lot_id = client.post(
+            "/lots",
+            json={"producer_id": producer_id, "material_type": "OCC Cardboard", "quantity_tons": 2, "location": "Erie, PA"},
+        ).json()["id"]
+        if index % 3 == 0:
+            client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+            lots["verified"].append(lot_id)
+        else:
+            lots["pending_verification"].append(lot_id)
+    return producer_id, lots
+
+
+def test_summary_counts_lots_and_lists_the_ones_awaiting_the_producer(client: TestClient, query_budget):
+    producer_id, lots = _producer_with_lots(client)
+    with query_budget(5, "GET /producers/{producer_id}"):
+        summary = client.get(f"/producers/{producer_id}", params={"summary": True}).json()
+
+    assert "lots" not in summary
+    assert summary["lot_counts"] == {"pending_verification": 4, "verified": 3}
+    assert summary["actionable_lot_ids"] == sorted(lots["pending_verification"] + lots["verified"])
+    assert {agent["owner_name"] for agent in summary["agents"]} == {"Paged Co"}
+
+
+def test_nested_lots_page_newest_first_and_filter_by_status(client: TestClient):
+    producer_id, lots = _producer_with_lots(client)
+
+    seen: list[int] = []
+    offset = 0
+    while offset is not None:
+        page = client.get(f"/producers/{producer_id}", params={"limit": 3, "offset": offset}).json()
+        assert page["lots_total"] == 7 and len(page["lots"]) <= 3
+        seen += [lot["id"] for lot in page["lots"]]
+        offset = page["next_offset"]
+    assert seen == sorted(lots["pending_verification"] + lots["verified"], reverse=True)
+
+    verified = client.get(f"/producers/{producer_id}", params={"status": "verified", "limit": 2}).json()
+    assert verified["lots_total"] == 3 and verified["next_offset"] == 2
+    assert [lot["id"] for lot in verified["lots"]] == sorted(lots["verified"], reverse=True)[:2]
+    assert client.get(f"/producers/{producer_id}", params={"limit": 0}).status_code == 422
+
+    listed = client.get("/lots", params=[("producer_id", producer_id), ("status", "verified"), ("status", "draft")])
+    assert sorted(lot["id"] for lot in listed.json()) == sorted(lots["verified"])
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+
+def _spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_attributes_wall_and_cpu_time_to_tagged_code(tmp_path):
+    from app.profiling import SamplingProfiler
+
+    stop = threading.Event()
+    profiler = SamplingProfiler({_spin.__code__: "GET /busy"}, interval=0.002)
+    worker = threading.Thread(target=_spin, args=(stop,))
+    worker.start()
+    profiler.start()
+    time.sleep(0.2)
+    profile = profiler.stop()
+    stop.set()
+    worker.join()
+
+    summary = profile.summary()
+    busy = summary["tags"]["GET /busy"]
+    assert busy["samples"] > 10
+    assert 0.1 < busy["wall_seconds"] <= profile.seconds + 0.01
+    assert busy["cpu_seconds"] > 0
+
+    paths = profile.write(tmp_path, "unit")
+    stacks = paths["wall"].read_text().splitlines()
+    assert any(line.startswith("GET /busy;") and "_spin (" in line for line in stacks)
+    stack, _, micros = stacks[0].rpartition(" ")
+    assert int(micros) > 0 and ";" in stack
+    assert paths["cpu"].read_text()
+    assert json.loads(paths["summary"].read_text())["tags"]["GET /busy"]["samples"] == busy["samples"]
+
+
+def test_route_tags_and_on_demand_capture(client: TestClient, tmp_path):
+    from app.config import get_settings
+    from app.main import app, marketplace_snapshot
+    from app.profiling import route_tags
+
+    assert route_tags(app.routes)[marketplace_snapshot.__code__] == "GET /snapshot"
+
+    get_settings().profile_dir = str(tmp_path)
+    body = client.post("/system/profiling/capture", params={"seconds": 0.05}).json()
+    assert body["samples"] > 0
+    assert set(body["files"]) == {"wall", "cpu", "summary"}
+    assert all(path.startswith(str(tmp_path)) for path in body["files"].values())
+    assert client.get("/system/profiling").json() == {"running": False}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _seed_lots(client: TestClient, count: int) -> int:
+    """`count` verified lots, each from its own producer and with a proof, so per-row lookups would show."""
+    for index in range(count):
+        producer_id = client.post(
+            "/producers", json={"name": f"Budget Producer {index}", "contact_email": f"ops{index}@budget.example"}
+        ).json()["id"]
+        lot_id = client.post(
+            "/lots",
+            json={"producer_id": producer_id, "material_type": "Aluminum Cans", "quantity_tons": 3, "location": "Erie, PA"},
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+        client.post(f"/lots/{lot_id}/proofs", json={"sensor_checksum": f"budget-{index}"})
+    return producer_id
+
+
+def test_statement_shapes_fold_in_lists():
+    from app.querylog import statement_shape
+
+    assert statement_shape("SELECT *\n  FROM lot WHERE id IN (?, ?,?)") == "SELECT * FROM lot WHERE id IN (?...)"
+    assert statement_shape("SELECT * FROM lot WHERE id IN (?)") == "SELECT * FROM lot WHERE id IN (?...)"
+
+
+@pytest.mark.parametrize("lots", [2, 12])
+def test_read_endpoints_stay_within_a_constant_query_budget(client: TestClient, query_budget, lots: int):
+    producer_id = _seed_lots(client, lots)
+
+    with query_budget(6, "GET /lots") as seen:
+        assert len(client.get("/lots").json()) >= lots
+    assert seen and not seen[0][1].repeated()
+
+    with query_budget(8, "GET /snapshot"):
+        client.get("/snapshot").raise_for_status()
+
+    with query_budget(6, "GET /producers/{producer_id}"):
+        client.get(f"/producers/{producer_id}").raise_for_status()
+
+
+@pytest.mark.query_budget(3, route="GET /negotiations")
+def test_marker_applies_a_budget_to_every_matching_request(client: TestClient):
+    response = client.get("/negotiations")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=") and '1 queries' in timing
+
+    routes = client.get("/system/queries").json()["routes"]
+    assert routes["GET /negotiations"]["max_queries"] == 1
+
+
+def test_exceeding_the_budget_fails_with_the_offending_route(client: TestClient, query_budget):
+    with pytest.raises(AssertionError, match="query budget of 0 exceeded:\nGET /producers: 1 queries"):
+        with query_budget(0, "GET /producers"):
+            client.get("/producers")
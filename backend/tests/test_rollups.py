@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _create_lot(client: TestClient, producer_id: int, floor: float, tons: float) -> int:
+    resp = client.post(
+        "/lots",
+        json={
+            "producer_id": producer_id,
+            "material_type": "Copper Wire",
+            "quantity_tons": tons,
+            "location": "Reno, NV",
+            "price_floor_usd_per_ton": floor,
+        },
+    )
+    resp.raise_for_status()
+    return resp.json()["id"]
+
+
+def test_price_rollups_update_incrementally_and_match_rebuild(client: TestClient):
+    producer_resp = client.post("/producers", json={"name": "Rollup Metals", "contact_email": "ops@rollup.example"})
+    producer_resp.raise_for_status()
+    producer_id = producer_resp.json()["id"]
+    client.post(
+        "/agents",
+        json={"owner_name": "Rollup Recycler", "agent_type": "recycler", "max_price_usd_per_ton": 500},
+    ).raise_for_status()
+
+    lot_ids = [_create_lot(client, producer_id, floor, tons) for floor, tons in ((200, 4), (300, 6))]
+    for lot_id in lot_ids:
+        client.post(
+            f"/lots/{lot_id}/verification", json={"method": "sensor_bundle", "mark_verified": True}
+        ).raise_for_status()
+    negotiations = client.post("/agents/matchmaking").json()
+    negotiation = next(item for item in negotiations if item["waste_lot_id"] == lot_ids[0])
+    client.post(f"/negotiations/{negotiation['id']}/decision", json={"agree": True}).raise_for_status()
+
+    rows = client.get("/analytics/prices", params={"material_type": "Copper Wire"}).json()
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["lot_count"] == 2
+    assert row["tons"] == 10
+    assert row["floor_min_usd_per_ton"] == 200
+    assert row["floor_avg_usd_per_ton"] == 250
+    assert row["floor_max_usd_per_ton"] == 300
+    assert row["agreed_count"] == 1
+    assert row["agreed_tons"] == 4
+
+    from app.db import session_scope
+    from app.services import rollups
+
+    with session_scope() as session:
+        assert rollups.verify(session) == []
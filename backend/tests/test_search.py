@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _lot(client: TestClient, producer_id: int, material_type: str, location: str, reference: str | None) -> int:
+    return client.post(
+        "/lots",
+        json={
+            "producer_id": producer_id,
+            "material_type": material_type,
+            "quantity_tons": 5,
+            "location": location,
+            "external_reference": reference,
+        },
+    ).json()["id"]
+
+
+def _search(client: TestClient, q: str, **params) -> dict:
+    response = client.get("/lots/search", params={"q": q, **params})
+    response.raise_for_status()
+    return response.json()
+
+
+def test_search_matches_substrings_of_every_searchable_column(client: TestClient):
+    producer_id = client.post("/producers", json={"name": "Search Co", "contact_email": "s@example.com"}).json()["id"]
+    glass = _lot(client, producer_id, "Cullet Glass", "Toledo, OH", "MAN-2024-0042")
+    bottles = _lot(client, producer_id, "PET Bottles", "Toledo, OH", "BOL-77120")
+    wire = _lot(client, producer_id, "Copper Wire", "Gary, IN", None)
+
+    def ids(q: str) -> list[int]:
+        return [hit["id"] for hit in _search(client, q)["results"]]
+
+    assert ids("glass") == [glass]
+    assert ids("0042") == [glass]  # middle of a manifest number
+    assert set(ids("toledo")) == {glass, bottles}
+    assert ids("toledo bottles") == [bottles]  # every term must match
+    assert ids("COPPER gary") == [wire]
+    assert ids("wire AND NOT") == []  # FTS operators are treated as literal terms
+    assert client.get("/lots/search", params={"q": "ab"}).status_code == 422
+    assert client.get(f"/lots/{glass}").json()["id"] == glass
+
+
+def test_manifest_number_hits_rank_first_and_pages_follow(client: TestClient):
+    producer_id = client.post("/producers", json={"name": "Rank Co", "contact_email": "r@example.com"}).json()["id"]
+    by_location = [_lot(client, producer_id, "HDPE Regrind", f"Port {n} Hub", None) for n in range(5)]
+    by_reference = _lot(client, producer_id, "HDPE Regrind", "Akron, OH", "PORT-HUB-9")
+
+    first = _search(client, "port hub", limit=2)
+    assert first["results"][0]["id"] == by_reference
+    assert first["ranked"] == 6 and first["truncated"] is False
+    assert [hit["score"] for hit in first["results"]] == sorted(hit["score"] for hit in first["results"])
+
+    seen = [hit["id"] for hit in first["results"]]
+    offset = first["next_offset"]
+    while offset is not None:
+        page = _search(client, "port hub", limit=2, offset=offset)
+        assert page["ranked"] == 6
+        seen += [hit["id"] for hit in page["results"]]
+        offset = page["next_offset"]
+    assert sorted(seen) == sorted(by_location + [by_reference])
+
+    past_the_end = _search(client, "port hub", limit=2, offset=10)
+    assert past_the_end["results"] == [] and past_the_end["ranked"] == 6 and past_the_end["next_offset"] is None
+
+
+def test_triggers_keep_the_index_in_step_and_init_db_backfills_it(client: TestClient):
+    from sqlalchemy import text
+
+    from app import db
+    from app.db_models import WasteLot
+    from app.services import search
+
+    producer_id = client.post("/producers", json={"name": "Sync Co", "contact_email": "y@example.com"}).json()["id"]
+    lot_id = _lot(client, producer_id, "Aluminum Cans", "Reno, NV", None)
+
+    with db.session_scope() as session:
+        lot = session.get(WasteLot, lot_id)
+        lot.location = "Fresno, CA"
+        session.add(lot)
+        session.commit()
+    assert _search(client, "reno")["results"] == []
+    assert [hit["id"] for hit in _search(client, "fresno")["results"]] == [lot_id]
+
+    # A database from before the search index existed gets it, filled, on the next migration.
+    with db.get_engine().begin() as connection:
+        for name in ("insert", "delete", "update"):
+            connection.exec_driver_sql(f"DROP TRIGGER {search.TABLE}_{name}")
+        connection.exec_driver_sql(f"DROP TABLE {search.TABLE}")
+        connection.execute(text("UPDATE schemaversion SET fingerprint = 'stale'"))
+    assert db.init_db() is True
+    assert [hit["id"] for hit in _search(client, "fresno")["results"]] == [lot_id]
+    assert _search(client, "HDPE Plastic Scrap")["results"]  # seeded lots are indexed too
+
+    with db.get_engine().begin() as connection:
+        connection.execute(text("DELETE FROM wastelot WHERE id = :id"), {"id": lot_id})
+    assert _search(client, "fresno")["results"] == []
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+
+def test_json_response_dumps_validated_models_without_revalidating_them():
+    from app import serialization
+    from app.models import WasteLotDetail, WasteLotStatus
+
+    created = datetime(2025, 3, 1, 9, 30)
+    lot = WasteLotDetail(
+        id=7,
+        producer_id=3,
+        material_type="PET Bales",
+        quantity_tons=12.5,
+        location="Dallas, TX",
+        photos=["https://cdn.example/lots/7.jpg"],
+        status=WasteLotStatus.VERIFIED,
+        created_at=created,
+        updated_at=created,
+    )
+
+    response = serialization.json_response([lot], list[WasteLotDetail], status_code=201)
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == [lot.model_dump(mode="json")]
+    assert json.loads(response.body)[0]["photos"] == ["https://cdn.example/lots/7.jpg"]
+    assert serialization._adapter(list[WasteLotDetail]) is serialization._adapter(list[WasteLotDetail])
+
+
+def test_lot_responses_match_their_response_model(client: TestClient):
+    from app.models import WasteLotDetail
+
+    producer_id = client.post(
+        "/producers", json={"name": "Serial Plastics", "contact_email": "ops@serial.example"}
+    ).json()["id"]
+    created = client.post(
+        "/lots",
+        json={
+            "producer_id": producer_id,
+            "material_type": "HDPE Regrind",
+            "quantity_tons": 4,
+            "location": "Akron, OH",
+            "photos": ["https://cdn.example/regrind.jpg"],
+        },
+    )
+    assert created.status_code == 201
+    body = client.get(f"/lots/{created.json()['id']}").json()
+    assert body == WasteLotDetail.model_validate(body).model_dump(mode="json")
+    assert body["photos"] == ["https://cdn.example/regrind.jpg"]
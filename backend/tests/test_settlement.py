@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _agreed_deals(client: TestClient, deals: int) -> tuple[int, list[int], list[int]]:
+    """One producer, two recyclers, `deals` agreed negotiations split across them."""
+    from app import db
+    from app.db_models import Negotiation, NegotiationStatus
+
+    producer_id = client.post(
+        "/producers",
+        json={"name": "Netting Plastics", "contact_email": "ops@netting.example", "aptos_address": "0xnetting"},
+    ).json()["id"]
+    producer_agent_id = client.post(
+        "/agents", json={"owner_name": "Netting Plastics", "agent_type": "producer", "producer_id": producer_id}
+    ).json()["id"]
+    recycler_ids = [
+        client.post("/agents", json={"owner_name": f"Buyer {index}", "agent_type": "recycler"}).json()["id"]
+        for index in range(2)
+    ]
+    lot_ids = [
+        client.post(
+            "/lots",
+            json={"producer_id": producer_id, "material_type": "HDPE Regrind", "quantity_tons": 2, "location": "Tulsa, OK"},
+        ).json()["id"]
+        for _ in range(deals)
+    ]
+    with db.session_scope() as session:
+        negotiations = [
+            Negotiation(
+                waste_lot_id=lot_id,
+                producer_agent_id=producer_agent_id,
+                recycler_agent_id=recycler_ids[index % 2],
+                status=NegotiationStatus.AGREED,
+                agreed_price_usd_per_ton=100.0 + index,
+            )
+            for index, lot_id in enumerate(lot_ids)
+        ]
+        session.add_all(negotiations)
+        session.commit()
+        return producer_id, recycler_ids, [negotiation.id for negotiation in negotiations]
+
+
+def test_agreed_deals_are_netted_into_one_escrow_per_pair(client: TestClient):
+    from app.services import settlement
+    from app.services.chain import ESCROW_FINALIZED, get_chain_backend
+
+    producer_id, recycler_ids, negotiation_ids = _agreed_deals(client, deals=10)
+    chain = get_chain_backend()
+    transactions_before = chain.metrics()["transactions_total"]
+
+    engine = settlement.current()
+    settled = [item for item in engine.run_once() if item.producer_id == producer_id]
+    transactions = chain.metrics()["transactions_total"] - transactions_before
+
+    assert len(settled) == 2
+    assert sum(item.negotiation_count for item in settled) == 10
+    assert transactions < 10
+    by_recycler = {item.recycler_agent_id: item for item in settled}
+    # Recycler 0 took deals 0, 2, 4, 6, 8 at $100-$108/t on 2 t lots.
+    assert by_recycler[recycler_ids[0]].amount_usd == 2 * (100 + 102 + 104 + 106 + 108)
+    for item in settled:
+        assert chain.view("escrow_settlement", "escrow_status", item.escrow_id) == ESCROW_FINALIZED
+
+    listed = client.get("/settlements", params={"producer_id": producer_id}).json()
+    assert {item["status"] for item in listed} == {"settled"}
+    negotiations = {item["id"]: item for item in client.get("/negotiations").json()}
+    for negotiation_id in negotiation_ids:
+        assert negotiations[negotiation_id]["status"] == "settled"
+        assert negotiations[negotiation_id]["settlement_id"] in {item.id for item in settled}
+
+    assert engine.run_once() == []
+    assert client.get("/system/settlement").json()["pending_negotiations"] == 0
+
+
+def test_failed_settlement_releases_negotiations_for_the_next_window(client: TestClient):
+    from app.services import settlement
+    from app.services.chain import get_chain_backend
+
+    producer_id, _, negotiation_ids = _agreed_deals(client, deals=4)
+    engine = settlement.current()
+
+    get_chain_backend().inject_failures(1)
+    failed = engine.run_once()
+    assert {item.status.value for item in failed} == {"failed"}
+    listed = client.get("/settlements", params={"producer_id": producer_id, "status": "failed"}).json()
+    assert len(listed) == 2
+
+    negotiations = {item["id"]: item for item in client.get("/negotiations").json()}
+    assert all(negotiations[n]["status"] == "agreed" and negotiations[n]["settlement_id"] is None for n in negotiation_ids)
+
+    retried = [item for item in engine.run_once() if item.producer_id == producer_id]
+    assert {item.status.value for item in retried} == {"settled"}
+
+
+def test_settlement_interrupted_after_open_resumes_the_same_escrows(client: TestClient, monkeypatch):
+    from app.services import settlement
+    from app.services.chain import ESCROW_FINALIZED, ESCROW_FUNDED, get_chain_backend
+
+    producer_id, _, negotiation_ids = _agreed_deals(client, deals=4)
+    engine = settlement.current()
+    chain = get_chain_backend()
+    sign_escrows = engine.service.sign_escrows
+
+    def sign_then_fail(escrows):
+        # The first signer transaction lands, the second aborts: one escrow ends up funded.
+        chain.inject_failures(1)
+        return sign_escrows(escrows)
+
+    monkeypatch.setattr(engine.service, "sign_escrows", sign_then_fail)
+    interrupted = [item for item in engine.run_once() if item.producer_id == producer_id]
+    assert {item.status.value for item in interrupted} == {"pending"}
+    assert all(item.escrow_id is not None and item.escrow_step.value == "opened" for item in interrupted)
+    escrow_ids = {item.escrow_id for item in interrupted}
+    statuses = [chain.view("escrow_settlement", "escrow_status", escrow_id) for escrow_id in escrow_ids]
+    assert ESCROW_FUNDED in statuses
+    negotiations = {item["id"]: item for item in client.get("/negotiations").json()}
+    assert all(negotiations[n]["settlement_id"] is not None for n in negotiation_ids)
+
+    monkeypatch.setattr(engine.service, "sign_escrows", sign_escrows)
+    opened = chain.metrics()["transactions_total"]
+    resumed = [item for item in engine.run_once() if item.producer_id == producer_id]
+    assert {item.escrow_id for item in resumed} == escrow_ids
+    assert {item.status.value for item in resumed} == {"settled"}
+    for escrow_id in escrow_ids:
+        assert chain.view("escrow_settlement", "escrow_status", escrow_id) == ESCROW_FINALIZED
+    # Only the missing signer call and the finalize batch were sent; nothing was reopened or refunded.
+    assert chain.metrics()["transactions_total"] - opened == 2
+
+    listed = client.get("/settlements", params={"producer_id": producer_id}).json()
+    assert len(listed) == 2 and {item["status"] for item in listed} == {"settled"}
+    negotiations = {item["id"]: item for item in client.get("/negotiations").json()}
+    assert all(negotiations[n]["status"] == "settled" for n in negotiation_ids)
+
+
+def test_escrows_opened_before_a_failed_open_transaction_are_kept(client: TestClient, monkeypatch):
+    from app.services import settlement
+    from app.services.chain import ESCROW_FINALIZED, get_chain_backend
+
+    producer_id, recycler_ids, negotiation_ids = _agreed_deals(client, deals=4)
+    engine = settlement.current()
+    chain = get_chain_backend()
+    execute = chain._execute
+    opens = []
+
+    def fail_second_open(pending):
+        if pending.calls[0].name == "escrow_settlement::open":
+            opens.append(pending.hash)
+            if len(opens) == 2:
+                chain.inject_failures(1)
+        return execute(pending)
+
+    monkeypatch.setattr(chain, "max_calls_per_transaction", 1)  # one open per transaction
+    monkeypatch.setattr(chain, "_execute", fail_second_open)
+    worked = {item.recycler_agent_id: item for item in engine.run_once() if item.producer_id == producer_id}
+    first, second = worked[recycler_ids[0]], worked[recycler_ids[1]]
+    assert len(opens) == 2
+    assert first.status.value == "settled"
+    assert chain.view("escrow_settlement", "escrow_status", first.escrow_id) == ESCROW_FINALIZED
+    assert second.status.value == "failed" and second.escrow_id is None
+
+    negotiations = {item["id"]: item for item in client.get("/negotiations").json()}
+    assert {negotiations[n]["status"] for n in negotiation_ids[0::2]} == {"settled"}
+    assert all(negotiations[n]["settlement_id"] is None for n in negotiation_ids[1::2])
+
+    retried = [item for item in engine.run_once() if item.producer_id == producer_id]
+    assert [item.recycler_agent_id for item in retried] == [recycler_ids[1]]
+    assert retried[0].status.value == "settled" and len(opens) == 3
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+# Generous enough for a loaded CI box; a local run of the app's own imports takes well under half of it.
+APP_IMPORT_BUDGET_SECONDS = float(os.getenv("AURA_APP_IMPORT_BUDGET_SECONDS", "1.0"))
+WARM_STARTUP_BUDGET_SECONDS = float(os.getenv("AURA_WARM_STARTUP_BUDGET_SECONDS", "0.25"))
+
+_MEASURE_IMPORT = """
+import json, sys, time
+import fastapi, fastapi.routing, pydantic, sqlalchemy, sqlmodel  # third-party floor, measured separately
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(m for m in sys.modules if m.startswith(("app", "pyarrow")))}))
+"""
+
+
+def test_importing_the_app_stays_within_budget_and_defers_rare_services(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE_IMPORT],
+        cwd=BACKEND_ROOT,
+        env={**os.environ, "AURA_DATABASE_URL": f"sqlite:///{tmp_path / 'import.db'}"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    measured = json.loads(result.stdout)
+    assert measured["seconds"] < APP_IMPORT_BUDGET_SECONDS, f"app import took {measured['seconds']:.3f}s"
+
+    deferred = {
+        "pyarrow",
+        "app.profiling",
+        "app.seed",
+        "app.services.agent_matcher",
+        "app.services.export",
+        "app.services.indexer",
+        "app.services.oracle",
+        "app.services.settlement",
+    }
+    assert deferred.isdisjoint(measured["modules"])
+    assert not (tmp_path / "import.db").exists()  # the engine is built lazily
+
+
+def test_warm_start_runs_one_query_and_no_ddl(client: TestClient):
+    import time
+
+    from app import db, main, querylog
+
+    assert db.schema_is_current()
+    with querylog.track() as counter:
+        started = time.perf_counter()
+        main.startup_event()
+        elapsed = time.perf_counter() - started
+    assert counter.count == 1
+    assert elapsed < WARM_STARTUP_BUDGET_SECONDS
+
+
+def test_model_changes_invalidate_the_recorded_schema(client: TestClient, monkeypatch):
+    from app import db, main
+    from app.config import get_settings
+
+    assert not db.init_db()
+    monkeypatch.setattr(db, "schema_fingerprint", lambda: "changed-models")
+    assert not db.schema_is_current()
+
+    monkeypatch.setattr(get_settings(), "auto_migrate", False)
+    with pytest.raises(RuntimeError, match="app.cli init-db"):
+        main.startup_event()
+
+    monkeypatch.setattr(get_settings(), "auto_migrate", True)
+    main.startup_event()
+    assert db.schema_is_current()
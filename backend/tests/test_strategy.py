@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+
+RULES = [
+    {
+        "when": "material_type == 'HDPE Regrind' and quantity_tons >= 10",
+        "max_price": "max_price + 60",
+        "offer": "floor + 15",
+    },
+    {"when": "material_type in ('HDPE Regrind', 'PET Bales')"},
+]
+
+
+def test_compiled_rules_pick_the_first_matching_rule():
+    from app.services.strategy import CompiledStrategy
+
+    strategy = CompiledStrategy(RULES)
+    bulk = strategy.decide({"material_type": "HDPE Regrind", "quantity_tons": 12, "floor": 100, "max_price": 200})
+    assert (bulk.max_price, bulk.offer) == (260, 115)
+
+    small = strategy.decide({"material_type": "HDPE Regrind", "quantity_tons": 2, "max_price": 200})
+    assert small.max_price == 200 and math.isnan(small.offer)
+    assert strategy.decide({"material_type": "Cullet Glass", "max_price": 200}) is None
+
+    # Missing prices are NaN: comparisons are false and min/max skip them.
+    capped = CompiledStrategy([{"when": "floor < 50", "offer": "0"}, {"max_price": "min(reference, max_price)"}])
+    assert capped.decide({"max_price": 300, "floor": None}).max_price == 300
+    assert capped.decide({"max_price": 300, "reference": 210}).max_price == 210
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        {"when": "True"},
+        [{"when": "__import__('os').system('true')"}],
+        [{"when": "lot.material_type == 'PET'"}],
+        [{"when": "unknown_name > 1"}],
+        [{"when": "material_type in ['PET']"}],
+        [{"max_price": "max_price +"}],
+        [{"bid": "100"}],
+        [{"offer": "material_type"}],
+        [{"max_price": "max_price if floor > 0 else 'none'"}],
+        [{"when": "('a' * 100000) * 100000 == ''"}],
+        [{"when": "material_type > 5"}],
+        [{"offer": "min(material_type, 5)"}],
+        [{"when": " + ".join(["1"] * 2000)}],  # over the length cap
+        [{"offer": "+".join(["1"] * 1000)}],  # under it, but over the node cap
+        [{"when": "(" * 500 + "1" + ")" * 500}],
+    ],
+)
+def test_invalid_rules_are_rejected(rules, client: TestClient):
+    from app.services.strategy import CompiledStrategy, StrategyError
+
+    with pytest.raises(StrategyError):
+        CompiledStrategy(rules)
+    response = client.post(
+        "/agents", json={"owner_name": "Bad Rules", "agent_type": "recycler", "strategy_metadata": {"rules": rules}}
+    )
+    assert response.status_code == 422
+
+
+def test_matchmaking_follows_recycler_rules_and_compiles_them_once(client: TestClient):
+    from app.services import strategy
+
+    producer_id = client.post(
+        "/producers", json={"name": "Rule Plastics", "contact_email": "ops@rules.example"}
+    ).json()["id"]
+    client.post("/agents", json={"owner_name": "Rule Plastics", "agent_type": "producer", "producer_id": producer_id})
+    recycler_id = client.post(
+        "/agents",
+        json={
+            "owner_name": "Rule Recycler",
+            "agent_type": "recycler",
+            "max_price_usd_per_ton": 200,
+            "strategy_metadata": {"version": 1, "rules": RULES},
+        },
+    ).json()["id"]
+
+    def lot(material_type: str, quantity_tons: float, floor: float) -> int:
+        lot_id = client.post(
+            "/lots",
+            json={
+                "producer_id": producer_id,
+                "material_type": material_type,
+                "quantity_tons": quantity_tons,
+                "location": "Akron, OH",
+                "price_floor_usd_per_ton": floor,
+            },
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+        return lot_id
+
+    bulk = lot("HDPE Regrind", 12, 240)  # above the 200 cap, but the bulk rule raises it to 260
+    small = lot("HDPE Regrind", 3, 240)  # second rule keeps the 200 cap
+    glass = lot("Cullet Glass", 20, 50)  # no rule matches
+
+    compiled_before = strategy.metrics()["compiled_total"]
+    offers = {
+        negotiation["waste_lot_id"]: negotiation["recycler_offer_usd_per_ton"]
+        for negotiation in client.post("/agents/matchmaking").json()
+        if negotiation["recycler_agent_id"] == recycler_id
+    }
+    assert offers == {bulk: 255}
+    assert small not in offers and glass not in offers
+
+    client.post("/agents/matchmaking").raise_for_status()
+    assert strategy.metrics()["compiled_total"] == compiled_before + 1
+
+
+def test_rules_failing_on_a_lot_are_skipped_without_failing_matchmaking(client: TestClient):
+    from app.services.strategy import CompiledStrategy, StrategyError
+
+    dividing = [{"offer": "max_price / (quantity_tons - 12)"}]
+    with pytest.raises(StrategyError):
+        CompiledStrategy(dividing).decide({"quantity_tons": 12.0, "max_price": 200})
+
+    producer_id = client.post(
+        "/producers", json={"name": "Divide Plastics", "contact_email": "ops@divide.example"}
+    ).json()["id"]
+    client.post("/agents", json={"owner_name": "Divide Plastics", "agent_type": "producer", "producer_id": producer_id})
+    recycler_id = client.post(
+        "/agents",
+        json={
+            "owner_name": "Divide Recycler",
+            "agent_type": "recycler",
+            "max_price_usd_per_ton": 200,
+            "strategy_metadata": {"rules": dividing},
+        },
+    ).json()["id"]
+    lot_ids = []
+    for quantity_tons in (12, 13):
+        lot_id = client.post(
+            "/lots",
+            json={
+                "producer_id": producer_id,
+                "material_type": "HDPE Regrind",
+                "quantity_tons": quantity_tons,
+                "location": "Akron, OH",
+            },
+        ).json()["id"]
+        client.post(f"/lots/{lot_id}/verification", json={"method": "video_upload", "mark_verified": True})
+        lot_ids.append(lot_id)
+
+    response = client.post("/agents/matchmaking")
+    assert response.status_code == 200
+    matched = {item["waste_lot_id"] for item in response.json() if item["recycler_agent_id"] == recycler_id}
+    assert lot_ids[0] not in matched and lot_ids[1] in matched
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+REMOTE_TRACE = "4bf92f3577b34da6a3ce929d0e0e4736"
+REMOTE_PARENT = "00f067aa0ba902b7"
+
+
+def test_requests_continue_the_callers_trace_down_to_sql(client: TestClient):
+    from app import tracing
+
+    exporter = tracing.MemoryExporter()
+    tracing.configure(0.0, exporter)
+    producer_id = client.post("/producers", json={"name": "Traced Tins", "contact_email": "ops@traced.example"}).json()["id"]
+    assert exporter.spans == []  # unsampled root: nothing exported
+
+    response = client.get(f"/producers/{producer_id}", headers={"traceparent": f"00-{REMOTE_TRACE}-{REMOTE_PARENT}-01"})
+    assert response.status_code == 200
+    spans = {span.name: span for span in exporter.spans}
+    server = spans["GET /producers/{producer_id}"]
+    endpoint = spans["endpoint /producers/{producer_id}"]
+    queries = [span for span in exporter.spans if span.name == "db.query"]
+
+    assert {span.trace_id for span in exporter.spans} == {REMOTE_TRACE}
+    assert server.parent_span_id == REMOTE_PARENT and server.kind == "server"
+    assert server.attributes["http.status_code"] == 200
+    assert endpoint.parent_span_id == server.span_id
+    assert queries and {span.parent_span_id for span in queries} == {endpoint.span_id}
+    assert all(span.attributes["db.statement"].startswith("SELECT") for span in queries)
+    assert server.start_ns <= endpoint.start_ns <= endpoint.end_ns <= server.end_ns
+    assert response.headers["traceparent"] == server.traceparent
+
+
+def test_sample_rate_and_file_export(client: TestClient, tmp_path):
+    import json
+
+    from app import tracing
+
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracing.configure(1.0, tracing.FileExporter(path))
+    client.get("/producers")
+    tracing.configure(0.0, None)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    (root,) = [record for record in records if record["parent_span_id"] is None]
+    assert root["name"] == "GET /producers" and root["service"] == "aura-api"
+    assert all(record["trace_id"] == root["trace_id"] for record in records)
+    assert tracing.parse_traceparent("00-" + "0" * 32 + "-" + REMOTE_PARENT + "-01") is None
+    assert tracing.parse_traceparent("garbage") is None
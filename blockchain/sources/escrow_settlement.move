@@ -170,6 +170,15 @@ module aura::escrow_settlement {
         simple_map::borrow(&registry.records, &escrow_id).status
     }
 
+    /// (producer_signed, recycler_signed), so an interrupted settlement can resume with only the missing calls.
+    #[view]
+    public fun signatures(escrow_id: u64): (bool, bool) acquires Registry {
+        let registry = borrow_global<Registry>(@aura);
+        assert!(simple_map::contains_key(&registry.records, &escrow_id), ERR_NOT_FOUND);
+        let record = simple_map::borrow(&registry.records, &escrow_id);
+        (record.producer_signed, record.recycler_signed)
+    }
+
     public fun outstanding_share(escrow_id: u64, participant: address): u64 acquires Registry {
         let registry = borrow_global<Registry>(@aura);
         assert!(simple_map::contains_key(&registry.records, &escrow_id), ERR_NOT_FOUND);
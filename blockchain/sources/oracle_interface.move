@@ -70,6 +70,7 @@ module aura::oracle_interface {
         };
     }
 
+    #[view]
     public fun read(feed_id: u64): Option<FeedView> acquires Registry {
         if (!exists<Registry>(@aura)) {
             return option::none()
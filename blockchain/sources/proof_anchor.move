@@ -0,0 +1,65 @@
+module aura::proof_anchor {
+    use aptos_std::simple_map;
+    use aptos_std::simple_map::SimpleMap;
+    use std::signer;
+
+    use aura::roles;
+
+    const ERR_ALREADY_INITIALIZED: u64 = 1;
+    const ERR_NOT_AUTHORIZED: u64 = 2;
+    const ERR_NOT_FOUND: u64 = 3;
+    const ERR_EMPTY_BATCH: u64 = 4;
+
+    struct AnchorRecord has drop, store {
+        anchor_id: u64,
+        root: vector<u8>,
+        leaf_count: u64,
+        submitter: address,
+        anchored_at: u64,
+    }
+
+    struct Registry has key {
+        next_id: u64,
+        records: SimpleMap<u64, AnchorRecord>,
+    }
+
+    public entry fun init(admin: &signer) {
+        assert!(!exists<Registry>(@aura), ERR_ALREADY_INITIALIZED);
+        assert!(signer::address_of(admin) == roles::admin_address(), ERR_NOT_AUTHORIZED);
+        move_to(admin, Registry {
+            next_id: 1,
+            records: simple_map::create<u64, AnchorRecord>(),
+        });
+    }
+
+    /// Record the Merkle root of a batch of off-chain proof and verification checksums.
+    public entry fun anchor_root(
+        marketplace: &signer,
+        root: vector<u8>,
+        leaf_count: u64,
+    ) acquires Registry {
+        roles::assert_marketplace(signer::address_of(marketplace));
+        assert!(leaf_count > 0, ERR_EMPTY_BATCH);
+        let registry = borrow_global_mut<Registry>(@aura);
+        let anchor_id = registry.next_id;
+        registry.next_id = anchor_id + 1;
+        simple_map::upsert(&mut registry.records, anchor_id, AnchorRecord {
+            anchor_id,
+            root,
+            leaf_count,
+            submitter: signer::address_of(marketplace),
+            anchored_at: now(),
+        });
+    }
+
+    #[view]
+    public fun root_of(anchor_id: u64): vector<u8> acquires Registry {
+        let registry = borrow_global<Registry>(@aura);
+        assert!(simple_map::contains_key(&registry.records, &anchor_id), ERR_NOT_FOUND);
+        simple_map::borrow(&registry.records, &anchor_id).root
+    }
+
+    fun now(): u64 {
+        aptos_framework::timestamp::now_seconds()
+    }
+}